@@ -21,11 +21,12 @@ import os
 import json
 import logging
 import sqlite3
+import time
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Database path
 DB_DIR = Path(__file__).resolve().parent / "data"
@@ -365,6 +366,24 @@ class DatabaseManager:
                 )
             """)
 
+            # Executor partition leases - which daemon owns which slice of action_insights
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS executor_partitions (
+                    partition INTEGER PRIMARY KEY,
+                    owner TEXT,
+                    lease_expires REAL DEFAULT 0,
+                    epoch INTEGER DEFAULT 0
+                )
+            """)
+
+            # Live executor daemons, used to size each daemon's fair share of partitions
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS executor_members (
+                    worker_id TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
             # Cortex memory table - dedicated storage for persistent memory (JSON)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS cortex_memory (
@@ -432,6 +451,36 @@ class DatabaseManager:
                 )
             """)
 
+            # Document catalog - stat and frontmatter status cache for markdown outputs
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS document_catalog (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    scanned_ns INTEGER NOT NULL,
+                    content_hash TEXT,
+                    readable INTEGER NOT NULL DEFAULT 1,
+                    status TEXT,
+                    sync_status TEXT,
+                    notion_page_id TEXT,
+                    ai_processed INTEGER NOT NULL DEFAULT 0,
+                    pending_ai INTEGER NOT NULL DEFAULT 0,
+                    ready_for_sync INTEGER NOT NULL DEFAULT 0,
+                    needs_sync INTEGER NOT NULL DEFAULT 0,
+                    synced INTEGER NOT NULL DEFAULT 0,
+                    frontmatter TEXT
+                )
+            """)
+
+            # Notion block manifests - per-page list of (block id, content hash) for diff sync
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS notion_block_manifest (
+                    page_id TEXT PRIMARY KEY,
+                    blocks TEXT NOT NULL,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
             # Create indexes for faster queries
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_journals_date ON journals(date)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_reports_type_period ON reports(report_type, period)")
@@ -909,6 +958,89 @@ class DatabaseManager:
             )
             return cursor.rowcount > 0
 
+    # ==========================================
+    # DOCUMENT CATALOG METHODS
+    # ==========================================
+
+    CATALOG_FLAGS = ("readable", "ai_processed", "pending_ai", "ready_for_sync", "needs_sync", "synced")
+
+    @staticmethod
+    def _catalog_range(root: str) -> Tuple[str, str]:
+        """Key range covering every path below `root` (a prefix scan on the primary key)."""
+        prefix = root.rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def get_catalog_stats(self, root: str) -> Dict[str, Tuple[int, int, int, Optional[str]]]:
+        """(size, mtime_ns, scanned_ns, content_hash) for each catalogued path below `root`."""
+        low, high = self._catalog_range(root)
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT path, size, mtime_ns, scanned_ns, content_hash FROM document_catalog WHERE path >= ? AND path < ?",
+                (low, high),
+            ).fetchall()
+        return {row["path"]: (row["size"], row["mtime_ns"], row["scanned_ns"], row["content_hash"]) for row in rows}
+
+    def upsert_catalog_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """Insert or replace catalog rows (one dict per file, keyed like the table columns)."""
+        if not entries:
+            return 0
+        columns = list(entries[0].keys())
+        with self._get_connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO document_catalog ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [tuple(entry[c] for c in columns) for entry in entries],
+            )
+        return len(entries)
+
+    def touch_catalog_entries(self, stats: List[Tuple[int, int, int, str]]) -> int:
+        """Update (size, mtime_ns, scanned_ns) for paths whose content hash did not change."""
+        if not stats:
+            return 0
+        with self._get_connection() as conn:
+            conn.executemany("UPDATE document_catalog SET size = ?, mtime_ns = ?, scanned_ns = ? WHERE path = ?", stats)
+        return len(stats)
+
+    def delete_catalog_entries(self, paths: List[str] = None, root: str = None) -> int:
+        """Drop catalog rows for `paths`, or for everything below `root`."""
+        with self._get_connection() as conn:
+            if root is not None:
+                cursor = conn.execute("DELETE FROM document_catalog WHERE path >= ? AND path < ?", self._catalog_range(root))
+                return cursor.rowcount
+            conn.executemany("DELETE FROM document_catalog WHERE path = ?", [(p,) for p in paths or []])
+            return len(paths or [])
+
+    def query_catalog(self, root: str, status: str = None, **flags: bool) -> List[Dict[str, Any]]:
+        """
+        Catalog rows below `root`, sorted by path.
+
+        Filter on lifecycle `status` and any of CATALOG_FLAGS, e.g.
+        query_catalog(root, needs_sync=True).
+        """
+        low, high = self._catalog_range(root)
+        where, params = ["path >= ?", "path < ?"], [low, high]
+        if status is not None:
+            where.append("status = ?")
+            params.append(status)
+        for flag, value in flags.items():
+            if flag not in self.CATALOG_FLAGS:
+                raise ValueError(f"Unknown catalog flag '{flag}'. Must be one of: {self.CATALOG_FLAGS}")
+            where.append(f"{flag} = ?")
+            params.append(int(bool(value)))
+
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM document_catalog WHERE {' AND '.join(where)} ORDER BY path", params
+            ).fetchall()
+        entries = []
+        for row in rows:
+            entry = dict(row)
+            entry["frontmatter"] = json.loads(entry["frontmatter"]) if entry["frontmatter"] else {}
+            for flag in self.CATALOG_FLAGS:
+                entry[flag] = bool(entry[flag])
+            entries.append(entry)
+        return entries
+
     # ==========================================
     # NOTION SYNC TRACKING METHODS
     # ==========================================
@@ -1059,6 +1191,28 @@ class DatabaseManager:
             cursor.execute("DELETE FROM notion_sync")
             return cursor.rowcount
 
+    def get_block_manifest(self, page_id: str) -> Optional[List[Dict]]:
+        """Stored block manifest of a Notion page (list of {id, hash, type, nested}), or None."""
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT blocks FROM notion_block_manifest WHERE page_id = ?", (page_id,)).fetchone()
+            return json.loads(row["blocks"]) if row else None
+
+    def save_block_manifest(self, page_id: str, blocks: List[Dict]) -> None:
+        """Replace the block manifest of a Notion page."""
+        with self._get_connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO notion_block_manifest (page_id, blocks, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(page_id) DO UPDATE SET blocks = excluded.blocks, updated_at = excluded.updated_at
+            """,
+                (page_id, json.dumps(blocks), datetime.now().isoformat()),
+            )
+
+    def delete_block_manifest(self, page_id: str) -> bool:
+        """Forget a page's block manifest (its next diff sync rewrites the page)."""
+        with self._get_connection() as conn:
+            return conn.execute("DELETE FROM notion_block_manifest WHERE page_id = ?", (page_id,)).rowcount > 0
+
     # ==========================================
     # JOURNAL METHODS
     # ==========================================
@@ -1369,8 +1523,14 @@ class DatabaseManager:
             rows = [dict(r) for r in cursor.fetchall()]
             return rows
 
-    def update_llm_task_result(self, task_id: int, status: str, response: Optional[str] = None, error: Optional[str] = None, attempts: Optional[int] = None):
-        """Update task status, response, error and attempts count."""
+    def update_llm_task_result(self, task_id: int, status: str, response: Optional[str] = None, error: Optional[str] = None, attempts: Optional[int] = None, claimed_attempts: Optional[int] = None) -> bool:
+        """
+        Update task status, response, error and attempts count.
+
+        With `claimed_attempts` the update only applies while the task is
+        still in_progress with that attempt count, i.e. still held by the
+        claim that computed the result. Returns whether a row was updated.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             fields = []
@@ -1389,7 +1549,12 @@ class DatabaseManager:
             fields.append("status = ?")
             params.append(status)
             params.append(task_id)
-            cursor.execute(f"UPDATE llm_tasks SET {', '.join(fields)} WHERE id = ?", params)
+            where = "id = ?"
+            if claimed_attempts is not None:
+                where += " AND status = 'in_progress' AND COALESCE(attempts, 0) = ?"
+                params.append(claimed_attempts)
+            cursor.execute(f"UPDATE llm_tasks SET {', '.join(fields)} WHERE {where}", params)
+            return cursor.rowcount > 0
 
     def get_llm_queue_length(self) -> int:
         """Return number of tasks pending or in progress."""
@@ -2045,7 +2210,9 @@ class DatabaseManager:
 
             return [dict(row) for row in cursor.fetchall()]
 
-    def get_ready_actions(self, limit: int = None) -> List[Dict]:
+    def get_ready_actions(
+        self, limit: int = None, partitions: Optional[List[int]] = None, n_partitions: int = None
+    ) -> List[Dict]:
         """
         Get actions that are ready to execute NOW.
 
@@ -2055,15 +2222,27 @@ class DatabaseManager:
 
         Tasks without scheduled_for execute immediately.
         Tasks with scheduled_for execute when that time arrives.
+
+        With `partitions`, only actions whose `id % n_partitions` is in that
+        list are returned (see acquire_partition_leases).
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
+            params: List[Any] = [now]
+
+            partition_filter = ""
+            if partitions is not None:
+                if not partitions:
+                    return []
+                partition_filter = f"AND (id % ?) IN ({','.join('?' for _ in partitions)})"
+                params += [n_partitions, *partitions]
 
-            query = """
+            query = f"""
                 SELECT * FROM action_insights
                 WHERE status = 'pending'
                   AND (scheduled_for IS NULL OR scheduled_for <= ?)
+                  {partition_filter}
                 ORDER BY
                     CASE priority
                         WHEN 'critical' THEN 1
@@ -2076,9 +2255,9 @@ class DatabaseManager:
             """
 
             if limit:
-                cursor.execute(query + " LIMIT ?", (now, limit))
+                cursor.execute(query + " LIMIT ?", (*params, limit))
             else:
-                cursor.execute(query, (now,))
+                cursor.execute(query, params)
 
             return [dict(row) for row in cursor.fetchall()]
 
@@ -2454,7 +2633,7 @@ class DatabaseManager:
     #
     # ==========================================
 
-    def claim_action(self, action_id: str, worker_id: str = None) -> bool:
+    def claim_action(self, action_id: str, worker_id: str = None, n_partitions: int = None) -> bool:
         """
         Atomically claim an action for execution.
 
@@ -2466,6 +2645,8 @@ class DatabaseManager:
         Args:
             action_id: The action to claim
             worker_id: Optional worker identifier for debugging
+            n_partitions: If set, the claim also requires `worker_id` to hold
+                an unexpired lease on the action's partition
 
         Returns:
             True if claim succeeded, False if action was already claimed
@@ -2475,24 +2656,132 @@ class DatabaseManager:
             now = datetime.now().isoformat()
             worker = worker_id or f"worker_{now}"
 
+            lease_filter = ""
+            params: List[Any] = [now, worker, action_id]
+            if n_partitions:
+                lease_filter = """
+                  AND EXISTS (
+                      SELECT 1 FROM executor_partitions p
+                      WHERE p.partition = action_insights.id % ?
+                        AND p.owner = ?
+                        AND p.lease_expires > ?
+                  )"""
+                params += [n_partitions, worker, time.time()]
+
             # Atomic claim: only succeeds if status is still 'pending'
             cursor.execute(
-                """
+                f"""
                 UPDATE action_insights
                 SET status = 'in_progress',
                     metadata = json_set(
-                        COALESCE(metadata, '{}'),
+                        COALESCE(metadata, '{{}}'),
                         '$.claimed_at', ?,
                         '$.claimed_by', ?
                     )
                 WHERE action_id = ?
-                  AND status = 'pending'
+                  AND status = 'pending'{lease_filter}
             """,
-                (now, worker, action_id),
+                params,
             )
 
             return cursor.rowcount > 0
 
+    def acquire_partition_leases(self, worker_id: str, n_partitions: int, lease_seconds: float = 30.0) -> List[int]:
+        """
+        Renew and rebalance this worker's partition leases.
+
+        Runs as one IMMEDIATE transaction, so concurrent daemons see each
+        other's changes in order. The worker registers itself as a live
+        member, renews the partitions it owns, gives back any beyond its fair
+        share (ceil(n_partitions / live members)) and takes free or expired
+        partitions up to that share. Leases of crashed daemons expire after
+        `lease_seconds`; every ownership change bumps the partition's epoch.
+
+        Returns:
+            Sorted partition numbers owned after the call
+        """
+        with self._get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
+            now = time.time()
+            expires = now + lease_seconds
+
+            cursor.executemany(
+                "INSERT OR IGNORE INTO executor_partitions (partition) VALUES (?)",
+                [(p,) for p in range(n_partitions)],
+            )
+            cursor.execute("DELETE FROM executor_members WHERE expires_at <= ?", (now,))
+            cursor.execute(
+                """
+                INSERT INTO executor_members (worker_id, expires_at) VALUES (?, ?)
+                ON CONFLICT(worker_id) DO UPDATE SET expires_at = excluded.expires_at
+            """,
+                (worker_id, expires),
+            )
+            cursor.execute("SELECT COUNT(1) AS cnt FROM executor_members")
+            fair_share = -(-n_partitions // max(1, cursor.fetchone()["cnt"]))
+
+            cursor.execute(
+                """
+                SELECT partition FROM executor_partitions
+                WHERE owner = ? AND lease_expires > ? AND partition < ?
+                ORDER BY partition
+            """,
+                (worker_id, now, n_partitions),
+            )
+            owned = [row["partition"] for row in cursor.fetchall()]
+
+            surplus = owned[fair_share:]
+            if surplus:
+                cursor.execute(
+                    f"""
+                    UPDATE executor_partitions SET owner = NULL, lease_expires = 0, epoch = epoch + 1
+                    WHERE partition IN ({','.join('?' for _ in surplus)})
+                """,
+                    surplus,
+                )
+                owned = owned[:fair_share]
+
+            if owned:
+                cursor.execute(
+                    f"UPDATE executor_partitions SET lease_expires = ? WHERE partition IN ({','.join('?' for _ in owned)})",
+                    (expires, *owned),
+                )
+
+            wanted = fair_share - len(owned)
+            if wanted > 0:
+                cursor.execute(
+                    """
+                    SELECT partition FROM executor_partitions
+                    WHERE (owner IS NULL OR lease_expires <= ?) AND partition < ?
+                    ORDER BY partition LIMIT ?
+                """,
+                    (now, n_partitions, wanted),
+                )
+                taken = [row["partition"] for row in cursor.fetchall()]
+                if taken:
+                    cursor.execute(
+                        f"""
+                        UPDATE executor_partitions SET owner = ?, lease_expires = ?, epoch = epoch + 1
+                        WHERE partition IN ({','.join('?' for _ in taken)})
+                    """,
+                        (worker_id, expires, *taken),
+                    )
+                    owned = sorted(owned + taken)
+
+            return owned
+
+    def release_partition_leases(self, worker_id: str) -> int:
+        """Give back all of a worker's partitions and leave the member list (graceful shutdown)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM executor_members WHERE worker_id = ?", (worker_id,))
+            cursor.execute(
+                "UPDATE executor_partitions SET owner = NULL, lease_expires = 0, epoch = epoch + 1 WHERE owner = ?",
+                (worker_id,),
+            )
+            return cursor.rowcount
+
     def release_action(self, action_id: str, reason: str = "released", delay_seconds: int = 0) -> bool:
         """
         Release a claimed action back to pending state.
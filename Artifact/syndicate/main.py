@@ -32,6 +32,8 @@ from dotenv import load_dotenv
 
 try:
     import pandas_ta as ta
+
+    _FallbackTA = None
 except Exception:
     # dependencies (like numba) are unavailable; provide a lightweight fallback TA
     import pandas as _pd
@@ -1326,15 +1328,25 @@ class QuantEngine:
     Handles market data fetching, technical indicator calculation, and chart generation.
     """
 
-    def __init__(self, config: Config, logger: logging.Logger):
+    def __init__(self, config: Config, logger: logging.Logger, market_data: Any = None):
         self.config = config
         self.logger = logger
         self.news: List[str] = []
+        # Cached, incrementally updated bars (scripts/market_data.py); pass a
+        # MarketDataStore with another source (e.g. SyntheticBarSource) to run offline
+        if market_data is None:
+            from scripts.market_data import MarketDataStore
+
+            market_data = MarketDataStore.from_env(config.DATA_DIR, log=logger)
+        self.market_data = market_data
         # Track charts generated during this QuantEngine instance (single run)
         # Charts will only be skipped if they were already created earlier in
         # the same run. This avoids re-using stale on-disk charts from
         # previous runs while preventing duplicate generation within one loop.
         self._generated_charts = set()
+        # Charts submitted to the chart service this cycle: name -> (future, plot_df, path)
+        self._pending_charts: Dict[str, Any] = {}
+        self.chart_stats: Dict[str, Any] = {}
         # Production mode: using ASSETS defined in the source configuration
 
     def get_data(self) -> Optional[Dict[str, Any]]:
@@ -1350,11 +1362,17 @@ class QuantEngine:
 
         # Clean up old charts
         self._cleanup_old_charts()
+        try:
+            from scripts.chart_service import get_chart_service
 
-        # Fetch data for each asset in parallel to reduce wall time
-        # Use single-threaded fetch to avoid yfinance concurrency issues that may
-        # cause mismatched or duplicated data across assets.
-        workers = 1
+            get_chart_service().begin_cycle()
+        except Exception:
+            self.logger.debug("Chart service unavailable", exc_info=True)
+
+        # Fetch data for each asset in parallel to reduce wall time. yf.download
+        # itself is serialized inside YFinanceSource (it shares module-level state
+        # between calls), so cache reads and indicator updates overlap instead.
+        workers = max(1, min(self.market_data.workers, len(ASSETS)))
         futures = {}
         with ThreadPoolExecutor(max_workers=workers) as ex:
             for key, conf in ASSETS.items():
@@ -1429,7 +1447,7 @@ class QuantEngine:
                     # Fetch news headlines
                     self._fetch_news(key, conf["p"])
 
-                    # Generate chart (cached - skip if up-to-date)
+                    # Queue chart (skipped by the chart service if unchanged)
                     try:
                         self._chart(key, df)
                     except Exception as c_err:
@@ -1441,6 +1459,11 @@ class QuantEngine:
                     self.logger.error(f"Error processing {key}: {e}", exc_info=True)
                     continue
 
+        try:
+            self._finish_charts()
+        except Exception as c_err:
+            self.logger.debug(f"Chart rendering failed: {c_err}")
+
         if not snapshot:
             self.logger.error("Failed to fetch any market data")
             return None
@@ -1547,19 +1570,21 @@ class QuantEngine:
         """Fetch market data with fallback to backup ticker."""
         # Production path: fetch from yfinance only
 
+        # With the built-in fallback TA, indicators come from the bar cache and are
+        # only computed for new bars; other TA libraries get the full frame below.
+        incremental = _FallbackTA is not None and isinstance(ta, _FallbackTA)
+
         for ticker in [primary, backup]:
             try:
                 self.logger.debug(f"Fetching data for {ticker}")
-                df = yf.download(
+                df = self.market_data.get(
                     ticker,
-                    period=self.config.DATA_PERIOD,
                     interval=self.config.DATA_INTERVAL,
-                    progress=False,
-                    multi_level_index=False,
-                    auto_adjust=True,
+                    period=self.config.DATA_PERIOD,
+                    indicators=incremental,
                 )
 
-                if df.empty:
+                if df is None or df.empty:
                     self.logger.debug(f"No data returned for {ticker}")
                     continue
 
@@ -1577,6 +1602,9 @@ class QuantEngine:
                     self.logger.warning(f"Missing required OHLC columns for {ticker}: {df.columns}")
                     continue
 
+                if incremental:
+                    return df
+
                 # Ensure index is timezone-aware or normalized
                 df.index = pd.to_datetime(df.index)
 
@@ -1869,15 +1897,17 @@ class QuantEngine:
         - Support/Resistance level annotations  
         - Trade setup zones
         - Trend direction indicators
+
+        The chart is queued on the chart service; _finish_charts() waits for it.
         """
         try:
-            from pathlib import Path
             chart_path = os.path.join(self.config.CHARTS_DIR, f"{name}.png")
 
-            # Only skip generation if this chart was already produced earlier
-            # during the same run. Do NOT rely on on-disk mtimes from previous
-            # runs — we want each run to produce a fresh, consistent set.
-            if name in getattr(self, "_generated_charts", set()):
+            # Skip charts already produced or queued earlier in this run. Across
+            # runs, the chart service keeps an existing file only when its
+            # content key (bars, indicators, options and renderer source) matches
+            # the one recorded in .render_cache.json; file mtimes are not trusted.
+            if name in getattr(self, "_generated_charts", set()) or name in self._pending_charts:
                 self.logger.info(f"Chart already generated in this run, skipping: {chart_path}")
                 return
 
@@ -1907,117 +1937,133 @@ class QuantEngine:
             # Slice to chart candle count
             plot_df = df.tail(self.config.CHART_CANDLE_COUNT).copy()
 
-            # Try enhanced charting first
-            try:
-                from scripts.charting import generate_enhanced_chart, ChartAnnotations
-                
-                # Auto-detect support/resistance from the data
-                annotations = None  # Let the charting module auto-detect
-                
-                meta = generate_enhanced_chart(
-                    df=plot_df,
-                    name=name,
-                    out_path=Path(chart_path),
-                    annotations=annotations,
-                    show_indicators=True,
-                    show_levels=True,
-                    show_trade_setup=False,  # Only show if we have trade setups
-                    figsize=(14, 10),
-                    dpi=150,
-                    style="nightclouds",
-                )
-                
-                if meta.get("success"):
-                    self.logger.info(f"Enhanced chart generated: {chart_path}")
-                    if meta.get("regime"):
-                        self.logger.debug(f"  Regime: {meta['regime']}")
-                    if meta.get("support_levels"):
-                        self.logger.debug(f"  Support: {[f'{l:.2f}' for l in meta['support_levels']]}")
-                    if meta.get("resistance_levels"):
-                        self.logger.debug(f"  Resistance: {[f'{l:.2f}' for l in meta['resistance_levels']]}")
-                    
-                    # Mark as generated
-                    try:
-                        self._generated_charts.add(name)
-                    except Exception:
-                        pass
-                    return
-                else:
-                    self.logger.warning(f"Enhanced charting failed: {meta.get('error', 'unknown')}, falling back")
-                    
-            except ImportError as e:
-                self.logger.debug(f"Enhanced charting not available ({e}), using standard mplfinance")
-            except Exception as e:
-                self.logger.warning(f"Enhanced charting error: {e}, falling back to standard")
+            # Enhanced chart through the chart service: skipped when the inputs are
+            # unchanged, otherwise rendered in a warm worker process
+            from scripts.chart_service import get_chart_service
+
+            future = get_chart_service().submit(
+                name,
+                plot_df,
+                chart_path,
+                annotations=None,  # Let the charting module auto-detect
+                show_indicators=True,
+                show_levels=True,
+                show_trade_setup=False,  # Only show if we have trade setups
+                figsize=(14, 10),
+                dpi=150,
+                style="nightclouds",
+            )
+            self._pending_charts[name] = (future, plot_df, chart_path)
 
-            # Fallback to original mplfinance charting
-            apds = []
-            sma50_plot = plot_df.get("SMA_50")
-            sma200_plot = plot_df.get("SMA_200")
-            # `apds` remains an array of mpl addplots after the import stage.
+        except Exception as e:
+            self.logger.error(f"Error generating chart for {name}: {e}")
+
+    def _finish_charts(self) -> Dict[str, Any]:
+        """Wait for the charts submitted by _chart, fall back where rendering failed, and log the cycle."""
+        from scripts.chart_service import get_chart_service
 
-            # Ensure mpl/mplfinance are imported with a headless backend
+        pending, self._pending_charts = self._pending_charts, {}
+        for name, (future, plot_df, chart_path) in pending.items():
             try:
-                if mpf is None:
-                    import matplotlib
-
-                    # Respect `MPLBACKEND` env var when provided, default to Agg
-                    matplotlib.use(os.environ.get("MPLBACKEND", "Agg"))
-                    import mplfinance as mpf_mod
-
-                    # bind local mpf for subsequent calls in this process
-                    globals()["mpf"] = mpf_mod
-
-                mpf_local = globals().get("mpf")
-                if mpf_local is None:
-                    raise RuntimeError("mplfinance not available after import attempt")
-
-                # Build addplots now that mpf_local is available
-                apds = []
-                if sma50_plot is not None and hasattr(sma50_plot, "isna") and not sma50_plot.isna().all():
-                    apds.append(mpf_local.make_addplot(sma50_plot, color="orange", width=1))
-                if sma200_plot is not None and hasattr(sma200_plot, "isna") and not sma200_plot.isna().all():
-                    apds.append(mpf_local.make_addplot(sma200_plot, color="blue", width=1))
-
-                style = mpf_local.make_mpf_style(base_mpf_style="nightclouds", rc={"font.size": 8})
-                chart_path = os.path.join(self.config.CHARTS_DIR, f"{name}.png")
-
-                plot_kwargs = {
-                    "type": "candle",
-                    "volume": False,
-                    "style": style,
-                    "title": f"{name} Quant View",
-                    "savefig": chart_path,
-                }
-
-                if apds:
-                    plot_kwargs["addplot"] = apds
-                mpf_local.plot(plot_df, **plot_kwargs)
-                # Mark as generated for this run so subsequent calls in the
-                # same execution loop don't regenerate the same chart.
-                try:
-                    self._generated_charts.add(name)
-                except Exception:
-                    pass
+                meta = future.result()
             except Exception as e:
-                self.logger.warning(f"Skipping chart generation (mplfinance unavailable or failed): {e}")
-            # ensure chart was actually written
-            ok = False
+                meta = {"success": False, "error": str(e)}
+
+            if meta.get("success"):
+                state = "unchanged, kept" if meta.get("cached") else "generated"
+                self.logger.info(f"Enhanced chart {state}: {chart_path}")
+                if meta.get("regime"):
+                    self.logger.debug(f"  Regime: {meta['regime']}")
+                if meta.get("support_levels"):
+                    self.logger.debug(f"  Support: {[f'{l:.2f}' for l in meta['support_levels']]}")
+                if meta.get("resistance_levels"):
+                    self.logger.debug(f"  Resistance: {[f'{l:.2f}' for l in meta['resistance_levels']]}")
+
+                # Mark as generated
+                self._generated_charts.add(name)
+                continue
+
+            self.logger.warning(f"Enhanced charting failed: {meta.get('error', 'unknown')}, falling back")
             try:
-                if os.path.exists(chart_path) and os.path.getsize(chart_path) > 2048:
-                    ok = True
-            except Exception:
-                ok = False
+                self._fallback_chart(name, plot_df, chart_path)
+            except Exception as e:
+                self.logger.error(f"Error generating chart for {name}: {e}")
 
-            if not ok:
-                self.logger.warning(
-                    f"Chart generated but verification failed (size too small or missing): {chart_path}"
-                )
-            else:
-                self.logger.info(f"Chart generated and verified: {chart_path}")
+        stats = get_chart_service().cycle_stats()
+        if stats["charts"]:
+            self.logger.info(
+                f"Charts: {stats['charts']} ({stats['hits']} unchanged, hit rate {stats['hit_rate']:.0%}), "
+                f"render {stats['render_ms']:.0f}ms in {stats['workers']} worker(s), wall {stats['wall_ms']:.0f}ms"
+            )
+        self.chart_stats = stats
+        return stats
+
+    def _fallback_chart(self, name: str, plot_df: pd.DataFrame, chart_path: str) -> None:
+        """Plain mplfinance candlestick chart, rendered in-process."""
+        apds = []
+        sma50_plot = plot_df.get("SMA_50")
+        sma200_plot = plot_df.get("SMA_200")
+        # `apds` remains an array of mpl addplots after the import stage.
+
+        # Ensure mpl/mplfinance are imported with a headless backend
+        try:
+            if mpf is None:
+                import matplotlib
+
+                # Respect `MPLBACKEND` env var when provided, default to Agg
+                matplotlib.use(os.environ.get("MPLBACKEND", "Agg"))
+                import mplfinance as mpf_mod
+
+                # bind local mpf for subsequent calls in this process
+                globals()["mpf"] = mpf_mod
+
+            mpf_local = globals().get("mpf")
+            if mpf_local is None:
+                raise RuntimeError("mplfinance not available after import attempt")
 
+            # Build addplots now that mpf_local is available
+            apds = []
+            if sma50_plot is not None and hasattr(sma50_plot, "isna") and not sma50_plot.isna().all():
+                apds.append(mpf_local.make_addplot(sma50_plot, color="orange", width=1))
+            if sma200_plot is not None and hasattr(sma200_plot, "isna") and not sma200_plot.isna().all():
+                apds.append(mpf_local.make_addplot(sma200_plot, color="blue", width=1))
+
+            style = mpf_local.make_mpf_style(base_mpf_style="nightclouds", rc={"font.size": 8})
+            chart_path = os.path.join(self.config.CHARTS_DIR, f"{name}.png")
+
+            plot_kwargs = {
+                "type": "candle",
+                "volume": False,
+                "style": style,
+                "title": f"{name} Quant View",
+                "savefig": chart_path,
+            }
+
+            if apds:
+                plot_kwargs["addplot"] = apds
+            mpf_local.plot(plot_df, **plot_kwargs)
+            # Mark as generated for this run so subsequent calls in the
+            # same execution loop don't regenerate the same chart.
+            try:
+                self._generated_charts.add(name)
+            except Exception:
+                pass
         except Exception as e:
-            self.logger.error(f"Error generating chart for {name}: {e}")
+            self.logger.warning(f"Skipping chart generation (mplfinance unavailable or failed): {e}")
+        # ensure chart was actually written
+        ok = False
+        try:
+            if os.path.exists(chart_path) and os.path.getsize(chart_path) > 2048:
+                ok = True
+        except Exception:
+            ok = False
+
+        if not ok:
+            self.logger.warning(
+                f"Chart generated but verification failed (size too small or missing): {chart_path}"
+            )
+        else:
+            self.logger.info(f"Chart generated and verified: {chart_path}")
 
     def _cleanup_old_charts(self) -> None:
         """Remove charts older than configured age."""
@@ -1346,13 +1346,16 @@ def handle_lifecycle_command(action: str, target_file: str = None, filter_status
         status_filter = filter_status or "all"
         print(f"\n[DOC] Documents by status: {status_filter}\n")
 
-        md_files = list(output_dir.glob("**/*.md"))
-        md_files = [f for f in md_files if "archive" not in str(f).lower()]
+        try:
+            from scripts.document_catalog import DocumentCatalog
+
+            statuses = [(Path(e["path"]), e["status"]) for e in DocumentCatalog(output_dir).entries() if e["readable"]]
+        except Exception:
+            statuses = [(f, get_document_status(f.read_text(encoding="utf-8"))) for f in output_dir.glob("**/*.md")]
+        statuses = [(f, status) for f, status in statuses if "archive" not in str(f).lower()]
 
         by_status = {}
-        for filepath in md_files:
-            content = filepath.read_text(encoding="utf-8")
-            status = get_document_status(content)
+        for filepath, status in statuses:
             if status_filter == "all" or status == status_filter:
                 if status not in by_status:
                     by_status[status] = []
@@ -0,0 +1,308 @@
+"""Price-structure analytics for Syndicate charts
+
+NumPy-vectorized swing detection, RANSAC trendlines and support/resistance
+level clustering. Results match the original element-wise implementations
+(kept at the bottom of this module as references for the benchmark), and
+RANSAC draws its samples exactly as before, so a given seed or global
+NumPy random state yields the same lines.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Upper bound on the (iterations x points) distance matrix built per RANSAC chunk
+RANSAC_CHUNK_ELEMENTS = 4_000_000
+
+
+@dataclass
+class Line:
+    x: Tuple[float, float]
+    y: Tuple[float, float]
+
+
+def detect_swings(prices: Union[pd.Series, Sequence[float], np.ndarray], window: int = 5) -> Tuple[List[int], List[int]]:
+    """Detect swing highs and lows indices in a price series.
+
+    A swing high is a point higher than the `window` points on each side.
+    A swing low is a point lower than the `window` points on each side.
+    NaN neighbours are ignored and NaN points are never swings.
+
+    Returns (lows_idx, highs_idx) as sorted lists of integer positions (0-based).
+    """
+    values = np.asarray(prices, dtype=float)
+    n = len(values)
+    if n < 2 * window + 1:
+        return [], []
+
+    center = values[window:n - window]
+    if window == 0:
+        neighbour_max = neighbour_min = np.full(len(center), np.nan)
+    else:
+        windows = sliding_window_view(values, 2 * window + 1)
+        left, right = windows[:, :window], windows[:, window + 1:]
+        # fmax/fmin skip NaN like pandas' max()/min() did
+        neighbour_max = np.fmax(np.fmax.reduce(left, axis=1), np.fmax.reduce(right, axis=1))
+        neighbour_min = np.fmin(np.fmin.reduce(left, axis=1), np.fmin.reduce(right, axis=1))
+
+    valid = ~np.isnan(center)
+    highs = valid & ((center > neighbour_max) | np.isnan(neighbour_max))
+    lows = valid & ((center < neighbour_min) | np.isnan(neighbour_min))
+    return (np.flatnonzero(lows) + window).tolist(), (np.flatnonzero(highs) + window).tolist()
+
+
+def detect_trendlines_ransac(
+    x: Sequence[int],
+    y: Sequence[float],
+    max_lines: int = 2,
+    threshold: float = 0.5,
+    min_support: int = 3,
+    iterations: int = 200,
+    seed: Optional[Union[int, np.random.RandomState]] = None,
+) -> List[Tuple[Line, List[int]]]:
+    """Detect multiple trendlines using a simple RANSAC-like approach.
+
+    All `iterations` candidate lines for a round are scored against the
+    remaining points at once, in chunks of at most RANSAC_CHUNK_ELEMENTS
+    distances.
+
+    Args:
+        x, y: lists of point coordinates (x indices and y values)
+        max_lines: maximum number of lines to return
+        threshold: distance threshold (in price units) to consider an inlier
+        min_support: minimal number of inliers to accept a line
+        iterations: number of random samples per line
+        seed: seed or RandomState for reproducible sampling; None samples
+            from NumPy's global random state
+
+    Returns:
+        List of tuples: (Line, inlier_indices)
+    """
+    if seed is None:
+        rng = np.random
+    elif isinstance(seed, np.random.RandomState):
+        rng = seed
+    else:
+        rng = np.random.RandomState(seed)
+
+    x_values, y_values = list(x), list(y)
+    xs = np.asarray(x_values, dtype=float)
+    ys = np.asarray(y_values, dtype=float)
+    # Inliers are reported as the position of the first point with their x
+    first_position: Dict[Any, int] = {}
+    for position, value in enumerate(x_values):
+        first_position.setdefault(value, position)
+
+    remaining = np.arange(len(x_values))
+    results: List[Tuple[Line, List[int]]] = []
+
+    while len(remaining) and len(results) < max_lines and len(remaining) >= min_support:
+        m = len(remaining)
+        if m < 2:
+            break
+        samples = np.array([rng.choice(m, size=2, replace=False) for _ in range(iterations)], dtype=int).reshape(-1, 2)
+        first, second = remaining[samples[:, 0]], remaining[samples[:, 1]]
+        x1, y1, x2, y2 = xs[first], ys[first], xs[second], ys[second]
+        distinct = x2 != x1
+
+        rx, ry = xs[remaining], ys[remaining]
+        counts = np.zeros(len(samples), dtype=int)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes = (y2 - y1) / (x2 - x1)
+            intercepts = y1 - slopes * x1
+            norms = np.sqrt(slopes * slopes + 1)
+            chunk = max(1, RANSAC_CHUNK_ELEMENTS // m)
+            for start in range(0, len(samples), chunk):
+                a = slopes[start:start + chunk, None]
+                b = intercepts[start:start + chunk, None]
+                distances = np.abs(a * rx - ry + b) / norms[start:start + chunk, None]
+                counts[start:start + chunk] = (distances <= threshold).sum(axis=1)
+        counts[~distinct] = 0
+
+        if not counts.any() or counts.max() < min_support:
+            break
+        # First sample with the most inliers wins
+        best = int(np.argmax(counts))
+
+        a, b = float(slopes[best]), float(intercepts[best])
+        inlier_mask = np.abs(a * rx - ry + b) / np.sqrt(a * a + 1) <= threshold
+        inliers = remaining[inlier_mask]
+        inlier_x = [x_values[i] for i in inliers]
+        lo, hi = min(inlier_x), max(inlier_x)
+        results.append((Line(x=(lo, hi), y=(a * lo + b, a * hi + b)), [first_position[v] for v in inlier_x]))
+        remaining = remaining[~inlier_mask]
+
+    return results
+
+
+def cluster_levels(levels: Sequence[float], tolerance: float = 0.005, num_levels: int = 3) -> List[float]:
+    """Merge sorted price levels within `tolerance` (relative) of their neighbour.
+
+    Returns the mean of each cluster, keeping the `num_levels` highest.
+    """
+    if len(levels) == 0:
+        return []
+    ordered = np.sort(np.asarray(levels, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        joined = np.abs(np.diff(ordered)) / ordered[:-1] < tolerance
+    clusters = [np.mean(group) for group in np.split(ordered, np.flatnonzero(~joined) + 1)]
+    return sorted(clusters)[-num_levels:] if len(clusters) > num_levels else clusters
+
+
+def detect_support_resistance(prices: Union[pd.Series, Sequence[float], np.ndarray], window: int = 10, num_levels: int = 3) -> Tuple[List[float], List[float]]:
+    """Detect horizontal support and resistance levels from price data.
+
+    Uses swing highs/lows and clusters them (within 0.5% of each other)
+    to find key price levels.
+
+    Returns (support_levels, resistance_levels) as sorted lists of price values.
+    """
+    values = np.asarray(prices, dtype=float)
+    lows_idx, highs_idx = detect_swings(values, window=window)
+    support = cluster_levels(values[lows_idx], num_levels=num_levels)
+    resistance = cluster_levels(values[highs_idx], num_levels=num_levels)
+    return support, resistance
+
+
+# ==========================================
+# BENCHMARK
+# ==========================================
+
+
+def _loop_detect_swings(prices: pd.Series, window: int = 5) -> Tuple[List[int], List[int]]:
+    """Reference: element-wise swing detection."""
+    highs = []
+    lows = []
+    n = len(prices)
+    for i in range(window, n - window):
+        window_slice = prices.iloc[i - window:i + window + 1]
+        val = prices.iloc[i]
+        if val == window_slice.max() and (window_slice == val).sum() == 1:
+            highs.append(int(i))
+        if val == window_slice.min() and (window_slice == val).sum() == 1:
+            lows.append(int(i))
+    return lows, highs
+
+
+def _loop_detect_trendlines_ransac(x, y, max_lines=2, threshold=0.5, min_support=3, iterations=200, rng=np.random):
+    """Reference: per-point inlier loop inside every RANSAC iteration."""
+    remaining = list(zip(list(x), list(y)))
+    original_indices = list(x)
+    results = []
+    while remaining and len(results) < max_lines and len(remaining) >= min_support:
+        best_inliers: List[int] = []
+        best_line = None
+        for _ in range(iterations):
+            if len(remaining) < 2:
+                break
+            i1, i2 = rng.choice(len(remaining), size=2, replace=False)
+            (x1, y1), (x2, y2) = remaining[i1], remaining[i2]
+            if x2 == x1:
+                continue
+            a = (y2 - y1) / (x2 - x1)
+            b = y1 - a * x1
+            inliers = [idx for idx, (xx, yy) in enumerate(remaining)
+                       if abs(a * xx - yy + b) / np.sqrt(a * a + 1) <= threshold]
+            if len(inliers) > len(best_inliers):
+                best_inliers = inliers
+                lo, hi = min(remaining[i][0] for i in inliers), max(remaining[i][0] for i in inliers)
+                best_line = Line(x=(lo, hi), y=(a * lo + b, a * hi + b))
+        if best_line is None or len(best_inliers) < min_support:
+            break
+        results.append((best_line, [original_indices.index(remaining[i][0]) for i in best_inliers]))
+        remaining = [p for i, p in enumerate(remaining) if i not in best_inliers]
+    return results
+
+
+def _loop_detect_support_resistance(prices: pd.Series, window: int = 10, num_levels: int = 3) -> Tuple[List[float], List[float]]:
+    """Reference: per-level clustering loop."""
+    lows_idx, highs_idx = _loop_detect_swings(prices, window=window)
+
+    def cluster(levels: List[float], tolerance: float = 0.005) -> List[float]:
+        if not levels:
+            return []
+        sorted_levels = sorted(levels)
+        clusters = []
+        current = [sorted_levels[0]]
+        for level in sorted_levels[1:]:
+            if abs(level - current[-1]) / current[-1] < tolerance:
+                current.append(level)
+            else:
+                clusters.append(np.mean(current))
+                current = [level]
+        clusters.append(np.mean(current))
+        return sorted(clusters)[-num_levels:] if len(clusters) > num_levels else clusters
+
+    return cluster([prices.iloc[i] for i in lows_idx]), cluster([prices.iloc[i] for i in highs_idx])
+
+
+def synthetic_ohlc(n_bars: int, seed: int = 0, start: float = 2000.0) -> pd.DataFrame:
+    """Random-walk OHLC bars, rounded to cents so equal prices occur."""
+    rng = np.random.default_rng(seed)
+    close = np.round(start + np.cumsum(rng.normal(0, 4, n_bars)), 2)
+    open_ = np.round(np.concatenate([[start], close[:-1]]), 2)
+    spread = np.round(np.abs(rng.normal(0, 3, (2, n_bars))), 2)
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread[0],
+        "Low": np.minimum(open_, close) - spread[1],
+        "Close": close,
+    })
+
+
+def benchmark_chart_analytics(n_bars: int = 20000, window: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    Element-wise reference implementations against the vectorized ones on
+    a long synthetic OHLC series; checks both give the same results.
+    Run it with `python scripts/chart_analytics.py` from the project root.
+    """
+    bars = synthetic_ohlc(n_bars, seed)
+
+    def analyse(swings, ransac, levels, rng_for):
+        lows, _ = swings(bars["Low"], window)
+        _, highs = swings(bars["High"], window)
+        return {
+            "swings": (lows, highs),
+            "support_lines": ransac(lows, bars["Low"].iloc[lows].tolist(), threshold=2.0, rng=rng_for()),
+            "resistance_lines": ransac(highs, bars["High"].iloc[highs].tolist(), threshold=2.0, rng=rng_for()),
+            "levels": levels(bars["Close"], window=window),
+        }
+
+    def vectorized_ransac(x, y, threshold, rng):
+        return detect_trendlines_ransac(x, y, threshold=threshold, seed=rng)
+
+    timings = {}
+    outputs = {}
+    for name, impl in (
+        ("loop", (_loop_detect_swings, _loop_detect_trendlines_ransac, _loop_detect_support_resistance)),
+        ("vectorized", (detect_swings, vectorized_ransac, detect_support_resistance)),
+    ):
+        start = time.perf_counter()
+        outputs[name] = analyse(*impl, rng_for=lambda: np.random.RandomState(seed))
+        timings[name] = time.perf_counter() - start
+
+    return {
+        "bars": n_bars,
+        "swing_points": sum(len(s) for s in outputs["vectorized"]["swings"]),
+        "loop_s": timings["loop"],
+        "vectorized_s": timings["vectorized"],
+        "speedup": timings["loop"] / timings["vectorized"] if timings["vectorized"] else float("inf"),
+        "identical": outputs["loop"] == outputs["vectorized"],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Benchmark chart analytics on a synthetic OHLC series")
+    parser.add_argument("--bars", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(benchmark_chart_analytics(args.bars, args.window, args.seed), indent=2))
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Syndicate Chart Service
+
+Renders charts off the main process and skips renders whose inputs have not
+changed.
+
+Every chart request is keyed by a content hash of its bars and indicator
+columns, annotations, render options (style, size, dpi, ...) and the source
+of the charting modules. If the output file was last written for the same
+key it is kept as is. Other requests go to a process pool whose workers
+import matplotlib/mplfinance and build the font cache once at start-up, so
+later renders skip that cost. Each cycle reports its hit rate and
+render time.
+
+Usage:
+    from scripts.chart_service import get_chart_service
+
+    service = get_chart_service()
+    service.begin_cycle()
+    future = service.submit("GOLD", df, "output/charts/GOLD.png", figsize=(14, 10), dpi=150)
+    meta = future.result()                      # render metadata + "cached" flag
+    print(service.cycle_stats())                # hits, misses, hit_rate, render_ms, wall_ms
+
+    python scripts/chart_service.py --bench
+"""
+
+import atexit
+import dataclasses
+import hashlib
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# ============================================================================
+# Configuration
+# ============================================================================
+# CHART_RENDER_WORKERS   - Render processes (0 renders in-process, default: min(4, CPUs))
+# CHART_RENDER_CACHE     - Set to 0 to always re-render (default: 1)
+
+DEFAULT_RENDERER = "scripts.charting:generate_enhanced_chart"
+MANIFEST_NAME = ".render_cache.json"
+# Changes to these modules change every chart key
+RENDERER_SOURCES = ("scripts/charting.py", "scripts/chart_analytics.py")
+
+logger = logging.getLogger("GoldStandard")
+
+
+def _renderer_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for rel in RENDERER_SOURCES:
+        try:
+            digest.update((PROJECT_ROOT / rel).read_bytes())
+        except OSError:
+            digest.update(rel.encode())
+    return digest.hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-able form of render options and annotations."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"__type__": type(value).__name__, **_canonical(dataclasses.asdict(value))}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def chart_key(df: pd.DataFrame, name: str, renderer: str = DEFAULT_RENDERER, fingerprint: str = "",
+              **options: Any) -> str:
+    """Content hash of everything that determines a rendered chart."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([name, renderer, fingerprint, _canonical(options)], default=repr).encode())
+    digest.update(json.dumps([str(c) for c in df.columns] + [str(t) for t in df.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+
+def _warm_worker() -> None:
+    """Pool initializer: pay matplotlib/mplfinance import and font cache cost once per worker."""
+    import matplotlib
+
+    matplotlib.use(os.environ.get("MPLBACKEND", "Agg"))
+    import matplotlib.pyplot as plt
+
+    try:
+        import mplfinance  # noqa: F401
+    except ImportError:
+        pass
+    importlib.import_module(DEFAULT_RENDERER.split(":")[0])
+    fig = plt.figure(figsize=(1, 1))
+    fig.text(0.5, 0.5, "warm", fontweight="bold")
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def _render(renderer: str, df: pd.DataFrame, name: str, out_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run `renderer` ("module:function") and time it; errors come back in the metadata."""
+    started = time.perf_counter()
+    try:
+        module, func = renderer.split(":")
+        meta = getattr(importlib.import_module(module), func)(df=df, name=name, out_path=Path(out_path), **options)
+        meta = dict(meta or {})
+        meta.setdefault("success", Path(out_path).exists())
+    except Exception as e:
+        meta = {"success": False, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        try:
+            import matplotlib.pyplot as plt
+
+            plt.close("all")
+        except Exception:
+            pass
+    meta["render_ms"] = (time.perf_counter() - started) * 1000
+    meta["pid"] = os.getpid()
+    return meta
+
+
+# ============================================================================
+# Service
+# ============================================================================
+
+
+class ChartService:
+    """Content-addressed chart cache in front of a pool of warm render processes."""
+
+    def __init__(self, workers: Optional[int] = None, cache: bool = True):
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        self.workers = max(0, workers)
+        self.cache = cache
+        self.fingerprint = _renderer_fingerprint()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._manifests: Dict[Path, Dict[str, Any]] = {}
+        self.begin_cycle()
+
+    @classmethod
+    def from_env(cls) -> "ChartService":
+        """Service configured from CHART_RENDER_* environment variables."""
+        workers = None
+        try:
+            if os.environ.get("CHART_RENDER_WORKERS"):
+                workers = int(os.environ["CHART_RENDER_WORKERS"])
+        except ValueError:
+            pass
+        cache = os.environ.get("CHART_RENDER_CACHE", "1").lower() not in ("0", "false", "no", "off")
+        return cls(workers=workers, cache=cache)
+
+    # -- cycle accounting --------------------------------------------------
+
+    def begin_cycle(self) -> None:
+        """Reset the per-cycle counters reported by cycle_stats()."""
+        with self._lock:
+            self._cycle_started = time.perf_counter()
+            self._cycle_finished = self._cycle_started
+            self._cycle = {"charts": 0, "hits": 0, "misses": 0, "failed": 0, "render_ms": 0.0}
+
+    def _record(self, meta: Dict[str, Any], cached: bool) -> None:
+        with self._lock:
+            self._cycle["charts"] += 1
+            self._cycle["hits" if cached else "misses"] += 1
+            if not meta.get("success"):
+                self._cycle["failed"] += 1
+            self._cycle["render_ms"] += 0.0 if cached else meta.get("render_ms", 0.0)
+            self._cycle_finished = time.perf_counter()
+
+    def cycle_stats(self) -> Dict[str, Any]:
+        """Charts, hits, misses, hit rate, summed worker render time and wall time since begin_cycle()."""
+        with self._lock:
+            stats = dict(self._cycle)
+            stats["hit_rate"] = stats["hits"] / stats["charts"] if stats["charts"] else 0.0
+            stats["wall_ms"] = (self._cycle_finished - self._cycle_started) * 1000
+            stats["workers"] = self.workers
+            return stats
+
+    # -- manifest ------------------------------------------------------------
+
+    def _manifest(self, directory: Path) -> Dict[str, Any]:
+        if directory not in self._manifests:
+            try:
+                self._manifests[directory] = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._manifests[directory] = {}
+        return self._manifests[directory]
+
+    def _lookup(self, out_path: Path, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._manifest(out_path.parent).get(out_path.name)
+        if not entry or entry.get("key") != key:
+            return None
+        try:
+            stat = out_path.stat()
+        except OSError:
+            return None
+        if stat.st_size != entry.get("size") or stat.st_mtime_ns != entry.get("mtime_ns"):
+            return None  # rewritten or replaced by something else
+        return entry.get("meta", {})
+
+    def _store(self, out_path: Path, key: str, meta: Dict[str, Any]) -> None:
+        try:
+            stat = out_path.stat()
+        except OSError:
+            return
+        with self._lock:
+            manifest = self._manifest(out_path.parent)
+            manifest[out_path.name] = {
+                "key": key,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "meta": json.loads(json.dumps(meta, default=_json_default)),
+            }
+            tmp = out_path.parent / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+            try:
+                tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+                os.replace(tmp, out_path.parent / MANIFEST_NAME)
+            except OSError as e:
+                logger.debug(f"Could not write chart manifest: {e}")
+
+    # -- rendering -----------------------------------------------------------
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers == 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # spawn: callers run thread pools, which fork does not copy safely
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+            return self._pool
+
+    def warm_up(self) -> None:
+        """Start the worker processes now instead of on the first miss."""
+        pool = self._executor()
+        if pool is not None:
+            for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+
+    def submit(self, name: str, df: pd.DataFrame, out_path: Any, renderer: str = DEFAULT_RENDERER,
+               **options: Any) -> "Future[Dict[str, Any]]":
+        """
+        Render `df` to `out_path` unless the file already holds the same chart.
+
+        Resolves to the renderer's metadata with `cached` set; a hit resolves immediately.
+        """
+        out_path = Path(out_path)
+        key = chart_key(df, name, renderer, self.fingerprint, **options)
+        if self.cache:
+            meta = self._lookup(out_path, key)
+            if meta is not None:
+                meta = {**meta, "cached": True, "chart_path": str(out_path)}
+                self._record(meta, cached=True)
+                try:
+                    os.utime(out_path)  # still current: keep it out of age-based cleanup
+                    self._store(out_path, key, meta)
+                except OSError:
+                    pass
+                done: Future = Future()
+                done.set_result(meta)
+                return done
+
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        pool = self._executor()
+        if pool is None:
+            result: Future = Future()
+            result.set_result(_render(renderer, df, name, str(out_path), options))
+        else:
+            result = pool.submit(_render, renderer, df, name, str(out_path), options)
+
+        finished: Future = Future()
+
+        def _done(fut: Future) -> None:
+            try:
+                meta = fut.result()
+            except Exception as e:  # worker died
+                meta = {"success": False, "error": f"{type(e).__name__}: {e}", "render_ms": 0.0}
+            meta["cached"] = False
+            if meta.get("success") and self.cache:
+                self._store(out_path, key, meta)
+            self._record(meta, cached=False)
+            finished.set_result(meta)
+
+        result.add_done_callback(_done)
+        return finished
+
+    def render_many(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Submit several charts (dicts of submit() arguments) and wait for all of them."""
+        futures = [self.submit(**job) for job in jobs]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+_service: Optional[ChartService] = None
+_service_lock = threading.Lock()
+
+
+def get_chart_service() -> ChartService:
+    """Process-wide chart service, so render workers stay warm across analysis cycles."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ChartService.from_env()
+            atexit.register(_service.shutdown)
+        return _service
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+
+def benchmark_chart_service(n_charts: int = 6, cycles: int = 3, changed_per_cycle: int = 1, workers: Optional[int] = None,
+                            out_dir: Any = None, figsize=(8, 6), dpi: int = 80) -> Dict[str, Any]:
+    """
+    Per-cycle chart time: serial in-process renders of every chart vs the service.
+
+    Each cycle after the first advances `changed_per_cycle` of the synthetic
+    tickers by one bar, so only those charts have new inputs.
+    """
+    import tempfile
+
+    from scripts.market_data import MarketDataStore, SyntheticBarSource
+
+    own_dir = None
+    if out_dir is None:
+        own_dir = tempfile.TemporaryDirectory()
+        out_dir = own_dir.name
+    out_dir = Path(out_dir)
+    source = SyntheticBarSource(end="2025-06-02")
+    tickers = [f"SYN{i}" for i in range(n_charts)]
+    ends = {t: source.end for t in tickers}
+    options = {"figsize": figsize, "dpi": dpi, "show_trade_setup": False}
+
+    def frames():
+        out = {}
+        for ticker in tickers:
+            source.end = ends[ticker]
+            out[ticker] = MarketDataStore(source).get(ticker).tail(100)
+        return out
+
+    service = ChartService(workers=workers)
+    service.warm_up()
+    report: Dict[str, Any] = {"charts": n_charts, "cycles": []}
+    for cycle in range(cycles):
+        if cycle:
+            for ticker in tickers[:changed_per_cycle]:
+                ends[ticker] += pd.offsets.BDay(1)
+        data = frames()
+
+        started = time.perf_counter()
+        module, func = DEFAULT_RENDERER.split(":")
+        render = getattr(importlib.import_module(module), func)
+        for ticker, df in data.items():
+            render(df=df, name=ticker, out_path=out_dir / "serial" / f"{ticker}.png", **options)
+        serial_ms = (time.perf_counter() - started) * 1000
+
+        service.begin_cycle()
+        service.render_many(
+            [{"name": t, "df": df, "out_path": out_dir / "service" / f"{t}.png", **options} for t, df in data.items()]
+        )
+        report["cycles"].append({"serial_ms": serial_ms, **service.cycle_stats()})
+    service.shutdown()
+    if own_dir is not None:
+        own_dir.cleanup()
+
+    steady = report["cycles"][1:] or report["cycles"]
+    report["serial_ms"] = sum(c["serial_ms"] for c in steady) / len(steady)
+    report["service_ms"] = sum(c["wall_ms"] for c in steady) / len(steady)
+    report["hit_rate"] = sum(c["hits"] for c in steady) / max(1, sum(c["charts"] for c in steady))
+    report["speedup"] = report["serial_ms"] / max(report["service_ms"], 1e-9)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Syndicate chart service")
+    parser.add_argument("--bench", action="store_true", help="Compare serial renders with the cached render pool")
+    parser.add_argument("--charts", type=int, default=6)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark_chart_service(args.charts, args.cycles, workers=args.workers), indent=2))
+    else:
+        parser.print_help()
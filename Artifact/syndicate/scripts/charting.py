@@ -20,11 +20,12 @@ from matplotlib.patches import Rectangle
 from pathlib import Path
 import os
 
-
-@dataclass
-class Line:
-    x: Tuple[float, float]
-    y: Tuple[float, float]
+from scripts.chart_analytics import (
+    Line,
+    detect_support_resistance,
+    detect_swings,
+    detect_trendlines_ransac,
+)
 
 
 @dataclass
@@ -52,27 +53,6 @@ class ChartAnnotations:
     atr_value: float = 0.0
 
 
-def detect_swings(prices: pd.Series, window: int = 5) -> Tuple[List[int], List[int]]:
-    """Detect swing highs and lows indices in a price series.
-
-    A swing high is a point higher than the `window` points on each side.
-    A swing low is a point lower than the `window` points on each side.
-
-    Returns (lows_idx, highs_idx) as sorted lists of integer positions (0-based).
-    """
-    highs = []
-    lows = []
-    n = len(prices)
-    for i in range(window, n - window):
-        window_slice = prices.iloc[i - window : i + window + 1]
-        val = prices.iloc[i]
-        if val == window_slice.max() and (window_slice == val).sum() == 1:
-            highs.append(int(i))
-        if val == window_slice.min() and (window_slice == val).sum() == 1:
-            lows.append(int(i))
-    return lows, highs
-
-
 def fit_trendline(x: List[int], y: List[float]) -> Line:
     """Fit a simple linear trendline through provided points and return endpoints across the full x range."""
     if len(x) < 2:
@@ -87,72 +67,6 @@ def fit_trendline(x: List[int], y: List[float]) -> Line:
     return Line(x=(x0, x1), y=(a * x0 + b, a * x1 + b))
 
 
-def _point_line_distance(x0: float, y0: float, a: float, b: float) -> float:
-    """Distance from point (x0,y0) to line y = a*x + b"""
-    # For line ax - y + b = 0, distance = |a*x0 - 1*y0 + b| / sqrt(a^2 + 1)
-    return abs(a * x0 - y0 + b) / np.sqrt(a * a + 1)
-
-
-def detect_trendlines_ransac(x: List[int], y: List[float], max_lines: int = 2, threshold: float = 0.5, min_support: int = 3, iterations: int = 200) -> List[Tuple[Line, List[int]]]:
-    """Detect multiple trendlines using a simple RANSAC-like approach.
-
-    Args:
-        x, y: lists of point coordinates (x indices and y values)
-        max_lines: maximum number of lines to return
-        threshold: distance threshold (in price units) to consider an inlier
-        min_support: minimal number of inliers to accept a line
-        iterations: number of random samples per line
-
-    Returns:
-        List of tuples: (Line, inlier_indices)
-    """
-    pts = list(zip(list(x), list(y)))
-    remaining = pts.copy()
-    results: List[Tuple[Line, List[int]]] = []
-
-    # Work on index-space remapped to original indices
-    original_indices = list(x)
-
-    while remaining and len(results) < max_lines and len(remaining) >= min_support:
-        best_inliers: List[int] = []
-        best_line: Line = None
-
-        for _ in range(iterations):
-            # pick two distinct points
-            if len(remaining) < 2:
-                break
-            i1, i2 = np.random.choice(len(remaining), size=2, replace=False)
-            (x1, y1), (x2, y2) = remaining[i1], remaining[i2]
-            if x2 == x1:
-                continue
-            # slope and intercept
-            a = (y2 - y1) / (x2 - x1)
-            b = y1 - a * x1
-            # find inliers
-            inliers = []
-            for idx, (xx, yy) in enumerate(remaining):
-                d = _point_line_distance(xx, yy, a, b)
-                if d <= threshold:
-                    inliers.append(idx)
-            if len(inliers) > len(best_inliers):
-                best_inliers = inliers
-                best_line = Line(x=(min([remaining[i][0] for i in inliers]), max([remaining[i][0] for i in inliers])), y=(a * min([remaining[i][0] for i in inliers]) + b, a * max([remaining[i][0] for i in inliers]) + b))
-
-        if best_line is None or len(best_inliers) < min_support:
-            break
-
-        # Map inliers back to original indices
-        inlier_points = [remaining[i] for i in best_inliers]
-        inlier_idxs = [original_indices.index(p[0]) for p in inlier_points]
-        results.append((best_line, inlier_idxs))
-
-        # Remove inliers from remaining
-        new_remaining = [p for i, p in enumerate(remaining) if i not in best_inliers]
-        remaining = new_remaining
-
-    return results
-
-
 def angle_degrees(line: Line) -> float:
     """Return angle in degrees of the trendline (positive = upward)"""
     dx = line.x[1] - line.x[0]
@@ -245,45 +159,6 @@ def generate_annotated_chart(
     return meta
 
 
-def detect_support_resistance(prices: pd.Series, window: int = 10, num_levels: int = 3) -> Tuple[List[float], List[float]]:
-    """Detect horizontal support and resistance levels from price data.
-    
-    Uses swing highs/lows and clusters them to find key price levels.
-    
-    Returns (support_levels, resistance_levels) as sorted lists of price values.
-    """
-    lows_idx, highs_idx = detect_swings(prices, window=window)
-    
-    # Extract price values at swing points
-    support_prices = [prices.iloc[i] for i in lows_idx] if lows_idx else []
-    resistance_prices = [prices.iloc[i] for i in highs_idx] if highs_idx else []
-    
-    # Cluster similar price levels (within 0.5% of each other)
-    def cluster_levels(levels: List[float], tolerance: float = 0.005) -> List[float]:
-        if not levels:
-            return []
-        sorted_levels = sorted(levels)
-        clusters = []
-        current_cluster = [sorted_levels[0]]
-        
-        for level in sorted_levels[1:]:
-            if abs(level - current_cluster[-1]) / current_cluster[-1] < tolerance:
-                current_cluster.append(level)
-            else:
-                clusters.append(np.mean(current_cluster))
-                current_cluster = [level]
-        clusters.append(np.mean(current_cluster))
-        
-        # Return the most significant levels (touched most often)
-        # For simplicity, return the levels closest to current price
-        return sorted(clusters)[-num_levels:] if len(clusters) > num_levels else clusters
-    
-    support = cluster_levels(support_prices)
-    resistance = cluster_levels(resistance_prices)
-    
-    return support, resistance
-
-
 def determine_regime(adx: float, atr_pct: float) -> str:
     """Determine market regime based on ADX and ATR.
     
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# ══════════════════════════════════════════════════════════════════════════════
+#  _________._____________.___ ____ ___  _________      .__         .__
+# /   _____/|   \______   \   |    |   \/   _____/____  |  | ______ |  |__ _____
+# \_____  \ |   ||       _/   |    |   /\_____  \__  \ |  | \____ \|  |  \__  \
+# /        \|   ||    |   \   |    |  / /        \/ __ \|  |_|  |_> >   Y  \/ __ \_
+# /_______  /|___||____|_  /___|______/ /_______  (____  /____/   __/|___|  (____  /
+#         \/             \/                     \/     \/     |__|        \/     \/
+#
+# Syndicate - Precious Metals Intelligence System
+# Copyright (c) 2025 SIRIUS Alpha
+# All rights reserved.
+# ══════════════════════════════════════════════════════════════════════════════
+"""
+Document Catalog for Syndicate Outputs
+
+Keeps the path, size, mtime, content hash and parsed frontmatter status of
+every markdown file under an output tree in the database, so status queries
+(pending AI, needs sync, published) don't re-read years of journals and
+reports. Each query first refreshes the catalog from file stats; only new
+or changed files are read and parsed.
+
+Usage:
+    python scripts/document_catalog.py [ROOT] [--pending | --needs-sync | --published]
+    python scripts/document_catalog.py [ROOT] --check [--repair]
+    python scripts/document_catalog.py [ROOT] --rebuild
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Project paths
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.frontmatter import document_flags, parse_frontmatter
+
+# A file modified this close to its last scan may have changed again within the
+# filesystem's mtime resolution without a visible stat change, so it is re-hashed
+# on every refresh until its mtime is comfortably older than the scan.
+RACY_WINDOW_NS = 2_000_000_000
+
+# Columns compared by the consistency checker
+_CHECKED_FIELDS = ("size", "mtime_ns", "content_hash", "readable", "status", "sync_status", "notion_page_id")
+
+
+def iter_markdown_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """(path, stat) for every *.md file below `root`; like Path.glob("**/*.md"), symlinked dirs aren't entered."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir() and not entry.is_symlink():
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    yield entry.path, entry.stat()
+            except OSError:
+                continue
+
+
+class DocumentCatalog:
+    """
+    Incrementally maintained index of the markdown documents under `root`.
+
+    Rows live in the `document_catalog` table; a file is re-read only when
+    its size or mtime changed (or its mtime is too recent to trust), and
+    files that vanished are dropped. `check()` compares the catalog with a
+    full rescan and `rebuild()` re-indexes everything.
+    """
+
+    def __init__(self, root, db=None):
+        self.root = Path(root)
+        self._abs_root = os.path.abspath(root)
+        self._prefix_len = len(os.path.join(self._abs_root, ""))
+        if db is None:
+            from db_manager import get_db
+
+            db = get_db()
+        self.db = db
+
+    def _display_path(self, path: str) -> str:
+        """Path in the form the caller's root was given (as Path(root).glob would return it)."""
+        return str(self.root / path[self._prefix_len:])
+
+    def _index(self, path: str, stat: os.stat_result, scanned_ns: int) -> Dict[str, Any]:
+        """Catalog row for one file, reading and parsing its frontmatter."""
+        entry = {
+            "path": path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "scanned_ns": scanned_ns,
+            "content_hash": None,
+            "readable": 0,
+            "status": None,
+            "sync_status": None,
+            "notion_page_id": None,
+            "ai_processed": 0,
+            "pending_ai": 0,
+            "ready_for_sync": 0,
+            "needs_sync": 0,
+            "synced": 0,
+            "frontmatter": None,
+        }
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            return entry
+        entry["content_hash"] = hashlib.sha256(data).hexdigest()
+        try:
+            # Same newline translation as Path.read_text
+            content = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        except UnicodeDecodeError:
+            return entry
+
+        frontmatter, _ = parse_frontmatter(content)
+        page_id = frontmatter.get("notion_page_id")
+        entry.update(
+            readable=1,
+            status=str(frontmatter.get("status", "draft")),
+            sync_status=str(frontmatter.get("sync_status", "pending")),
+            notion_page_id=str(page_id) if page_id else None,
+            frontmatter=json.dumps(frontmatter, default=str),
+            **{flag: int(value) for flag, value in document_flags(frontmatter).items()},
+        )
+        return entry
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the catalog up to date from file stats, reading only new or changed files."""
+        known = self.db.get_catalog_stats(self._abs_root)
+        now_ns = time.time_ns()
+        indexed: List[Dict[str, Any]] = []
+        touched: List[Tuple[int, int, int, str]] = []
+        seen = set()
+        unchanged = 0
+
+        for path, stat in iter_markdown_files(self._abs_root):
+            seen.add(path)
+            previous = known.get(path)
+            if (
+                previous
+                and (stat.st_size, stat.st_mtime_ns) == previous[:2]
+                and stat.st_mtime_ns < previous[2] - RACY_WINDOW_NS
+            ):
+                unchanged += 1
+                continue
+
+            entry = self._index(path, stat, now_ns)
+            if previous and entry["content_hash"] is not None and entry["content_hash"] == previous[3]:
+                touched.append((entry["size"], entry["mtime_ns"], now_ns, path))
+            else:
+                indexed.append(entry)
+
+        removed = [path for path in known if path not in seen]
+        self.db.upsert_catalog_entries(indexed)
+        self.db.touch_catalog_entries(touched)
+        self.db.delete_catalog_entries(removed)
+        return {
+            "files": len(seen),
+            "indexed": len(indexed),
+            "touched": len(touched),
+            "unchanged": unchanged,
+            "removed": len(removed),
+        }
+
+    def rebuild(self) -> Dict[str, int]:
+        """Full-rescan fallback: forget everything under root and re-index every file."""
+        self.db.delete_catalog_entries(root=self._abs_root)
+        return self.refresh()
+
+    def entries(self, refresh: bool = True, status: str = None, **flags: bool) -> List[Dict[str, Any]]:
+        """Catalog rows under root, filtered like DatabaseManager.query_catalog."""
+        if refresh:
+            self.refresh()
+        rows = self.db.query_catalog(self._abs_root, status=status, **flags)
+        for row in rows:
+            row["path"] = self._display_path(row["path"])
+        return rows
+
+    def pending_documents(self, refresh: bool = True) -> List[Dict[str, Any]]:
+        """Documents pending AI processing, in the shape get_pending_documents returns."""
+        return [
+            {
+                "path": entry["path"],
+                "reason": entry["frontmatter"].get("pending_reason") or "not_processed",
+                "since": entry["frontmatter"].get("pending_since"),
+            }
+            for entry in self.entries(refresh, pending_ai=True)
+        ]
+
+    def needs_sync(self, refresh: bool = True) -> List[str]:
+        """Paths of published documents not yet (successfully) synced to Notion."""
+        return [entry["path"] for entry in self.entries(refresh, needs_sync=True)]
+
+    def published(self, refresh: bool = True) -> List[str]:
+        """Paths of documents with status 'published'."""
+        return [entry["path"] for entry in self.entries(refresh, status="published")]
+
+    def check(self, repair: bool = False) -> Dict[str, Any]:
+        """
+        Compare the catalog against a full rescan of the tree.
+
+        Reports files missing from the catalog, catalog rows for files that
+        no longer exist, and rows whose stat, hash or parsed status differ
+        from the file on disk. With repair=True those rows are rewritten.
+        """
+        known = {row["path"]: row for row in self.db.query_catalog(self._abs_root)}
+        now_ns = time.time_ns()
+        missing, mismatched, fresh_entries = [], [], []
+        files = 0
+
+        for path, stat in iter_markdown_files(self._abs_root):
+            files += 1
+            fresh = self._index(path, stat, now_ns)
+            row = known.pop(path, None)
+            if row is None:
+                missing.append(path)
+            elif (
+                any(fresh[field] != row[field] for field in _CHECKED_FIELDS)
+                or any(bool(fresh[flag]) != row[flag] for flag in self.db.CATALOG_FLAGS)
+                or json.loads(fresh["frontmatter"] or "{}") != row["frontmatter"]
+            ):
+                mismatched.append(path)
+            else:
+                continue
+            fresh_entries.append(fresh)
+
+        stale = sorted(known)
+        if repair:
+            self.db.upsert_catalog_entries(fresh_entries)
+            self.db.delete_catalog_entries(stale)
+
+        return {
+            "files": files,
+            "missing": [self._display_path(p) for p in sorted(missing)],
+            "stale": [self._display_path(p) for p in stale],
+            "mismatched": [self._display_path(p) for p in sorted(mismatched)],
+            "consistent": not (missing or stale or mismatched),
+            "repaired": repair,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Document status catalog for Syndicate outputs")
+    parser.add_argument("root", nargs="?", default=str(PROJECT_ROOT / "output"))
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--pending", action="store_true", help="List documents pending AI processing")
+    group.add_argument("--needs-sync", action="store_true", help="List documents that need a Notion sync")
+    group.add_argument("--published", action="store_true", help="List published documents")
+    group.add_argument("--check", action="store_true", help="Compare the catalog with a full rescan")
+    group.add_argument("--rebuild", action="store_true", help="Re-index every file")
+    parser.add_argument("--repair", action="store_true", help="With --check, rewrite inconsistent rows")
+    args = parser.parse_args()
+
+    catalog = DocumentCatalog(args.root)
+    if args.pending:
+        output = catalog.pending_documents()
+    elif args.needs_sync:
+        output = catalog.needs_sync()
+    elif args.published:
+        output = catalog.published()
+    elif args.check:
+        output = catalog.check(repair=args.repair)
+    elif args.rebuild:
+        output = catalog.rebuild()
+    else:
+        output = catalog.refresh()
+    print(json.dumps(output, indent=2))
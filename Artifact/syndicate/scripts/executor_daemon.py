@@ -16,6 +16,8 @@ EXECUTION MODES:
 
 FEATURES:
     - Continuous polling for ready tasks
+    - Partitioned multi-worker mode: several daemons split the queue by
+      lease-based partition ownership and run tasks concurrently
     - Orphan recovery on startup
     - Graceful shutdown with task completion
     - Signal handling (SIGTERM, SIGINT, SIGHUP)
@@ -30,6 +32,9 @@ USAGE:
     # Run once and exit (drain queue)
     python executor_daemon.py --once
 
+    # Run 4 tasks at a time; start more daemons to share the queue
+    python executor_daemon.py --daemon --workers 4
+
     # Recover orphans only
     python executor_daemon.py --recover-orphans
 
@@ -47,10 +52,12 @@ import socket
 import sys
 import threading
 import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 # Project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -82,6 +89,12 @@ MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
 INITIAL_BACKOFF_SECONDS = int(os.getenv("LLM_INITIAL_BACKOFF", "30"))
 MAX_BACKOFF_SECONDS = int(os.getenv("LLM_MAX_BACKOFF", "600"))
 
+# Partitioned multi-worker mode (overridable via env)
+EXECUTOR_PARTITIONS = int(os.getenv("EXECUTOR_PARTITIONS", "16"))
+PARTITION_LEASE_SECONDS = float(os.getenv("EXECUTOR_LEASE_SECONDS", "30"))
+# Per action_type concurrency caps within one daemon; unlisted types are only bounded by --workers
+TYPE_CONCURRENCY = os.getenv("EXECUTOR_TYPE_CONCURRENCY", "research=2,news_scan=2,code_task=1")
+
 QUOTA_ERROR_PATTERNS = [
     "quota",
     "rate limit",
@@ -92,6 +105,17 @@ QUOTA_ERROR_PATTERNS = [
     "overloaded",
 ]
 
+
+def parse_type_limits(spec: str) -> Dict[str, int]:
+    """Parse "research=2,code_task=1" into {"research": 2, "code_task": 1}."""
+    limits = {}
+    for item in (spec or "").split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip()] = max(1, int(value))
+    return limits
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # LOGGING SETUP
 # ══════════════════════════════════════════════════════════════════════════════
@@ -149,6 +173,15 @@ class ExecutorDaemon:
     - Graceful shutdown with task completion
     - Health monitoring and heartbeat
     - Quota-aware execution
+
+    By default one daemon is elected leader and runs tasks one at a time.
+    In partitioned mode (`partitioned=True`, implied by `workers > 1`) there
+    is no leader: action_insights rows are split into `n_partitions` by id,
+    each daemon leases a fair share of partitions in SQLite and runs up to
+    `workers` tasks from them at once, with at most `type_limits[type]` of
+    one action_type in flight. Adding daemons adds throughput; claims are
+    still the atomic pending -> in_progress update, now also fenced on the
+    partition lease, so a task never runs twice.
     """
 
     def __init__(
@@ -157,18 +190,32 @@ class ExecutorDaemon:
         poll_interval: int = POLL_INTERVAL_SECONDS,
         worker_id: str = WORKER_ID,
         dry_run: bool = False,
+        workers: int = 1,
+        partitioned: bool = False,
+        n_partitions: int = EXECUTOR_PARTITIONS,
+        lease_seconds: float = PARTITION_LEASE_SECONDS,
+        type_limits: Optional[Dict[str, int]] = None,
     ):
         self.logger = logger
         self.poll_interval = poll_interval
         self.worker_id = worker_id
         self.dry_run = dry_run
+        self.workers = max(1, workers)
+        self.partitioned = partitioned or self.workers > 1
+        self.n_partitions = n_partitions
+        self.lease_seconds = lease_seconds
+        self.type_limits = parse_type_limits(TYPE_CONCURRENCY) if type_limits is None else type_limits
 
         # State
         self._running = False
         self._shutdown_requested = False
-        self._current_task_id: Optional[str] = None
+        self._active_tasks: Dict[str, Optional[str]] = {}
         self._lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._local = threading.local()
         self._heartbeat_thread: Optional[threading.Thread] = None
+        self._owned_partitions: List[int] = []
+        self._leases_renewed_at = 0.0
 
         # Statistics
         self.stats = {
@@ -178,17 +225,18 @@ class ExecutorDaemon:
             "tasks_failed": 0,
             "tasks_retried": 0,
             "orphans_recovered": 0,
+            "claims_lost": 0,
             "total_execution_time_ms": 0,
             "last_poll_at": None,
             "last_task_at": None,
             "consecutive_errors": 0,
+            "partitions_owned": 0,
         }
 
         # Lazy-loaded components
         self._db = None
         self._config = None
         self._model = None
-        self._task_executor = None
 
         # Register signal handlers
         self._setup_signal_handlers()
@@ -196,6 +244,16 @@ class ExecutorDaemon:
         # Register cleanup on exit
         atexit.register(self._cleanup)
 
+    @property
+    def _current_task_id(self) -> Optional[str]:
+        """One of the tasks in flight (the only one outside partitioned mode)."""
+        with self._lock:
+            return next(iter(self._active_tasks), None)
+
+    def _bump(self, key: str, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
     def _setup_signal_handlers(self):
         """Register handlers for graceful shutdown."""
         signal.signal(signal.SIGTERM, self._handle_shutdown_signal)
@@ -209,8 +267,8 @@ class ExecutorDaemon:
         self.logger.info(f"Received {sig_name}, initiating graceful shutdown...")
         self._shutdown_requested = True
 
-        if self._current_task_id:
-            self.logger.info(f"Waiting for current task to complete: {self._current_task_id}")
+        if self._active_tasks:
+            self.logger.info(f"Waiting for current task(s) to complete: {', '.join(list(self._active_tasks))}")
         else:
             self.logger.info("No task in progress, shutting down immediately")
 
@@ -230,14 +288,16 @@ class ExecutorDaemon:
             self.logger.error(f"Failed to reload configuration: {e}")
 
     def _cleanup(self):
-        """Cleanup on exit - release any claimed tasks."""
-        if self._current_task_id:
-            self.logger.warning(f"Releasing uncompleted task on exit: {self._current_task_id}")
+        """Cleanup on exit - release any claimed tasks and partition leases."""
+        for action_id in list(self._active_tasks):
+            self.logger.warning(f"Releasing uncompleted task on exit: {action_id}")
             try:
                 db = self._get_db()
-                db.release_action(self._current_task_id, reason="daemon_exit")
+                db.release_action(action_id, reason="daemon_exit")
             except Exception as e:
                 self.logger.error(f"Failed to release task: {e}")
+        if self.partitioned and self._owned_partitions:
+            self._release_partitions()
 
     def _print_status(self, text: str, level: str = "info"):
         """Helper to print status via rich console if available for better UX."""
@@ -280,6 +340,10 @@ class ExecutorDaemon:
 
     def _get_model(self):
         """Lazy-load LLM model."""
+        with self._init_lock:
+            return self._load_model()
+
+    def _load_model(self):
         if self._model is None:
             try:
                 from main import create_llm_provider
@@ -295,8 +359,8 @@ class ExecutorDaemon:
         return self._model
 
     def _get_task_executor(self):
-        """Lazy-load task executor."""
-        if self._task_executor is None:
+        """Lazy-load task executor (one per worker thread: it holds the action queue being run)."""
+        if getattr(self._local, "task_executor", None) is None:
             try:
                 from scripts.insights_engine import InsightsExtractor
                 from scripts.task_executor import TaskExecutor
@@ -306,11 +370,11 @@ class ExecutorDaemon:
 
                 if model:
                     extractor = InsightsExtractor(config, self.logger, model)
-                    self._task_executor = TaskExecutor(config, self.logger, model, extractor)
+                    self._local.task_executor = TaskExecutor(config, self.logger, model, extractor)
                     self.logger.info("Task executor initialized")
             except Exception as e:
                 self.logger.error(f"Failed to initialize task executor: {e}")
-        return self._task_executor
+        return getattr(self._local, "task_executor", None)
 
     # ══════════════════════════════════════════════════════════════════════════
     # ORPHAN RECOVERY
@@ -368,13 +432,15 @@ class ExecutorDaemon:
         action_id = action_dict["action_id"]
         db = self._get_db()
 
-        # Claim the task atomically
-        if not db.claim_action(action_id, worker_id=self.worker_id):
+        # Claim the task atomically (and only while we hold its partition, when partitioned)
+        n_partitions = self.n_partitions if self.partitioned else None
+        if not db.claim_action(action_id, worker_id=self.worker_id, n_partitions=n_partitions):
             self.logger.debug(f"Task already claimed: {action_id}")
+            self._bump("claims_lost")
             return False
 
         with self._lock:
-            self._current_task_id = action_id
+            self._active_tasks[action_id] = action_dict.get("action_type")
 
         try:
             self.logger.info(f"Executing task: {action_dict.get('title', action_id)[:50]}")
@@ -391,9 +457,9 @@ class ExecutorDaemon:
                 # Release task back to pending (don't mark complete in dry-run)
                 db.release_action(action_id, reason="dry_run")
 
-                self.stats["total_execution_time_ms"] += execution_time_ms
-                self.stats["tasks_executed"] += 1
-                self.stats["tasks_succeeded"] += 1
+                self._bump("total_execution_time_ms", execution_time_ms)
+                self._bump("tasks_executed")
+                self._bump("tasks_succeeded")
                 self.stats["last_task_at"] = datetime.now().isoformat()
 
                 self.logger.info(f"[DRY-RUN] Task simulated: {action_id}")
@@ -431,8 +497,8 @@ class ExecutorDaemon:
             results = executor.execute_all_pending(max_tasks=1)
 
             execution_time_ms = (time.time() - start_time) * 1000
-            self.stats["total_execution_time_ms"] += execution_time_ms
-            self.stats["tasks_executed"] += 1
+            self._bump("total_execution_time_ms", execution_time_ms)
+            self._bump("tasks_executed")
             self.stats["last_task_at"] = datetime.now().isoformat()
 
             if results and results[0].success:
@@ -444,8 +510,9 @@ class ExecutorDaemon:
                     execution_time_ms=execution_time_ms,
                     artifacts=str(results[0].artifacts) if results[0].artifacts else None,
                 )
-                self.stats["tasks_succeeded"] += 1
-                self.stats["consecutive_errors"] = 0
+                self._bump("tasks_succeeded")
+                with self._lock:
+                    self.stats["consecutive_errors"] = 0
                 self.logger.info(f"Task completed: {action_id}")
                 return True
             else:
@@ -458,7 +525,7 @@ class ExecutorDaemon:
                         # schedule delayed retry proportional to exponential backoff
                         backoff = min(INITIAL_BACKOFF_SECONDS * (2 ** max(0, retry_count - 1)), MAX_BACKOFF_SECONDS)
                         db.release_action(action_id, reason=f"quota_retry_{retry_count}", delay_seconds=backoff)
-                        self.stats["tasks_retried"] += 1
+                        self._bump("tasks_retried")
                         self.logger.warning(f"Task quota-limited, will retry in {backoff}s: {action_id}")
                         return False
 
@@ -470,8 +537,8 @@ class ExecutorDaemon:
                     error_message=error_msg,
                     execution_time_ms=execution_time_ms,
                 )
-                self.stats["tasks_failed"] += 1
-                self.stats["consecutive_errors"] += 1
+                self._bump("tasks_failed")
+                self._bump("consecutive_errors")
                 self.logger.error(f"Task failed: {action_id} - {error_msg[:100]}")
                 return False
 
@@ -484,7 +551,7 @@ class ExecutorDaemon:
                 retry_count = db.increment_retry_count(action_id, error_msg)
                 backoff = min(INITIAL_BACKOFF_SECONDS * (2 ** max(0, retry_count - 1)), MAX_BACKOFF_SECONDS)
                 db.release_action(action_id, reason=f"exception_quota_{retry_count}", delay_seconds=backoff)
-                self.stats["tasks_retried"] += 1
+                self._bump("tasks_retried")
             else:
                 retry_count = db.increment_retry_count(action_id, error_msg)
                 if retry_count >= MAX_RETRIES:
@@ -492,12 +559,12 @@ class ExecutorDaemon:
                 else:
                     db.release_action(action_id, reason=f"exception_retry_{retry_count}")
 
-            self.stats["consecutive_errors"] += 1
+            self._bump("consecutive_errors")
             return False
 
         finally:
             with self._lock:
-                self._current_task_id = None
+                self._active_tasks.pop(action_id, None)
 
     def poll_and_execute(self, remaining_limit: int = None) -> int:
         """
@@ -538,6 +605,143 @@ class ExecutorDaemon:
             self.stats["consecutive_errors"] += 1
             return 0
 
+    # ══════════════════════════════════════════════════════════════════════════
+    # PARTITIONED EXECUTION
+    # ══════════════════════════════════════════════════════════════════════════
+
+    def _renew_partitions(self, force: bool = False) -> List[int]:
+        """Renew partition leases every lease_seconds/3, picking up rebalancing from other daemons."""
+        now = time.time()
+        if force or now - self._leases_renewed_at >= self.lease_seconds / 3:
+            try:
+                owned = self._get_db().acquire_partition_leases(self.worker_id, self.n_partitions, self.lease_seconds)
+                if owned != self._owned_partitions:
+                    self.logger.info(f"Partitions owned: {owned or 'none'}")
+                self._owned_partitions = owned
+                self._leases_renewed_at = now
+                self.stats["partitions_owned"] = len(owned)
+            except Exception as e:
+                # Keep the old list; claims are fenced on the lease, so a stale list is harmless
+                self.logger.error(f"Partition lease renewal failed: {e}")
+        return self._owned_partitions
+
+    def _release_partitions(self):
+        try:
+            self._get_db().release_partition_leases(self.worker_id)
+        except Exception as e:
+            self.logger.error(f"Failed to release partition leases: {e}")
+        self._owned_partitions = []
+        self.stats["partitions_owned"] = 0
+
+    def _submit_ready(self, pool: ThreadPoolExecutor, futures: Dict[Any, Dict], limit: Optional[int] = None) -> int:
+        """
+        Fill free worker slots with ready tasks from owned partitions.
+
+        Tasks whose action_type is at its cap are left pending for a later
+        poll. Returns the number of tasks submitted.
+        """
+        free = self.workers - len(futures)
+        if limit is not None:
+            free = min(free, limit)
+        partitions = self._renew_partitions()
+        if free <= 0 or not partitions:
+            return 0
+
+        ready = self._get_db().get_ready_actions(
+            limit=free * 4 + len(futures), partitions=partitions, n_partitions=self.n_partitions
+        )
+        in_flight = {task["action_id"] for task in futures.values()}
+        per_type = Counter(task.get("action_type") for task in futures.values())
+        submitted = 0
+        for task in ready:
+            if submitted >= free or self._shutdown_requested:
+                break
+            action_type = task.get("action_type")
+            if task["action_id"] in in_flight or per_type[action_type] >= self.type_limits.get(action_type, self.workers):
+                continue
+            futures[pool.submit(self.execute_task, task)] = task
+            per_type[action_type] += 1
+            submitted += 1
+        return submitted
+
+    def run_partitioned(self, max_tasks: int = None, drain: bool = False) -> int:
+        """
+        Run tasks from owned partitions on `workers` threads.
+
+        With `drain`, returns once the whole ready queue is empty (other
+        daemons may be draining their partitions meanwhile); otherwise runs
+        until shutdown. Returns the number of tasks that succeeded.
+        """
+        idle_wait = min(self.poll_interval, self.lease_seconds / 3)
+        futures: Dict[Any, Dict] = {}
+        submitted_total = 0
+        succeeded = 0
+        last_orphan_check = time.time()
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="executor")
+        self._renew_partitions(force=True)
+        self.logger.info(
+            f"Partitioned execution: workers={self.workers} partitions={self.n_partitions} "
+            f"type_limits={self.type_limits or 'none'}"
+        )
+
+        try:
+            while not self._shutdown_requested:
+                self.stats["last_poll_at"] = datetime.now().isoformat()
+                remaining = None if max_tasks is None else max_tasks - submitted_total
+                if remaining == 0 and not futures:
+                    self.logger.info(f"Reached task limit ({max_tasks})")
+                    break
+                claims_lost = self.stats["claims_lost"]
+
+                try:
+                    submitted_total += self._submit_ready(pool, futures, remaining)
+                except Exception as e:
+                    self.logger.error(f"Poll error: {e}")
+                    self._bump("consecutive_errors")
+
+                if futures:
+                    done, _ = wait(list(futures), timeout=idle_wait if drain else self.poll_interval,
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = futures.pop(future)
+                        try:
+                            succeeded += 1 if future.result() else 0
+                        except Exception as e:
+                            self.logger.error(f"Task {task.get('action_id')} raised: {e}")
+                    if done and self.stats["claims_lost"] - claims_lost >= len(done):
+                        # Every finished task lost its claim: our partition list is stale (or
+                        # another daemon got there first). Renew and back off rather than
+                        # polling the same rows again straight away.
+                        self._renew_partitions(force=True)
+                        time.sleep(idle_wait)
+                    continue
+
+                if drain and not self._get_db().get_ready_actions(limit=1):
+                    break
+
+                if not drain:
+                    if time.time() - last_orphan_check > ORPHAN_CHECK_INTERVAL_SECONDS:
+                        self.recover_orphans()
+                        last_orphan_check = time.time()
+                    if self.stats["consecutive_errors"] >= MAX_CONSECUTIVE_ERRORS:
+                        self.logger.error(
+                            f"Too many consecutive errors ({MAX_CONSECUTIVE_ERRORS}), pausing for extended cooldown..."
+                        )
+                        time.sleep(MAX_BACKOFF_SECONDS)
+                        self.stats["consecutive_errors"] = 0
+                time.sleep(idle_wait if drain else self.poll_interval)
+        finally:
+            # Let running tasks finish, then hand partitions to the other daemons
+            for future in list(futures):
+                try:
+                    succeeded += 1 if future.result() else 0
+                except Exception as e:
+                    self.logger.error(f"Task {futures[future].get('action_id')} raised: {e}")
+            pool.shutdown(wait=True)
+            self._release_partitions()
+
+        return succeeded
+
     # ══════════════════════════════════════════════════════════════════════════
     # HEARTBEAT
     # ══════════════════════════════════════════════════════════════════════════
@@ -645,6 +849,12 @@ class ExecutorDaemon:
         # Recover any orphans first
         self.recover_orphans()
 
+        if self.partitioned:
+            total_executed = self.run_partitioned(max_tasks=max_tasks, drain=True)
+            self.logger.info(f"Drain complete. Executed {total_executed} tasks.")
+            self._print_stats()
+            return total_executed
+
         total_executed = 0
         while True:
             # Check task limit
@@ -693,6 +903,14 @@ class ExecutorDaemon:
         # Start HTTP health endpoint (best-effort)
         self._start_http_health()
 
+        # Partitioned mode needs no leader: every daemon works its own partitions
+        if self.partitioned:
+            self.run_partitioned()
+            self._running = False
+            self.logger.info("Executor daemon stopped")
+            self._print_stats()
+            return
+
         # Attempt to become leader; only leader performs work (supports HA)
         self._is_leader = self._attempt_leader_election()
         if not getattr(self, "_is_leader", False):
@@ -776,6 +994,9 @@ class ExecutorDaemon:
                 else 0
             ),
             "current_task": self._current_task_id,
+            "active_tasks": list(self._active_tasks),
+            "mode": f"partitioned ({self.workers} workers)" if self.partitioned else "leader",
+            "partitions": self._owned_partitions,
             "stats": self.stats,
             "queue": task_stats,
         }
@@ -892,6 +1113,20 @@ Examples:
     parser.add_argument(
         "--max-tasks", type=int, default=None, help="Maximum number of tasks to execute (default: unlimited)"
     )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Tasks to run concurrently; >1 implies --partitioned (default: 1)"
+    )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Share the queue with other daemons through partition leases instead of leader election",
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=EXECUTOR_PARTITIONS,
+        help=f"Number of queue partitions; must match across daemons (default: {EXECUTOR_PARTITIONS})",
+    )
 
     args = parser.parse_args()
 
@@ -921,6 +1156,9 @@ Examples:
         try:
             while True:
                 cmd = [python_exe, script, "--daemon", "--log-file", str(args.log_file) if args.log_file else ""]
+                cmd += ["--workers", str(args.workers), "--partitions", str(args.partitions)]
+                if args.partitioned:
+                    cmd.append("--partitioned")
                 # Remove empty args
                 cmd = [c for c in cmd if c]
                 proc = subprocess.Popen(cmd)
@@ -944,6 +1182,9 @@ Examples:
         logger=logger,
         poll_interval=args.poll_interval,
         dry_run=getattr(args, "dry_run", False),
+        workers=args.workers,
+        partitioned=args.partitioned,
+        n_partitions=args.partitions,
     )
 
     # Execute based on mode
@@ -556,9 +556,11 @@ def is_ready_for_sync(content: str) -> bool:
     to 'published' should be an explicit action (manual review or a trusted automation).
     """
     frontmatter, _ = parse_frontmatter(content)
-    status = frontmatter.get("status", "draft")
+    return _ready_for_sync(frontmatter)
+
 
-    return status in ("published", "complete")
+def _ready_for_sync(frontmatter: Dict[str, Any]) -> bool:
+    return frontmatter.get("status", "draft") in ("published", "complete")
 
 
 def is_draft(content: str) -> bool:
@@ -581,9 +583,11 @@ def is_synced_to_notion(content: str) -> bool:
         True if document has a notion_page_id and sync_status is 'synced'
     """
     frontmatter, _ = parse_frontmatter(content)
-    page_id = frontmatter.get("notion_page_id")
-    sync_status = frontmatter.get("sync_status", "pending")
-    return bool(page_id) and sync_status == "synced"
+    return _synced_to_notion(frontmatter)
+
+
+def _synced_to_notion(frontmatter: Dict[str, Any]) -> bool:
+    return bool(frontmatter.get("notion_page_id")) and frontmatter.get("sync_status", "pending") == "synced"
 
 
 def get_notion_page_id(content: str) -> Optional[str]:
@@ -620,7 +624,10 @@ def needs_sync(content: str) -> bool:
         True if document should be synced
     """
     frontmatter, _ = parse_frontmatter(content)
+    return _needs_sync(frontmatter)
 
+
+def _needs_sync(frontmatter: Dict[str, Any]) -> bool:
     # Must be published to sync
     status = frontmatter.get("status", "draft")
     if status not in ("published", "complete"):
@@ -823,16 +830,54 @@ def mark_ai_pending(content: str, filename: str, reason: str = "quota") -> str:
         )
 
 
-def get_pending_documents(directory: str) -> list:
+def _pending_ai(frontmatter: Dict[str, Any]) -> bool:
+    # Document needs AI if it's draft and not processed, or has a pending reason
+    status = frontmatter.get("status", "draft")
+    return status == "draft" and (not frontmatter.get("ai_processed", False) or bool(frontmatter.get("pending_reason")))
+
+
+def document_flags(frontmatter: Dict[str, Any]) -> Dict[str, bool]:
+    """
+    Evaluate the status predicates on already-parsed frontmatter.
+
+    Used by the document catalog to store each file's answers once
+    instead of re-reading the file for every query.
+    """
+    return {
+        "pending_ai": _pending_ai(frontmatter),
+        "ready_for_sync": _ready_for_sync(frontmatter),
+        "needs_sync": _needs_sync(frontmatter),
+        "synced": _synced_to_notion(frontmatter),
+        "ai_processed": frontmatter.get("ai_processed", False) is True,
+    }
+
+
+def get_pending_documents(directory: str, use_catalog: bool = True) -> list:
     """
     Find all documents that are pending AI processing.
 
+    Answered from the document catalog (refreshed from file stats first);
+    falls back to reading every file if the catalog is unavailable.
+
     Args:
         directory: Directory to search for markdown files
+        use_catalog: Set False to force a full rescan
 
     Returns:
         List of file paths that need AI processing
     """
+    if use_catalog:
+        try:
+            from scripts.document_catalog import DocumentCatalog
+
+            return DocumentCatalog(directory).pending_documents()
+        except Exception:
+            pass
+    return scan_pending_documents(directory)
+
+
+def scan_pending_documents(directory: str) -> list:
+    """Full-rescan variant of get_pending_documents: reads and parses every file."""
     from pathlib import Path
 
     pending = []
@@ -841,16 +886,11 @@ def get_pending_documents(directory: str) -> list:
             content = md_file.read_text(encoding="utf-8")
             frontmatter, _ = parse_frontmatter(content)
 
-            status = frontmatter.get("status", "draft")
-            ai_processed = frontmatter.get("ai_processed", False)
-            pending_reason = frontmatter.get("pending_reason")
-
-            # Document needs AI if it's draft and not processed, or has a pending reason
-            if status == "draft" and (not ai_processed or pending_reason):
+            if _pending_ai(frontmatter):
                 pending.append(
                     {
                         "path": str(md_file),
-                        "reason": pending_reason or "not_processed",
+                        "reason": frontmatter.get("pending_reason") or "not_processed",
                         "since": frontmatter.get("pending_since"),
                     }
                 )
@@ -20,15 +20,18 @@ Entity Insights: Named entities of importance (Fed, ECB, CME, central banks, etc
 Action Insights: Research tasks, data to find, news to investigate, code/math to explore
 """
 
+import bisect
 import json
 import logging
 import os
+import random
 import re
 import sys
+import time
 from dataclasses import asdict, dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
 import threading
 
 # Project paths
@@ -296,6 +299,180 @@ ACTION_PATTERNS = {
 # ==========================================
 
 
+# ==========================================
+# COMPILED MATCHERS
+# ==========================================
+
+_SENTENCE_SPLIT = re.compile(r"[.!?]\s+")
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Regex alternation of `words` factored into a trie, longest match first."""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """True if `\\b` matches between text[index - 1] and text[index]."""
+    return bool(_WORD_CHAR.match(text[index - 1])) != bool(_WORD_CHAR.match(text[index]))
+
+
+@dataclass
+class EntityScan:
+    """Where each known entity occurs in one report."""
+
+    sentences: List[str]
+    sentence_hits: Dict[str, List[int]]  # lowercased entity -> indices of sentences mentioning it
+    mentions: Dict[str, int]  # lowercased entity -> whole-word mentions in the report
+    header_lines: str  # lines containing "##"
+    bold_lines: str  # lines containing "**"
+
+
+class EntityMatcher:
+    """
+    Finds every known entity in a report in a single regex pass.
+
+    All entity names are folded into one case-insensitive trie regex, tried
+    inside a lookahead at each word start so overlapping names ("US Treasury"
+    and "Treasury") are all found. At a given start the trie reports the
+    longest name; shorter names ending on a word boundary inside it ("Fed" in
+    "Fed Meeting") match there too and come from a lookup table.
+    """
+
+    def __init__(self, entities: Dict[str, List[str]]):
+        self.entities = entities
+        self._keys = sorted({name.lower() for names in entities.values() for name in names})
+        self._prefixes = {
+            key: [other for other in self._keys if len(other) < len(key) and key.startswith(other)
+                  and _is_boundary(key, len(other))]
+            for key in self._keys
+        }
+        self._pattern = re.compile(rf"\b(?=({_trie_pattern(self._keys)})\b)", re.IGNORECASE)
+        self._line_patterns: Dict[str, Tuple[Pattern, Pattern]] = {}
+
+    def _key(self, matched: str) -> str:
+        key = matched.lower()
+        if key in self._prefixes:
+            return key
+        # Case-insensitive matches whose lower() differs (e.g. the Kelvin sign)
+        return next(k for k in self._keys if re.fullmatch(re.escape(k), matched, re.IGNORECASE))
+
+    def scan(self, content: str) -> EntityScan:
+        """Locate all entity mentions, by sentence, in one pass over `content`."""
+        starts, ends = [0], []
+        for separator in _SENTENCE_SPLIT.finditer(content):
+            ends.append(separator.start())
+            starts.append(separator.end())
+        ends.append(len(content))
+
+        sentence_hits: Dict[str, List[int]] = {}
+        mentions: Dict[str, int] = {}
+        resume: Dict[str, int] = {}
+        for match in self._pattern.finditer(content):
+            position = match.start()
+            index = bisect.bisect_right(starts, position) - 1
+            longest = self._key(match.group(1))
+            for key in [longest] + self._prefixes[longest]:
+                end = position + len(key)
+                # findall counts non-overlapping mentions
+                if position >= resume.get(key, 0):
+                    mentions[key] = mentions.get(key, 0) + 1
+                    resume[key] = end
+                if end <= ends[index]:
+                    hits = sentence_hits.setdefault(key, [])
+                    if not hits or hits[-1] != index:
+                        hits.append(index)
+
+        lines = content.split("\n")
+        return EntityScan(
+            sentences=[content[start:end] for start, end in zip(starts, ends)],
+            sentence_hits=sentence_hits,
+            mentions=mentions,
+            header_lines="\n".join(line for line in lines if "##" in line),
+            bold_lines="\n".join(line for line in lines if "**" in line),
+        )
+
+    def hits(self, scan: EntityScan, entity: str) -> List[int]:
+        """Indices of the sentences that mention `entity`."""
+        return scan.sentence_hits.get(entity.lower(), [])
+
+    def line_patterns(self, entity: str) -> Tuple[Pattern, Pattern]:
+        """Compiled header and bold patterns for `entity`."""
+        patterns = self._line_patterns.get(entity)
+        if patterns is None:
+            escaped = re.escape(entity)
+            patterns = (
+                re.compile(rf"(?:##.*{escaped}|{escaped}.*##)", re.IGNORECASE),
+                re.compile(rf"\*\*.*{escaped}.*\*\*", re.IGNORECASE),
+            )
+            self._line_patterns[entity] = patterns
+        return patterns
+
+
+class ActionScanner:
+    """
+    Runs every action pattern over a report in one pass.
+
+    A lookahead alternation of all patterns stops only where at least one of
+    them matches, and each pattern is tried individually at those positions.
+    Matches come back grouped by (action type, pattern), in position order and
+    non-overlapping within a pattern: the sequence each pattern's own finditer
+    would produce.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]], flags: int = re.IGNORECASE | re.MULTILINE):
+        self.patterns = [
+            (action_type, pattern, re.compile(pattern, flags))
+            for action_type, pattern_list in patterns.items()
+            for pattern in pattern_list
+        ]
+        combined = "|".join(f"(?:{pattern})" for _, pattern, _ in self.patterns)
+        self._candidates = re.compile(f"(?=(?:{combined}))", flags)
+
+    def finditer(self, content: str) -> Iterator[Tuple[str, str, "re.Match"]]:
+        """Yield (action_type, pattern, match) for every pattern match in `content`."""
+        found: List[List["re.Match"]] = [[] for _ in self.patterns]
+        resume = [0] * len(self.patterns)
+        for candidate in self._candidates.finditer(content):
+            position = candidate.start()
+            for i, (_, _, regex) in enumerate(self.patterns):
+                if position < resume[i]:
+                    continue
+                match = regex.match(content, position)
+                if match:
+                    found[i].append(match)
+                    resume[i] = match.end()
+
+        for (action_type, pattern, _), matches in zip(self.patterns, found):
+            for match in matches:
+                yield action_type, pattern, match
+
+
+ENTITY_MATCHER = EntityMatcher(KNOWN_ENTITIES)
+ACTION_SCANNER = ActionScanner(ACTION_PATTERNS)
+
+
+# ==========================================
+# INSIGHTS EXTRACTOR
+# ==========================================
+
+
 class InsightsExtractor:
     """
     Extracts entity and action insights from generated reports.
@@ -321,49 +498,49 @@ class InsightsExtractor:
         """Extract named entities from report content."""
         entities = []
 
-        # Split into sentences for context extraction
-        sentences = re.split(r"[.!?]\s+", report_content)
+        # One pass finds every entity's sentences and mention counts
+        scan = ENTITY_MATCHER.scan(report_content)
 
         for entity_type, entity_list in KNOWN_ENTITIES.items():
             for entity in entity_list:
-                # Case-insensitive search with word boundaries
-                pattern = rf"\b{re.escape(entity)}\b"
-
-                for sentence in sentences:
-                    if re.search(pattern, sentence, re.IGNORECASE):
-                        # Calculate relevance based on context
-                        relevance = self._calculate_entity_relevance(entity, sentence, report_content)
-
-                        # Avoid duplicates
-                        entity_key = f"{entity}:{report_name}"
-                        if entity_key not in self.entity_cache:
-                            insight = EntityInsight(
-                                entity_name=entity,
-                                entity_type=entity_type.rstrip("s"),  # Remove plural
-                                context=sentence.strip()[:500],  # Limit context length
-                                relevance_score=relevance,
-                                source_report=report_name,
-                                metadata={"mentions": 1},
-                            )
-                            entities.append(insight)
-                            self.entity_cache[entity_key] = insight
-                        else:
-                            # Update mention count
-                            self.entity_cache[entity_key].metadata["mentions"] = (
-                                self.entity_cache[entity_key].metadata.get("mentions", 1) + 1
-                            )
+                for index in ENTITY_MATCHER.hits(scan, entity):
+                    sentence = scan.sentences[index]
+
+                    # Avoid duplicates
+                    entity_key = f"{entity}:{report_name}"
+                    if entity_key not in self.entity_cache:
+                        insight = EntityInsight(
+                            entity_name=entity,
+                            entity_type=entity_type.rstrip("s"),  # Remove plural
+                            context=sentence.strip()[:500],  # Limit context length
+                            relevance_score=self._score_entity(entity, sentence, scan),
+                            source_report=report_name,
+                            metadata={"mentions": 1},
+                        )
+                        entities.append(insight)
+                        self.entity_cache[entity_key] = insight
+                    else:
+                        # Update mention count
+                        self.entity_cache[entity_key].metadata["mentions"] = (
+                            self.entity_cache[entity_key].metadata.get("mentions", 1) + 1
+                        )
 
         self.logger.info(f"[INSIGHTS] Extracted {len(entities)} entities from {report_name}")
         return entities
 
     def _calculate_entity_relevance(self, entity: str, sentence: str, full_content: str) -> float:
         """Calculate relevance score for an entity based on context."""
+        return self._score_entity(entity, sentence, ENTITY_MATCHER.scan(full_content))
+
+    def _score_entity(self, entity: str, sentence: str, scan: EntityScan) -> float:
+        """Relevance score from a report's precomputed entity scan."""
         score = 0.5  # Base score
 
-        # Boost for entities in headers (##, **bold**)
-        if re.search(rf"(?:##.*{re.escape(entity)}|{re.escape(entity)}.*##)", full_content, re.IGNORECASE):
+        # Boost for entities in headers (##, **bold**); neither pattern spans lines
+        header, bold = ENTITY_MATCHER.line_patterns(entity)
+        if header.search(scan.header_lines):
             score += 0.2
-        if re.search(rf"\*\*.*{re.escape(entity)}.*\*\*", full_content, re.IGNORECASE):
+        if bold.search(scan.bold_lines):
             score += 0.1
 
         # Boost for action-related context
@@ -372,7 +549,7 @@ class InsightsExtractor:
             score += 0.15
 
         # Boost for multiple mentions
-        mentions = len(re.findall(rf"\b{re.escape(entity)}\b", full_content, re.IGNORECASE))
+        mentions = scan.mentions.get(entity.lower(), 0)
         score += min(mentions * 0.05, 0.2)  # Cap at 0.2 boost
 
         return min(score, 1.0)  # Cap at 1.0
@@ -381,44 +558,8 @@ class InsightsExtractor:
         """Extract actionable tasks from report content."""
         actions = []
 
-        for action_type, patterns in ACTION_PATTERNS.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, report_content, re.IGNORECASE | re.MULTILINE)
-
-                for match in matches:
-                    # Get the matched content
-                    if match.groups():
-                        target = match.group(1).strip() if match.group(1) else match.group(0)
-                    else:
-                        target = match.group(0)
-
-                    # Clean up the target
-                    target = re.sub(r"\s+", " ", target).strip()
-                    if len(target) < 5:  # Skip too short matches
-                        continue
-
-                    # Find context (surrounding paragraph)
-                    context = self._find_context(match.start(), report_content)
-
-                    # Determine priority
-                    priority = self._determine_action_priority(target, context)
-
-                    # Extract scheduled date from description/context
-                    scheduled_for = self._extract_scheduled_date(target, context)
-
-                    action = ActionInsight(
-                        action_id=self._generate_action_id(),
-                        action_type=action_type,
-                        title=self._generate_action_title(action_type, target),
-                        description=f"Auto-extracted from {report_name}: {target}",
-                        priority=priority,
-                        source_report=report_name,
-                        source_context=context[:500],
-                        deadline=self._calculate_deadline(priority),
-                        scheduled_for=scheduled_for,
-                        metadata={"pattern_matched": pattern, "raw_match": match.group(0)[:200]},
-                    )
-                    actions.append(action)
+        for action_type, pattern, match in ACTION_SCANNER.finditer(report_content):
+            actions.extend(self._action_from_match(action_type, pattern, match, report_content, report_name))
 
         # Use AI for advanced extraction if available
         if self.model and len(actions) < 5:
@@ -433,6 +574,45 @@ class InsightsExtractor:
         self.logger.info(f"[INSIGHTS] Extracted {len(actions)} actions from {report_name}")
         return actions
 
+    def _action_from_match(
+        self, action_type: str, pattern: str, match: "re.Match", report_content: str, report_name: str
+    ) -> List[ActionInsight]:
+        """Build the action for one pattern match (empty if the target is too short)."""
+        # Get the matched content
+        if match.groups():
+            target = match.group(1).strip() if match.group(1) else match.group(0)
+        else:
+            target = match.group(0)
+
+        # Clean up the target
+        target = re.sub(r"\s+", " ", target).strip()
+        if len(target) < 5:  # Skip too short matches
+            return []
+
+        # Find context (surrounding paragraph)
+        context = self._find_context(match.start(), report_content)
+
+        # Determine priority
+        priority = self._determine_action_priority(target, context)
+
+        # Extract scheduled date from description/context
+        scheduled_for = self._extract_scheduled_date(target, context)
+
+        return [
+            ActionInsight(
+                action_id=self._generate_action_id(),
+                action_type=action_type,
+                title=self._generate_action_title(action_type, target),
+                description=f"Auto-extracted from {report_name}: {target}",
+                priority=priority,
+                source_report=report_name,
+                source_context=context[:500],
+                deadline=self._calculate_deadline(priority),
+                scheduled_for=scheduled_for,
+                metadata={"pattern_matched": pattern, "raw_match": match.group(0)[:200]},
+            )
+        ]
+
     def _find_context(self, position: int, content: str, window: int = 300) -> str:
         """Find surrounding context for a match position."""
         start = max(0, position - window // 2)
@@ -784,11 +964,134 @@ Extract 3-5 most important actionable tasks. Focus on specific, executable tasks
         }
 
 
+# ==========================================
+# BENCHMARK
+# ==========================================
+
+
+def _per_pattern_entities(extractor: InsightsExtractor, content: str, report_name: str) -> List[EntityInsight]:
+    """Reference extraction: one regex per entity per sentence, full-report rescans per hit."""
+    entities = []
+    for entity_type, entity_list in KNOWN_ENTITIES.items():
+        for entity in entity_list:
+            pattern = rf"\b{re.escape(entity)}\b"
+            for sentence in re.split(r"[.!?]\s+", content):
+                if not re.search(pattern, sentence, re.IGNORECASE):
+                    continue
+                score = 0.5
+                if re.search(rf"(?:##.*{re.escape(entity)}|{re.escape(entity)}.*##)", content, re.IGNORECASE):
+                    score += 0.2
+                if re.search(rf"\*\*.*{re.escape(entity)}.*\*\*", content, re.IGNORECASE):
+                    score += 0.1
+                keywords = ["watch", "monitor", "key", "critical", "important", "catalyst", "trigger"]
+                if any(kw in sentence.lower() for kw in keywords):
+                    score += 0.15
+                score += min(len(re.findall(pattern, content, re.IGNORECASE)) * 0.05, 0.2)
+
+                entity_key = f"{entity}:{report_name}"
+                if entity_key not in extractor.entity_cache:
+                    insight = EntityInsight(
+                        entity_name=entity,
+                        entity_type=entity_type.rstrip("s"),
+                        context=sentence.strip()[:500],
+                        relevance_score=min(score, 1.0),
+                        source_report=report_name,
+                        metadata={"mentions": 1},
+                    )
+                    entities.append(insight)
+                    extractor.entity_cache[entity_key] = insight
+                else:
+                    extractor.entity_cache[entity_key].metadata["mentions"] += 1
+    return entities
+
+
+def _per_pattern_actions(extractor: InsightsExtractor, content: str, report_name: str) -> List[ActionInsight]:
+    """Reference extraction: a separate finditer pass per action pattern."""
+    actions = []
+    for action_type, patterns in ACTION_PATTERNS.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE):
+                actions.extend(extractor._action_from_match(action_type, pattern, match, content, report_name))
+    return extractor._deduplicate_actions(actions)
+
+
+def synthetic_reports(n_reports: int, sentences_per_report: int = 150, seed: int = 7) -> List[str]:
+    """Markdown reports mixing known entities, action phrasing, price levels and dates."""
+    rng = random.Random(seed)
+    names = [name for entity_list in KNOWN_ENTITIES.values() for name in entity_list]
+    templates = [
+        "{a} and {b} remain in focus as {c} drifts",
+        "Need to research {a} positioning into the {b} decision",
+        "Monitor closely {a} after the {b} print",
+        "Support at ${level} held while {a} weakened",
+        "Watch for breakout above ${level} if {a} softens",
+        "Check the latest {a} data before {month} {day}",
+        "Calculate position size based on ATR around {a}",
+        "Latest news on {a} and {b} could move {c}",
+        "**{a}** flows versus {b} holdings diverged",
+        "Analysts at {a} see {b} as the key catalyst for {c}",
+        "Geopolitical risk around {a} keeps a bid under gold",
+    ]
+    months = ["Jan", "February", "Mar", "April", "Dec"]
+    reports = []
+    for _ in range(n_reports):
+        lines = [f"# Daily Analysis - {rng.choice(months)} {rng.randint(1, 28)}", ""]
+        for i in range(sentences_per_report):
+            if i % 15 == 0:
+                lines += ["", f"## {rng.choice(names)} Outlook", ""]
+            sentence = rng.choice(templates).format(
+                a=rng.choice(names), b=rng.choice(names), c=rng.choice(names),
+                level=f"{rng.randint(1800, 4800):,}", month=rng.choice(months), day=rng.randint(1, 28),
+            )
+            lines.append(sentence + rng.choice([".", ".", "!", "?"]))
+        reports.append("\n".join(lines))
+    return reports
+
+
+def benchmark_insights_extraction(
+    n_reports: int = 100, sentences_per_report: int = 150, seed: int = 7
+) -> Dict[str, Any]:
+    """
+    Time per-pattern extraction against the single-pass matchers over a
+    synthetic corpus, and check both produce the same insights.
+    Run it with `python scripts/insights_engine.py --bench`.
+    """
+    reports = synthetic_reports(n_reports, sentences_per_report, seed)
+    logger = logging.getLogger("insights.benchmark")
+    volatile = {"extracted_at", "created_at", "deadline"}
+
+    def run(extract_entities, extract_actions) -> Tuple[float, List[Dict[str, Any]]]:
+        extractor = InsightsExtractor(None, logger)
+        start = time.perf_counter()
+        insights = []
+        for i, content in enumerate(reports):
+            insights += extract_entities(extractor, content, f"report_{i}")
+            insights += extract_actions(extractor, content, f"report_{i}")
+        elapsed = time.perf_counter() - start
+        return elapsed, [{k: v for k, v in asdict(item).items() if k not in volatile} for item in insights]
+
+    per_pattern_s, expected = run(_per_pattern_entities, _per_pattern_actions)
+    single_pass_s, actual = run(InsightsExtractor.extract_entities, InsightsExtractor.extract_actions)
+    return {
+        "reports": n_reports,
+        "corpus_chars": sum(len(r) for r in reports),
+        "insights": len(actual),
+        "per_pattern_s": per_pattern_s,
+        "single_pass_s": single_pass_s,
+        "speedup": per_pattern_s / single_pass_s if single_pass_s else float("inf"),
+        "identical": actual == expected,
+    }
+
+
 # ==========================================
 # STANDALONE TEST
 # ==========================================
 
 if __name__ == "__main__":
+    if "--bench" in sys.argv[1:]:
+        print(json.dumps(benchmark_insights_extraction(), indent=2))
+        sys.exit(0)
+
     # Test with sample report content
     sample_report = """
 # Daily Analysis - December 3, 2025
@@ -2,13 +2,21 @@
 """LLM Worker
 
 Polls the `llm_tasks` table and processes pending tasks using the configured LLM provider.
+
+Tasks are dispatched continuously: a new task is claimed as soon as a slot
+frees up, the number of slots adapts to observed latency and error rate, and
+a task that overruns its timeout gives its slot back immediately.
 """
 
 import logging
 import os
+import queue
+import random
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from typing import Callable, Dict, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
@@ -30,11 +38,25 @@ LOG = logging.getLogger("llm_worker")
 WORKER_CONCURRENCY = int(os.environ.get("LLM_WORKER_CONCURRENCY", "2"))
 POLL_INTERVAL = float(os.environ.get("LLM_WORKER_POLL_INTERVAL", "5"))
 MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
-TASK_BATCH_SIZE = int(os.environ.get("LLM_TASK_BATCH_SIZE", str(WORKER_CONCURRENCY)))
 GOLD_LLM_TIMEOUT = int(os.environ.get("GOLDSTANDARD_LLM_TIMEOUT", "120"))
+# Adaptive concurrency bounds (defaults: WORKER_CONCURRENCY fixed at start, up to 4x)
+WORKER_MIN_CONCURRENCY = int(os.environ.get("LLM_WORKER_MIN_CONCURRENCY", "1"))
+WORKER_MAX_CONCURRENCY = int(os.environ.get("LLM_WORKER_MAX_CONCURRENCY", str(WORKER_CONCURRENCY * 4)))
+
+# Statuses process_task reports that count as errors for concurrency control
+ERROR_STATUSES = {"failed", "pending", "error", "timeout"}
 
 
-def process_task(task: dict, cfg: Config) -> None:
+def process_task(task: dict, cfg: Config, cancel_event: Optional[threading.Event] = None) -> str:
+    """
+    Run one claimed task and record its outcome in the DB.
+
+    Returns the status written for the task. Once `cancel_event` is set (the
+    dispatcher timed the task out and re-queued it), nothing more is written
+    to the output file or the DB and "cancelled" is returned. Every status
+    write is also conditional on the row still holding this claim, so a run
+    that loses a race with its timeout cannot overwrite a newer claim.
+    """
     db = get_db()
     task_id = task["id"]
     doc_path = task["document_path"]
@@ -44,6 +66,15 @@ def process_task(task: dict, cfg: Config) -> None:
 
     attempts = task.get("attempts", 0) + 1
 
+    def cancelled() -> bool:
+        if cancel_event is not None and cancel_event.is_set():
+            LOG.warning("Task %s timed out; discarding its late result", task_id)
+            return True
+        return False
+
+    def record(status: str, response: Optional[str] = None, error: Optional[str] = None) -> bool:
+        return not cancelled() and _write_result(db, task_id, status, attempts, response=response, error=error)
+
     try:
         task_type = task.get("task_type", "generate")
 
@@ -91,6 +122,8 @@ def process_task(task: dict, cfg: Config) -> None:
                     raise RuntimeError("No LLM provider available")
 
             resp = provider.generate_content(prompt)
+            if cancelled():
+                return "cancelled"
             text = getattr(resp, "text", str(resp))
 
             # Sanitize generated content using canonical values embedded in prompt
@@ -167,7 +200,7 @@ def process_task(task: dict, cfg: Config) -> None:
 
             # Persist audit if corrections occurred
             try:
-                if corrections:
+                if corrections and not cancelled():
                     try:
                         # Increment Prometheus counter if available
                         from syndicate.metrics.server import METRICS
@@ -194,17 +227,18 @@ def process_task(task: dict, cfg: Config) -> None:
                     )
                     # add a flag in frontmatter
                     final_content = final_content.replace("\n---\n", "\n---\nsanitizer_flagged: true\n", 1)
+                    if cancelled():
+                        return "cancelled"
                     # Ensure parent directory exists to avoid FileNotFoundError
                     os.makedirs(os.path.dirname(doc_path), exist_ok=True)
                     with open(doc_path, "w", encoding="utf-8") as f:
                         f.write(final_content)
-                    db.update_llm_task_result(
-                        task_id, "flagged", response=sanitized_text, error=None, attempts=attempts
-                    )
+                    if not record("flagged", response=sanitized_text):
+                        return "cancelled"
                 except Exception as e:
                     LOG.exception("Failed to write flagged report for %s: %s", doc_path, e)
-                    db.update_llm_task_result(task_id, "failed", response=None, error=str(e), attempts=attempts)
-                return
+                    return "failed" if record("failed", error=str(e)) else "cancelled"
+                return "flagged"
 
             # Write sanitized content to file and update frontmatter
             try:
@@ -212,6 +246,8 @@ def process_task(task: dict, cfg: Config) -> None:
                 final_content = add_frontmatter(
                     sanitized_text, os.path.basename(doc_path), doc_type=doc_type, ai_processed=True
                 )
+                if cancelled():
+                    return "cancelled"
                 try:
                     # Ensure parent directory exists to avoid FileNotFoundError
                     os.makedirs(os.path.dirname(doc_path), exist_ok=True)
@@ -219,22 +255,21 @@ def process_task(task: dict, cfg: Config) -> None:
                         f.write(final_content)
                 except Exception as e:
                     LOG.exception("Failed to write generated content to %s: %s", doc_path, e)
-                    db.update_llm_task_result(task_id, "failed", response=None, error=str(e), attempts=attempts)
-                    return
+                    return "failed" if record("failed", error=str(e)) else "cancelled"
             except Exception as e:
                 LOG.exception("Failed to generate final content for %s: %s", doc_path, e)
-                db.update_llm_task_result(task_id, "failed", response=None, error=str(e), attempts=attempts)
-                return
+                return "failed" if record("failed", error=str(e)) else "cancelled"
 
             # Attempt Notion publish if available
-            if NOTION_AVAILABLE:
+            if NOTION_AVAILABLE and not cancelled():
                 try:
                     pub = NotionPublisher()
                     pub.sync_file(doc_path)
                 except Exception as e:
                     LOG.warning("Notion publish failed (task=%s): %s", task_id, e)
 
-            db.update_llm_task_result(task_id, "completed", response=sanitized_text, error=None, attempts=attempts)
+            if not record("completed", response=sanitized_text):
+                return "cancelled"
             LOG.info("Task %s completed (generate) - corrections=%s", task_id, corrections)
             # Push context & task metadata to Automata so the cognition engine stays in sync
             try:
@@ -260,6 +295,7 @@ def process_task(task: dict, cfg: Config) -> None:
                     LOG.exception("Postprocessing failed for %s: %s", doc_path, e)
             except Exception:
                 LOG.debug("Postprocessor not available; skipping chart generation")
+            return "completed"
         elif task_type == "insights":
             # Perform insights extraction and save action insights
             try:
@@ -272,35 +308,301 @@ def process_task(task: dict, cfg: Config) -> None:
                 provider = create_llm_provider(cfg, LOG)
                 extractor = InsightsExtractor(cfg, LOG, model=provider)
                 actions = extractor.extract_actions(content, os.path.basename(doc_path))
+                if cancelled():
+                    return "cancelled"
 
                 if actions:
                     db.save_action_insights(actions)
 
-                db.update_llm_task_result(
-                    task_id, "completed", response=f"insights:{len(actions)}", error=None, attempts=attempts
-                )
+                if not record("completed", response=f"insights:{len(actions)}"):
+                    return "cancelled"
                 LOG.info("Task %s completed (insights) - actions=%s", task_id, len(actions))
+                return "completed"
             except Exception as e:
                 LOG.exception("Insights extraction failed for %s: %s", doc_path, e)
-                if attempts >= MAX_RETRIES:
-                    db.update_llm_task_result(task_id, "failed", response=None, error=str(e), attempts=attempts)
-                else:
-                    db.update_llm_task_result(task_id, "pending", response=None, error=str(e), attempts=attempts)
-                return
+                return "cancelled" if cancelled() else _record_failure(db, task_id, str(e), attempts)
 
         else:
             LOG.warning("Unknown task_type '%s' for task %s", task_type, task_id)
-            db.update_llm_task_result(
-                task_id, "failed", response=None, error=f"unknown task_type {task_type}", attempts=attempts
-            )
-            return
+            return "failed" if record("failed", error=f"unknown task_type {task_type}") else "cancelled"
     except Exception as e:
         LOG.exception("LLM generation failed for task %s: %s", task_id, e)
-        if attempts >= MAX_RETRIES:
-            db.update_llm_task_result(task_id, "failed", response=None, error=str(e), attempts=attempts)
+        return "cancelled" if cancelled() else _record_failure(db, task_id, str(e), attempts)
+
+
+def _write_result(db, task_id, status: str, attempts: int, response: Optional[str] = None,
+                  error: Optional[str] = None) -> bool:
+    """
+    Record an outcome only if the row still holds the claim made `attempts`
+    tries in (in_progress, attempt count unchanged). A timed-out run whose
+    task was re-queued, and perhaps claimed again, writes nothing.
+    """
+    written = db.update_llm_task_result(task_id, status, response=response, error=error, attempts=attempts,
+                                        claimed_attempts=attempts - 1)
+    if not written:
+        LOG.warning("Task %s no longer holds its claim; dropping '%s' result", task_id, status)
+    return bool(written)
+
+
+def _record_failure(db, task_id, error: str, attempts: int) -> str:
+    """Re-queue a failed task, or fail it for good once MAX_RETRIES is reached"""
+    status = "failed" if attempts >= MAX_RETRIES else "pending"
+    return status if _write_result(db, task_id, status, attempts, error=error) else "cancelled"
+
+
+class ConcurrencyLimit:
+    """
+    AIMD concurrency limit driven by task outcomes.
+
+    Every successful completion while the limit is in use adds 1/limit (about
+    +1 per limit's worth of tasks). An error, a timeout, or a median of the
+    last `window` latencies above `latency_tolerance` times the long-run
+    mean latency cuts the limit by `backoff`, at most once per `cooldown`
+    seconds so one burst of failures counts once. The median keeps single
+    slow generations in a heavy tail from shrinking the limit.
+    """
+
+    def __init__(
+        self,
+        initial: int = WORKER_CONCURRENCY,
+        min_limit: int = WORKER_MIN_CONCURRENCY,
+        max_limit: int = WORKER_MAX_CONCURRENCY,
+        backoff: float = 0.75,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+        window: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.clock = clock
+        self.outcomes = deque(maxlen=max(window, 50))
+        self.latencies = deque(maxlen=window)
+        self.latency_baseline: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    @property
+    def recent_latency(self) -> float:
+        """Median of the last `window` successful latencies"""
+        ordered = sorted(self.latencies)
+        return ordered[len(ordered) // 2] if ordered else 0.0
+
+    def _decrease(self):
+        now = self.clock()
+        if now - self._last_decrease >= self.cooldown:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+            self._last_decrease = now
+
+    def on_success(self, latency: float, in_flight: int):
+        with self._lock:
+            self.outcomes.append(0)
+            self.latencies.append(latency)
+            self.latency_baseline = (latency if self.latency_baseline is None
+                                     else 0.98 * self.latency_baseline + 0.02 * latency)
+            if (len(self.latencies) == self.latencies.maxlen
+                    and self.recent_latency > self.latency_tolerance * self.latency_baseline):
+                self._decrease()
+            elif in_flight + 1 >= self.limit:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+    def on_error(self):
+        with self._lock:
+            self.outcomes.append(1)
+            self._decrease()
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "error_rate": round(self.error_rate, 3),
+            "recent_latency": round(self.recent_latency, 3),
+            "latency_baseline": round(self.latency_baseline or 0.0, 3),
+        }
+
+
+class TaskDispatcher:
+    """
+    Keeps up to `limit.limit` tasks running, claiming more as slots free up.
+
+    Each task runs on its own daemon thread with a deadline of `task_timeout`
+    seconds. An overrunning task is recorded as a retryable failure, its
+    cancel event is set so a late result is discarded, and its slot is
+    reused right away; the abandoned thread is counted in `orphaned` until
+    it returns. `slot_idle_seconds` adds up, for every task started, how
+    long its slot sat free before it was claimed.
+    """
+
+    def __init__(
+        self,
+        db,
+        handler: Callable[[dict, threading.Event], str],
+        limit: Optional[ConcurrencyLimit] = None,
+        task_timeout: float = GOLD_LLM_TIMEOUT,
+        poll_interval: float = POLL_INTERVAL,
+        metrics=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.db = db
+        self.handler = handler
+        self.limit = limit or ConcurrencyLimit(clock=clock)
+        self.task_timeout = task_timeout
+        self.poll_interval = poll_interval
+        self.metrics = metrics
+        self.clock = clock
+        self.in_flight: Dict[int, dict] = {}
+        self.completions: "queue.Queue[tuple]" = queue.Queue()
+        self.stats = {"claimed": 0, "completed": 0, "errors": 0, "timeouts": 0, "late_results": 0,
+                      "orphaned": 0, "slot_idle_seconds": 0.0, "busy_seconds": 0.0}
+        self._orphans = set()
+        self._started = None
+        self._queue_drained = False
+        # When each currently free slot became free
+        self._free_since = deque()
+
+    def _set_metric(self, name: str, value):
+        if self.metrics is not None:
+            try:
+                self.metrics[name].set(value)
+            except Exception:
+                pass
+
+    def _run_task(self, task: dict, cancel_event: threading.Event, started: float):
+        try:
+            status = self.handler(task, cancel_event)
+        except Exception as e:
+            LOG.exception("Task %s raised: %s", task.get("id"), e)
+            status = "error"
+        self.completions.put((task["id"], status, self.clock() - started))
+
+    def _start(self, task: dict):
+        now = self.clock()
+        cancel_event = threading.Event()
+        self.in_flight[task["id"]] = {"task": task, "started": now, "deadline": now + self.task_timeout,
+                                      "cancel": cancel_event}
+        threading.Thread(target=self._run_task, args=(task, cancel_event, now),
+                         name=f"llm-task-{task['id']}", daemon=True).start()
+        self.stats["claimed"] += 1
+
+    def _finish(self, task_id, status: str, latency: float):
+        entry = self.in_flight.pop(task_id, None)
+        if entry is not None:
+            self._free_since.append(self.clock())
+        if entry is None:
+            # Result of a task already timed out; its slot was reused long ago
+            self._orphans.discard(task_id)
+            self.stats["late_results"] += 1
+            self.stats["orphaned"] = len(self._orphans)
+            return
+        self.stats["busy_seconds"] += latency
+        if status in ERROR_STATUSES:
+            self.stats["errors"] += 1
+            self.limit.on_error()
         else:
-            # Re-queue (backoff could be added)
-            db.update_llm_task_result(task_id, "pending", response=None, error=str(e), attempts=attempts)
+            self.stats["completed"] += 1
+            self.limit.on_success(latency, len(self.in_flight))
+
+    def _expire(self, now: float):
+        for task_id, entry in list(self.in_flight.items()):
+            if now < entry["deadline"]:
+                continue
+            entry["cancel"].set()
+            del self.in_flight[task_id]
+            self._free_since.append(now)
+            self._orphans.add(task_id)
+            self.stats["timeouts"] += 1
+            self.stats["orphaned"] = len(self._orphans)
+            self.stats["busy_seconds"] += now - entry["started"]
+            task = entry["task"]
+            LOG.warning("Task %s timed out after %ss; releasing its slot", task_id, self.task_timeout)
+            try:
+                _record_failure(self.db, task_id, f"timed out after {self.task_timeout}s",
+                                task.get("attempts", 0) + 1)
+            except Exception:
+                LOG.exception("Failed to record timeout for task %s", task_id)
+            self.limit.on_error()
+
+    def _wait(self, timeout: float):
+        """Block until a task finishes or `timeout` passes, then drain all finished tasks"""
+        try:
+            self._finish(*self.completions.get(timeout=max(0.0, timeout)))
+        except queue.Empty:
+            return
+        while True:
+            try:
+                self._finish(*self.completions.get_nowait())
+            except queue.Empty:
+                return
+
+    def step(self) -> int:
+        """Claim tasks into free slots, then wait for progress; returns the number claimed"""
+        now = self.clock()
+        self._expire(now)
+        free = self.limit.limit - len(self.in_flight)
+        claimed = []
+        if free > 0:
+            claimed = self.db.claim_llm_tasks(limit=free) or []
+            for task in claimed:
+                self._start(task)
+        queue_drained = len(claimed) < free
+        if free > 0:
+            self._queue_drained = queue_drained
+
+        for _ in claimed:
+            self.stats["slot_idle_seconds"] += now - (self._free_since.popleft() if self._free_since else now)
+        free = max(0, self.limit.limit - len(self.in_flight))
+        if queue_drained:
+            # Nothing was waiting for these slots; start timing them from now
+            self._free_since = deque([now] * free)
+        while len(self._free_since) > free:
+            self._free_since.pop()
+
+        self._set_metric("llm_tasks_processing", len(self.in_flight))
+        deadlines = [e["deadline"] for e in self.in_flight.values()]
+        wait = self.poll_interval if queue_drained else 0.05
+        if deadlines:
+            wait = min(wait, min(deadlines) - self.clock())
+        self._wait(wait)
+        return len(claimed)
+
+    def run(self, stop_event: Optional[threading.Event] = None, until_idle: bool = False):
+        """Dispatch until `stop_event` is set, or (with `until_idle`) the queue and slots are empty"""
+        self._started = self.clock()
+        self._free_since = deque([self._started] * self.limit.limit)
+        while not (stop_event is not None and stop_event.is_set()):
+            if self.metrics is not None:
+                try:
+                    self.metrics["llm_queue_length"].set(self.db.get_llm_queue_length() or 0)
+                except Exception:
+                    pass
+            self.step()
+            if until_idle and self._queue_drained and not self.in_flight:
+                break
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, float]:
+        elapsed = self.clock() - self._started if self._started is not None else 0.0
+        stats = dict(self.stats)
+        stats.update({
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_per_sec": round(self.stats["completed"] / elapsed, 3) if elapsed else 0.0,
+            "in_flight": len(self.in_flight),
+            "concurrency": self.limit.get_stats(),
+            "slot_idle_seconds": round(self.stats["slot_idle_seconds"], 3),
+        })
+        return stats
 
 
 def main():
@@ -324,59 +626,123 @@ def main():
         except Exception:
             pass
 
-    LOG.info("LLM Worker starting (concurrency=%s poll_interval=%s)" % (WORKER_CONCURRENCY, POLL_INTERVAL))
+    LOG.info(
+        "LLM Worker starting (concurrency=%s [%s-%s] timeout=%ss poll_interval=%s)"
+        % (WORKER_CONCURRENCY, WORKER_MIN_CONCURRENCY, WORKER_MAX_CONCURRENCY, GOLD_LLM_TIMEOUT, POLL_INTERVAL)
+    )
 
-    executor = ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY)
+    dispatcher = TaskDispatcher(db, lambda task, cancel: process_task(task, cfg, cancel), metrics=METRICS)
+    stop_event = threading.Event()
 
     try:
-        while True:
-            # Update queue length metric
-            if METRICS is not None:
-                try:
-                    METRICS["llm_queue_length"].set(db.get_llm_queue_length() or 0)
-                except Exception:
-                    pass
-
-            # Claim a batch of tasks (up to TASK_BATCH_SIZE)
-            tasks = db.claim_llm_tasks(limit=TASK_BATCH_SIZE)
-            if not tasks:
-                time.sleep(POLL_INTERVAL)
-                continue
-
-            # Update processing metric
-            if METRICS is not None:
-                try:
-                    METRICS["llm_tasks_processing"].set(len(tasks))
-                except Exception:
-                    pass
-
-            futures = {executor.submit(process_task, t, cfg): t for t in tasks}
-            # Wait for current batch to finish but do not block polling forever
-            for fut in as_completed(futures):
-                try:
-                    fut.result(timeout=GOLD_LLM_TIMEOUT)
-                except Exception as e:
-                    t = futures[fut]
-                    LOG.exception("Task %s raised: %s", t.get("id"), e)
-
-            # Reset processing metric
-            if METRICS is not None:
-                try:
-                    METRICS["llm_tasks_processing"].set(0)
-                except Exception:
-                    pass
-
+        dispatcher.run(stop_event)
     except KeyboardInterrupt:
         LOG.info("LLM Worker stopping (KeyboardInterrupt)")
     finally:
+        stop_event.set()
+        LOG.info("LLM Worker stats: %s", dispatcher.get_stats())
         if METRICS is not None:
             try:
                 METRICS["llm_worker_running"].set(0)
                 METRICS["llm_tasks_processing"].set(0)
             except Exception:
                 pass
-        executor.shutdown(wait=True)
+
+
+class _BenchQueue:
+    """In-memory stand-in for the llm_tasks queue used by benchmark_dispatch"""
+
+    def __init__(self, n_tasks: int):
+        self.pending = deque({"id": i, "attempts": 0} for i in range(n_tasks))
+        self.results: Dict[int, str] = {}
+        self.lock = threading.Lock()
+
+    def claim_llm_tasks(self, limit: int = 1):
+        with self.lock:
+            return [self.pending.popleft() for _ in range(min(limit, len(self.pending)))]
+
+    def update_llm_task_result(self, task_id, status, response=None, error=None, attempts=None,
+                               claimed_attempts=None):
+        with self.lock:
+            self.results[task_id] = status
+            return True
+
+    def get_llm_queue_length(self) -> int:
+        return len(self.pending)
+
+
+def _heavy_tailed_handler(latencies: Dict[int, float], error_rate: float, seed: int):
+    rng = random.Random(seed)
+    failing = {task_id for task_id in latencies if rng.random() < error_rate}
+
+    def handler(task: dict, cancel_event: threading.Event) -> str:
+        cancel_event.wait(latencies[task["id"]])
+        if cancel_event.is_set():
+            return "cancelled"
+        return "failed" if task["id"] in failing else "completed"
+
+    return handler
+
+
+def benchmark_dispatch(
+    n_tasks: int = 200,
+    concurrency: int = 8,
+    median_latency: float = 0.05,
+    sigma: float = 1.0,
+    task_timeout: float = 1.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compare the old claim-a-batch-and-wait loop against TaskDispatcher on a
+    fake provider whose latencies are lognormal (median `median_latency`,
+    shape `sigma`). Reports throughput and slot-idle seconds for both.
+    """
+    rng = random.Random(seed)
+    latencies = {i: median_latency * rng.lognormvariate(0, sigma) for i in range(n_tasks)}
+    results = {}
+
+    # Batch loop: claim `concurrency`, wait for the slowest, repeat
+    bench_queue = _BenchQueue(n_tasks)
+    handler = _heavy_tailed_handler(latencies, error_rate, seed)
+    idle = 0.0
+    start = time.monotonic()
+    while True:
+        batch = bench_queue.claim_llm_tasks(concurrency)
+        if not batch:
+            break
+        batch_start = time.monotonic()
+        threads = []
+        for task in batch:
+            thread = threading.Thread(target=handler, args=(task, threading.Event()))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        batch_time = time.monotonic() - batch_start
+        # Every slot waits for the slowest task of its batch
+        idle += sum(batch_time - min(latencies[t["id"]], batch_time) for t in batch)
+        idle += (concurrency - len(batch)) * batch_time if bench_queue.pending else 0.0
+    elapsed = time.monotonic() - start
+    results["batch"] = {"elapsed_seconds": round(elapsed, 3), "throughput_per_sec": round(n_tasks / elapsed, 3),
+                        "slot_idle_seconds": round(idle, 3)}
+
+    bench_queue = _BenchQueue(n_tasks)
+    limit = ConcurrencyLimit(initial=concurrency, min_limit=1, max_limit=concurrency)
+    dispatcher = TaskDispatcher(bench_queue, _heavy_tailed_handler(latencies, error_rate, seed), limit=limit,
+                                task_timeout=task_timeout, poll_interval=0.01)
+    stats = dispatcher.run(until_idle=True)
+    results["continuous"] = {key: stats[key] for key in
+                             ("elapsed_seconds", "slot_idle_seconds", "completed", "errors", "timeouts")}
+    results["continuous"]["throughput_per_sec"] = round(n_tasks / stats["elapsed_seconds"], 3)
+    results["continuous"]["final_limit"] = limit.limit
+    return results
 
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv:
+        import json
+
+        print(json.dumps(benchmark_dispatch(), indent=2))
+    else:
+        main()
@@ -23,6 +23,7 @@ Usage:
 
 import os
 import sys
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
@@ -93,8 +94,6 @@ except ImportError:
 
 # Backend 3: Ollama (requires ollama server running)
 try:
-    import threading
-
     # Concurrency limit for Ollama (prevent overload). Default: 2 concurrent calls
     _OLLAMA_MAX_CONCURRENCY = int(os.environ.get("OLLAMA_MAX_CONCURRENCY", "2"))
     _ollama_semaphore = threading.BoundedSemaphore(_OLLAMA_MAX_CONCURRENCY)
@@ -140,6 +139,10 @@ HAS_NATIVE_LLM = HAS_LLM_SUPPORT
 # Ollama:
 # OLLAMA_HOST          - Ollama server URL (default: http://localhost:11434)
 # OLLAMA_MODEL         - Ollama model name (default: llama3.2)
+#
+# Serving (scripts/local_llm_server.py):
+# LOCAL_LLM_SERVER     - Serve generate_content through the request queue (default: 1)
+# LOCAL_LLM_PREFIX_CACHE / LOCAL_LLM_PREFIX_CACHE_MB / LOCAL_LLM_PREFIX_MIN_TOKENS - prefix state reuse
 
 
 @dataclass
@@ -203,6 +206,8 @@ class LocalLLM:
         self._loaded = False
         self._model_name = ""
         self._backend = BACKEND
+        self._server = None  # LocalLLMServer, created by server()
+        self._server_lock = threading.Lock()
 
         # Default model search paths
         self._model_dirs = [
@@ -385,6 +390,10 @@ class LocalLLM:
 
     def unload(self):
         """Unload the current model."""
+        with self._server_lock:
+            if self._server:
+                self._server.stop()
+                self._server = None
         if self._engine:
             self._engine.unload()
             self._engine = None
@@ -512,6 +521,21 @@ class LocalLLM:
 
         raise RuntimeError("No LLM backend available")
 
+    def server(self, **kwargs):
+        """
+        Shared serving layer for this model: an ordered request queue with
+        prefix state reuse and per-request timings (see scripts/local_llm_server.py).
+        """
+        server = self._server
+        if server is None:
+            with self._server_lock:
+                if self._server is None:
+                    from scripts.local_llm_server import LocalLLMServer
+
+                    self._server = LocalLLMServer(self, **kwargs)
+                server = self._server
+        return server
+
     def count_tokens(self, text: str) -> int:
         """Count tokens in text."""
         if not self.is_loaded:
@@ -576,7 +600,11 @@ class GeminiCompatibleLLM:
             Response object with .text attribute
         """
         wrapped_prompt = self._wrap_prompt(prompt)
-        text = self._llm.generate(wrapped_prompt, **kwargs)
+        # Serve through the shared queue so concurrent callers don't contend on the model handle
+        if get_env_bool("LOCAL_LLM_SERVER", True) and self._llm.is_loaded:
+            text = self._llm.server().generate(wrapped_prompt, **kwargs)
+        else:
+            text = self._llm.generate(wrapped_prompt, **kwargs)
         return GenerateContentResponse(text)
 
 
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Syndicate Local LLM Server
+
+Serializes access to a LocalLLM model handle and reuses evaluation state for
+recurring prompt prefixes (system prompts, report templates).
+
+All requests go through one FIFO queue served by a single thread that owns
+the model, so concurrent callers (threaded workers, executor) never contend
+on the handle. With the llama-cpp-python backend the server snapshots the
+model state after a request with a new prefix and restores it before later
+requests sharing that prefix, so only the differing tail of the prompt is
+evaluated. Every request records queue wait, prompt evaluation and
+generation time.
+
+Usage:
+    from scripts.local_llm import LocalLLM
+
+    llm = LocalLLM("models/phi-3-mini-4k-instruct-q4.gguf")
+    server = llm.server()
+    text = server.generate(prompt)              # drop-in for llm.generate
+    result = server.generate_timed(prompt)      # text + RequestTiming
+    print(server.stats())
+
+    python scripts/local_llm_server.py --bench models/tiny.gguf
+"""
+
+import itertools
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Add project root
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.local_llm import get_env_int
+
+# ============================================================================
+# Configuration
+# ============================================================================
+# LOCAL_LLM_PREFIX_CACHE         - Number of saved prefix states (0 disables, default: 8)
+# LOCAL_LLM_PREFIX_CACHE_MB      - Memory budget for saved states (default: 1024)
+# LOCAL_LLM_PREFIX_MIN_TOKENS    - Shortest shared prefix worth restoring (default: 32)
+
+
+def longest_common_prefix(a: Sequence[int], b: Sequence[int]) -> int:
+    """Number of leading tokens two sequences share."""
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+# ============================================================================
+# Backend sessions
+# ============================================================================
+
+
+class LlamaCppSession:
+    """Model access for the server thread on the llama-cpp-python backend."""
+
+    supports_state = True
+
+    def __init__(self, llama):
+        self.llama = llama
+
+    def tokenize(self, text: str) -> List[int]:
+        # Same tokenization create_completion applies to the prompt
+        return list(self.llama.tokenize(text.encode("utf-8"), special=True)) if text else [self.llama.token_bos()]
+
+    def evaluated_tokens(self) -> List[int]:
+        """Tokens currently held in the context (reused by llama-cpp for a matching prompt prefix)."""
+        return list(self.llama.input_ids[: self.llama.n_tokens])
+
+    def save_state(self) -> Tuple[Any, int]:
+        state = self.llama.save_state()
+        return state, int(state.llama_state_size)
+
+    def load_state(self, state: Any) -> None:
+        self.llama.load_state(state)
+
+    def stream_completion(self, prompt: str, **params) -> Iterator[str]:
+        for chunk in self.llama(prompt, stream=True, echo=False, **params):
+            yield chunk["choices"][0]["text"]
+
+    def stream_chat(self, messages: List[Dict[str, str]], **params) -> Iterator[str]:
+        for chunk in self.llama.create_chat_completion(messages=messages, stream=True, **params):
+            content = chunk["choices"][0].get("delta", {}).get("content")
+            if content:
+                yield content
+
+
+class PassthroughSession:
+    """Backends without state save/restore (pyvdb): calls LocalLLM directly, one request at a time."""
+
+    supports_state = False
+
+    def __init__(self, llm):
+        self.llm = llm
+
+    def tokenize(self, text: str) -> List[int]:
+        return []
+
+    def evaluated_tokens(self) -> List[int]:
+        return []
+
+    def stream_completion(self, prompt: str, stop: Optional[List[str]] = None, **params) -> Iterator[str]:
+        yield self.llm.generate(prompt, stop_sequences=stop, **params)
+
+    def stream_chat(self, messages: List[Dict[str, str]], **params) -> Iterator[str]:
+        yield self.llm.chat(messages, **params)["content"]
+
+
+def make_session(llm):
+    """Session for a loaded LocalLLM's backend."""
+    if llm.backend == "llama-cpp-python" and getattr(llm, "_llama", None) is not None:
+        return LlamaCppSession(llm._llama)
+    return PassthroughSession(llm)
+
+
+# ============================================================================
+# Prefix state cache
+# ============================================================================
+
+
+@dataclass
+class _PrefixEntry:
+    tokens: Tuple[int, ...]
+    label: Optional[str]
+    state: Any
+    nbytes: int
+
+
+class PrefixStateCache:
+    """LRU of saved model states, looked up by longest shared token prefix or by label."""
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 1024 * 1024**2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, _PrefixEntry]" = OrderedDict()
+        self._ids = itertools.count()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def best_match(self, tokens: Sequence[int]) -> Tuple[Optional[_PrefixEntry], int]:
+        best, best_len, best_key = None, 0, None
+        for key, entry in self._entries.items():
+            shared = longest_common_prefix(entry.tokens, tokens)
+            if shared > best_len:
+                best, best_len, best_key = entry, shared, key
+        if best_key is not None:
+            self._entries.move_to_end(best_key)
+        return best, best_len
+
+    def by_label(self, label: str) -> Optional[_PrefixEntry]:
+        for key, entry in reversed(self._entries.items()):
+            if entry.label == label:
+                self._entries.move_to_end(key)
+                return entry
+        return None
+
+    def put(self, tokens: Sequence[int], state: Any, nbytes: int, label: Optional[str] = None) -> bool:
+        if self.max_entries <= 0 or nbytes > self.max_bytes:
+            return False
+        self._entries[next(self._ids)] = _PrefixEntry(tuple(tokens), label, state, nbytes)
+        self.nbytes += nbytes
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        return True
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+
+@dataclass
+class RequestTiming:
+    """Where the time of one served request went (milliseconds)."""
+
+    request_id: int
+    kind: str
+    queue_wait_ms: float = 0.0
+    restore_ms: float = 0.0
+    prompt_eval_ms: float = 0.0  # start of service to first token, including any state restore
+    generation_ms: float = 0.0
+    ttft_ms: float = 0.0  # submit to first token
+    total_ms: float = 0.0
+    prompt_tokens: int = 0
+    reused_tokens: int = 0
+    cache: str = "off"  # off | hit | warm | miss
+    chunks: int = 0
+
+
+@dataclass
+class ServedResult:
+    text: str
+    timing: RequestTiming
+
+
+@dataclass
+class _Request:
+    request_id: int
+    kind: str
+    payload: Any
+    params: Dict[str, Any]
+    future: Future
+    submitted: float
+
+
+class LocalLLMServer:
+    """
+    Ordered, single-threaded serving of a LocalLLM with prefix state reuse.
+
+    Requests are served strictly in submission order by one worker thread.
+    The server starts on first use and stops with stop() (or when used as a
+    context manager).
+    """
+
+    def __init__(
+        self,
+        llm,
+        session=None,
+        cache_entries: int = None,
+        cache_mb: int = None,
+        min_prefix_tokens: int = None,
+        history: int = 1000,
+    ):
+        self.llm = llm
+        self.session = session or make_session(llm)
+        if cache_entries is None:
+            cache_entries = get_env_int("LOCAL_LLM_PREFIX_CACHE", 8)
+        if cache_mb is None:
+            cache_mb = get_env_int("LOCAL_LLM_PREFIX_CACHE_MB", 1024)
+        self.min_prefix_tokens = (
+            min_prefix_tokens if min_prefix_tokens is not None else get_env_int("LOCAL_LLM_PREFIX_MIN_TOKENS", 32)
+        )
+        self.cache = PrefixStateCache(cache_entries, cache_mb * 1024**2)
+        self.timings: deque = deque(maxlen=history)
+
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> "LocalLLMServer":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._serve, name="local-llm-server", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        """Finish queued requests, then stop the worker thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def __enter__(self) -> "LocalLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Client API
+    # ------------------------------------------------------------------
+
+    def submit(self, kind: str, payload: Any, **params) -> Future:
+        """Queue a 'generate' (payload: prompt) or 'chat' (payload: messages) request; resolves to a ServedResult."""
+        if kind not in ("generate", "chat"):
+            raise ValueError(f"Unknown request kind: {kind}")
+        self.start()
+        future: Future = Future()
+        with self._lock:
+            # Ids are taken under the lock so queue order always matches id order
+            request = _Request(next(self._ids), kind, payload, params, future, time.perf_counter())
+            self._queue.put(request)
+        return future
+
+    def generate_timed(
+        self,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        stop_sequences: Optional[List[str]] = None,
+        **kwargs,
+    ) -> ServedResult:
+        return self.submit(
+            "generate",
+            prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            top_k=top_k,
+            stop=stop_sequences or [],
+        ).result()
+
+    def generate(self, prompt: str, **kwargs) -> str:
+        """Same contract as LocalLLM.generate, served through the queue."""
+        return self.generate_timed(prompt, **kwargs).text
+
+    def chat(
+        self, messages: List[Dict[str, str]], max_tokens: int = 1024, temperature: float = 0.7, **kwargs
+    ) -> Dict[str, Any]:
+        """Same contract as LocalLLM.chat, plus a 'timing' dict."""
+        result = self.submit("chat", messages, max_tokens=max_tokens, temperature=temperature).result()
+        timing = result.timing
+        return {
+            "content": result.text,
+            "tokens_generated": timing.chunks,
+            "tokens_prompt": timing.prompt_tokens,
+            "generation_time_ms": timing.prompt_eval_ms + timing.generation_ms,
+            "timing": asdict(timing),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate timings over the recorded requests."""
+        timings = list(self.timings)
+        n = len(timings) or 1
+        return {
+            "requests": len(timings),
+            "queued": self._queue.qsize(),
+            "cache_entries": len(self.cache),
+            "cache_mb": round(self.cache.nbytes / 1024**2, 1),
+            **{state: sum(t.cache == state for t in timings) for state in ("hit", "warm", "miss")},
+            "reused_tokens": sum(t.reused_tokens for t in timings),
+            "avg_queue_wait_ms": sum(t.queue_wait_ms for t in timings) / n,
+            "avg_prompt_eval_ms": sum(t.prompt_eval_ms for t in timings) / n,
+            "avg_generation_ms": sum(t.generation_ms for t in timings) / n,
+            "avg_ttft_ms": sum(t.ttft_ms for t in timings) / n,
+        }
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _serve(self) -> None:
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            try:
+                request.future.set_result(self._handle(request))
+            except BaseException as e:
+                request.future.set_exception(e)
+
+    def _prepare(self, request: _Request, timing: RequestTiming) -> Tuple[List[int], Optional[str]]:
+        """Restore the best saved state for the request's prefix; returns its prompt tokens and cache label."""
+        session = self.session
+        use_cache = session.supports_state and self.cache.max_entries > 0
+        if request.kind == "chat":
+            # Chat prompts are templated inside the backend; saved states are keyed by the system prompt
+            system = [m.get("content", "") for m in request.payload if m.get("role") == "system"]
+            label = "\n".join(system) if system else None
+            if not (use_cache and label):
+                return [], None
+            entry = self.cache.by_label(label)
+            timing.cache = "miss"
+            if entry is not None:
+                started = time.perf_counter()
+                session.load_state(entry.state)
+                timing.restore_ms = (time.perf_counter() - started) * 1000
+                timing.cache = "hit"
+            return list(entry.tokens) if entry else [], label
+
+        tokens = session.tokenize(request.payload)
+        timing.prompt_tokens = len(tokens)
+        if not use_cache:
+            return tokens, None
+        live = longest_common_prefix(session.evaluated_tokens(), tokens)
+        entry, shared = self.cache.best_match(tokens)
+        if entry is not None and shared >= self.min_prefix_tokens and shared > live:
+            started = time.perf_counter()
+            session.load_state(entry.state)
+            timing.restore_ms = (time.perf_counter() - started) * 1000
+            timing.cache, timing.reused_tokens = "hit", shared
+        elif live >= self.min_prefix_tokens:
+            # The context still holds this prefix from the previous request
+            timing.cache, timing.reused_tokens = "warm", live
+        else:
+            timing.cache = "miss"
+        return tokens, None
+
+    def _handle(self, request: _Request) -> ServedResult:
+        started = time.perf_counter()
+        timing = RequestTiming(request.request_id, request.kind, queue_wait_ms=(started - request.submitted) * 1000)
+        tokens, label = self._prepare(request, timing)
+
+        if request.kind == "chat":
+            stream = self.session.stream_chat(request.payload, **request.params)
+        else:
+            stream = self.session.stream_completion(request.payload, **request.params)
+        pieces: List[str] = []
+        first = None
+        for piece in stream:
+            if first is None:
+                first = time.perf_counter()
+            pieces.append(piece)
+        finished = time.perf_counter()
+        first = first or finished
+
+        timing.prompt_eval_ms = (first - started) * 1000
+        timing.generation_ms = (finished - first) * 1000
+        timing.ttft_ms = (first - request.submitted) * 1000
+        timing.total_ms = (finished - request.submitted) * 1000
+        timing.chunks = len(pieces)
+
+        if timing.cache in ("hit", "miss"):
+            evaluated = self.session.evaluated_tokens()
+            if request.kind == "chat":
+                timing.prompt_tokens = max(len(evaluated) - timing.chunks, 0)
+                timing.reused_tokens = longest_common_prefix(tokens, evaluated)
+            if timing.cache == "miss":
+                state, nbytes = self.session.save_state()
+                self.cache.put(evaluated, state, nbytes, label=label)
+        self.timings.append(timing)
+        return ServedResult("".join(pieces), timing)
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+
+def benchmark_prefix_cache(
+    llm, n_requests: int = 12, n_prefixes: int = 2, prefix_words: int = 300, max_tokens: int = 8, session=None
+) -> Dict[str, Any]:
+    """
+    Time-to-first-token with and without prefix state reuse.
+
+    Requests alternate between `n_prefixes` long system prompts, so the context
+    left by the previous request never matches the next one; only the saved
+    prefix states can avoid re-evaluating them.
+    """
+    prefixes = [
+        f"System {p}: you are a precious metals analyst. " + " ".join(f"rule{p}_{i}" for i in range(prefix_words))
+        for p in range(n_prefixes)
+    ]
+    prompts = [f"{prefixes[i % n_prefixes]}\nQuestion {i}: what is the gold bias today?" for i in range(n_requests)]
+
+    report: Dict[str, Any] = {"requests": n_requests, "prefixes": n_prefixes}
+    for name, entries in (("uncached", 0), ("cached", max(8, n_prefixes))):
+        server = LocalLLMServer(llm, session=session, cache_entries=entries, min_prefix_tokens=16)
+        with server:
+            texts = [server.generate_timed(p, max_tokens=max_tokens, temperature=0.0) for p in prompts]
+        # The first request of each prefix pays full evaluation either way
+        steady = [r.timing.ttft_ms for r in texts[n_prefixes:]] or [0.0]
+        report[f"{name}_ttft_ms"] = sum(steady) / len(steady)
+        report[f"{name}_stats"] = server.stats()
+    report["ttft_speedup"] = report["uncached_ttft_ms"] / max(report["cached_ttft_ms"], 1e-9)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Syndicate Local LLM server")
+    parser.add_argument("--bench", metavar="MODEL", help="Measure TTFT with/without prefix reuse on a GGUF model")
+    parser.add_argument("--requests", type=int, default=12)
+    parser.add_argument("--prefix-words", type=int, default=300)
+    args = parser.parse_args()
+
+    if args.bench:
+        from scripts.local_llm import LocalLLM
+
+        llm = LocalLLM(args.bench)
+        if not llm.is_loaded:
+            sys.exit(1)
+        print(json.dumps(benchmark_prefix_cache(llm, args.requests, prefix_words=args.prefix_words), indent=2))
+    else:
+        parser.print_help()
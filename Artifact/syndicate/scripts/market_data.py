@@ -0,0 +1,687 @@
+#!/usr/bin/env python3
+"""
+Syndicate Market Data Store
+
+Keeps a local columnar bar cache per ticker and interval for QuantEngine and
+tops it up with only the bars that are missing, instead of downloading the
+whole history every cycle.
+
+Each cache file holds the bars plus the fallback indicators (RSI, SMA_50,
+SMA_200, ATR, ADX_14/DMP_14/DMN_14) computed over them. All indicators are
+fixed-window, so a top-up only recomputes the new rows from the last
+WARMUP_BARS bars of cached input. Window sums are accumulated in a fixed
+order, which makes the incremental result bit-identical to recomputing the
+whole frame.
+
+The last cached bar may still be forming, so a top-up re-requests it along
+with the bar before it. If that earlier bar no longer matches (dividend or
+split adjustment, vendor revision) the ticker is downloaded in full again.
+
+The cache also records how far back its last full download reached. A get()
+whose period starts before that (say "2y" after caching "1y") downloads the
+longer history instead of serving a truncated window.
+
+Data sources are pluggable: anything with a
+`fetch(ticker, interval, period=None, start=None)` method returning an OHLC
+DataFrame. YFinanceSource is the production source; SyntheticBarSource
+generates deterministic bars for offline tests and benchmarks.
+
+Usage:
+    from scripts.market_data import MarketDataStore
+
+    store = MarketDataStore(cache_dir="data/market_cache")
+    df = store.get("GC=F", interval="1d", period="1y")
+    frames = store.get_many(["GC=F", "SI=F"])
+
+    python scripts/market_data.py --bench
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# ============================================================================
+# Configuration
+# ============================================================================
+# MARKET_DATA_CACHE          - Set to 0 to disable the on-disk bar cache (default: 1)
+# MARKET_DATA_CACHE_DIR      - Cache directory (default: <DATA_DIR>/market_cache)
+# MARKET_DATA_WORKERS        - Tickers fetched concurrently (default: 6)
+# MARKET_DATA_MEMORY_FRAMES  - Frames kept in memory, least recently used evicted (default: 64)
+
+OHLC_COLUMNS = ["Open", "High", "Low", "Close"]
+BAR_COLUMNS = OHLC_COLUMNS + ["Volume"]
+INDICATOR_COLUMNS = ["RSI", "SMA_200", "SMA_50", "ATR", "ADX_14", "DMP_14", "DMN_14"]
+
+RSI_LENGTH = 14
+ATR_LENGTH = 14
+ADX_LENGTH = 14
+SMA_LENGTHS = (200, 50)
+
+# Input bars an indicator row depends on: SMA_200 reads the last 200 closes,
+# ADX chains TR/DM (1) -> DI sums (14) -> ADX mean (14) for 28 bars.
+WARMUP_BARS = max(max(SMA_LENGTHS), 2 * ADX_LENGTH)
+
+CACHE_FORMAT_VERSION = 1
+
+logger = logging.getLogger("GoldStandard")
+
+
+# ============================================================================
+# Indicators
+# ============================================================================
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    out = np.empty_like(values)
+    out[:1] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    return values - _shift(values)
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum over each full window, NaN where the window is incomplete or has a NaN.
+
+    Every window is summed oldest to newest on its own, so a row's value only
+    depends on the inputs inside its window and not on where the array starts.
+    """
+    out = np.full(len(values), np.nan)
+    rows = len(values) - window + 1
+    if rows <= 0:
+        return out
+    acc = values[:rows].copy()
+    for k in range(1, window):
+        acc += values[k : k + rows]
+    out[window - 1 :] = acc
+    return out
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_sum(values, window) / window
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = _shift(close)
+    # fmax skips NaN like DataFrame.max(axis=1) does for the first bar
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def _indicator_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+    """Same formulas as main._FallbackTA (rsi, sma, atr, adx)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = _diff(close)
+        ma_up = _rolling_mean(np.clip(delta, 0, None), RSI_LENGTH)
+        ma_down = _rolling_mean(-np.clip(delta, None, 0), RSI_LENGTH)
+        rsi = 100 - (100 / (1 + ma_up / ma_down))
+
+        tr = _true_range(high, low, close)
+        atr = _rolling_mean(tr, ATR_LENGTH)
+        adx_atr = atr if ADX_LENGTH == ATR_LENGTH else _rolling_mean(tr, ADX_LENGTH)
+
+        up_move = _diff(high)
+        down_move = -_diff(low)
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), -down_move, 0.0)
+        plus_di = (_rolling_sum(plus_dm, ADX_LENGTH) / adx_atr) * 100
+        minus_di = (_rolling_sum(minus_dm, ADX_LENGTH) / adx_atr) * 100
+        dx = np.abs(plus_di - minus_di) / (plus_di + minus_di) * 100
+        adx = _rolling_mean(dx, ADX_LENGTH)
+
+    return {
+        "RSI": rsi,
+        "SMA_200": _rolling_mean(close, 200),
+        "SMA_50": _rolling_mean(close, 50),
+        "ATR": atr,
+        f"ADX_{ADX_LENGTH}": adx,
+        f"DMP_{ADX_LENGTH}": plus_di,
+        f"DMN_{ADX_LENGTH}": minus_di,
+    }
+
+
+def compute_indicators(bars: pd.DataFrame, start: int = 0) -> pd.DataFrame:
+    """
+    Indicator rows for bars[start:], reading only the WARMUP_BARS bars before `start`.
+
+    compute_indicators(bars, k) equals compute_indicators(bars).iloc[k:] exactly.
+    """
+    lo = max(0, start - WARMUP_BARS)
+    arrays = _indicator_arrays(
+        bars["High"].to_numpy(dtype=float)[lo:],
+        bars["Low"].to_numpy(dtype=float)[lo:],
+        bars["Close"].to_numpy(dtype=float)[lo:],
+    )
+    skip = start - lo
+    return pd.DataFrame({name: arrays[name][skip:] for name in INDICATOR_COLUMNS}, index=bars.index[start:])
+
+
+# ============================================================================
+# Bars
+# ============================================================================
+
+
+def normalize_bars(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Reduce a source frame to float OHLC(+Volume) columns on a sorted, unique DatetimeIndex.
+
+    Copes with MultiIndex / duplicated column labels (first sub-column wins) and
+    drops rows missing any OHLC value. Returns None if an OHLC column is absent.
+    """
+    if df is None or len(df) == 0:
+        return None
+    columns: Dict[str, np.ndarray] = {}
+    for name in BAR_COLUMNS:
+        if name in df.columns:
+            col = df[name]
+        elif isinstance(df.columns, pd.MultiIndex) and name in df.columns.get_level_values(0):
+            col = df.xs(name, axis=1, level=0)
+        else:
+            if name in OHLC_COLUMNS:
+                return None
+            continue
+        if isinstance(col, pd.DataFrame):
+            col = col.iloc[:, 0]
+        if col.dtype.kind not in "fiu":
+            col = pd.to_numeric(col, errors="coerce")
+        columns[name] = col.to_numpy(dtype=float)
+
+    bars = pd.DataFrame(columns, index=pd.to_datetime(df.index))
+    if bars.index.has_duplicates:
+        bars = bars[~bars.index.duplicated(keep="last")]
+    if not bars.index.is_monotonic_increasing:
+        bars = bars.sort_index()
+    missing = np.isnan(bars[OHLC_COLUMNS].to_numpy()).any(axis=1)
+    if missing.any():
+        bars = bars[~missing]
+    return bars if len(bars) else None
+
+
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+
+def period_start(period: Optional[str], last: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """First timestamp inside a yfinance-style `period` ("5d", "6mo", "1y", "ytd", "max") ending at `last`."""
+    if not period or period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=last.year, month=1, day=1, tz=last.tz)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    return last - pd.DateOffset(**{_PERIOD_UNITS[match.group(2)]: int(match.group(1))})
+
+
+# ============================================================================
+# Sources
+# ============================================================================
+
+
+class YFinanceSource:
+    """
+    Bars from Yahoo Finance via yf.download (auto-adjusted, like the original QuantEngine fetch).
+
+    yf.download collects results in module-level state that concurrent calls
+    overwrite, which used to mix up data between assets; calls are therefore
+    serialized here. Top-ups keep each call small.
+    """
+
+    thread_safe = False
+    _download_lock = threading.Lock()
+
+    def fetch(self, ticker: str, interval: str = "1d", period: Optional[str] = None,
+              start: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        import yfinance as yf
+
+        kwargs: Dict[str, Any] = {"interval": interval, "progress": False, "multi_level_index": False,
+                                  "auto_adjust": True}
+        if start is not None:
+            kwargs["start"] = pd.Timestamp(start).strftime("%Y-%m-%d")
+        else:
+            kwargs["period"] = period or "1y"
+        with self._download_lock:
+            return yf.download(ticker, **kwargs)
+
+
+_SYNTHETIC_FREQ = {"1d": "B", "1wk": "W-FRI", "1h": "h"}
+
+
+class SyntheticBarSource:
+    """
+    Deterministic random-walk bars for offline tests and benchmarks.
+
+    The history of a ticker only depends on (ticker, seed), so moving `end`
+    forward reveals new bars without changing old ones. `live_last_bar` makes
+    the newest bar a half-formed one, `adjustments` rescales a ticker's whole
+    history (as a dividend adjustment would) and `failing` tickers raise.
+    `latency_s` and `per_bar_s` simulate network cost. Every call is logged in
+    `requests` as (ticker, interval, period, start, bars returned).
+    """
+
+    thread_safe = True
+
+    def __init__(self, end: Any = "2026-01-30", history_start: Any = "2020-01-01", seed: int = 0,
+                 latency_s: float = 0.0, per_bar_s: float = 0.0, live_last_bar: bool = False):
+        self.end = pd.Timestamp(end)
+        self.history_start = pd.Timestamp(history_start)
+        self.seed = seed
+        self.latency_s = latency_s
+        self.per_bar_s = per_bar_s
+        self.live_last_bar = live_last_bar
+        self.adjustments: Dict[str, float] = {}
+        self.failing: set = set()
+        self.requests: List[Tuple[str, str, Optional[str], Optional[pd.Timestamp], int]] = []
+        self._lock = threading.Lock()
+
+    def history(self, ticker: str, interval: str = "1d") -> pd.DataFrame:
+        """All bars of `ticker` up to `end`, the last one final (not live)."""
+        freq = _SYNTHETIC_FREQ.get(interval, "B")
+        if freq == "B":
+            days = np.arange(self.history_start.date(), self.end.date() + pd.Timedelta(days=1), dtype="datetime64[D]")
+            index = pd.DatetimeIndex(days[np.is_busday(days)].astype("datetime64[ns]"))
+        else:
+            index = pd.date_range(self.history_start, self.end, freq=freq)
+        n = len(index)
+        key = zlib.crc32(f"{ticker}|{interval}".encode())
+        # One stream per column, so a longer history keeps every earlier bar
+        close_rng, open_rng, high_rng, low_rng, volume_rng = (
+            np.random.default_rng([key, self.seed, column]) for column in range(5)
+        )
+        base = 20 + zlib.crc32(ticker.encode()) % 2000
+        close = base * np.exp(np.cumsum(close_rng.normal(0.0002, 0.012, n)))
+        open_ = np.concatenate([[base], close[:-1]]) * np.exp(open_rng.normal(0, 0.003, n))
+        high = np.maximum(open_, close) * (1 + np.abs(high_rng.normal(0, 0.006, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(low_rng.normal(0, 0.006, n)))
+        volume = volume_rng.integers(10_000, 500_000, n).astype(float)
+        bars = pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+        factor = self.adjustments.get(ticker)
+        if factor:
+            bars[OHLC_COLUMNS] *= factor
+        return bars
+
+    def fetch(self, ticker: str, interval: str = "1d", period: Optional[str] = None,
+              start: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        if ticker in self.failing:
+            raise ConnectionError(f"synthetic outage for {ticker}")
+        bars = self.history(ticker, interval)
+        if start is not None:
+            bars = bars[bars.index >= pd.Timestamp(start)]
+        else:
+            first = period_start(period or "1y", bars.index[-1])
+            if first is not None:
+                bars = bars[bars.index >= first]
+        if self.live_last_bar and len(bars):
+            bars = bars.copy()
+            last = bars.index[-1]
+            bars.loc[last, "Close"] = (bars.at[last, "Open"] + bars.at[last, "Close"]) / 2
+            bars.loc[last, "Volume"] = bars.at[last, "Volume"] / 2
+        with self._lock:
+            self.requests.append((ticker, interval, period, start, len(bars)))
+        if self.latency_s or self.per_bar_s:
+            time.sleep(self.latency_s + self.per_bar_s * len(bars))
+        return bars
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+
+class BarCache:
+    """One .npz file of column arrays per (ticker, interval), written atomically."""
+
+    def __init__(self, cache_dir: Any):
+        self.cache_dir = Path(cache_dir)
+
+    def path(self, ticker: str, interval: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return self.cache_dir / f"{safe}_{interval}.npz"
+
+    def load(self, ticker: str, interval: str) -> Tuple[Optional[pd.DataFrame], Optional[pd.Timestamp]]:
+        """(frame, covered_from) or (None, None); covered_from is None when the full history is cached."""
+        path = self.path(ticker, interval)
+        if not path.exists():
+            return None, None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) != CACHE_FORMAT_VERSION or str(data["ticker"]) != ticker:
+                    return None, None
+                tz = str(data["tz"])
+                index = _stamps_to_index(data["index"], tz)
+                columns = [str(c) for c in data["columns"]]
+                frame = pd.DataFrame({c: data[f"col_{i}"] for i, c in enumerate(columns)}, index=index)
+                # Files written before coverage was recorded cover their first bar onwards
+                covered = _stamps_to_index(data["covered_from"], tz) if "covered_from" in data else index[:1]
+        except Exception as e:
+            logger.warning(f"Discarding unreadable bar cache {path.name}: {e}")
+            return None, None
+        if any(c not in frame.columns for c in OHLC_COLUMNS + INDICATOR_COLUMNS):
+            return None, None
+        return frame, (covered[0] if len(covered) else None)
+
+    def save(self, ticker: str, interval: str, frame: pd.DataFrame, covered_from: Optional[pd.Timestamp]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(ticker, interval)
+        index = frame.index
+        tz = str(index.tz) if index.tz is not None else ""
+        stamps = _index_to_stamps(index)
+        covered = _index_to_stamps(pd.DatetimeIndex([] if covered_from is None else [covered_from]))
+        arrays = {f"col_{i}": frame[c].to_numpy(dtype=float) for i, c in enumerate(frame.columns)}
+        tmp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as fh:
+            np.savez(
+                fh,
+                version=CACHE_FORMAT_VERSION,
+                ticker=ticker,
+                tz=tz,
+                index=stamps,
+                covered_from=covered,
+                columns=np.array([str(c) for c in frame.columns]),
+                **arrays,
+            )
+        os.replace(tmp, path)
+
+
+def _index_to_stamps(index: pd.DatetimeIndex) -> np.ndarray:
+    return (index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index).asi8
+
+
+def _stamps_to_index(stamps: np.ndarray, tz: str) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(stamps.astype("datetime64[ns]"))
+    return index.tz_localize("UTC").tz_convert(tz) if tz else index
+
+
+# ============================================================================
+# Store
+# ============================================================================
+
+
+class MarketDataStore:
+    """
+    Cached, incrementally updated bars + indicators for a set of tickers.
+
+    get() returns the trailing `period` of bars with indicator columns; the
+    frames it caches always equal compute_indicators() over the cached bars.
+    At most `memory_frames` frames stay in memory; evicted ones are reloaded
+    from the bar cache on their next get().
+    """
+
+    def __init__(self, source: Any = None, cache_dir: Any = None, workers: int = 6,
+                 log: Optional[logging.Logger] = None, memory_frames: int = 64):
+        self.source = source if source is not None else YFinanceSource()
+        self.cache = BarCache(cache_dir) if cache_dir else None
+        self.workers = max(1, workers)
+        self.log = log or logger
+        self.memory_frames = max(1, memory_frames)
+        self._frames: "OrderedDict[Tuple[str, str], pd.DataFrame]" = OrderedDict()
+        self._covered: Dict[Tuple[str, str], Optional[pd.Timestamp]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"full_fetches": 0, "top_ups": 0, "unchanged": 0, "stale_served": 0, "bars_fetched": 0,
+                      "rows_computed": 0}
+
+    @classmethod
+    def from_env(cls, data_dir: str, source: Any = None, log: Optional[logging.Logger] = None) -> "MarketDataStore":
+        """Store configured from MARKET_DATA_* environment variables."""
+        cache_dir = None
+        if os.environ.get("MARKET_DATA_CACHE", "1").lower() not in ("0", "false", "no", "off"):
+            cache_dir = os.environ.get("MARKET_DATA_CACHE_DIR") or os.path.join(data_dir, "market_cache")
+        try:
+            workers = int(os.environ.get("MARKET_DATA_WORKERS") or 6)
+        except ValueError:
+            workers = 6
+        try:
+            memory_frames = int(os.environ.get("MARKET_DATA_MEMORY_FRAMES") or 64)
+        except ValueError:
+            memory_frames = 64
+        return cls(source, cache_dir=cache_dir, workers=workers, log=log, memory_frames=memory_frames)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._locks_guard:
+            self.stats[key] += n
+
+    def _lock_for(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _recall(self, key: Tuple[str, str]) -> Tuple[Optional[pd.DataFrame], Optional[pd.Timestamp]]:
+        with self._locks_guard:
+            frame = self._frames.get(key)
+            if frame is None:
+                return None, None
+            self._frames.move_to_end(key)
+            return frame, self._covered.get(key)
+
+    def _remember(self, key: Tuple[str, str], frame: pd.DataFrame, covered_from: Optional[pd.Timestamp]) -> None:
+        with self._locks_guard:
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            self._covered[key] = covered_from
+            while len(self._frames) > self.memory_frames:
+                evicted, _ = self._frames.popitem(last=False)
+                self._covered.pop(evicted, None)
+
+    @staticmethod
+    def _covers(covered_from: Optional[pd.Timestamp], period: str, last: pd.Timestamp) -> bool:
+        """Whether bars cached from `covered_from` reach back to the start of `period` ending at `last`."""
+        if covered_from is None:
+            return True
+        first = period_start(period, last)
+        return first is not None and first >= covered_from
+
+    def get(self, ticker: str, interval: str = "1d", period: str = "1y",
+            indicators: bool = True) -> Optional[pd.DataFrame]:
+        """Bars for the trailing `period` (with indicator columns unless `indicators` is False)."""
+        key = (ticker, interval)
+        with self._lock_for(key):
+            cached, covered = self._recall(key)
+            if cached is None and self.cache is not None:
+                cached, covered = self.cache.load(ticker, interval)
+
+            frame = None
+            if cached is not None:
+                if not self._covers(covered, period, cached.index[-1]):
+                    self.log.info(f"Cached bars for {ticker} don't reach back {period}; fetching full history")
+                else:
+                    try:
+                        frame = self._top_up(ticker, interval, cached)
+                    except Exception as e:
+                        self.log.warning(f"Top-up of {ticker} failed ({e}); fetching full history")
+            if frame is None:
+                try:
+                    frame = self._full_fetch(ticker, interval, period)
+                except Exception as e:
+                    self.log.warning(f"Error fetching {ticker}: {e}")
+                if frame is not None:
+                    first = period_start(period, frame.index[-1])
+                    covered = None if first is None else min(first, frame.index[0])
+            if frame is None:
+                if cached is None:
+                    return None
+                self.log.warning(f"Serving cached bars for {ticker} (last {cached.index[-1]})")
+                self._count("stale_served")
+                frame = cached
+            else:
+                self._remember(key, frame, covered)
+            if frame is not cached and self.cache is not None:
+                try:
+                    self.cache.save(ticker, interval, frame, covered)
+                except OSError as e:
+                    self.log.warning(f"Could not write bar cache for {ticker}: {e}")
+
+        return self._window(frame, period, indicators)
+
+    @staticmethod
+    def _window(frame: pd.DataFrame, period: str, indicators: bool) -> pd.DataFrame:
+        """
+        The trailing `period` of `frame`, with indicators as a fresh download of that period would have them.
+
+        Rows past the first WARMUP_BARS only read bars inside the window, so
+        just the head is recomputed over the window's own bars.
+        """
+        first = period_start(period, frame.index[-1])
+        cut = 0 if first is None else int(frame.index.searchsorted(first))
+        window = frame.iloc[cut:].copy()
+        if not indicators:
+            return window[[c for c in window.columns if c not in INDICATOR_COLUMNS]]
+        if cut > 0 and len(window):
+            head = window.index[:WARMUP_BARS]
+            window.loc[head, INDICATOR_COLUMNS] = compute_indicators(window.iloc[: len(head)])
+        return window
+
+    def get_many(self, tickers: Iterable[str], interval: str = "1d", period: str = "1y",
+                 indicators: bool = True) -> Dict[str, Optional[pd.DataFrame]]:
+        """get() for several tickers concurrently."""
+        tickers = list(dict.fromkeys(tickers))
+        workers = self.workers if getattr(self.source, "thread_safe", False) else 1
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tickers)))) as ex:
+            frames = ex.map(lambda t: self.get(t, interval, period, indicators), tickers)
+            return dict(zip(tickers, frames))
+
+    def _fetch_bars(self, ticker: str, interval: str, **kwargs) -> Optional[pd.DataFrame]:
+        raw = self.source.fetch(ticker, interval, **kwargs)
+        bars = normalize_bars(raw)
+        if raw is not None and len(raw) and bars is None:
+            self.log.warning(f"Missing required OHLC columns for {ticker}: {list(raw.columns)}")
+        if bars is not None:
+            self._count("bars_fetched", len(bars))
+        return bars
+
+    def _full_fetch(self, ticker: str, interval: str, period: str) -> Optional[pd.DataFrame]:
+        bars = self._fetch_bars(ticker, interval, period=period)
+        if bars is None:
+            return None
+        self._count("full_fetches")
+        self._count("rows_computed", len(bars))
+        return pd.concat([bars, compute_indicators(bars)], axis=1)
+
+    def _top_up(self, ticker: str, interval: str, cached: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Merge bars newer than the cache into it; None if the cache has to be rebuilt.
+
+        Re-requests the last two cached bars: the newest may have been cached
+        while still forming, and the one before it must come back unchanged.
+        """
+        since = cached.index[-2] if len(cached) > 1 else cached.index[-1]
+        fetched = self._fetch_bars(ticker, interval, start=since)
+        if fetched is None:
+            return cached
+        fetched = fetched[fetched.index >= since]
+        if not len(fetched):
+            return cached
+
+        bar_columns = [c for c in cached.columns if c not in INDICATOR_COLUMNS]
+        cut = int(cached.index.searchsorted(fetched.index[0]))
+        settled = cached.index[cut:-1]
+        fetched_at = fetched.index.get_indexer(settled)
+        if (fetched_at < 0).any() or not np.allclose(
+            cached[OHLC_COLUMNS].to_numpy()[cut:-1], fetched[OHLC_COLUMNS].to_numpy()[fetched_at], rtol=1e-9, atol=0.0
+        ):
+            self.log.info(f"Cached bars for {ticker} were revised upstream; rebuilding cache")
+            return None
+
+        tail = cached.iloc[cut:][bar_columns]
+        if tail.index.equals(fetched.index) and tail.reindex(columns=fetched.columns).equals(fetched):
+            self._count("unchanged")
+            return cached
+
+        bars = pd.concat([cached.iloc[:cut][bar_columns], fetched])
+        new_rows = compute_indicators(bars, start=cut)
+        head = cached.iloc[:cut][INDICATOR_COLUMNS]
+        self._count("top_ups")
+        self._count("rows_computed", len(new_rows))
+        return pd.concat([bars, pd.concat([head, new_rows])], axis=1)
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+
+def _full_refresh_cycle(source: Any, tickers: List[str], interval: str, period: str) -> Dict[str, pd.DataFrame]:
+    """Reference: the pre-cache cycle, downloading full history one ticker at a time and recomputing everything."""
+    frames = {}
+    for ticker in tickers:
+        bars = normalize_bars(source.fetch(ticker, interval, period=period))
+        frames[ticker] = pd.concat([bars, compute_indicators(bars)], axis=1)
+    return frames
+
+
+def benchmark_market_data(n_tickers: int = 6, cycles: int = 5, latency_s: float = 0.05, per_bar_s: float = 0.0002,
+                          cache_dir: Any = None, period: str = "1y") -> Dict[str, Any]:
+    """
+    Wall time per cycle of full serial refreshes vs cached concurrent top-ups.
+
+    Each cycle moves the synthetic market forward by one bar. Also checks every
+    served frame against the full refresh of the same cycle.
+    """
+    import tempfile
+
+    tickers = [f"SYN{i}" for i in range(n_tickers)]
+    source = SyntheticBarSource(end="2025-12-01", latency_s=latency_s, per_bar_s=per_bar_s)
+    own_dir = None
+    if cache_dir is None:
+        own_dir = tempfile.TemporaryDirectory()
+        cache_dir = own_dir.name
+    store = MarketDataStore(source, cache_dir=cache_dir, workers=n_tickers)
+    store.get_many(tickers, period=period)  # initial download, not timed
+
+    full_s = cached_s = 0.0
+    identical = True
+    for _ in range(cycles):
+        source.end += pd.offsets.BDay(1)
+        t0 = time.perf_counter()
+        reference = _full_refresh_cycle(source, tickers, "1d", period)
+        full_s += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        served = store.get_many(tickers, period=period)
+        cached_s += time.perf_counter() - t0
+
+        for ticker in tickers:
+            identical &= served[ticker].equals(reference[ticker][served[ticker].columns])
+    if own_dir is not None:
+        own_dir.cleanup()
+
+    return {
+        "tickers": n_tickers,
+        "cycles": cycles,
+        "full_refresh_ms": full_s / cycles * 1000,
+        "cached_ms": cached_s / cycles * 1000,
+        "speedup": full_s / max(cached_s, 1e-9),
+        "identical": bool(identical),
+        "stats": dict(store.stats),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Syndicate market data store")
+    parser.add_argument("--bench", action="store_true", help="Compare full refreshes with cached top-ups offline")
+    parser.add_argument("--tickers", type=int, default=6)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark_market_data(args.tickers, args.cycles, latency_s=args.latency_ms / 1000), indent=2))
+    else:
+        parser.print_help()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# ══════════════════════════════════════════════════════════════════════════════
+#  _________._____________.___ ____ ___  _________      .__         .__
+# /   _____/|   \______   \   |    |   \/   _____/____  |  | ______ |  |__ _____
+# \_____  \ |   ||       _/   |    |   /\_____  \__  \ |  | \____ \|  |  \__  \
+# /        \|   ||    |   \   |    |  / /        \/ __ \|  |_|  |_> >   Y  \/ __ \_
+# /_______  /|___||____|_  /___|______/ /_______  (____  /____/   __/|___|  (____  /
+#         \/             \/                     \/     \/     |__|        \/     \/
+#
+# Syndicate - Precious Metals Intelligence System
+# Copyright (c) 2025 SIRIUS Alpha
+# All rights reserved.
+# ══════════════════════════════════════════════════════════════════════════════
+"""
+Block-level Diff Sync for Notion Pages
+
+Keeps a manifest of every synced page's top-level blocks (Notion block id +
+content hash) in the database. When a document changes, the new block list
+is diffed against the manifest and only the difference is sent: changed
+blocks are updated in place, removed ones deleted and new runs appended
+after their predecessor. Pages without a usable manifest are rewritten once.
+
+Each sync returns a BlockSyncStats with the API calls and request bytes it
+used next to what a full rewrite of the page would have cost.
+"""
+
+import difflib
+import hashlib
+import json
+import logging
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Project paths
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Notion accepts at most 100 children per append request
+MAX_CHILDREN_PER_REQUEST = 100
+
+
+def block_hash(block: Dict[str, Any]) -> str:
+    """Content hash of a block payload (key order independent)."""
+    return hashlib.sha256(json.dumps(block, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+def manifest_entry(block: Dict[str, Any], block_id: Optional[str] = None) -> Dict[str, Any]:
+    """Manifest record for a block; nested blocks (tables, toggles with children) can't be updated in place."""
+    block_type = block.get("type")
+    return {
+        "id": block_id,
+        "hash": block_hash(block),
+        "type": block_type,
+        "nested": bool((block.get(block_type) or {}).get("children")),
+    }
+
+
+def _payload_bytes(payload: Any) -> int:
+    return len(json.dumps(payload, default=str).encode())
+
+
+@dataclass
+class BlockOp:
+    """One step of a block diff: append new[start:stop], update new[index] into old[old_index], or delete old[old_index]."""
+
+    action: str
+    index: int = -1
+    old_index: int = -1
+    start: int = 0
+    stop: int = 0
+
+
+@dataclass
+class BlockSyncStats:
+    """API usage of one page sync, next to the cost of rewriting the whole page."""
+
+    page_id: str
+    mode: str = "diff"  # diff | full | dry_run
+    blocks: int = 0
+    appended: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    api_calls: int = 0
+    bytes_sent: int = 0
+    full_api_calls: int = 0
+    full_bytes: int = 0
+
+    @property
+    def api_calls_saved(self) -> int:
+        return self.full_api_calls - self.api_calls
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.full_bytes - self.bytes_sent
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "api_calls_saved": self.api_calls_saved, "bytes_saved": self.bytes_saved}
+
+
+def plan_block_diff(manifest: List[Dict[str, Any]], blocks: List[Dict[str, Any]]) -> Optional[List[BlockOp]]:
+    """
+    Minimal operations turning the page described by `manifest` into `blocks`.
+
+    Unchanged blocks are kept, a changed block is updated in place when its
+    type is unchanged and neither version has nested children, and runs of
+    new blocks are appended after the block preceding them. Returns None when
+    new blocks would have to go before the first kept block, which the API's
+    `after` anchor cannot express.
+    """
+    new_entries = [manifest_entry(block) for block in blocks]
+    matcher = difflib.SequenceMatcher(
+        None, [e["hash"] for e in manifest], [e["hash"] for e in new_entries], autojunk=False
+    )
+    ops: List[BlockOp] = []
+    run_start: Optional[int] = None
+    kept = False
+
+    def flush(stop: int) -> None:
+        nonlocal run_start
+        if run_start is not None:
+            ops.append(BlockOp("append", start=run_start, stop=stop))
+            run_start = None
+
+    for tag, old_start, old_stop, new_start, new_stop in matcher.get_opcodes():
+        if tag == "equal":
+            flush(new_start)
+            kept = True
+            continue
+        for k in range(max(old_stop - old_start, new_stop - new_start)):
+            old_index = old_start + k if old_start + k < old_stop else None
+            new_index = new_start + k if new_start + k < new_stop else None
+            if (
+                old_index is not None
+                and new_index is not None
+                and manifest[old_index]["type"] == new_entries[new_index]["type"]
+                and not manifest[old_index]["nested"]
+                and not new_entries[new_index]["nested"]
+            ):
+                flush(new_index)
+                ops.append(BlockOp("update", index=new_index, old_index=old_index))
+                kept = True
+                continue
+            if old_index is not None:
+                ops.append(BlockOp("delete", old_index=old_index))
+            if new_index is not None and run_start is None:
+                run_start = new_index
+
+    flush(len(blocks))
+    if kept and any(op.action == "append" and op.start == 0 for op in ops):
+        return None
+    return ops
+
+
+class BlockSyncer:
+    """Sync page content through a Notion client using stored block manifests."""
+
+    def __init__(self, client, db=None):
+        self.client = client
+        if db is None:
+            from db_manager import get_db
+
+            db = get_db()
+        self.db = db
+
+    def record_created(self, page_id: str, blocks: List[Dict[str, Any]]) -> None:
+        """Remember the children a page was created with; their ids are looked up on the first diff sync."""
+        self.db.save_block_manifest(page_id, [manifest_entry(block) for block in blocks])
+
+    def sync(self, page_id: str, blocks: List[Dict[str, Any]], dry_run: bool = False) -> BlockSyncStats:
+        """Make the page's top-level content equal to `blocks`, sending only what changed."""
+        manifest = self.db.get_block_manifest(page_id)
+        stats = BlockSyncStats(page_id=page_id, blocks=len(blocks))
+        stats.full_api_calls, stats.full_bytes = self._full_cost(len(manifest or []), blocks)
+
+        listed = None
+        if manifest is not None and any(entry["id"] is None for entry in manifest) and not dry_run:
+            listed = self._list_children(page_id, stats)
+            manifest = self._resolve_ids(manifest, listed)
+
+        plan = plan_block_diff(manifest, blocks) if manifest is not None else None
+        if dry_run:
+            stats.mode = "dry_run"
+            if plan is None:
+                stats.api_calls, stats.bytes_sent = stats.full_api_calls, stats.full_bytes
+            else:
+                self._apply(page_id, plan, manifest, blocks, stats, dry_run=True)
+            return stats
+
+        ids = None
+        if plan is not None:
+            try:
+                ids = self._apply(page_id, plan, manifest, blocks, stats)
+            except Exception as e:
+                logging.warning("Block diff sync of %s failed (%s); rewriting the page", page_id, e)
+                listed = None
+        if ids is None:
+            stats.mode = "full"
+            stats.appended = stats.updated = stats.deleted = stats.unchanged = 0
+            ids = self._replace(page_id, blocks, stats, listed)
+
+        self.db.save_block_manifest(page_id, [manifest_entry(block, block_id) for block, block_id in zip(blocks, ids)])
+        return stats
+
+    @staticmethod
+    def _full_cost(n_old: int, blocks: List[Dict[str, Any]]):
+        """API calls and bytes to delete `n_old` blocks and re-append all of `blocks`."""
+        batches = [blocks[i : i + MAX_CHILDREN_PER_REQUEST] for i in range(0, len(blocks), MAX_CHILDREN_PER_REQUEST)]
+        return n_old + len(batches), sum(_payload_bytes({"children": batch}) for batch in batches)
+
+    @staticmethod
+    def _resolve_ids(manifest: List[Dict[str, Any]], listed: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Fill in block ids by position if the page still holds exactly the recorded blocks."""
+        if len(listed) != len(manifest) or any(e["type"] != b.get("type") for e, b in zip(manifest, listed)):
+            return None
+        return [{**entry, "id": block["id"]} for entry, block in zip(manifest, listed)]
+
+    def _list_children(self, page_id: str, stats: BlockSyncStats) -> List[Dict[str, Any]]:
+        children, cursor = [], None
+        while True:
+            kwargs = {"page_size": MAX_CHILDREN_PER_REQUEST}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+            response = self.client.blocks.children.list(block_id=page_id, **kwargs)
+            stats.api_calls += 1
+            children.extend(response.get("results", []))
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return children
+
+    def _append(self, page_id: str, children: List[Dict[str, Any]], after: Optional[str], stats: BlockSyncStats,
+                dry_run: bool = False) -> List[Optional[str]]:
+        """Append `children` after block `after` (page end if None), in batches; returns the new block ids."""
+        ids: List[Optional[str]] = []
+        for i in range(0, len(children), MAX_CHILDREN_PER_REQUEST):
+            payload = {"children": children[i : i + MAX_CHILDREN_PER_REQUEST]}
+            if after:
+                payload["after"] = after
+            stats.api_calls += 1
+            stats.bytes_sent += _payload_bytes(payload)
+            if dry_run:
+                ids.extend([None] * len(payload["children"]))
+                continue
+            response = self.client.blocks.children.append(block_id=page_id, **payload)
+            created = [block["id"] for block in response.get("results", [])]
+            if len(created) != len(payload["children"]):
+                raise RuntimeError(f"append returned {len(created)} blocks for {len(payload['children'])} children")
+            ids.extend(created)
+            after = created[-1] if created else after
+        stats.appended += len(children)
+        return ids
+
+    def _apply(self, page_id: str, plan: List[BlockOp], manifest: List[Dict[str, Any]], blocks: List[Dict[str, Any]],
+               stats: BlockSyncStats, dry_run: bool = False) -> List[Optional[str]]:
+        """Execute a diff plan; returns the block id of every entry of `blocks`."""
+        touched = {op.old_index for op in plan if op.action in ("update", "delete")}
+        appended = {i for op in plan if op.action == "append" for i in range(op.start, op.stop)}
+        updated = {op.index: op.old_index for op in plan if op.action == "update"}
+
+        # Kept blocks keep their ids; pair them with the new positions in order
+        kept_old = iter(i for i in range(len(manifest)) if i not in touched)
+        ids: List[Optional[str]] = []
+        for index in range(len(blocks)):
+            if index in appended:
+                ids.append(None)
+            elif index in updated:
+                ids.append(manifest[updated[index]]["id"])
+            else:
+                ids.append(manifest[next(kept_old)]["id"])
+                stats.unchanged += 1
+
+        for op in plan:
+            if op.action == "delete":
+                stats.api_calls += 1
+                stats.deleted += 1
+                if not dry_run:
+                    self.client.blocks.delete(block_id=manifest[op.old_index]["id"])
+            elif op.action == "update":
+                block = blocks[op.index]
+                payload = {block["type"]: block[block["type"]]}
+                stats.api_calls += 1
+                stats.bytes_sent += _payload_bytes(payload)
+                stats.updated += 1
+                if not dry_run:
+                    self.client.blocks.update(block_id=ids[op.index], **payload)
+            else:
+                after = ids[op.start - 1] if op.start > 0 else None
+                ids[op.start : op.stop] = self._append(page_id, blocks[op.start : op.stop], after, stats, dry_run)
+        return ids
+
+    def _replace(self, page_id: str, blocks: List[Dict[str, Any]], stats: BlockSyncStats,
+                 listed: Optional[List[Dict[str, Any]]] = None) -> List[Optional[str]]:
+        """Rewrite the page: delete every current child, then append all blocks."""
+        for child in listed if listed is not None else self._list_children(page_id, stats):
+            self.client.blocks.delete(block_id=child["id"])
+            stats.api_calls += 1
+            stats.deleted += 1
+        return self._append(page_id, blocks, None, stats)
@@ -25,7 +25,7 @@ import sys
 from dataclasses import dataclass
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Add parent to path for imports
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -229,12 +229,16 @@ class NotionConfig:
 class NotionPublisher:
     """Publish Syndicate reports to Notion."""
 
-    def __init__(self, config: NotionConfig = None, no_client_ok: bool = False):
+    def __init__(self, config: NotionConfig = None, no_client_ok: bool = False, diff_sync: bool = None):
         # Allow tests or dry-run to construct without the Notion client.
         if not no_client_ok and not NOTION_AVAILABLE and Client is None:
             raise ImportError("notion-client package not installed")
 
         self.config = config or NotionConfig.from_env()
+        # Re-syncs of pages we already created update them block by block instead of creating a new page
+        if diff_sync is None:
+            diff_sync = str(os.getenv("NOTION_DIFF_SYNC", "1")).lower() in ("1", "true", "yes")
+        self.diff_sync = diff_sync
         # Initialize the notion client (may be a real client, a monkeypatched fake, or None for dry-run)
         self.client = Client(auth=self.config.api_key) if (Client is not None and not no_client_ok) else None
 
@@ -608,29 +612,110 @@ class NotionPublisher:
 
         return blocks
 
-    def publish(
+    def _content_blocks(
+        self, content: str, body: str, doc_type: str, bias: str = None, use_enhanced_formatting: bool = True
+    ) -> List[Dict]:
+        """Convert a document to Notion blocks - use enhanced formatter if available."""
+        if use_enhanced_formatting:
+            try:
+                from scripts.chart_publisher import ChartPublisher
+                from scripts.notion_formatter import format_for_notion
+
+                # Try to get chart URLs for tickers in content
+                chart_urls = None
+                try:
+                    chart_pub = ChartPublisher()
+                    chart_urls = chart_pub.get_charts_for_content(body)
+                    if chart_urls:
+                        print(f"  📊 Adding charts: {', '.join(chart_urls.keys())}")
+                except Exception as e:
+                    print(f"  ⚠ Chart upload skipped: {e}")
+
+                return format_for_notion(content, doc_type=doc_type, bias=bias, chart_urls=chart_urls)
+            except ImportError:
+                # Fallback to basic formatting
+                pass
+        return self.markdown_to_blocks(body)
+
+    def update_page(
         self,
+        page_id: str,
         title: str,
         content: str,
         doc_type: str = None,
-        tags: List[str] = None,
-        doc_date: str = None,
         filename: str = None,
         use_enhanced_formatting: bool = True,
         dry_run: bool = False,
-    ) -> Dict[str, str]:
-        """Publish a document to Notion."""
+        tags: List[str] = None,
+        doc_date: str = None,
+    ) -> Dict[str, Any]:
+        """
+        Update an existing Notion page in place, sending only the blocks that changed.
 
-        # Parse frontmatter
-        meta, body = self.parse_frontmatter(content)
+        Page properties are rebuilt from the frontmatter the same way publish() does.
+        If Notion rejects them the title alone is sent, and if the page can no longer
+        be updated at all this falls back to publish() (a new page).
+        The result carries a 'block_sync' dict with the API calls and bytes used
+        and saved compared to rewriting the whole page.
+        """
+        from scripts.notion_block_sync import BlockSyncer
 
-        # Determine type
+        meta, body = self.parse_frontmatter(content)
         if not doc_type:
             doc_type = meta.get("type") or (self.detect_type(filename) if filename else "notes")
-
         if doc_type not in NOTION_TYPES:
             doc_type = "notes"
 
+        blocks = self._content_blocks(content, body, doc_type, meta.get("bias"), use_enhanced_formatting)
+        properties, tags, _ = self._page_properties(title, meta, body, doc_type, tags, doc_date)
+        syncer = BlockSyncer(self.client)
+        if not dry_run:
+            try:
+                try:
+                    self.client.pages.update(page_id=page_id, properties=properties)
+                except Exception as e:
+                    if set(properties) == {"title"}:
+                        raise
+                    logging.warning("Notion rejected properties for page %s (%s); updating the title only", page_id, e)
+                    self.client.pages.update(page_id=page_id, properties={"title": properties["title"]})
+            except Exception as e:
+                logging.warning("Notion page %s can't be updated (%s); publishing a new page", page_id, e)
+                syncer.db.delete_block_manifest(page_id)
+                return self.publish(
+                    title=title,
+                    content=content,
+                    doc_type=doc_type,
+                    tags=tags,
+                    doc_date=doc_date,
+                    filename=filename,
+                    use_enhanced_formatting=use_enhanced_formatting,
+                )
+
+        stats = syncer.sync(page_id, blocks, dry_run=dry_run)
+        logging.info(
+            "Notion page %s synced (%s): %d appended, %d updated, %d deleted, %d unchanged; "
+            "%d API calls and %d bytes saved",
+            page_id, stats.mode, stats.appended, stats.updated, stats.deleted, stats.unchanged,
+            stats.api_calls_saved, stats.bytes_saved,
+        )
+        return {
+            "page_id": page_id,
+            "url": f"https://notion.so/{page_id.replace('-', '')}",
+            "type": doc_type,
+            "tags": tags,
+            "block_sync": stats.to_dict(),
+        }
+
+    def _page_properties(
+        self, title: str, meta: Dict[str, Any], body: str, doc_type: str, tags: List[str] = None, doc_date: str = None
+    ) -> tuple[Dict[str, Any], List[str], List[str]]:
+        """
+        Build the Notion page properties for a document from its frontmatter.
+
+        Returns (properties, normalized tags, frontmatter validation errors).
+        Shared by publish() and update_page() so re-syncs keep tags, type,
+        date, status and relations current.
+        """
         # Determine tags
         if not tags:
             tags = meta.get("tags") if isinstance(meta.get("tags"), list) else self.extract_tags(body)
@@ -639,32 +724,6 @@ class NotionPublisher:
         if not doc_date:
             doc_date = meta.get("date") or date.today().isoformat()
 
-        # Get bias from frontmatter
-        bias = meta.get("bias")
-
-        # Convert to blocks - use enhanced formatter if available
-        if use_enhanced_formatting:
-            try:
-                from scripts.chart_publisher import ChartPublisher
-                from scripts.notion_formatter import format_for_notion
-
-                # Try to get chart URLs for tickers in content
-                chart_urls = None
-                try:
-                    chart_pub = ChartPublisher()
-                    chart_urls = chart_pub.get_charts_for_content(body)
-                    if chart_urls:
-                        print(f"  📊 Adding charts: {', '.join(chart_urls.keys())}")
-                except Exception as e:
-                    print(f"  ⚠ Chart upload skipped: {e}")
-
-                blocks = format_for_notion(content, doc_type=doc_type, bias=bias, chart_urls=chart_urls)
-            except ImportError:
-                # Fallback to basic formatting
-                blocks = self.markdown_to_blocks(body)
-        else:
-            blocks = self.markdown_to_blocks(body)
-
         # Frontmatter validation and tag normalization
         def _validate_frontmatter(meta_obj: Dict) -> List[str]:
             errs = []
@@ -828,6 +887,38 @@ class NotionPublisher:
         except Exception:
             pass
 
+        return properties, tags, fm_errors
+
+    def publish(
+        self,
+        title: str,
+        content: str,
+        doc_type: str = None,
+        tags: List[str] = None,
+        doc_date: str = None,
+        filename: str = None,
+        use_enhanced_formatting: bool = True,
+        dry_run: bool = False,
+    ) -> Dict[str, str]:
+        """Publish a document to Notion."""
+
+        # Parse frontmatter
+        meta, body = self.parse_frontmatter(content)
+
+        # Determine type
+        if not doc_type:
+            doc_type = meta.get("type") or (self.detect_type(filename) if filename else "notes")
+
+        if doc_type not in NOTION_TYPES:
+            doc_type = "notes"
+
+        # Get bias from frontmatter
+        bias = meta.get("bias")
+
+        blocks = self._content_blocks(content, body, doc_type, bias, use_enhanced_formatting)
+
+        properties, tags, fm_errors = self._page_properties(title, meta, body, doc_type, tags, doc_date)
+
         # Determine parent to use for page creation - prefer a specific data_source_id when available
         parent = {"database_id": self.config.database_id}
         try:
@@ -891,7 +982,7 @@ class NotionPublisher:
 
                 # If it's a property-type error, attempt the Status/Minimal fallbacks before retrying
                 try:
-                    db_props = db_props if "db_props" in locals() else self._get_database_properties()
+                    db_props = self._get_database_properties()
                     # If Status property exists, ensure the chosen option is valid for the DB schema
                     if "Status" in properties and "Status" in db_props:
                         prop_type = db_props["Status"].get("type")
@@ -1031,6 +1122,15 @@ class NotionPublisher:
             pass
 
         page_id = response["id"]
+
+        # Remember what the page was created with so later edits can be diff-synced
+        if DB_AVAILABLE:
+            try:
+                from scripts.notion_block_sync import BlockSyncer
+
+                BlockSyncer(self.client).record_created(page_id, blocks[:100])
+            except Exception:
+                logging.debug("Could not record block manifest for %s", page_id, exc_info=True)
         url = response.get("url", f"https://notion.so/{page_id.replace('-', '')}")
 
         return {"page_id": page_id, "url": url, "type": doc_type, "tags": tags}
@@ -1315,12 +1415,26 @@ class NotionPublisher:
                     return s
 
             title = _sanitize_title(title)
-            result = self.publish(
-                title=title, content=content, doc_type=doc_type, tags=tags, filename=filename, dry_run=dry_run
-            )
+
+            # Pages we already created are updated in place with a block diff
+            page_id = existing_page_id if self.diff_sync else None
+            if self.diff_sync and not page_id and DB_AVAILABLE:
+                try:
+                    page_id = (get_db().get_notion_page_for_file(str(path)) or {}).get("notion_page_id")
+                except Exception:
+                    page_id = None
+
+            if page_id:
+                result = self.update_page(
+                    page_id, title=title, content=content, doc_type=doc_type, tags=tags, filename=filename, dry_run=dry_run
+                )
+            else:
+                result = self.publish(
+                    title=title, content=content, doc_type=doc_type, tags=tags, filename=filename, dry_run=dry_run
+                )
 
             # Record the sync in the database, using the strong fingerprint when available
-            if DB_AVAILABLE:
+            if DB_AVAILABLE and not dry_run:
                 db = get_db()
                 try:
                     db.record_notion_sync(
@@ -1416,6 +1530,27 @@ class NotionPublisher:
         return results
 
 
+def _catalog_skip_reason(entry: Dict[str, Any]) -> Optional[str]:
+    """
+    Why sync_file would skip a document, decided from its catalog entry
+    without opening the file (None if it has to be looked at).
+    """
+    if entry["synced"]:
+        return "already_synced_frontmatter"
+    if not entry["readable"]:
+        return None
+    if entry["frontmatter"].get("publish_to_notion") is False:
+        return "opted_out_publish"
+    if not entry["ready_for_sync"]:
+        reason = f"Document status is '{entry['status']}'"
+        if entry["status"] == "draft":
+            reason += " (AI processing incomplete or failed)"
+        elif not entry["ai_processed"]:
+            reason += " (not AI processed)"
+        return reason
+    return None
+
+
 def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
     """
     Sync all Syndicate outputs to Notion with intelligent deduplication.
@@ -1449,8 +1584,17 @@ def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool
     publisher = NotionPublisher(no_client_ok=dry_run)
     results = {"success": [], "skipped": [], "failed": []}
 
-    # Find all markdown files recursively
-    md_files = list(output_path.glob("**/*.md"))
+    # Find all markdown files recursively; the document catalog answers from
+    # file stats and only re-reads files that changed since the last run
+    catalog_entries: Dict[str, Dict[str, Any]] = {}
+    try:
+        from scripts.document_catalog import DocumentCatalog
+
+        catalog_entries = {entry["path"]: entry for entry in DocumentCatalog(output_path).entries()}
+        md_files = [Path(path) for path in catalog_entries]
+    except Exception as e:
+        print(f"[NOTION] Document catalog unavailable ({e}); scanning {output_path}")
+        md_files = list(output_path.glob("**/*.md"))
 
     # Filter out index files and archive
     md_files = [f for f in md_files if "FILE_INDEX" not in f.name and "/archive/" not in str(f).replace("\\", "/")]
@@ -1471,6 +1615,12 @@ def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool
     md_files = [f for f in md_files if not _is_ignored(f)]
 
     for filepath in md_files:
+        entry = catalog_entries.get(str(filepath))
+        skip_reason = _catalog_skip_reason(entry) if entry and not force else None
+        if skip_reason:
+            results["skipped"].append({"file": filepath.name, "reason": skip_reason})
+            continue
+
         try:
             result = publisher.sync_file(str(filepath), force=force, dry_run=dry_run)
 
@@ -143,6 +143,8 @@ def monthly_yearly_report(config: Config, logger, model=None, dry_run=False, no_
 
             # Generate a chart for the monthly range (last 12 months)
             q._chart(key, df.tail(365))
+            # _chart only queues the render; wait for it before copying the file
+            q._finish_charts()
             # copy chart to reports/charts
             src = os.path.join(config.CHARTS_DIR, f"{key}.png")
             dst = os.path.join(charts_dir, f"{key}_1y.png")
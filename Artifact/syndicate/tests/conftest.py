@@ -5,6 +5,10 @@ from pathlib import Path
 
 # Make test environment hermetic by stubbing heavy optional dependencies
 sys.modules.setdefault('yfinance', types.ModuleType('yfinance'))
+# Keep QuantEngine from writing bar caches into the repo's data directory
+os.environ.setdefault("MARKET_DATA_CACHE", "0")
+# Render charts in-process unless a test starts its own pool
+os.environ.setdefault("CHART_RENDER_WORKERS", "0")
 
 # Ensure pytest-asyncio plugin is available for async tests
 pytest_plugins = "pytest_asyncio"
@@ -0,0 +1,136 @@
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Ensure project root is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+from scripts.chart_service import ChartService, benchmark_chart_service, chart_key
+from scripts.market_data import MarketDataStore, SyntheticBarSource
+
+SMALL = {"figsize": (6, 4), "dpi": 60, "show_trade_setup": False}
+
+
+def bars(end="2025-06-02", ticker="GC=F"):
+    return MarketDataStore(SyntheticBarSource(end=end)).get(ticker).tail(60)
+
+
+def test_key_covers_bars_indicators_and_options():
+    df = bars()
+    key = chart_key(df, "GOLD", **SMALL)
+    assert chart_key(df.copy(), "GOLD", **SMALL) == key
+    changed = df.copy()
+    changed.iloc[-1, changed.columns.get_loc("RSI")] += 1e-9
+    assert chart_key(changed, "GOLD", **SMALL) != key
+    assert chart_key(df, "GOLD", **{**SMALL, "dpi": 61}) != key
+    assert chart_key(df, "SILVER", **SMALL) != key
+
+
+def test_unchanged_inputs_skip_rendering(tmp_path):
+    service = ChartService(workers=0)
+    out = tmp_path / "charts" / "GOLD.png"
+
+    first = service.submit("GOLD", bars(), out, **SMALL).result()
+    assert first["success"] and not first["cached"] and out.stat().st_size > 2048
+
+    # A fresh service (next process) still recognises the file from the manifest
+    service = ChartService(workers=0)
+    service.begin_cycle()
+    again = service.submit("GOLD", bars(), out, **SMALL).result()
+    assert again["cached"] and again["regime"] == first["regime"]
+    assert again["support_levels"] == first["support_levels"]
+
+    newer = service.submit("GOLD", bars(end="2025-06-03"), out, **SMALL).result()
+    assert newer["success"] and not newer["cached"]
+
+    out.unlink()
+    assert not service.submit("GOLD", bars(end="2025-06-03"), out, **SMALL).result()["cached"]
+
+    stats = service.cycle_stats()
+    assert (stats["charts"], stats["hits"], stats["misses"]) == (3, 1, 2)
+    assert stats["render_ms"] > 0 and abs(stats["hit_rate"] - 1 / 3) < 1e-9
+
+
+def test_pool_renders_in_warm_worker_processes(tmp_path):
+    service = ChartService(workers=1)
+    try:
+        service.warm_up()
+        metas = service.render_many(
+            [
+                {"name": "GOLD", "df": bars(), "out_path": tmp_path / "GOLD.png", **SMALL},
+                {"name": "BROKEN", "df": bars()[["Close"]], "out_path": tmp_path / "BROKEN.png", **SMALL},
+            ]
+        )
+    finally:
+        service.shutdown()
+
+    gold, broken = metas
+    assert gold["success"] and gold["pid"] != os.getpid()
+    assert not broken["success"] and "Missing required column" in broken["error"]
+    assert service.cycle_stats()["failed"] == 1
+    # Failed renders are not remembered
+    assert service.submit("BROKEN", bars()[["Close"]], tmp_path / "BROKEN.png", **SMALL).result()["cached"] is False
+
+
+def test_quant_engine_reuses_unchanged_charts(tmp_path, monkeypatch):
+    import main
+    import scripts.chart_service as chart_service
+
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "quant.db"))
+    monkeypatch.setattr(main, "ASSETS", {k: main.ASSETS[k] for k in ("GOLD", "SILVER")})
+    monkeypatch.setattr(main.QuantEngine, "_fetch_news", lambda self, key, ticker: None)
+    monkeypatch.setattr(chart_service, "_service", ChartService(workers=0))
+    config = main.Config()
+    config.BASE_DIR = str(tmp_path)
+    config.CHART_CANDLE_COUNT = 40
+    source = SyntheticBarSource(end="2025-06-02")
+
+    def cycle():
+        engine = main.QuantEngine(config, logging.getLogger("test"), market_data=MarketDataStore(source))
+        assert engine.get_data()
+        return engine.chart_stats
+
+    first = cycle()
+    assert (first["charts"], first["misses"]) == (2, 2)
+    assert (Path(config.CHARTS_DIR) / "GOLD.png").exists()
+    second = cycle()
+    assert second["hit_rate"] == 1.0 and second["render_ms"] == 0.0
+
+
+def test_split_reports_copies_the_rendered_chart(tmp_path, monkeypatch):
+    import main
+    import scripts.chart_service as chart_service
+    from scripts.split_reports import monthly_yearly_report
+
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "quant.db"))
+    monkeypatch.setattr(main, "ASSETS", {"GOLD": main.ASSETS["GOLD"]})
+    monkeypatch.setattr(main.QuantEngine, "_fetch_news", lambda self, key, ticker: None)
+    source = SyntheticBarSource(end="2025-06-02")
+    monkeypatch.setattr(MarketDataStore, "from_env", classmethod(lambda cls, *a, **kw: cls(source)))
+    service = ChartService(workers=1)
+    monkeypatch.setattr(chart_service, "_service", service)
+    config = main.Config()
+    config.BASE_DIR = str(tmp_path)
+    config.CHART_CANDLE_COUNT = 40
+
+    try:
+        monthly_yearly_report(config, logging.getLogger("test"), no_ai=True)
+    finally:
+        service.shutdown()
+
+    # The render ran in a worker process and had finished before the copy
+    copied = Path(config.OUTPUT_DIR) / "reports" / "charts" / "GOLD_1y.png"
+    assert copied.exists()
+    assert copied.read_bytes() == (Path(config.CHARTS_DIR) / "GOLD.png").read_bytes()
+
+
+def test_benchmark_reports_hit_rate_and_cycle_time(tmp_path):
+    report = benchmark_chart_service(n_charts=3, cycles=2, workers=1, out_dir=tmp_path, figsize=(6, 4), dpi=60)
+    first, second = report["cycles"]
+    assert (first["charts"], first["hits"], first["misses"], first["failed"]) == (3, 0, 3, 0)
+    # Only the one advanced ticker is rendered again
+    assert (second["charts"], second["hits"], second["misses"], second["failed"]) == (3, 2, 1, 0)
+    assert abs(report["hit_rate"] - 2 / 3) < 1e-9
+    assert report["serial_ms"] > 0 and report["service_ms"] > 0
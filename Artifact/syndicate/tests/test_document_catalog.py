@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db_manager import DatabaseManager
+from scripts.document_catalog import RACY_WINDOW_NS, DocumentCatalog
+from scripts.frontmatter import get_pending_documents, scan_pending_documents
+
+OLD_NS = 1_600_000_000 * 10**9
+
+
+def write(path, status="published", ai_processed=True, extra="", body="Body text"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"---\ntitle: {path.stem}\nstatus: {status}\nai_processed: {str(ai_processed).lower()}\n{extra}---\n\n{body}\n",
+        encoding="utf-8",
+    )
+    # Old mtimes keep files outside the racy window so refreshes can trust their stats
+    os.utime(path, ns=(OLD_NS, OLD_NS))
+    return path
+
+
+def make_tree(root):
+    write(root / "journals" / "a.md")
+    write(root / "journals" / "b.md", status="draft", ai_processed=False,
+          extra="pending_ai: true\npending_reason: llm_unavailable\npending_since: 2025-01-01\n")
+    write(root / "reports" / "c.md", extra="notion_page_id: abc123\nsync_status: synced\n")
+    write(root / "reports" / "deep" / "d.md", status="in_progress")
+    (root / "reports" / "notes.txt").write_text("not markdown")
+
+
+def catalog(tmp_path, root):
+    return DocumentCatalog(root, db=DatabaseManager(tmp_path / "catalog.db"))
+
+
+def test_refresh_only_reads_changed_files(tmp_path):
+    root = tmp_path / "output"
+    make_tree(root)
+    cat = catalog(tmp_path, root)
+
+    assert cat.refresh() == {"files": 4, "indexed": 4, "touched": 0, "unchanged": 0, "removed": 0}
+    assert cat.refresh()["unchanged"] == 4
+
+    write(root / "journals" / "a.md", status="draft")
+    (root / "reports" / "deep" / "d.md").unlink()
+    write(root / "journals" / "e.md")
+    assert cat.refresh() == {"files": 4, "indexed": 2, "touched": 0, "unchanged": 2, "removed": 1}
+    assert [Path(p).name for p in cat.published()] == ["e.md", "c.md"]
+
+
+def test_recent_files_are_rehashed_but_not_reparsed(tmp_path):
+    root = tmp_path / "output"
+    path = write(root / "fresh.md")
+    now = time.time_ns() - RACY_WINDOW_NS // 2  # inside the racy window of any scan made now
+    os.utime(path, ns=(now, now))
+    cat = catalog(tmp_path, root)
+
+    assert cat.refresh()["indexed"] == 1
+    # Same stat, but too recent to trust: re-hashed, and unchanged content is only touched
+    assert cat.refresh()["touched"] == 1
+
+    # An edit that keeps size and mtime is still picked up while the file is racy
+    path.write_text(path.read_text().replace("published", "draft_____"))
+    os.utime(path, ns=(now, now))
+    assert cat.refresh()["indexed"] == 1
+    assert cat.entries(status="draft_____")
+
+
+def test_queries_match_full_scan(tmp_path):
+    root = tmp_path / "output"
+    make_tree(root)
+    cat = catalog(tmp_path, root)
+
+    assert cat.pending_documents() == scan_pending_documents(str(root))
+    assert cat.pending_documents()[0]["reason"] == "llm_unavailable"
+    assert [Path(p).name for p in cat.needs_sync()] == ["a.md"]
+    assert [Path(p).name for p in cat.published()] == ["a.md", "c.md"]
+    # Paths come back relative to the root the catalog was given, like Path.glob
+    assert all(p.startswith(str(root)) for p in cat.published())
+
+
+def test_check_detects_and_repairs_drift(tmp_path):
+    root = tmp_path / "output"
+    make_tree(root)
+    cat = catalog(tmp_path, root)
+    cat.refresh()
+    assert cat.check()["consistent"]
+
+    # Edited behind the catalog's back with its stats restored, plus a new and a deleted file
+    path = root / "journals" / "a.md"
+    size = path.stat().st_size
+    path.write_text(path.read_text().replace("status: published", "status: archived!"))
+    assert path.stat().st_size == size
+    os.utime(path, ns=(OLD_NS, OLD_NS))
+    write(root / "new.md")
+    (root / "reports" / "c.md").unlink()
+
+    report = cat.check()
+    assert not report["consistent"]
+    assert [Path(p).name for p in report["mismatched"]] == ["a.md"]
+    assert [Path(p).name for p in report["missing"]] == ["new.md"]
+    assert [Path(p).name for p in report["stale"]] == ["c.md"]
+
+    assert cat.check(repair=True)["repaired"]
+    assert cat.check()["consistent"]
+    assert cat.entries(refresh=False, status="archived!")
+
+
+def test_catalogs_of_sibling_roots_are_separate(tmp_path):
+    db = DatabaseManager(tmp_path / "catalog.db")
+    write(tmp_path / "out" / "a.md")
+    write(tmp_path / "out2" / "b.md")
+
+    assert [Path(p).name for p in DocumentCatalog(tmp_path / "out", db=db).published()] == ["a.md"]
+    assert [Path(p).name for p in DocumentCatalog(tmp_path / "out2", db=db).published()] == ["b.md"]
+    assert DocumentCatalog(tmp_path / "out", db=db).rebuild()["indexed"] == 1
+
+
+def test_get_pending_documents_uses_catalog_with_scan_fallback(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "default.db"))
+    root = tmp_path / "output"
+    make_tree(root)
+
+    expected = scan_pending_documents(str(root))
+    assert get_pending_documents(str(root), use_catalog=False) == expected
+    assert get_pending_documents(str(root)) == expected
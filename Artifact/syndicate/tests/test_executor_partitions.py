@@ -0,0 +1,220 @@
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Ensure project root is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db_manager import DatabaseManager
+from scripts.executor_daemon import ExecutorDaemon, parse_type_limits
+from scripts.task_executor import TaskResult
+
+N_PARTITIONS = 8
+
+
+class FakeTaskExecutor:
+    """Stands in for TaskExecutor: logs each execution and sleeps instead of calling an LLM."""
+
+    def __init__(self, log_path, worker_id, task_seconds, running=None):
+        self.insights_extractor = SimpleNamespace(action_queue=[])
+        self.log_path = log_path
+        self.worker_id = worker_id
+        self.task_seconds = task_seconds
+        self.running = running
+
+    def execute_all_pending(self, max_tasks=None):
+        action = self.insights_extractor.action_queue[0]
+        if self.running is not None:
+            self.running.enter(action.action_type)
+        with open(self.log_path, "a") as f:
+            f.write(f"{action.action_id} {self.worker_id}\n")
+        time.sleep(self.task_seconds)
+        if self.running is not None:
+            self.running.leave(action.action_type)
+        return [TaskResult(action_id=action.action_id, success=True, result_data={"by": self.worker_id},
+                           execution_time_ms=self.task_seconds * 1000)]
+
+
+class RunningCounter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = Counter()
+        self.peak = Counter()
+
+    def enter(self, action_type):
+        with self.lock:
+            self.current[action_type] += 1
+            self.peak[action_type] = max(self.peak[action_type], self.current[action_type])
+
+    def leave(self, action_type):
+        with self.lock:
+            self.current[action_type] -= 1
+
+
+def make_db(tmp_path, n_tasks=0, action_types=("research",)):
+    db_path = tmp_path / "executor_test.db"
+    db = DatabaseManager(db_path)
+    with db._get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO action_insights (action_id, action_type, title, status) VALUES (?, ?, ?, 'pending')",
+            [(f"ACT-{i:04d}", action_types[i % len(action_types)], f"Task {i}") for i in range(n_tasks)],
+        )
+    return db
+
+
+def make_daemon(db, log_path, worker_id, workers, task_seconds, running=None, **kwargs):
+    daemon = ExecutorDaemon(
+        logging.getLogger(f"test.executor.{worker_id}"),
+        poll_interval=1,
+        worker_id=worker_id,
+        workers=workers,
+        partitioned=True,
+        n_partitions=N_PARTITIONS,
+        lease_seconds=kwargs.pop("lease_seconds", 0.6),
+        type_limits=kwargs.pop("type_limits", {}),
+    )
+    daemon._db = db
+    local = threading.local()
+
+    def task_executor():
+        if not hasattr(local, "executor"):
+            local.executor = FakeTaskExecutor(log_path, worker_id, task_seconds, running)
+        return local.executor
+
+    daemon._get_task_executor = task_executor
+    return daemon
+
+
+def _daemon_process(db_path, log_path, worker_id, workers, task_seconds, results):
+    daemon = make_daemon(DatabaseManager(Path(db_path)), log_path, worker_id, workers, task_seconds)
+    results.put((worker_id, daemon.run_once()))
+
+
+def run_daemons(tmp_path, db, n_daemons, workers, task_seconds):
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    log_path = str(tmp_path / f"executions_{n_daemons}.log")
+    start = time.monotonic()
+    procs = [
+        ctx.Process(target=_daemon_process,
+                    args=(str(db.db_path), log_path, f"daemon-{i}", workers, task_seconds, results))
+        for i in range(n_daemons)
+    ]
+    for proc in procs:
+        proc.start()
+    counts = dict(results.get(timeout=60) for _ in procs)
+    for proc in procs:
+        proc.join(timeout=10)
+    elapsed = time.monotonic() - start
+    with open(log_path) as f:
+        executions = [line.split() for line in f]
+    return counts, executions, elapsed
+
+
+def test_parse_type_limits():
+    assert parse_type_limits("research=2, code_task=1,bad,x=") == {"research": 2, "code_task": 1}
+
+
+def test_partition_leases_rebalance_and_expire(tmp_path):
+    db = make_db(tmp_path)
+    assert db.acquire_partition_leases("a", N_PARTITIONS, lease_seconds=0.5) == list(range(8))
+    # Newcomer registers but every partition is still leased
+    assert db.acquire_partition_leases("b", N_PARTITIONS, lease_seconds=0.5) == []
+    # "a" gives back its surplus on renewal, "b" takes it
+    assert db.acquire_partition_leases("a", N_PARTITIONS, lease_seconds=0.5) == [0, 1, 2, 3]
+    assert db.acquire_partition_leases("b", N_PARTITIONS, lease_seconds=0.5) == [4, 5, 6, 7]
+
+    # "a" stops renewing; once its lease and membership expire "b" owns everything
+    time.sleep(0.3)
+    db.acquire_partition_leases("b", N_PARTITIONS, lease_seconds=0.5)
+    time.sleep(0.3)
+    assert db.acquire_partition_leases("b", N_PARTITIONS, lease_seconds=0.5) == list(range(8))
+
+    assert db.release_partition_leases("b") == 8
+    assert db.acquire_partition_leases("c", N_PARTITIONS) == list(range(8))
+
+
+def test_claims_are_fenced_on_partition_lease(tmp_path):
+    db = make_db(tmp_path, n_tasks=N_PARTITIONS)
+    db.acquire_partition_leases("a", N_PARTITIONS)
+    ready = db.get_ready_actions()
+    owned = db.get_ready_actions(partitions=[0, 1], n_partitions=N_PARTITIONS)
+    assert len(owned) == 2 and {t["id"] % N_PARTITIONS for t in owned} == {0, 1}
+
+    assert not db.claim_action(ready[0]["action_id"], worker_id="b", n_partitions=N_PARTITIONS)
+    assert db.claim_action(ready[0]["action_id"], worker_id="a", n_partitions=N_PARTITIONS)
+    assert not db.claim_action(ready[0]["action_id"], worker_id="a", n_partitions=N_PARTITIONS)
+
+
+def test_type_limits_cap_concurrency_per_action_type(tmp_path):
+    db = make_db(tmp_path, n_tasks=16, action_types=("research", "calculation"))
+    running = RunningCounter()
+    daemon = make_daemon(db, str(tmp_path / "exec.log"), "solo", workers=4, task_seconds=0.05,
+                         running=running, type_limits={"research": 1})
+
+    assert daemon.run_once() == 16
+    assert running.peak["research"] == 1
+    assert running.peak["calculation"] > 1
+    assert db.get_ready_actions() == []
+
+
+def test_lost_claims_back_off_instead_of_spinning(tmp_path):
+    db = make_db(tmp_path, n_tasks=4)
+    daemon = make_daemon(db, str(tmp_path / "exec.log"), "stale", workers=2, task_seconds=0.01)
+    # Another daemon keeps winning every claim, e.g. while our partition list is stale
+    db.claim_action = lambda *args, **kwargs: False
+    polls = Counter()
+    get_ready_actions = db.get_ready_actions
+
+    def counting_get_ready_actions(*args, **kwargs):
+        polls["ready"] += 1
+        return get_ready_actions(*args, **kwargs)
+
+    db.get_ready_actions = counting_get_ready_actions
+    runner = threading.Thread(target=daemon.run_partitioned, kwargs={"drain": True})
+    runner.start()
+    time.sleep(1.0)
+    daemon._shutdown_requested = True
+    runner.join(timeout=5)
+
+    assert not runner.is_alive()
+    assert daemon.stats["claims_lost"] > 0
+    # One poll per idle_wait (0.2s), not thousands per second
+    assert polls["ready"] < 30
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_daemons_split_the_queue_without_double_execution(tmp_path):
+    db = make_db(tmp_path, n_tasks=90, action_types=("research", "calculation", "monitoring"))
+
+    counts, executions, _ = run_daemons(tmp_path, db, n_daemons=3, workers=3, task_seconds=0.05)
+
+    executed = Counter(action_id for action_id, _ in executions)
+    assert len(executed) == 90
+    assert max(executed.values()) == 1
+    assert sum(counts.values()) == 90
+    assert all(count > 0 for count in counts.values())
+    with db._get_connection() as conn:
+        statuses = Counter(row["status"] for row in conn.execute("SELECT status FROM action_insights"))
+    assert statuses == {"completed": 90}
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_throughput_scales_with_daemons(tmp_path):
+    (tmp_path / "one").mkdir()
+    (tmp_path / "three").mkdir()
+    one = make_db(tmp_path / "one", n_tasks=48)
+    three = make_db(tmp_path / "three", n_tasks=48)
+
+    _, _, single = run_daemons(tmp_path / "one", one, n_daemons=1, workers=2, task_seconds=0.1)
+    _, _, triple = run_daemons(tmp_path / "three", three, n_daemons=3, workers=2, task_seconds=0.1)
+
+    # 48 x 100ms tasks: ~2.4s on one daemon, ~0.8s across three
+    assert triple < single * 0.6
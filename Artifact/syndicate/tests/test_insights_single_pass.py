@@ -0,0 +1,84 @@
+import logging
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Ensure project root is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.insights_engine import (
+    ACTION_SCANNER,
+    ENTITY_MATCHER,
+    InsightsExtractor,
+    _per_pattern_actions,
+    _per_pattern_entities,
+    benchmark_insights_extraction,
+)
+
+REPORT = """
+# Daily Analysis
+
+## Fed Meeting Preview
+
+The **US Treasury** curve flattened as Treasury bids returned. FEDERAL reserve speakers were quiet!
+Monitor closely the Fed Meeting outcome. Watch for breakout above $4,350 and watch for the Fed speech.
+Need to research the ECB stance. Fedwire volumes are not an entity. Check the latest COT data now.
+"""
+
+
+def extractor():
+    return InsightsExtractor(None, logging.getLogger("test.insights"))
+
+
+def stable(items):
+    volatile = {"extracted_at", "created_at", "deadline"}
+    return [{k: v for k, v in asdict(item).items() if k not in volatile} for item in items]
+
+
+def test_overlapping_entities_are_all_found():
+    scan = ENTITY_MATCHER.scan(REPORT)
+    found = {key for key, hits in scan.sentence_hits.items() if hits}
+
+    assert {"fed meeting", "fed", "us treasury", "treasury", "federal reserve"} <= found
+    assert "fedwire" not in found
+    # "Fed" inside "Fed Meeting" (twice) and "Fed speech"; not in "Fedwire" or "FEDERAL"
+    assert scan.mentions["fed"] == 3
+    assert ENTITY_MATCHER.hits(scan, "Treasury") == [0]
+
+
+def test_entities_match_per_pattern_reference():
+    single, reference = extractor(), extractor()
+    for name in ("a", "b", "a"):
+        assert stable(single.extract_entities(REPORT, name)) == stable(_per_pattern_entities(reference, REPORT, name))
+    assert stable(single.entity_cache.values()) == stable(reference.entity_cache.values())
+
+
+def test_relevance_helper_matches_scan_scores():
+    ex = extractor()
+    sentence = "Monitor closely the Fed Meeting outcome"
+    assert ex._calculate_entity_relevance("Fed", sentence, REPORT) == 1.0
+    assert ex._calculate_entity_relevance("ECB", "Need to research the ECB stance", REPORT) == 0.55
+
+
+def test_actions_match_per_pattern_reference():
+    single, reference = extractor(), extractor()
+    assert stable(single.extract_actions(REPORT, "r")) == stable(_per_pattern_actions(reference, REPORT, "r"))
+
+
+def test_overlapping_matches_of_different_patterns_are_kept():
+    matched = [(action_type, match.group(0)) for action_type, _, match in ACTION_SCANNER.finditer(REPORT)]
+    types = [action_type for action_type, _ in matched]
+
+    assert types == sorted(types, key=list(dict.fromkeys(types)).index)
+    # Matches of different patterns overlap freely
+    watch = "Watch for breakout above $4,350 and watch for the Fed speech."
+    assert ("research", watch) in matched
+    assert ("monitoring", watch) in matched
+    assert ("monitoring", "breakout above $4,350") in matched
+
+
+def test_benchmark_on_synthetic_corpus():
+    report = benchmark_insights_extraction(n_reports=5, sentences_per_report=60)
+    assert report["identical"]
+    assert report["insights"] > 0
+    assert report["single_pass_s"] < report["per_pattern_s"]
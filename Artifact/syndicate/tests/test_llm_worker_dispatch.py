@@ -0,0 +1,196 @@
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure project root is on path for tests
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from main import Config
+from scripts.llm_worker import ConcurrencyLimit, TaskDispatcher, benchmark_dispatch, process_task
+
+
+class FakeQueue:
+    def __init__(self, n_tasks):
+        self.pending = [{"id": i, "attempts": 0} for i in range(n_tasks)]
+        self.results = {}
+        self.lock = threading.Lock()
+
+    def claim_llm_tasks(self, limit=1):
+        with self.lock:
+            claimed, self.pending = self.pending[:limit], self.pending[limit:]
+            return claimed
+
+    def update_llm_task_result(self, task_id, status, response=None, error=None, attempts=None,
+                               claimed_attempts=None):
+        with self.lock:
+            self.results[task_id] = (status, error)
+            return True
+
+
+def sleeping_handler(latencies, finished):
+    def handler(task, cancel_event):
+        cancel_event.wait(latencies.get(task["id"], 0.01))
+        if cancel_event.is_set():
+            return "cancelled"
+        finished.append(task["id"])
+        return "completed"
+
+    return handler
+
+
+def test_slow_task_does_not_hold_back_other_slots():
+    finished = []
+    dispatcher = TaskDispatcher(
+        FakeQueue(12),
+        sleeping_handler({0: 0.5}, finished),
+        limit=ConcurrencyLimit(initial=2, min_limit=2, max_limit=2),
+        task_timeout=5,
+        poll_interval=0.01,
+    )
+    start = time.monotonic()
+    stats = dispatcher.run(until_idle=True)
+
+    assert stats["completed"] == 12
+    # The other 11 tasks share the second slot while task 0 runs
+    assert finished[-1] == 0
+    assert time.monotonic() - start < 1.0
+    assert stats["slot_idle_seconds"] < 0.2
+
+
+def test_timeout_releases_slot_and_requeues_task():
+    finished = []
+    queue = FakeQueue(4)
+    dispatcher = TaskDispatcher(
+        queue,
+        sleeping_handler({0: 10}, finished),
+        limit=ConcurrencyLimit(initial=1, min_limit=1, max_limit=1),
+        task_timeout=0.2,
+        poll_interval=0.01,
+    )
+    start = time.monotonic()
+    stats = dispatcher.run(until_idle=True)
+
+    assert time.monotonic() - start < 1.0
+    assert stats["timeouts"] == 1
+    assert stats["completed"] == 3
+    assert queue.results[0][0] == "pending"
+    assert "timed out" in queue.results[0][1]
+    assert sorted(finished) == [1, 2, 3]
+
+
+def test_limit_grows_on_success_and_backs_off_on_errors():
+    now = [0.0]
+    limit = ConcurrencyLimit(initial=2, min_limit=1, max_limit=6, cooldown=1.0, clock=lambda: now[0])
+    for _ in range(20):
+        limit.on_success(0.1, in_flight=limit.limit)
+    assert limit.limit == 6
+
+    limit.on_error()
+    limit.on_error()  # within cooldown: counted once
+    assert limit.limit == 4
+    now[0] += 2
+    limit.on_error()
+    assert limit.limit == 3
+    assert limit.error_rate > 0
+
+
+def test_limit_ignores_isolated_slow_tasks_but_not_sustained_slowdown():
+    now = [0.0]
+    limit = ConcurrencyLimit(initial=4, min_limit=1, max_limit=4, window=8, clock=lambda: now[0])
+    for i in range(80):
+        limit.on_success(2.0 if i % 8 == 7 else 0.1, in_flight=0)
+    assert limit.limit == 4
+
+    for _ in range(8):
+        now[0] += 2
+        limit.on_success(1.0, in_flight=0)
+    assert limit.limit < 4
+
+
+def test_process_task_discards_result_after_cancel(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "gs_test.db"))
+    import scripts.llm_worker as worker_mod
+    from db_manager import get_db
+
+    cancel_event = threading.Event()
+
+    class CancelledProvider:
+        def generate_content(self, prompt):
+            cancel_event.set()
+
+            class R:
+                text = "late output"
+
+            return R()
+
+    monkeypatch.setattr(worker_mod, "create_llm_provider", lambda cfg, log: CancelledProvider())
+    db = get_db()
+    report = tmp_path / "late_report.md"
+    db.add_llm_task(str(report), prompt="Test prompt", task_type="generate")
+    task = db.claim_llm_tasks(limit=1)[0]
+
+    assert process_task(task, Config(), cancel_event) == "cancelled"
+    assert not report.exists()
+    conn = sqlite3.connect(str(db.db_path))
+    status = conn.execute("SELECT status FROM llm_tasks WHERE id = ?", (task["id"],)).fetchone()[0]
+    conn.close()
+    assert status == "in_progress"
+
+
+def test_timed_out_run_cannot_overwrite_a_newer_claim(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "gs_test.db"))
+    import scripts.llm_worker as worker_mod
+    from db_manager import get_db
+
+    db = get_db()
+    report = tmp_path / "report.md"
+    db.add_llm_task(str(report), prompt="Test prompt", task_type="generate")
+    stale = db.claim_llm_tasks(limit=1)[0]
+
+    # The dispatcher times the first run out and another worker claims the task again
+    assert worker_mod._record_failure(db, stale["id"], "timed out", stale["attempts"] + 1) == "pending"
+    fresh = db.claim_llm_tasks(limit=1)[0]
+    assert fresh["attempts"] == 1
+
+    class FailingProvider:
+        def generate_content(self, prompt):
+            raise RuntimeError("provider error after the timeout")
+
+    # The stale run fails later without ever seeing its cancel event
+    monkeypatch.setattr(worker_mod, "create_llm_provider", lambda cfg, log: FailingProvider())
+    assert process_task(stale, Config()) == "cancelled"
+    row = db.get_llm_task(fresh["id"])
+    assert (row["status"], row["attempts"]) == ("in_progress", 1)
+
+    # A cancel that lands after generation still stops the file write and the DB update
+    cancel_event = threading.Event()
+
+    class Provider:
+        def generate_content(self, prompt):
+            class R:
+                text = "late output"
+
+            return R()
+
+    def add_frontmatter(*args, **kwargs):
+        cancel_event.set()
+        return "late output"
+
+    monkeypatch.setattr(worker_mod, "create_llm_provider", lambda cfg, log: Provider())
+    monkeypatch.setattr(worker_mod, "add_frontmatter", add_frontmatter)
+    assert process_task(fresh, Config(), cancel_event) == "cancelled"
+    assert not report.exists()
+    assert db.get_llm_task(fresh["id"])["status"] == "in_progress"
+
+    # The current claim still records its own outcome
+    monkeypatch.setattr(worker_mod, "add_frontmatter", lambda text, *a, **kw: text)
+    assert process_task(fresh, Config()) == "completed"
+    assert db.get_llm_task(fresh["id"])["status"] == "completed"
+
+
+def test_benchmark_reports_less_idle_time_than_batches():
+    results = benchmark_dispatch(n_tasks=40, concurrency=4, median_latency=0.01)
+    assert results["continuous"]["completed"] == 40
+    assert results["continuous"]["slot_idle_seconds"] < results["batch"]["slot_idle_seconds"]
@@ -0,0 +1,190 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure project root is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.local_llm_server import (
+    LocalLLMServer,
+    PassthroughSession,
+    PrefixStateCache,
+    benchmark_prefix_cache,
+    longest_common_prefix,
+)
+
+EVAL_S = 0.0002  # simulated cost per evaluated prompt token
+GEN_S = 0.0005  # per generated token
+
+
+class FakeLlamaSession:
+    """Behaves like llama-cpp: a prompt only evaluates the tokens past the prefix shared with the live context."""
+
+    supports_state = True
+
+    def __init__(self):
+        self.vocab = {}
+        self.live = []
+        self.evaluated = 0
+        self.order = []
+        self.active = 0
+        self.max_active = 0
+
+    def tokenize(self, text):
+        return [self.vocab.setdefault(word, len(self.vocab)) for word in text.split()]
+
+    def evaluated_tokens(self):
+        return list(self.live)
+
+    def save_state(self):
+        return tuple(self.live), 64 * len(self.live)
+
+    def load_state(self, state):
+        self.live = list(state)
+
+    def _run(self, tokens, max_tokens):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        reused = longest_common_prefix(self.live, tokens)
+        self.evaluated += len(tokens) - reused
+        time.sleep(EVAL_S * (len(tokens) - reused))
+        self.live = list(tokens)
+        for i in range(max_tokens):
+            if i:
+                time.sleep(GEN_S)
+            self.live.append(-1 - i)
+            yield f"t{i} "
+        self.active -= 1
+
+    def stream_completion(self, prompt, max_tokens=4, **params):
+        self.order.append(prompt)
+        yield from self._run(self.tokenize(prompt), max_tokens)
+
+    def stream_chat(self, messages, max_tokens=4, **params):
+        text = " ".join(f"<{m['role']}> {m['content']}" for m in messages) + " <assistant>"
+        self.order.append(text)
+        yield from self._run(self.tokenize(text), max_tokens)
+
+
+def prompt(prefix, i):
+    return " ".join(f"{prefix}{k}" for k in range(200)) + f" question {i}"
+
+
+def test_requests_are_served_in_order_one_at_a_time():
+    session = FakeLlamaSession()
+    with LocalLLMServer(None, session=session, cache_entries=0) as server:
+        submitted, lock = [], threading.Lock()
+
+        def client(n):
+            for i in range(5):
+                text = f"client {n} request {i}"
+                with lock:
+                    submitted.append((server.submit("generate", text, max_tokens=2), text))
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        results = [(future.result(timeout=10), text) for future, text in submitted]
+
+    assert session.max_active == 1
+    # Served strictly in submission (request id) order
+    by_id = sorted(results, key=lambda r: r[0].timing.request_id)
+    assert [r.timing.request_id for r, _ in by_id] == list(range(1, 31))
+    assert session.order == [text for _, text in by_id]
+    assert all(r.text == "t0 t1 " and r.timing.cache == "off" for r, _ in results)
+    assert all(r.timing.ttft_ms >= r.timing.queue_wait_ms >= 0 for r, _ in results)
+
+
+def test_saved_prefix_states_skip_prompt_evaluation():
+    session = FakeLlamaSession()
+    server = LocalLLMServer(None, session=session, cache_entries=4, min_prefix_tokens=16)
+    with server:
+        for i in range(6):
+            server.generate_timed(prompt("a" if i % 2 == 0 else "b", i), max_tokens=2)
+
+    timings = list(server.timings)
+    assert [t.cache for t in timings] == ["miss", "miss", "hit", "hit", "hit", "hit"]
+    assert all(t.reused_tokens == 201 for t in timings[2:])  # prefix + "question"
+    # Two full prefix evaluations, then only the question tails
+    assert session.evaluated == 2 * 202 + 4
+    assert server.stats()["hit"] == 4 and server.stats()["cache_entries"] == 2
+
+    # Repeating the prefix that is still live needs no restore
+    with server:
+        assert server.generate_timed(prompt("b", 9), max_tokens=1).timing.cache == "warm"
+
+
+def test_chat_states_are_keyed_by_system_prompt():
+    session = FakeLlamaSession()
+    system = {"role": "system", "content": " ".join(f"rule{k}" for k in range(100))}
+    with LocalLLMServer(None, session=session, min_prefix_tokens=16) as server:
+        first = server.chat([system, {"role": "user", "content": "gold bias?"}], max_tokens=3)
+        server.generate("unrelated prompt resets the context", max_tokens=1)
+        second = server.chat([system, {"role": "user", "content": "silver bias?"}], max_tokens=3)
+
+    assert first["content"] == "t0 t1 t2 " and first["timing"]["cache"] == "miss"
+    assert second["timing"]["cache"] == "hit"
+    assert second["timing"]["reused_tokens"] == 102  # <system> + rules + <user>
+    assert second["tokens_prompt"] == 105
+
+
+def test_cache_evicts_least_recently_used_within_budget():
+    cache = PrefixStateCache(max_entries=2, max_bytes=1000)
+    cache.put([1, 2, 3], "a", 400)
+    cache.put([4, 5, 6], "b", 400)
+    assert cache.best_match([1, 2, 9])[1] == 2  # touches "a"
+    cache.put([7, 8], "c", 400)
+    assert len(cache) == 2 and cache.best_match([4, 5])[0] is None
+    assert not cache.put([1], "huge", 2000)
+
+
+def test_passthrough_backend_and_errors():
+    class FakeLLM:
+        def generate(self, prompt, stop_sequences=None, **kw):
+            if prompt == "boom":
+                raise RuntimeError("backend failure")
+            return prompt.upper()
+
+        def chat(self, messages, **kw):
+            return {"content": messages[-1]["content"][::-1]}
+
+    with LocalLLMServer(FakeLLM(), session=PassthroughSession(FakeLLM())) as server:
+        assert server.generate("gold") == "GOLD"
+        assert server.chat([{"role": "user", "content": "abc"}])["content"] == "cba"
+        failed = server.submit("generate", "boom")
+        assert isinstance(failed.exception(timeout=5), RuntimeError)
+        # The worker keeps serving after a failed request
+        assert server.generate("still up") == "STILL UP"
+    assert all(t.cache == "off" for t in server.timings)
+
+
+def test_benchmark_reports_ttft_speedup():
+    report = benchmark_prefix_cache(None, n_requests=8, prefix_words=300, max_tokens=2, session=FakeLlamaSession())
+    assert report["cached_stats"]["hit"] == 6
+    assert report["ttft_speedup"] > 3
+
+
+def test_llm_creates_one_server_under_concurrent_calls(monkeypatch):
+    import scripts.local_llm_server as server_module
+    from scripts.local_llm import LocalLLM
+
+    created = []
+
+    class SlowServer:
+        def __init__(self, llm, **kwargs):
+            time.sleep(0.05)
+            created.append(self)
+
+    monkeypatch.setattr(server_module, "LocalLLMServer", SlowServer)
+    llm = LocalLLM()
+    servers = []
+    threads = [threading.Thread(target=lambda: servers.append(llm.server())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 1
+    assert all(s is created[0] for s in servers)
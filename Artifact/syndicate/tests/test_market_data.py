@@ -0,0 +1,191 @@
+import logging
+import sys
+import threading
+from pathlib import Path
+
+# Ensure project root is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from scripts.market_data import (
+    INDICATOR_COLUMNS,
+    MarketDataStore,
+    SyntheticBarSource,
+    benchmark_market_data,
+    compute_indicators,
+    normalize_bars,
+)
+
+
+def full_recompute(frame):
+    bars = frame[[c for c in frame.columns if c not in INDICATOR_COLUMNS]]
+    return pd.concat([bars, compute_indicators(bars)], axis=1)
+
+
+def test_indicators_match_fallback_ta_and_are_slice_invariant():
+    import main
+
+    bars = normalize_bars(SyntheticBarSource().fetch("GC=F", period="2y"))
+    full = compute_indicators(bars)
+    for start in (1, 37, 250, len(bars) - 1):
+        assert compute_indicators(bars, start).equals(full.iloc[start:])
+
+    ta = main._FallbackTA()
+    expected = pd.concat(
+        [
+            ta.rsi(bars["Close"]).rename("RSI"),
+            ta.sma(bars["Close"], 200).rename("SMA_200"),
+            ta.sma(bars["Close"], 50).rename("SMA_50"),
+            ta.atr(bars["High"], bars["Low"], bars["Close"]).rename("ATR"),
+            ta.adx(bars["High"], bars["Low"], bars["Close"]),
+        ],
+        axis=1,
+    )
+    pd.testing.assert_frame_equal(full, expected[INDICATOR_COLUMNS], check_exact=False, rtol=1e-10)
+
+
+def test_top_up_fetches_only_missing_bars(tmp_path):
+    source = SyntheticBarSource(end="2025-06-02", live_last_bar=True)
+    store = MarketDataStore(source, cache_dir=tmp_path)
+    first = store.get("GC=F")
+    assert source.requests[-1][2:] == ("1y", None, len(first))
+
+    # Three sessions later; the bar cached while forming is now final
+    source.end = pd.Timestamp("2025-06-05")
+    served = store.get("GC=F")
+    _, _, period, start, n_bars = source.requests[-1]
+    assert (period, start, n_bars) == (None, first.index[-2], 5)
+    assert store.stats["top_ups"] == 1 and store.stats["rows_computed"] == len(first) + 5
+
+    cached = store._frames[("GC=F", "1d")]
+    assert cached.equals(full_recompute(cached))
+    fresh = normalize_bars(source.fetch("GC=F", period="1y"))
+    assert served.index.equals(fresh.index)
+    pd.testing.assert_frame_equal(served, full_recompute(fresh), check_exact=True)
+
+    # A new process picks the cache up from disk and asks for the same two bars only
+    reopened = MarketDataStore(source, cache_dir=tmp_path)
+    assert reopened.get("GC=F").equals(served)
+    assert source.requests[-1][3] == served.index[-2] and reopened.stats["unchanged"] == 1
+    assert reopened.stats["full_fetches"] == 0
+
+
+def test_revised_history_rebuilds_the_cache(tmp_path):
+    source = SyntheticBarSource(end="2025-06-02")
+    store = MarketDataStore(source, cache_dir=tmp_path)
+    store.get("GLD")
+    source.adjustments["GLD"] = 0.98  # e.g. a dividend adjustment of the whole history
+    source.end = pd.Timestamp("2025-06-03")
+    served = store.get("GLD")
+
+    assert store.stats["full_fetches"] == 2 and store.stats["top_ups"] == 0
+    fresh = normalize_bars(source.fetch("GLD", period="1y"))
+    pd.testing.assert_frame_equal(served, full_recompute(fresh), check_exact=True)
+
+
+def test_longer_period_than_cached_fetches_full_history(tmp_path):
+    source = SyntheticBarSource(end="2025-06-02")
+    store = MarketDataStore(source, cache_dir=tmp_path)
+    store.get("GC=F", period="1y")
+    store.get("GC=F", period="6mo")
+    assert store.stats["full_fetches"] == 1
+
+    served = MarketDataStore(source, cache_dir=tmp_path).get("GC=F", period="2y")
+    assert source.requests[-1][2] == "2y"
+    fresh = normalize_bars(source.fetch("GC=F", period="2y"))
+    pd.testing.assert_frame_equal(served, full_recompute(fresh), check_exact=True)
+
+    # The longer download now covers the shorter period too
+    reopened = MarketDataStore(source, cache_dir=tmp_path)
+    reopened.get("GC=F", period="1y")
+    assert reopened.stats["full_fetches"] == 0 and reopened.stats["unchanged"] == 1
+
+
+def test_memory_frames_are_bounded(tmp_path):
+    source = SyntheticBarSource(end="2025-06-02")
+    store = MarketDataStore(source, cache_dir=tmp_path, memory_frames=2)
+    for ticker in ("GC=F", "SI=F", "GLD", "GC=F"):
+        store.get(ticker)
+    assert list(store._frames) == [("GLD", "1d"), ("GC=F", "1d")]
+    assert set(store._covered) == set(store._frames)
+
+    # The evicted frame comes back from disk with a top-up, not a full download
+    store.get("SI=F")
+    assert store.stats["full_fetches"] == 3 and store.stats["unchanged"] == 2
+
+
+def test_outage_serves_cached_bars(tmp_path):
+    source = SyntheticBarSource(end="2025-06-02")
+    store = MarketDataStore(source, cache_dir=tmp_path)
+    before = store.get("SI=F")
+    source.failing.add("SI=F")
+    source.end = pd.Timestamp("2025-06-04")
+
+    assert store.get("SI=F").equals(before)
+    assert store.stats["stale_served"] == 1
+    assert MarketDataStore(source).get("SI=F") is None  # nothing cached, nothing to serve
+
+
+def test_quant_engine_runs_offline_on_synthetic_bars(tmp_path, monkeypatch):
+    from main import ASSETS, Config, QuantEngine
+
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "quant.db"))
+    monkeypatch.setattr(QuantEngine, "_fetch_news", lambda self, key, ticker: None)
+    monkeypatch.setattr(QuantEngine, "_chart", lambda self, key, df: None)
+    config = Config()
+    config.BASE_DIR = str(tmp_path)
+
+    source = SyntheticBarSource(end="2025-06-02", latency_s=0.05)
+    store = MarketDataStore(source, cache_dir=tmp_path / "bars", workers=len(ASSETS))
+    engine = QuantEngine(config, logging.getLogger("test"), market_data=store)
+
+    active, peak, lock = [0], [0], threading.Lock()
+    fetch = source.fetch
+
+    def tracking_fetch(*args, **kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            return fetch(*args, **kwargs)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(source, "fetch", tracking_fetch)
+    snapshot = engine.get_data()
+    assert peak[0] > 1  # assets are fetched concurrently
+    for key, conf in ASSETS.items():
+        bars = normalize_bars(source.fetch(conf["p"], period="1y"))
+        latest = full_recompute(bars).iloc[-1]
+        assert snapshot[key]["price"] == round(latest["Close"], 2)
+        assert snapshot[key]["adx"] == round(latest["ADX_14"], 2)
+        assert snapshot[key]["sma200"] == round(latest["SMA_200"], 2)
+
+    source.end = pd.Timestamp("2025-06-03")
+    source.requests.clear()
+    df = engine._fetch("GC=F", "GLD")
+    assert [r[0] for r in source.requests] == ["GC=F"] and not np.isnan(df["RSI"].iloc[-1])
+    assert store.stats["full_fetches"] == len({c["p"] for c in ASSETS.values()})
+
+
+def test_served_window_matches_full_refresh_after_many_top_ups(tmp_path):
+    source = SyntheticBarSource(end="2025-06-02")
+    store = MarketDataStore(source, cache_dir=tmp_path)
+    store.get("GC=F")
+    for _ in range(40):
+        source.end += pd.offsets.BDay(1)
+        served = store.get("GC=F")
+    assert len(store._frames[("GC=F", "1d")]) > len(served)
+    fresh = normalize_bars(source.fetch("GC=F", period="1y"))
+    pd.testing.assert_frame_equal(served, full_recompute(fresh), check_exact=True)
+    bars_only = store.get("GC=F", indicators=False)
+    pd.testing.assert_frame_equal(bars_only, fresh, check_exact=True)
+
+
+def test_benchmark_reports_identical_results(tmp_path):
+    report = benchmark_market_data(n_tickers=6, cycles=2, latency_s=0.05, cache_dir=tmp_path)
+    assert report["identical"]
+    assert report["stats"]["top_ups"] == 12 and report["stats"]["full_fetches"] == 6
@@ -0,0 +1,228 @@
+import copy
+import itertools
+import json
+import sys
+from pathlib import Path
+
+# Ensure project root is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from db_manager import DatabaseManager
+from scripts.notion_block_sync import BlockSyncer, manifest_entry, plan_block_diff
+from scripts.notion_publisher import NotionConfig, NotionPublisher
+
+
+class InMemoryNotion:
+    """Minimal Notion client keeping pages in memory and counting requests and request bytes."""
+
+    def __init__(self, auth=None):
+        self.pages_content = {}
+        self.calls = []
+        self.bytes_sent = 0
+        self._ids = itertools.count(1)
+        self.pages = _Endpoint(self, create=self._create_page, update=self._update_page)
+        self.blocks = _Endpoint(self, update=self._update_block, delete=self._delete_block)
+        self.blocks.children = _Endpoint(self, append=self._append, list=self._list)
+
+    def _record(self, name, payload):
+        self.calls.append(name)
+        self.bytes_sent += len(json.dumps(payload, default=str).encode())
+
+    def _stored(self, block):
+        return {**copy.deepcopy(block), "id": f"blk-{next(self._ids)}"}
+
+    def _create_page(self, parent=None, properties=None, children=None):
+        self._record("pages.create", {"parent": parent, "properties": properties, "children": children})
+        page_id = f"page-{next(self._ids)}"
+        self.pages_content[page_id] = [self._stored(b) for b in children or []]
+        return {"id": page_id, "url": f"https://notion.so/{page_id}"}
+
+    def _update_page(self, page_id, properties=None):
+        self._record("pages.update", {"properties": properties})
+        self.updated_properties = properties
+        if page_id not in self.pages_content:
+            raise RuntimeError("object_not_found")
+        return {"id": page_id}
+
+    def _find(self, block_id):
+        for children in self.pages_content.values():
+            for i, block in enumerate(children):
+                if block["id"] == block_id:
+                    return children, i
+        raise RuntimeError("object_not_found")
+
+    def _update_block(self, block_id, **payload):
+        self._record("blocks.update", payload)
+        children, i = self._find(block_id)
+        (block_type,) = payload
+        if block_type != children[i]["type"]:
+            raise RuntimeError("block type can't change")
+        children[i][block_type] = copy.deepcopy(payload[block_type])
+        return children[i]
+
+    def _delete_block(self, block_id):
+        self._record("blocks.delete", {})
+        children, i = self._find(block_id)
+        del children[i]
+
+    def _append(self, block_id, children, after=None):
+        self._record("blocks.children.append", {"children": children, **({"after": after} if after else {})})
+        content = self.pages_content[block_id]
+        at = len(content) if after is None else self._find(after)[1] + 1
+        created = [self._stored(b) for b in children]
+        content[at:at] = created
+        return {"results": created}
+
+    def _list(self, block_id, page_size=100, start_cursor=None):
+        self._record("blocks.children.list", {})
+        content = self.pages_content[block_id]
+        start = int(start_cursor or 0)
+        stop = start + page_size
+        return {
+            "results": copy.deepcopy(content[start:stop]),
+            "has_more": stop < len(content),
+            "next_cursor": str(stop) if stop < len(content) else None,
+        }
+
+    def content(self, page_id):
+        return [{k: v for k, v in b.items() if k != "id"} for b in self.pages_content[page_id]]
+
+
+class _Endpoint:
+    def __init__(self, client, **methods):
+        self.__dict__.update(methods)
+
+
+def paragraph(text):
+    return {"object": "block", "type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": text}}]}}
+
+
+def heading(text):
+    return {"object": "block", "type": "heading_2", "heading_2": {"rich_text": [{"type": "text", "text": {"content": text}}]}}
+
+
+def document(n_sections, changed=()):
+    lines = ["---", "status: published", "ai_processed: true", "---", "# Weekly Report", ""]
+    for i in range(n_sections):
+        lines += [f"## Section {i}", "", f"Gold commentary paragraph {i}" + (" revised" if i in changed else "") * 3, ""]
+    return "\n".join(lines)
+
+
+@pytest.fixture
+def publisher(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "notion.db"))
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr("scripts.notion_publisher.Client", InMemoryNotion)
+    monkeypatch.setattr("scripts.cleanup_manager.CleanupManager.record_notion_page", lambda self, n: None)
+    pub = NotionPublisher(NotionConfig(api_key="x", database_id="db-test"))
+    monkeypatch.setattr(pub, "_get_database_properties", lambda: {})
+    monkeypatch.setattr(pub, "_content_blocks", lambda content, body, *a, **k: pub.markdown_to_blocks(body))
+    pub._data_source_id = "ds-1"
+    return pub
+
+
+def test_plan_updates_appends_and_deletes_minimally():
+    old = [heading("A"), paragraph("a"), heading("B"), paragraph("b"), paragraph("c")]
+    manifest = [manifest_entry(b, f"id-{i}") for i, b in enumerate(old)]
+
+    edited = [heading("A"), paragraph("a2"), heading("B"), paragraph("new"), paragraph("b"), paragraph("c")]
+    assert [(op.action, op.index, op.start, op.stop) for op in plan_block_diff(manifest, edited)] == [
+        ("update", 1, 0, 0),
+        ("append", -1, 3, 4),
+    ]
+    assert [(op.action, op.old_index) for op in plan_block_diff(manifest, old[:2] + old[3:])] == [("delete", 2)]
+    # Nothing can be inserted before the first kept block with an `after` anchor
+    assert plan_block_diff(manifest, [paragraph("intro")] + old) is None
+
+
+def test_type_change_is_delete_and_append():
+    old = [heading("A"), paragraph("a")]
+    manifest = [manifest_entry(b, f"id-{i}") for i, b in enumerate(old)]
+    plan = plan_block_diff(manifest, [heading("A"), heading("a")])
+    assert [(op.action, op.old_index, op.start, op.stop) for op in plan] == [("delete", 1, 0, 0), ("append", -1, 1, 2)]
+
+
+def test_resync_sends_only_changed_blocks(publisher, tmp_path):
+    path = tmp_path / "weekly_report.md"
+    path.write_text(document(40), encoding="utf-8")
+    client = publisher.client
+
+    created = publisher.sync_file(str(path))
+    page_id = created["page_id"]
+    assert client.calls == ["pages.create"]
+    assert client.content(page_id) == publisher.markdown_to_blocks(publisher.parse_frontmatter(document(40))[1])
+
+    # Edit two paragraphs; frontmatter now carries the page id, so the page is updated in place
+    text = path.read_text()
+    for i in (3, 17):
+        text = text.replace(f"paragraph {i}\n", f"paragraph {i} revised revised revised\n")
+    path.write_text(text)
+    client.calls.clear()
+    result = publisher.sync_file(str(path), force=True)
+
+    stats = result["block_sync"]
+    assert result["page_id"] == page_id and not result["skipped"]
+    assert client.content(page_id) == publisher.markdown_to_blocks(publisher.parse_frontmatter(document(40, {3, 17}))[1])
+    assert stats["mode"] == "diff" and stats["updated"] == 2 and stats["appended"] == stats["deleted"] == 0
+    # One list call resolves the ids of the created blocks, then two updates
+    assert client.calls == ["pages.update", "blocks.children.list", "blocks.update", "blocks.update"]
+    assert stats["api_calls"] == 3 and stats["full_api_calls"] > 80
+    assert stats["bytes_saved"] > 10 * stats["bytes_sent"]
+
+    # The manifest now has ids: a further edit needs no list call
+    client.calls.clear()
+    result = publisher.update_page(page_id, "Weekly Report", document(41, {3, 17}))
+    assert client.calls == ["pages.update", "blocks.children.append"]
+    assert client.content(page_id) == publisher.markdown_to_blocks(publisher.parse_frontmatter(document(41, {3, 17}))[1])
+    assert result["block_sync"]["appended"] == 2
+
+
+def test_update_in_place_sends_frontmatter_properties(publisher, tmp_path, monkeypatch):
+    schema = {"Type": {"type": "select"}, "Tags": {"type": "multi_select"}, "Date": {"type": "date"}}
+    monkeypatch.setattr(publisher, "_get_database_properties", lambda: schema)
+    path = tmp_path / "weekly_report.md"
+    path.write_text(document(3), encoding="utf-8")
+    page_id = publisher.sync_file(str(path))["page_id"]
+
+    text = path.read_text().replace("status: published", "status: published\ntype: analysis\ndate: 2025-01-31\ntags: [gold, macro]")
+    path.write_text(text)
+    result = publisher.sync_file(str(path), force=True)
+
+    props = publisher.client.updated_properties
+    assert result["page_id"] == page_id and result["tags"] == ["GOLD", "MACRO"]
+    assert props["Type"] == {"select": {"name": "analysis"}}
+    assert props["Date"] == {"date": {"start": "2025-01-31"}}
+    assert props["Tags"] == {"multi_select": [{"name": "GOLD"}, {"name": "MACRO"}]}
+    assert props["title"]["title"][0]["text"]["content"] == "Weekly Report"
+
+
+def test_blocks_past_the_create_limit_are_appended_on_first_sync(publisher):
+    content = document(120)
+    created = publisher.publish("Long", content, use_enhanced_formatting=False)
+    expected = publisher.markdown_to_blocks(publisher.parse_frontmatter(content)[1])
+    assert len(expected) > 200 and len(publisher.client.content(created["page_id"])) == 100
+
+    stats = publisher.update_page(created["page_id"], "Long", content)["block_sync"]
+    assert publisher.client.content(created["page_id"]) == expected
+    assert stats["mode"] == "diff" and stats["unchanged"] == 100
+
+
+def test_manual_edits_in_notion_fall_back_to_a_rewrite(publisher, tmp_path):
+    db = DatabaseManager(tmp_path / "notion.db")
+    client = publisher.client
+    created = publisher.publish("Doc", document(5), use_enhanced_formatting=False)
+    page_id = created["page_id"]
+    publisher.update_page(page_id, "Doc", document(5))
+
+    # Someone deletes the block about to be edited by hand: its stored id no longer exists
+    del client.pages_content[page_id][6]
+    stats = BlockSyncer(client, db=db).sync(page_id, publisher.markdown_to_blocks(document(5, {2}).split("---", 2)[2]))
+    assert stats.mode == "full"
+    assert client.content(page_id) == publisher.markdown_to_blocks(document(5, {2}).split("---", 2)[2])
+
+    # Dry runs plan without calling the API
+    client.calls.clear()
+    dry = BlockSyncer(client, db=db).sync(page_id, publisher.markdown_to_blocks(document(5).split("---", 2)[2]), dry_run=True)
+    assert client.calls == [] and dry.mode == "dry_run" and dry.updated == 1 and dry.api_calls == 1
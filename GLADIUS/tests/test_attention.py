@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+# Ensure training/ is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "training"))
+
+import pytest
+import torch
+
+import gladius_trainer
+from gladius_trainer import GladiusConfig, GladiusModel
+
+
+def tiny_model(num_attention_heads=4, num_key_value_heads=2):
+    torch.manual_seed(0)
+    config = GladiusConfig(vocab_size=300, hidden_size=64, intermediate_size=128, num_hidden_layers=2,
+                           num_attention_heads=num_attention_heads, num_key_value_heads=num_key_value_heads)
+    return GladiusModel(config).eval()
+
+
+def logits(model, implementation, input_ids, segment_ids=None):
+    model.set_attn_implementation(implementation)
+    with torch.no_grad():
+        return model(input_ids, segment_ids=segment_ids)["logits"]
+
+
+@pytest.mark.parametrize("kv_heads", [4, 2, 1])
+@pytest.mark.parametrize("packed", [False, True])
+def test_sdpa_folded_gqa_and_eager_logits_agree(monkeypatch, kv_heads, packed):
+    model = tiny_model(num_key_value_heads=kv_heads)
+    input_ids = torch.randint(3, 300, (2, 24), generator=torch.Generator().manual_seed(1))
+    segment_ids = torch.tensor([[0] * 10 + [1] * 9 + [2] * 5, [0] * 24]) if packed else None
+
+    eager = logits(model, "eager", input_ids, segment_ids)
+    sdpa = logits(model, "sdpa", input_ids, segment_ids)
+    # Without enable_gqa (PyTorch < 2.5) query heads are folded onto their K/V head instead
+    monkeypatch.setattr(gladius_trainer, "_SDPA_GQA", False)
+    folded = logits(model, "sdpa", input_ids, segment_ids)
+
+    torch.testing.assert_close(sdpa, eager, rtol=0, atol=1e-6)
+    torch.testing.assert_close(folded, eager, rtol=0, atol=1e-6)
@@ -0,0 +1,130 @@
+import sys
+from pathlib import Path
+
+# Ensure tools/ and training/ are importable
+GLADIUS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(GLADIUS_DIR / "tools"))
+sys.path.insert(0, str(GLADIUS_DIR / "training"))
+
+import numpy as np
+import pytest
+import torch
+
+import gladius_to_gguf as gguf
+from gladius_to_gguf import (
+    GGMLType,
+    GGUFStreamWriter,
+    ValueType,
+    decode_tensor,
+    encode_rows,
+    permute_rope,
+    read_gguf,
+)
+
+
+def sample_rows(seed=0):
+    rng = np.random.default_rng(seed)
+    rows = rng.normal(0, 1, (64, 96)).astype(np.float32)
+    rows[0] = 0.0                   # all-zero blocks must stay zero
+    rows[1, :32] = 1e-3             # constant block
+    rows[2] *= 100                  # large scale
+    rows[3, 5] = -40.0              # block whose max magnitude is negative
+    return rows
+
+
+@pytest.mark.parametrize("qtype, steps", [(GGMLType.Q8_0, 127), (GGMLType.Q4_0, 8)])
+def test_block_quantization_error_is_bounded(qtype, steps):
+    rows = sample_rows()
+    decoded = decode_tensor(encode_rows(rows, qtype), qtype, rows.shape)
+
+    blocks = rows.reshape(-1, gguf.QK)
+    amax = np.abs(blocks).max(axis=1, keepdims=True)
+    err = np.abs(decoded.reshape(-1, gguf.QK) - blocks)
+    # Half a step for Q8_0; Q4_0 only has 7 steps above zero, so its extreme costs a whole step.
+    # Both also carry the fp16 rounding of the block scale.
+    step = amax / steps
+    bound = (step / 2 if qtype == GGMLType.Q8_0 else step) + amax * 2.0 ** -10
+    assert (err <= bound + 1e-12).all()
+    assert (decoded[0] == 0).all()
+    if qtype == GGMLType.Q4_0:
+        # The largest magnitude of each block is the scale itself, so it survives up to fp16 rounding
+        imax = np.abs(blocks).argmax(axis=1)[:, None]
+        np.testing.assert_allclose(np.take_along_axis(decoded.reshape(-1, gguf.QK), imax, 1),
+                                   np.take_along_axis(blocks, imax, 1), rtol=2.0 ** -10)
+
+
+def test_stream_writer_round_trips_through_read_gguf(tmp_path, monkeypatch):
+    monkeypatch.setattr(gguf, "CHUNK_ELEMENTS", 96 * 5)  # several chunks per tensor
+    rows = sample_rows()
+    path = tmp_path / "model.gguf"
+    writer = GGUFStreamWriter(path)
+    writer.add_string("general.name", "GLADIUS")
+    writer.add_uint32("llama.block_count", 2)
+    writer.add_float32("llama.rope.freq_base", 10000.0)
+    writer.add_array("tokenizer.ggml.tokens", [b"<unk>", "<s>".encode(), "é".encode()], ValueType.STRING)
+    writer.add_array("tokenizer.ggml.scores", [0.0, -1.0, -2.0], ValueType.FLOAT32)
+    tensors = {"norm": (rows[0, :32] + 1, GGMLType.F32), "f16": (rows, GGMLType.F16),
+               "q8": (rows, GGMLType.Q8_0), "q4": (rows[:7], GGMLType.Q4_0)}
+    for name, (array, qtype) in tensors.items():
+        writer.add_tensor_info(name, array.shape, qtype)
+    writer.write_header()
+    for name, (array, _) in tensors.items():
+        writer.write_tensor(name, array)
+    writer.close()
+
+    metadata, stored = read_gguf(path)
+    assert metadata["general.name"] == "GLADIUS" and metadata["llama.block_count"] == 2
+    assert metadata["llama.rope.freq_base"] == 10000.0
+    assert metadata["tokenizer.ggml.tokens"] == ["<unk>", "<s>", "é"]
+    assert metadata["tokenizer.ggml.scores"] == [0.0, -1.0, -2.0]
+    assert list(stored) == list(tensors)
+    for name, (array, qtype) in tensors.items():
+        stored_type, shape, data = stored[name]
+        assert (stored_type, shape) == (qtype, array.shape)
+        expected = decode_tensor(encode_rows(array, qtype), qtype, array.shape)
+        np.testing.assert_array_equal(decode_tensor(data, stored_type, shape), expected)
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_stream_writer_leaves_no_file_when_interrupted(tmp_path):
+    path = tmp_path / "model.gguf"
+    writer = GGUFStreamWriter(path)
+    writer.add_tensor_info("a", (2, 32), GGMLType.F32)
+    writer.add_tensor_info("b", (2, 32), GGMLType.F32)
+    writer.write_header()
+    writer.write_tensor("a", np.zeros((2, 32), np.float32))
+    with pytest.raises(RuntimeError):
+        writer.close()
+    assert not path.exists() and not list(tmp_path.iterdir())
+
+
+def test_permute_rope_inverse_restores_the_weight():
+    n_heads, head_dim, hidden = 4, 8, 32
+    weight = np.random.default_rng(1).normal(size=(n_heads * head_dim, hidden)).astype(np.float32)
+    permuted = permute_rope(weight, n_heads)
+    np.testing.assert_array_equal(permute_rope(permuted, n_heads, inverse=True), weight)
+
+    # Each head's halves are interleaved into the adjacent pairs llama.cpp rotates
+    order = permute_rope(np.arange(n_heads * head_dim)[:, None], n_heads)[:head_dim, 0]
+    assert order.tolist() == [0, 4, 1, 5, 2, 6, 3, 7]
+
+
+def test_fallback_verification_is_labelled_as_quantization_check_only(tmp_path, monkeypatch):
+    from gladius_trainer import GladiusConfig, GladiusModel, LlamaTokenizer
+
+    torch.manual_seed(0)
+    config = GladiusConfig(vocab_size=512, hidden_size=64, intermediate_size=128, num_hidden_layers=2,
+                           num_attention_heads=4, num_key_value_heads=2)
+    model = GladiusModel(config).eval()
+    tokenizer = LlamaTokenizer(vocab_size=config.vocab_size)
+    path = tmp_path / "gladius-f32.gguf"
+    gguf.write_gguf(path, model.state_dict(), config, tokenizer, "f32")
+
+    monkeypatch.setattr(gguf, "_llama_cpp", lambda: None)
+    report = gguf.verify_gguf(path, model, [1, 40, 41, 42, 43], new_tokens=2)
+
+    assert report["check"] == "quantization_error_only"
+    assert "not run" in report["llama_cpp"]
+    assert "tokens_per_sec" not in report and "load_sec" not in report
+    # f32 keeps the weights exactly, so only the rope permutation could move the logits
+    assert report["max_abs_logit_diff"] < 1e-4 and report["top1_agreement"] == 1.0
@@ -0,0 +1,84 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure training/ is importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "training"))
+
+import pytest
+import torch
+import torch.nn.functional as F
+
+from gladius_trainer import GladiusConfig, GladiusModel, LlamaTokenizer, PackedGladiusDataset, pretokenize_corpus
+
+MAX_LENGTH = 32
+TEXTS = ["the system is up", "GLADIUS reads the database file and writes a json response " * 2,
+         "short", "user asked the assistant a query", "true"]
+
+
+@pytest.fixture
+def packed(tmp_path):
+    tokenizer = LlamaTokenizer(vocab_size=512)
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text("".join(json.dumps({"text": t}) + "\n" for t in TEXTS))
+    pretokenize_corpus(corpus, tokenizer, workers=1)
+    dataset = PackedGladiusDataset(corpus, MAX_LENGTH, shuffle=False, pad_id=tokenizer.unk_id)
+    return tokenizer, dataset, list(dataset)
+
+
+def segments(sample):
+    """(segment id, start, stop) of each packed document piece"""
+    ids = sample["segment_ids"].tolist()
+    starts = [i for i, s in enumerate(ids) if s and (i == 0 or ids[i - 1] != s)]
+    return [(ids[start], start, start + ids.count(ids[start])) for start in starts]
+
+
+def tiny_model(vocab_size):
+    torch.manual_seed(0)
+    config = GladiusConfig(vocab_size=vocab_size, hidden_size=64, intermediate_size=128, num_hidden_layers=2,
+                           num_attention_heads=4, num_key_value_heads=2)
+    return GladiusModel(config).eval()
+
+
+def test_boundary_and_padding_labels_are_ignored(packed):
+    tokenizer, dataset, samples = packed
+    # The model's loss ignores label 0, which is what the dataset pads with
+    assert tokenizer.unk_id == 0
+
+    stream = [t for text in TEXTS for t in tokenizer.encode(text)]
+    assert torch.cat([s["input_ids"][s["segment_ids"] > 0] for s in samples]).tolist() == stream
+    assert len(samples) == len(dataset)  # exact with a single reader
+
+    model = tiny_model(tokenizer.vocab_size)
+    for sample in samples:
+        labels, input_ids = sample["labels"], sample["input_ids"]
+        pad = sample["segment_ids"] == 0
+        starts = torch.zeros_like(pad)
+        starts[[start for _, start, _ in segments(sample)]] = True
+        assert (labels[pad | starts] == tokenizer.unk_id).all()
+        assert (labels[~(pad | starts)] == input_ids[~(pad | starts)]).all()
+
+        # Same loss as cross entropy over in-document next-token targets only
+        with torch.no_grad():
+            out = model(input_ids[None], labels=labels[None], segment_ids=sample["segment_ids"][None])
+        targets = labels[1:].masked_fill((pad | starts)[1:], -100)
+        expected = F.cross_entropy(out["logits"][0, :-1], targets, ignore_index=-100)
+        torch.testing.assert_close(out["loss"], expected)
+
+
+@pytest.mark.parametrize("implementation", ["eager", "sdpa"])
+def test_packed_document_has_the_logits_it_has_alone(packed, implementation):
+    tokenizer, _, samples = packed
+    model = tiny_model(tokenizer.vocab_size)
+    model.set_attn_implementation(implementation)
+
+    checked = 0
+    for sample in samples:
+        with torch.no_grad():
+            packed_logits = model(sample["input_ids"][None], segment_ids=sample["segment_ids"][None])["logits"][0]
+            for _, start, stop in segments(sample):
+                alone = model(sample["input_ids"][None, start:stop])["logits"][0]
+                # Rotary embeddings are relative, so an offset document only moves by rounding
+                torch.testing.assert_close(packed_logits[start:stop], alone, rtol=0, atol=1e-5)
+                checked += start > 0
+    assert checked >= 2  # documents packed behind another one were compared
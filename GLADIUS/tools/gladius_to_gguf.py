@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""
+GLADIUS -> GGUF Converter
+=========================
+
+Streams a GLADIUS model into a llama.cpp compatible GGUF file, optionally
+block-quantized, and verifies the export against the PyTorch model.
+
+- Quantization: f32, f16, q8_0 and q4_0 (ggml reference block layouts)
+- Layer-streamed writer: every tensor's shape and byte size is known up
+  front, so the header is written first and the tensors are converted,
+  quantized and written one at a time, in row chunks. Peak export memory
+  is one chunk, not a second copy of the model.
+- Verification: logits of the exported file against the PyTorch model,
+  plus file size, load time and tokens/second per quantization level,
+  by running the file through llama-cpp-python. Without it, the check
+  falls back to dequantizing the file into a GladiusModel. That only
+  measures quantization error: it says nothing about llama.cpp loading
+  the file or its speed, and the report says llama.cpp was not run.
+
+Usage:
+    python gladius_to_gguf.py models/native/gladius_final --quant q8_0
+    python gladius_to_gguf.py models/native/gladius_final --verify f16 q8_0 q4_0
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import logging
+import argparse
+import tracemalloc
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# GGUF FORMAT
+# =============================================================================
+
+GGUF_MAGIC = b"GGUF"
+GGUF_VERSION = 3
+GGUF_ALIGNMENT = 32
+QK = 32  # elements per Q8_0 / Q4_0 block
+
+# Rows are converted this many elements at a time
+CHUNK_ELEMENTS = 1 << 20
+
+
+class GGMLType(IntEnum):
+    F32 = 0
+    F16 = 1
+    Q4_0 = 2
+    Q8_0 = 8
+
+
+class ValueType(IntEnum):
+    UINT8 = 0
+    INT8 = 1
+    UINT16 = 2
+    INT16 = 3
+    UINT32 = 4
+    INT32 = 5
+    FLOAT32 = 6
+    BOOL = 7
+    STRING = 8
+    ARRAY = 9
+    UINT64 = 10
+    INT64 = 11
+    FLOAT64 = 12
+
+
+class TokenType(IntEnum):
+    NORMAL = 1
+    UNKNOWN = 2
+    CONTROL = 3
+    USER_DEFINED = 4
+    UNUSED = 5
+    BYTE = 6
+
+
+# (elements per block, bytes per block)
+BLOCK_SIZES = {
+    GGMLType.F32: (1, 4),
+    GGMLType.F16: (1, 2),
+    GGMLType.Q8_0: (QK, 2 + QK),
+    GGMLType.Q4_0: (QK, 2 + QK // 2),
+}
+
+_SCALAR_FORMATS = {
+    ValueType.UINT8: "<B", ValueType.INT8: "<b", ValueType.UINT16: "<H", ValueType.INT16: "<h",
+    ValueType.UINT32: "<I", ValueType.INT32: "<i", ValueType.FLOAT32: "<f", ValueType.BOOL: "<?",
+    ValueType.UINT64: "<Q", ValueType.INT64: "<q", ValueType.FLOAT64: "<d",
+}
+
+# --quant name -> (type of 2-D weights, general.file_type)
+QUANT_TYPES = {
+    "f32": (GGMLType.F32, 0),
+    "f16": (GGMLType.F16, 1),
+    "q4_0": (GGMLType.Q4_0, 2),
+    "q8_0": (GGMLType.Q8_0, 7),
+}
+
+
+def tensor_nbytes(shape: Tuple[int, ...], qtype: GGMLType) -> int:
+    block, size = BLOCK_SIZES[qtype]
+    n = int(np.prod(shape))
+    if shape[-1] % block:
+        raise ValueError(f"Row length {shape[-1]} is not a multiple of {block} for {qtype.name}")
+    return n // block * size
+
+
+def _pad(n: int, alignment: int = GGUF_ALIGNMENT) -> int:
+    return (alignment - n % alignment) % alignment
+
+
+# =============================================================================
+# QUANTIZATION
+# =============================================================================
+
+def _roundf(x: np.ndarray) -> np.ndarray:
+    """C roundf (halves away from zero); np.round rounds halves to even"""
+    return np.sign(x) * np.floor(np.abs(x) + 0.5)
+
+
+def quantize_q8_0(rows: np.ndarray) -> np.ndarray:
+    """Blocks of 32: fp16 scale amax/127, then 32 int8 values"""
+    blocks = rows.astype(np.float32, copy=False).reshape(-1, QK)
+    d = np.abs(blocks).max(axis=1, keepdims=True) / 127
+    with np.errstate(divide="ignore"):
+        inv = np.where(d == 0, 0, 1 / d)
+    qs = _roundf(blocks * inv).astype(np.int8)
+    return np.concatenate([d.astype(np.float16).view(np.uint8), qs.view(np.uint8)], axis=1)
+
+
+def dequantize_q8_0(data: np.ndarray) -> np.ndarray:
+    blocks = data.reshape(-1, 2 + QK)
+    d = blocks[:, :2].copy().view(np.float16).astype(np.float32)
+    return (blocks[:, 2:].view(np.int8).astype(np.float32) * d).reshape(-1)
+
+
+def quantize_q4_0(rows: np.ndarray) -> np.ndarray:
+    """
+    Blocks of 32: fp16 scale max/-8 (max by magnitude, sign kept), then
+    16 bytes of 4-bit values offset by 8; element j in the low nibble of
+    byte j, element j + 16 in the high nibble.
+    """
+    blocks = rows.astype(np.float32, copy=False).reshape(-1, QK)
+    imax = np.abs(blocks).argmax(axis=1)[:, None]
+    d = np.take_along_axis(blocks, imax, axis=1) / -8
+    with np.errstate(divide="ignore"):
+        inv = np.where(d == 0, 0, 1 / d)
+    qs = np.trunc(blocks.astype(np.float64) * inv.astype(np.float64) + 8.5).astype(np.uint8).clip(0, 15)
+    packed = qs[:, :QK // 2] | (qs[:, QK // 2:] << 4)
+    return np.concatenate([d.astype(np.float16).view(np.uint8), packed], axis=1)
+
+
+def dequantize_q4_0(data: np.ndarray) -> np.ndarray:
+    blocks = data.reshape(-1, 2 + QK // 2)
+    d = blocks[:, :2].copy().view(np.float16).astype(np.float32)
+    qs = blocks[:, 2:]
+    values = np.concatenate([qs & 0x0F, qs >> 4], axis=1).astype(np.int8) - 8
+    return (values.astype(np.float32) * d).reshape(-1)
+
+
+def encode_rows(rows: np.ndarray, qtype: GGMLType) -> np.ndarray:
+    """float32 rows -> raw tensor bytes as uint8"""
+    if qtype == GGMLType.F32:
+        return rows.astype(np.float32, copy=False).reshape(-1).view(np.uint8)
+    if qtype == GGMLType.F16:
+        return rows.astype(np.float16).reshape(-1).view(np.uint8)
+    if qtype == GGMLType.Q8_0:
+        return quantize_q8_0(rows).reshape(-1)
+    if qtype == GGMLType.Q4_0:
+        return quantize_q4_0(rows).reshape(-1)
+    raise ValueError(f"Unsupported tensor type: {qtype}")
+
+
+def decode_tensor(data: np.ndarray, qtype: GGMLType, shape: Tuple[int, ...]) -> np.ndarray:
+    """Raw tensor bytes -> float32 array of `shape`"""
+    if qtype == GGMLType.F32:
+        values = data.view(np.float32)
+    elif qtype == GGMLType.F16:
+        values = data.view(np.float16).astype(np.float32)
+    elif qtype == GGMLType.Q8_0:
+        values = dequantize_q8_0(data)
+    elif qtype == GGMLType.Q4_0:
+        values = dequantize_q4_0(data)
+    else:
+        raise ValueError(f"Unsupported tensor type: {qtype}")
+    return values.reshape(shape)
+
+
+# =============================================================================
+# STREAMING WRITER
+# =============================================================================
+
+class GGUFStreamWriter:
+    """
+    Minimal GGUF v3 writer that never holds tensor data: declare metadata
+    and tensor infos, write the header, then stream each tensor in the
+    declared order. The file is written next to the target and renamed
+    into place on close, so an interrupted export leaves no partial file.
+    """
+
+    def __init__(self, path: Path, alignment: int = GGUF_ALIGNMENT):
+        self.path = Path(path)
+        self.alignment = alignment
+        self.kv: List[Tuple[str, ValueType, Any, Optional[ValueType]]] = []
+        self.tensors: List[Tuple[str, Tuple[int, ...], GGMLType]] = []
+        self._next = 0
+        self._file = None
+        self._tmp = self.path.with_name(self.path.name + ".part")
+
+    # -- metadata ------------------------------------------------------------
+
+    def add_value(self, key: str, value: Any, vtype: ValueType):
+        self.kv.append((key, vtype, value, None))
+
+    def add_array(self, key: str, values: Iterable[Any], item_type: ValueType):
+        self.kv.append((key, ValueType.ARRAY, list(values), item_type))
+
+    def add_uint32(self, key: str, value: int):
+        self.add_value(key, int(value), ValueType.UINT32)
+
+    def add_float32(self, key: str, value: float):
+        self.add_value(key, float(value), ValueType.FLOAT32)
+
+    def add_string(self, key: str, value: str):
+        self.add_value(key, value, ValueType.STRING)
+
+    def add_tensor_info(self, name: str, shape: Tuple[int, ...], qtype: GGMLType):
+        tensor_nbytes(shape, qtype)  # validates the row length
+        self.tensors.append((name, tuple(int(s) for s in shape), qtype))
+
+    # -- encoding ------------------------------------------------------------
+
+    @staticmethod
+    def _string(value) -> bytes:
+        raw = value if isinstance(value, bytes) else str(value).encode("utf-8")
+        return struct.pack("<Q", len(raw)) + raw
+
+    def _value(self, vtype: ValueType, value: Any, item_type: Optional[ValueType] = None) -> bytes:
+        if vtype == ValueType.STRING:
+            return self._string(value)
+        if vtype == ValueType.ARRAY:
+            head = struct.pack("<IQ", item_type, len(value))
+            if item_type == ValueType.STRING:
+                return head + b"".join(self._string(v) for v in value)
+            fmt = _SCALAR_FORMATS[item_type]
+            return head + struct.pack("<" + fmt[1] * len(value), *value)
+        return struct.pack(_SCALAR_FORMATS[vtype], value)
+
+    def write_header(self):
+        """Header, metadata and tensor infos; offsets follow from the declared shapes"""
+        out = [GGUF_MAGIC, struct.pack("<IQQ", GGUF_VERSION, len(self.tensors), len(self.kv))]
+        for key, vtype, value, item_type in self.kv:
+            out += [self._string(key), struct.pack("<I", vtype), self._value(vtype, value, item_type)]
+
+        offset = 0
+        for name, shape, qtype in self.tensors:
+            dims = shape[::-1]  # ggml lists the contiguous dimension first
+            out += [self._string(name), struct.pack("<I", len(dims)),
+                    struct.pack(f"<{len(dims)}Q", *dims), struct.pack("<IQ", qtype, offset)]
+            nbytes = tensor_nbytes(shape, qtype)
+            offset += nbytes + _pad(nbytes, self.alignment)
+
+        header = b"".join(out)
+        self._file = open(self._tmp, "wb")
+        self._file.write(header + b"\0" * _pad(len(header), self.alignment))
+
+    def write_tensor(self, name: str, array: np.ndarray):
+        """Encode and write the next declared tensor, CHUNK_ELEMENTS at a time"""
+        expected, shape, qtype = self.tensors[self._next]
+        if name != expected or tuple(array.shape) != shape:
+            raise ValueError(f"Expected {expected} {shape}, got {name} {tuple(array.shape)}")
+
+        rows = array.reshape(-1, shape[-1])
+        step = max(1, CHUNK_ELEMENTS // shape[-1])
+        for start in range(0, rows.shape[0], step):
+            self._file.write(encode_rows(rows[start:start + step], qtype).tobytes())
+        self._file.write(b"\0" * _pad(tensor_nbytes(shape, qtype), self.alignment))
+        self._next += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if self._next != len(self.tensors):
+            self._tmp.unlink(missing_ok=True)
+            raise RuntimeError(f"Only {self._next} of {len(self.tensors)} tensors were written")
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._tmp.unlink(missing_ok=True)
+
+
+# =============================================================================
+# READER
+# =============================================================================
+
+def read_gguf(path: Path) -> Tuple[Dict[str, Any], Dict[str, Tuple[GGMLType, Tuple[int, ...], np.ndarray]]]:
+    """Metadata and {name: (type, shape, raw bytes)}; tensor data is memory-mapped"""
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    buf = memoryview(data)
+    pos = 0
+
+    def take(fmt: str):
+        nonlocal pos
+        values = struct.unpack_from(fmt, buf, pos)
+        pos += struct.calcsize(fmt)
+        return values if len(values) > 1 else values[0]
+
+    def string() -> str:
+        nonlocal pos
+        n = take("<Q")
+        pos += n
+        return bytes(buf[pos - n:pos]).decode("utf-8", errors="replace")
+
+    def value(vtype: int):
+        if vtype == ValueType.STRING:
+            return string()
+        if vtype == ValueType.ARRAY:
+            item_type, n = take("<IQ")
+            return [value(item_type) for _ in range(n)]
+        return take(_SCALAR_FORMATS[ValueType(vtype)])
+
+    if bytes(buf[:4]) != GGUF_MAGIC:
+        raise ValueError(f"{path} is not a GGUF file")
+    pos = 4
+    version, n_tensors, n_kv = take("<IQQ")
+    if version != GGUF_VERSION:
+        raise ValueError(f"Unsupported GGUF version {version}")
+
+    metadata = {}
+    for _ in range(n_kv):
+        key = string()
+        metadata[key] = value(take("<I"))
+
+    infos = []
+    for _ in range(n_tensors):
+        name = string()
+        n_dims = take("<I")
+        dims = struct.unpack_from(f"<{n_dims}Q", buf, pos)
+        pos += 8 * n_dims
+        qtype, offset = take("<IQ")
+        infos.append((name, tuple(dims[::-1]), GGMLType(qtype), offset))
+
+    alignment = metadata.get("general.alignment", GGUF_ALIGNMENT)
+    start = pos + _pad(pos, alignment)
+    tensors = {}
+    for name, shape, qtype, offset in infos:
+        begin = start + offset
+        tensors[name] = (qtype, shape, data[begin:begin + tensor_nbytes(shape, qtype)])
+    return metadata, tensors
+
+
+# =============================================================================
+# GLADIUS EXPORT
+# =============================================================================
+
+def tensor_name_map(num_layers: int) -> Dict[str, str]:
+    """GLADIUS state_dict names -> llama.cpp tensor names"""
+    names = {
+        "embed_tokens.weight": "token_embd.weight",
+        "norm.weight": "output_norm.weight",
+        "lm_head.weight": "output.weight",
+    }
+    for n in range(num_layers):
+        names.update({
+            f"layers.{n}.input_layernorm.weight": f"blk.{n}.attn_norm.weight",
+            f"layers.{n}.post_attention_layernorm.weight": f"blk.{n}.ffn_norm.weight",
+            f"layers.{n}.self_attn.q_proj.weight": f"blk.{n}.attn_q.weight",
+            f"layers.{n}.self_attn.k_proj.weight": f"blk.{n}.attn_k.weight",
+            f"layers.{n}.self_attn.v_proj.weight": f"blk.{n}.attn_v.weight",
+            f"layers.{n}.self_attn.o_proj.weight": f"blk.{n}.attn_output.weight",
+            f"layers.{n}.mlp.gate_proj.weight": f"blk.{n}.ffn_gate.weight",
+            f"layers.{n}.mlp.up_proj.weight": f"blk.{n}.ffn_up.weight",
+            f"layers.{n}.mlp.down_proj.weight": f"blk.{n}.ffn_down.weight",
+        })
+    return names
+
+
+def _rope_heads(gguf_name: str, config) -> int:
+    if gguf_name.endswith("attn_q.weight"):
+        return config.num_attention_heads
+    if gguf_name.endswith("attn_k.weight"):
+        return config.num_key_value_heads
+    return 0
+
+
+def permute_rope(weight: np.ndarray, n_heads: int, inverse: bool = False) -> np.ndarray:
+    """
+    GLADIUS rotates the two halves of each head (rotate_half); llama.cpp's
+    llama architecture rotates adjacent pairs. Interleaving the q/k rows of
+    every head makes both produce the same attention scores.
+    """
+    head_dim = weight.shape[0] // n_heads
+    split = (n_heads, head_dim // 2, 2) if inverse else (n_heads, 2, head_dim // 2)
+    return weight.reshape(*split, *weight.shape[1:]).swapaxes(1, 2).reshape(weight.shape)
+
+
+def tensor_type(gguf_name: str, shape: Tuple[int, ...], quant: str) -> GGMLType:
+    """Norms and other 1-D tensors stay F32; rows that don't split into blocks fall back to F16"""
+    qtype = QUANT_TYPES[quant][0]
+    if "norm" in gguf_name or len(shape) == 1:
+        return GGMLType.F32
+    if shape[-1] % BLOCK_SIZES[qtype][0]:
+        return GGMLType.F16
+    return qtype
+
+
+def add_tokenizer_metadata(writer: GGUFStreamWriter, tokenizer, vocab_size: int):
+    """Add the byte-level tokenizer to GGUF"""
+    tokens, scores, token_types = [], [], []
+
+    for idx in range(vocab_size):
+        tok = tokenizer.id_to_token.get(idx, f"<unused{idx}>")
+        tokens.append(tok.encode("utf-8"))
+        scores.append(-float(idx))
+
+        if tok == "<unk>":
+            token_types.append(int(TokenType.UNKNOWN))
+        elif tok in ["<s>", "</s>"]:
+            token_types.append(int(TokenType.CONTROL))
+        elif tok.startswith("<0x"):
+            token_types.append(int(TokenType.BYTE))
+        elif tok.startswith("<unused"):
+            token_types.append(int(TokenType.UNUSED))
+        else:
+            token_types.append(int(TokenType.NORMAL))
+
+    writer.add_string("tokenizer.ggml.model", "llama")
+    writer.add_array("tokenizer.ggml.tokens", tokens, ValueType.STRING)
+    writer.add_array("tokenizer.ggml.scores", scores, ValueType.FLOAT32)
+    writer.add_array("tokenizer.ggml.token_type", token_types, ValueType.INT32)
+    writer.add_uint32("tokenizer.ggml.bos_token_id", tokenizer.bos_id)
+    writer.add_uint32("tokenizer.ggml.eos_token_id", tokenizer.eos_id)
+    writer.add_uint32("tokenizer.ggml.padding_token_id", tokenizer.unk_id)
+
+    logger.info(f"Added tokenizer with {vocab_size} tokens")
+
+
+def write_gguf(output_path: Path, state_dict: Mapping[str, torch.Tensor], config, tokenizer,
+               quant: str = "f16") -> Dict[str, Any]:
+    """
+    Write `state_dict` (tensors may live on any device, or be mmap-loaded)
+    as a llama-architecture GGUF file. Tensors are moved to the CPU,
+    converted and written one at a time.
+    """
+    if quant not in QUANT_TYPES:
+        raise ValueError(f"Unknown quantization {quant!r}; choose from {', '.join(QUANT_TYPES)}")
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = GGUFStreamWriter(output_path)
+
+    writer.add_string("general.architecture", "llama")
+    writer.add_string("general.name", "GLADIUS")
+    writer.add_string("general.author", "Artifact Virtual")
+    writer.add_string("general.description", "GLADIUS native model - llama.cpp compatible")
+    writer.add_uint32("general.file_type", QUANT_TYPES[quant][1])
+    writer.add_uint32("general.quantization_version", 2)
+
+    # Architecture metadata
+    writer.add_uint32("llama.context_length", config.max_position_embeddings)
+    writer.add_uint32("llama.embedding_length", config.hidden_size)
+    writer.add_uint32("llama.block_count", config.num_hidden_layers)
+    writer.add_uint32("llama.feed_forward_length", config.intermediate_size)
+    writer.add_uint32("llama.attention.head_count", config.num_attention_heads)
+    writer.add_uint32("llama.attention.head_count_kv", config.num_key_value_heads)
+    writer.add_uint32("llama.rope.dimension_count", config.head_dim)
+    writer.add_float32("llama.attention.layer_norm_rms_epsilon", config.rms_norm_eps)
+    writer.add_float32("llama.rope.freq_base", config.rope_theta)
+    writer.add_uint32("llama.vocab_size", config.vocab_size)
+
+    add_tokenizer_metadata(writer, tokenizer, config.vocab_size)
+
+    names = tensor_name_map(config.num_hidden_layers)
+    plan = [(name, names[name]) for name in state_dict if name in names]
+    counts: Dict[str, int] = {}
+    for name, gguf_name in plan:
+        shape = tuple(state_dict[name].shape)
+        qtype = tensor_type(gguf_name, shape, quant)
+        writer.add_tensor_info(gguf_name, shape, qtype)
+        counts[qtype.name] = counts.get(qtype.name, 0) + 1
+
+    logger.info(f"Streaming {len(plan)} tensors to GGUF ({quant}): {counts}")
+    try:
+        writer.write_header()
+        for name, gguf_name in plan:
+            array = state_dict[name].detach().to("cpu", torch.float32).numpy()
+            heads = _rope_heads(gguf_name, config)
+            if heads:
+                array = permute_rope(array, heads)
+            writer.write_tensor(gguf_name, array)
+            del array
+        writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+    return {"path": str(output_path), "quant": quant, "tensors": len(plan), "types": counts,
+            "size_mb": round(output_path.stat().st_size / 1024 / 1024, 2)}
+
+
+def load_gguf_state_dict(path: Path, config) -> Dict[str, torch.Tensor]:
+    """Dequantize a GLADIUS GGUF file back into a float32 state_dict"""
+    _, tensors = read_gguf(path)
+    names = tensor_name_map(config.num_hidden_layers)
+    state = {}
+    for name, gguf_name in names.items():
+        if gguf_name not in tensors:
+            continue
+        qtype, shape, data = tensors[gguf_name]
+        array = decode_tensor(data, qtype, shape)
+        heads = _rope_heads(gguf_name, config)
+        if heads:
+            array = permute_rope(array, heads, inverse=True)
+        state[name] = torch.from_numpy(np.array(array, dtype=np.float32))
+    return state
+
+
+# =============================================================================
+# VERIFICATION
+# =============================================================================
+
+def _llama_cpp():
+    try:
+        from llama_cpp import Llama
+        return Llama
+    except ImportError:
+        return None
+
+
+def _logit_metrics(logits: np.ndarray, reference: np.ndarray) -> Dict[str, float]:
+    diff = np.abs(logits - reference)
+    cosine = (logits * reference).sum(-1) / (np.linalg.norm(logits, axis=-1) * np.linalg.norm(reference, axis=-1))
+    return {
+        "max_abs_logit_diff": round(float(diff.max()), 5),
+        "mean_abs_logit_diff": round(float(diff.mean()), 6),
+        "min_cosine": round(float(cosine.min()), 6),
+        "top1_agreement": round(float((logits.argmax(-1) == reference.argmax(-1)).mean()), 4),
+    }
+
+
+@torch.no_grad()
+def _greedy_tokens_per_sec(model: torch.nn.Module, input_ids: List[int], new_tokens: int) -> float:
+    ids = torch.tensor([input_ids])
+    start = time.perf_counter()
+    for _ in range(new_tokens):
+        next_id = model(ids)["logits"][:, -1].argmax(-1, keepdim=True)
+        ids = torch.cat([ids, next_id], dim=1)
+    return new_tokens / (time.perf_counter() - start)
+
+
+@torch.no_grad()
+def verify_gguf(path: Path, model: torch.nn.Module, input_ids: List[int], new_tokens: int = 16,
+                reference: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Compare the logits of an exported file with `model` on `input_ids`
+    and measure its load time and greedy tokens/second in llama.cpp.
+
+    Without llama-cpp-python only the quantization error is checked
+    ("check": "quantization_error_only"); load_sec and tokens_per_sec
+    are then left out rather than reporting PyTorch figures.
+    """
+    if reference is None:
+        model.eval()
+        device = next(model.parameters()).device
+        reference = model(torch.tensor([input_ids], device=device))["logits"][0].float().cpu().numpy()
+
+    Llama = _llama_cpp()
+    result = {"file_size_mb": round(Path(path).stat().st_size / 1024 / 1024, 2)}
+    if Llama is not None:
+        start = time.perf_counter()
+        llm = Llama(model_path=str(path), n_ctx=max(512, len(input_ids) + new_tokens),
+                    logits_all=True, verbose=False)
+        result["load_sec"] = round(time.perf_counter() - start, 3)
+        llm.eval(input_ids)
+        logits = np.array(llm.scores[:len(input_ids)], dtype=np.float32)
+        llm.reset()
+        start = time.perf_counter()
+        completion = llm.create_completion(input_ids, max_tokens=new_tokens, temperature=0.0)
+        generated = completion["usage"]["completion_tokens"]
+        result["tokens_per_sec"] = round(generated / (time.perf_counter() - start), 1)
+        result["runtime"] = "llama.cpp"
+        result["check"] = "llama_cpp_inference"
+    else:
+        # No llama.cpp here: read the file back, dequantize it into a fresh model
+        # and compare logits. This bounds the quantization error only.
+        logger.warning("llama-cpp-python is not installed; %s is checked for quantization error only", path)
+        restored = type(model)(model.config)
+        restored.load_state_dict(load_gguf_state_dict(path, model.config), strict=False)
+        restored.eval()
+        logits = restored(torch.tensor([input_ids]))["logits"][0].numpy()
+        result["runtime"] = "pytorch (dequantized)"
+        result["check"] = "quantization_error_only"
+        result["llama_cpp"] = "not run: llama-cpp-python is not installed"
+
+    result.update(_logit_metrics(logits, reference))
+    return result
+
+
+def benchmark_gguf_export(model: torch.nn.Module, tokenizer, out_dir: Path,
+                          quants: Iterable[str] = ("f16", "q8_0", "q4_0"),
+                          prompt: str = "GLADIUS is the native model of Artifact Virtual.",
+                          new_tokens: int = 16) -> Dict[str, Any]:
+    """
+    Export `model` once per quantization level and report file size,
+    export time and peak export allocations, the logit error of each
+    against the PyTorch model and, when llama.cpp is installed, its load
+    time and tokens/second.
+    """
+    config = model.config
+    out_dir = Path(out_dir)
+    input_ids = tokenizer.encode(prompt, add_eos=False)
+
+    model.eval()
+    device = next(model.parameters()).device
+    with torch.no_grad():
+        reference = model(torch.tensor([input_ids], device=device))["logits"][0].float().cpu().numpy()
+
+    weights_mb = sum(t.numel() * 4 for t in model.state_dict().values()) / 1024 / 1024
+    report: Dict[str, Any] = {"params_m": round(config.total_params / 1e6, 1),
+                              "fp32_state_dict_mb": round(weights_mb, 1),
+                              "prompt_tokens": len(input_ids), "new_tokens": new_tokens}
+    if device.type == "cpu":
+        report["pytorch_tokens_per_sec"] = round(_greedy_tokens_per_sec(model, input_ids, new_tokens), 1)
+
+    for quant in quants:
+        path = out_dir / f"gladius-{quant}.gguf"
+        tracemalloc.start()
+        start = time.perf_counter()
+        write_gguf(path, model.state_dict(), config, tokenizer, quant)
+        export_sec = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        entry = {"export_sec": round(export_sec, 2), "export_peak_alloc_mb": round(peak / 1024 / 1024, 1)}
+        entry.update(verify_gguf(path, model, input_ids, new_tokens, reference=reference))
+        report[quant] = entry
+        logger.info(f"{quant}: {entry}")
+    return report
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def _load_saved_model(model_dir: Path):
+    """Config, tokenizer and a memory-mapped state_dict from GladiusTrainer.save_model()"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "training"))
+    from gladius_trainer import GladiusConfig, LlamaTokenizer
+
+    with open(model_dir / "config.json") as f:
+        config = GladiusConfig(**json.load(f))
+    tokenizer = LlamaTokenizer.load(model_dir / "tokenizer.json")
+    state_dict = torch.load(model_dir / "model.pt", map_location="cpu", mmap=True, weights_only=True)
+    return config, tokenizer, state_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a saved GLADIUS model to GGUF")
+    parser.add_argument("model_dir", type=Path, help="Directory with model.pt, config.json and tokenizer.json")
+    parser.add_argument("--quant", choices=list(QUANT_TYPES), default="f16", help="Weight type of the export")
+    parser.add_argument("--output", type=Path, default=None, help="Output .gguf path")
+    parser.add_argument("--verify", nargs="*", choices=list(QUANT_TYPES), default=None,
+                        help="Export each level (default f16 q8_0 q4_0) and compare it with the PyTorch model")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    config, tokenizer, state_dict = _load_saved_model(args.model_dir)
+
+    if args.verify is not None:
+        from gladius_trainer import GladiusModel
+        model = GladiusModel(config)
+        model.load_state_dict(state_dict)
+        out_dir = args.output or args.model_dir / "gguf_verify"
+        print(json.dumps(benchmark_gguf_export(model, tokenizer, out_dir,
+                                               quants=args.verify or ("f16", "q8_0", "q4_0")), indent=2))
+        return
+
+    output = args.output or args.model_dir / f"gladius-{args.quant}.gguf"
+    print(json.dumps(write_gguf(output, state_dict, config, tokenizer, args.quant), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ import math
 import time
 import logging
 import argparse
+import functools
 import threading
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
@@ -33,7 +34,7 @@ from collections import deque
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, IterableDataset, get_worker_info
 
 # =============================================================================
 # TERMINAL DISPLAY SYSTEM
@@ -433,6 +434,10 @@ GGUF_PY_PATH = GLADIUS_DIR / "tools" / "llama.cpp" / "gguf-py"
 if GGUF_PY_PATH.exists():
     sys.path.insert(0, str(GGUF_PY_PATH))
 
+# GGUF converter (tools/gladius_to_gguf.py)
+TOOLS_DIR = GLADIUS_DIR / "tools"
+sys.path.append(str(TOOLS_DIR))
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -607,15 +612,46 @@ def apply_rotary_pos_emb(q: torch.Tensor, k: torch.Tensor, cos: torch.Tensor, si
     return q_embed, k_embed
 
 
+# Attention backend: "sdpa" uses PyTorch's fused scaled_dot_product_attention,
+# "eager" the explicit matmul/softmax path. Override with GLADIUS_ATTN.
+ATTN_IMPLEMENTATION = os.environ.get("GLADIUS_ATTN", "sdpa")
+_HAS_SDPA = hasattr(F, "scaled_dot_product_attention")
+# enable_gqa lets SDPA broadcast K/V heads itself (PyTorch >= 2.5)
+_SDPA_GQA = _HAS_SDPA and tuple(int(p) for p in torch.__version__.split("+")[0].split(".")[:2]) >= (2, 5)
+
+
+@functools.lru_cache(maxsize=16)
+def causal_mask(seq_len: int, device: torch.device, groups: int = 1) -> torch.Tensor:
+    """
+    Boolean mask, True where a query may attend, shared by every layer.
+    With groups > 1 the rows repeat once per query head folded onto a K/V head.
+    """
+    mask = torch.ones(seq_len, seq_len, dtype=torch.bool, device=device).tril()
+    return mask.repeat(groups, 1) if groups > 1 else mask
+
+
+def document_attention_mask(segment_ids: torch.Tensor) -> torch.Tensor:
+    """
+    Causal mask that keeps packed documents apart: (batch, 1, s, s), True
+    where a token may attend, i.e. earlier positions of its own segment.
+    """
+    seq_len = segment_ids.shape[1]
+    same_segment = segment_ids.unsqueeze(2) == segment_ids.unsqueeze(1)
+    return (same_segment & causal_mask(seq_len, segment_ids.device)).unsqueeze(1)
+
+
 class GladiusAttention(nn.Module):
     """Multi-head attention with GQA support"""
-    def __init__(self, config: GladiusConfig):
+    def __init__(self, config: GladiusConfig, implementation: Optional[str] = None):
         super().__init__()
         self.hidden_size = config.hidden_size
         self.num_heads = config.num_attention_heads
         self.num_kv_heads = config.num_key_value_heads
         self.head_dim = config.head_dim
         self.num_kv_groups = self.num_heads // self.num_kv_heads
+        self.implementation = implementation or ATTN_IMPLEMENTATION
+        if self.implementation == "sdpa" and not _HAS_SDPA:
+            self.implementation = "eager"
         
         self.q_proj = nn.Linear(self.hidden_size, self.num_heads * self.head_dim, bias=False)
         self.k_proj = nn.Linear(self.hidden_size, self.num_kv_heads * self.head_dim, bias=False)
@@ -634,23 +670,53 @@ class GladiusAttention(nn.Module):
         cos, sin = self.rotary_emb(x, seq_len)
         q, k = apply_rotary_pos_emb(q, k, cos.unsqueeze(0).unsqueeze(0), sin.unsqueeze(0).unsqueeze(0))
         
+        if self.implementation == "sdpa":
+            out = self._sdpa_attention(q, k, v, attention_mask)
+        else:
+            out = self._eager_attention(q, k, v, attention_mask)
+        out = out.transpose(1, 2).contiguous().view(batch, seq_len, -1)
+        
+        return self.o_proj(out)
+    
+    def _fold_groups(self, q: torch.Tensor) -> torch.Tensor:
+        """
+        GQA without repeating K/V: query heads sharing a K/V head are stacked
+        along the sequence axis, (b, heads, s, d) -> (b, kv_heads, groups * s, d)
+        """
+        batch, _, seq_len, _ = q.shape
+        return q.reshape(batch, self.num_kv_heads, self.num_kv_groups * seq_len, self.head_dim)
+    
+    def _sdpa_attention(self, q: torch.Tensor, k: torch.Tensor, v: torch.Tensor,
+                        attention_mask: Optional[torch.Tensor] = None) -> torch.Tensor:
+        # attention_mask, if given, is a full (batch, 1, s, s) mask from document_attention_mask
+        causal = attention_mask is None
+        if self.num_kv_groups == 1:
+            return F.scaled_dot_product_attention(q, k, v, attn_mask=attention_mask, is_causal=causal)
+        if _SDPA_GQA:
+            return F.scaled_dot_product_attention(q, k, v, attn_mask=attention_mask, is_causal=causal,
+                                                  enable_gqa=True)
+        
+        if causal:
+            mask = causal_mask(q.shape[2], q.device, self.num_kv_groups)
+        else:
+            mask = attention_mask.repeat(1, 1, self.num_kv_groups, 1)
+        out = F.scaled_dot_product_attention(self._fold_groups(q), k, v, attn_mask=mask)
+        return out.view(q.shape)
+    
+    def _eager_attention(self, q: torch.Tensor, k: torch.Tensor, v: torch.Tensor,
+                         attention_mask: Optional[torch.Tensor] = None) -> torch.Tensor:
         # GQA: expand k, v
         if self.num_kv_groups > 1:
             k = k.repeat_interleave(self.num_kv_groups, dim=1)
             v = v.repeat_interleave(self.num_kv_groups, dim=1)
         
-        # Attention
+        if attention_mask is None:
+            attention_mask = causal_mask(q.shape[2], q.device)
         attn_weights = torch.matmul(q, k.transpose(-2, -1)) / math.sqrt(self.head_dim)
-        
-        # Causal mask
-        causal_mask = torch.triu(torch.ones(seq_len, seq_len, device=x.device), diagonal=1).bool()
-        attn_weights = attn_weights.masked_fill(causal_mask, float('-inf'))
+        attn_weights = attn_weights.masked_fill(~attention_mask, float('-inf'))
         
         attn_weights = F.softmax(attn_weights, dim=-1)
-        out = torch.matmul(attn_weights, v)
-        out = out.transpose(1, 2).contiguous().view(batch, seq_len, -1)
-        
-        return self.o_proj(out)
+        return torch.matmul(attn_weights, v)
 
 
 class GladiusMLP(nn.Module):
@@ -674,8 +740,8 @@ class GladiusBlock(nn.Module):
         self.post_attention_layernorm = RMSNorm(config.hidden_size, config.rms_norm_eps)
         self.mlp = GladiusMLP(config)
     
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        x = x + self.self_attn(self.input_layernorm(x))
+    def forward(self, x: torch.Tensor, attention_mask: Optional[torch.Tensor] = None) -> torch.Tensor:
+        x = x + self.self_attn(self.input_layernorm(x), attention_mask)
         x = x + self.mlp(self.post_attention_layernorm(x))
         return x
 
@@ -697,17 +763,25 @@ class GladiusModel(nn.Module):
         # Initialize
         self.apply(self._init_weights)
     
+    def set_attn_implementation(self, implementation: str):
+        """Switch every layer between the "sdpa" and "eager" attention paths"""
+        for layer in self.layers:
+            layer.self_attn.implementation = implementation if _HAS_SDPA else "eager"
+    
     def _init_weights(self, module):
         if isinstance(module, nn.Linear):
             torch.nn.init.normal_(module.weight, mean=0.0, std=0.02)
         elif isinstance(module, nn.Embedding):
             torch.nn.init.normal_(module.weight, mean=0.0, std=0.02)
     
-    def forward(self, input_ids: torch.Tensor, labels: Optional[torch.Tensor] = None):
+    def forward(self, input_ids: torch.Tensor, labels: Optional[torch.Tensor] = None,
+                segment_ids: Optional[torch.Tensor] = None):
+        """segment_ids marks packed documents; tokens only attend within their own"""
         x = self.embed_tokens(input_ids)
+        attention_mask = document_attention_mask(segment_ids) if segment_ids is not None else None
         
         for layer in self.layers:
-            x = layer(x)
+            x = layer(x, attention_mask)
         
         x = self.norm(x)
         logits = self.lm_head(x)
@@ -850,6 +924,208 @@ class GladiusDataset(Dataset):
         return {"input_ids": tokens, "labels": tokens.clone()}
 
 
+# Pre-tokenized corpus layout, next to the JSONL file:
+#   <stem>.tokens.bin   all documents' token ids back to back (uint16/uint32)
+#   <stem>.idx.bin      int64 offsets, document i is tokens[idx[i]:idx[i + 1]]
+#   <stem>.tokens.json  dtype, counts and the source/tokenizer it was built from
+
+def pretokenized_paths(data_path: Path) -> Dict[str, Path]:
+    data_path = Path(data_path)
+    return {
+        "tokens": data_path.with_name(data_path.stem + ".tokens.bin"),
+        "index": data_path.with_name(data_path.stem + ".idx.bin"),
+        "meta": data_path.with_name(data_path.stem + ".tokens.json"),
+    }
+
+
+_pretokenize_tokenizer = None
+
+
+def _pretokenize_init(tokenizer: "LlamaTokenizer"):
+    global _pretokenize_tokenizer
+    _pretokenize_tokenizer = tokenizer
+
+
+def _pretokenize_lines(lines: List[str]) -> List[List[int]]:
+    docs = []
+    for line in lines:
+        try:
+            text = json.loads(line).get("text", "")
+        except json.JSONDecodeError:
+            continue
+        if text:
+            docs.append(_pretokenize_tokenizer.encode(text, add_bos=True, add_eos=True))
+    return docs
+
+
+def _read_line_batches(data_path: Path, batch_lines: int):
+    batch = []
+    with open(data_path) as f:
+        for line in f:
+            batch.append(line)
+            if len(batch) >= batch_lines:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _source_fingerprint(data_path: Path, tokenizer: "LlamaTokenizer") -> Dict[str, Any]:
+    st = os.stat(data_path)
+    return {"source": str(Path(data_path).resolve()), "source_size": st.st_size,
+            "source_mtime_ns": st.st_mtime_ns, "vocab_size": tokenizer.vocab_size}
+
+
+def pretokenize_corpus(data_path: Path, tokenizer: "LlamaTokenizer", workers: Optional[int] = None,
+                       batch_lines: int = 1024, force: bool = False) -> Path:
+    """
+    Tokenize a JSONL corpus once into a memory-mappable token file plus a
+    document index, in a streaming pass with `workers` processes.
+    Returns the token file; an up-to-date existing one is reused.
+    """
+    import numpy as np
+    import multiprocessing
+    
+    data_path = Path(data_path)
+    paths = pretokenized_paths(data_path)
+    fingerprint = _source_fingerprint(data_path, tokenizer)
+    if not force and paths["meta"].exists() and paths["tokens"].exists():
+        with open(paths["meta"]) as f:
+            meta = json.load(f)
+        if all(meta.get(k) == v for k, v in fingerprint.items()):
+            return paths["tokens"]
+    
+    dtype = np.uint16 if tokenizer.vocab_size <= np.iinfo(np.uint16).max + 1 else np.uint32
+    workers = workers or max(1, (os.cpu_count() or 1) - 1)
+    logger.info(f"Pre-tokenizing {data_path} with {workers} worker(s)")
+    
+    start = time.time()
+    n_docs = n_tokens = 0
+    tmp_tokens = paths["tokens"].with_suffix(".bin.tmp")
+    tmp_index = paths["index"].with_suffix(".bin.tmp")
+    pool = multiprocessing.Pool(workers, _pretokenize_init, (tokenizer,)) if workers > 1 else None
+    try:
+        if pool is None:
+            _pretokenize_init(tokenizer)
+            batches = map(_pretokenize_lines, _read_line_batches(data_path, batch_lines))
+        else:
+            batches = pool.imap(_pretokenize_lines, _read_line_batches(data_path, batch_lines))
+        with open(tmp_tokens, "wb") as tok_f, open(tmp_index, "wb") as idx_f:
+            idx_f.write(np.zeros(1, dtype=np.int64).tobytes())
+            for docs in batches:
+                if not docs:
+                    continue
+                lengths = np.fromiter((len(d) for d in docs), dtype=np.int64, count=len(docs))
+                tok_f.write(np.fromiter((t for d in docs for t in d), dtype=dtype, count=int(lengths.sum())).tobytes())
+                idx_f.write((n_tokens + np.cumsum(lengths)).tobytes())
+                n_docs += len(docs)
+                n_tokens += int(lengths.sum())
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    
+    os.replace(tmp_tokens, paths["tokens"])
+    os.replace(tmp_index, paths["index"])
+    with open(paths["meta"], "w") as f:
+        json.dump({**fingerprint, "dtype": np.dtype(dtype).name, "documents": n_docs, "tokens": n_tokens}, f, indent=2)
+    logger.info(f"Pre-tokenized {n_docs} documents, {n_tokens} tokens in {time.time() - start:.1f}s")
+    return paths["tokens"]
+
+
+class PackedGladiusDataset(IterableDataset):
+    """
+    Streams a pre-tokenized corpus as fully packed sequences.
+    
+    Documents are concatenated into `max_length` sequences, long ones split
+    across sequences, so only the final sequence of each worker has padding.
+    Each sample carries `segment_ids` (0 for padding) that the model turns
+    into a block-diagonal causal mask, and the first token of every document
+    is excluded from the loss so nothing is predicted across a boundary.
+    Token data is memory-mapped and every DataLoader worker reads its own
+    shard of the shuffled documents.
+    """
+    def __init__(self, data_path: Path, max_length: int = 512, shuffle: bool = True, seed: int = 0,
+                 pad_id: int = 0):
+        import numpy as np
+        
+        paths = pretokenized_paths(data_path)
+        with open(paths["meta"]) as f:
+            self.meta = json.load(f)
+        self.tokens_path = paths["tokens"]
+        self.index_path = paths["index"]
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.max_length = max_length
+        self.shuffle = shuffle
+        self.seed = seed
+        self.pad_id = pad_id
+        self.epoch = 0
+    
+    def set_epoch(self, epoch: int):
+        """Reshuffle documents differently for each epoch"""
+        self.epoch = epoch
+    
+    def __len__(self):
+        """
+        Sequences per epoch, assuming a single reader. It is approximate:
+        each of N DataLoader workers ends on its own partial sequence and
+        partial batch, so an epoch can run up to N - 1 batches past
+        len(dataloader). Fine for progress display; anything that must not
+        overrun (an LR schedule) needs headroom or to count real steps.
+        """
+        return max(1, math.ceil(self.meta["tokens"] / self.max_length))
+    
+    def _document_order(self, n_docs: int):
+        import numpy as np
+        
+        order = np.arange(n_docs)
+        if self.shuffle:
+            np.random.default_rng(self.seed + self.epoch).shuffle(order)
+        worker = get_worker_info()
+        if worker is not None:
+            order = order[worker.id::worker.num_workers]
+        return order
+    
+    def __iter__(self):
+        import numpy as np
+        
+        tokens = np.memmap(self.tokens_path, dtype=self.dtype, mode="r")
+        offsets = np.memmap(self.index_path, dtype=np.int64, mode="r")
+        
+        length = self.max_length
+        input_ids = np.full(length, self.pad_id, dtype=np.int64)
+        labels = np.full(length, self.pad_id, dtype=np.int64)
+        segment_ids = np.zeros(length, dtype=np.int64)
+        filled = segment = 0
+        
+        for doc in self._document_order(len(offsets) - 1):
+            start, end = int(offsets[doc]), int(offsets[doc + 1])
+            while start < end:
+                take = min(end - start, length - filled)
+                input_ids[filled:filled + take] = tokens[start:start + take]
+                labels[filled:filled + take] = input_ids[filled:filled + take]
+                # Never predict a segment's first token from the previous segment
+                labels[filled] = self.pad_id
+                segment += 1
+                segment_ids[filled:filled + take] = segment
+                filled += take
+                start += take
+                
+                if filled == length:
+                    yield {"input_ids": torch.from_numpy(input_ids.copy()),
+                           "labels": torch.from_numpy(labels.copy()),
+                           "segment_ids": torch.from_numpy(segment_ids.copy())}
+                    input_ids.fill(self.pad_id)
+                    labels.fill(self.pad_id)
+                    segment_ids.fill(0)
+                    filled = segment = 0
+        
+        if filled:
+            yield {"input_ids": torch.from_numpy(input_ids),
+                   "labels": torch.from_numpy(labels),
+                   "segment_ids": torch.from_numpy(segment_ids)}
+
+
 # =============================================================================
 # UNIFIED TRAINER
 # =============================================================================
@@ -927,17 +1203,36 @@ class GladiusTrainer:
         return self.base_lr
     
     def train(self, data_path: Path, epochs: int = 3, batch_size: int = None, 
-              max_length: int = 256, animated: bool = True):
-        """Train the model with animated display"""
+              max_length: int = 256, animated: bool = True, packed: bool = True,
+              num_workers: Optional[int] = None):
+        """
+        Train the model with animated display.
+        
+        With `packed` the JSONL corpus is pre-tokenized once (reused while
+        unchanged) and streamed as packed sequences; otherwise every sample
+        is tokenized on the fly and padded to `max_length`.
+        """
         if batch_size is None:
             batch_size = self.device_info["recommended_batch_size"]
         
-        dataset = GladiusDataset(data_path, self.tokenizer, max_length)
-        dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True, 
-                               num_workers=2 if self.device.type == "cuda" else 0,
-                               pin_memory=self.device.type == "cuda")
+        if packed:
+            pretokenize_corpus(data_path, self.tokenizer)
+            dataset = PackedGladiusDataset(data_path, max_length, pad_id=self.tokenizer.unk_id)
+            if num_workers is None:
+                num_workers = min(2, max(0, (os.cpu_count() or 1) - 1))
+            dataloader = DataLoader(dataset, batch_size=batch_size, num_workers=num_workers,
+                                   pin_memory=self.device.type == "cuda")
+        else:
+            dataset = GladiusDataset(data_path, self.tokenizer, max_length)
+            if num_workers is None:
+                num_workers = 2 if self.device.type == "cuda" else 0
+            dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True, 
+                                   num_workers=num_workers,
+                                   pin_memory=self.device.type == "cuda")
         
         self.model.train()
+        # Approximate with packed data and several loader workers (see
+        # PackedGladiusDataset.__len__); only the progress display uses it.
         total_steps = len(dataloader) * epochs
         
         # Initialize display and metrics
@@ -959,6 +1254,7 @@ class GladiusTrainer:
         logger.info(f"  Epochs: {epochs}")
         logger.info(f"  Batch size: {batch_size}")
         logger.info(f"  Total steps: {total_steps}")
+        logger.info(f"  Packed sequences: {packed} ({num_workers} loader workers)")
         logger.info(f"  Mixed precision: {self.use_amp}")
         
         try:
@@ -966,17 +1262,21 @@ class GladiusTrainer:
                 self.metrics.start_epoch(epoch + 1)
                 epoch_loss = 0
                 step_in_epoch = 0
+                if packed:
+                    dataset.set_epoch(epoch)
                 
                 for batch in dataloader:
                     input_ids = batch["input_ids"].to(self.device)
                     labels = batch["labels"].to(self.device)
-                    batch_tokens = input_ids.numel()
+                    segment_ids = batch["segment_ids"].to(self.device) if "segment_ids" in batch else None
+                    # Effective tokens: padding is not counted
+                    batch_tokens = int((input_ids != self.tokenizer.unk_id).sum())
                     
                     self.optimizer.zero_grad()
                     
                     if self.use_amp:
                         with torch.cuda.amp.autocast():
-                            outputs = self.model(input_ids, labels=labels)
+                            outputs = self.model(input_ids, labels=labels, segment_ids=segment_ids)
                             loss = outputs["loss"]
                         self.scaler.scale(loss).backward()
                         self.scaler.unscale_(self.optimizer)
@@ -984,7 +1284,7 @@ class GladiusTrainer:
                         self.scaler.step(self.optimizer)
                         self.scaler.update()
                     else:
-                        outputs = self.model(input_ids, labels=labels)
+                        outputs = self.model(input_ids, labels=labels, segment_ids=segment_ids)
                         loss = outputs["loss"]
                         loss.backward()
                         torch.nn.utils.clip_grad_norm_(self.model.parameters(), 1.0)
@@ -1122,130 +1422,204 @@ class GladiusTrainer:
         
         logger.info(f"Model saved: {path}")
     
-    def export_gguf(self, output_path: Path = None) -> Path:
-        """Export model to GGUF format"""
-        try:
-            from gguf import GGUFWriter, GGMLQuantizationType, TokenType
-        except ImportError:
-            logger.error("gguf package not found. Install from llama.cpp/gguf-py")
-            return None
+    def export_gguf(self, output_path: Path = None, quant: str = "f16") -> Path:
+        """
+        Export model to GGUF format, streamed one tensor at a time.
+        `quant` is the weight type: f32, f16, q8_0 or q4_0.
+        """
+        from gladius_to_gguf import write_gguf
         
         if output_path is None:
             params_m = self.config.total_params / 1e6
-            output_path = OUTPUT_DIR / f"gladius1.1-{int(params_m)}M.gguf"
-        
-        import numpy as np
+            suffix = "" if quant == "f16" else f"-{quant}"
+            output_path = OUTPUT_DIR / f"gladius1.1-{int(params_m)}M{suffix}.gguf"
         
         logger.info(f"Exporting to GGUF: {output_path}")
-        
-        writer = GGUFWriter(str(output_path), "llama")
-        
-        # Architecture metadata
-        writer.add_context_length(self.config.max_position_embeddings)
-        writer.add_embedding_length(self.config.hidden_size)
-        writer.add_block_count(self.config.num_hidden_layers)
-        writer.add_feed_forward_length(self.config.intermediate_size)
-        writer.add_head_count(self.config.num_attention_heads)
-        writer.add_head_count_kv(self.config.num_key_value_heads)
-        writer.add_rope_dimension_count(self.config.head_dim)
-        writer.add_layer_norm_rms_eps(self.config.rms_norm_eps)
-        writer.add_rope_freq_base(self.config.rope_theta)
-        writer.add_vocab_size(self.config.vocab_size)
-        writer.add_name("GLADIUS")
-        writer.add_author("Artifact Virtual")
-        writer.add_description("GLADIUS native model - llama.cpp compatible")
-        
-        # Tokenizer
-        self._add_tokenizer_to_gguf(writer, TokenType)
-        
-        # Tensor mappings
-        tensor_map = {
-            "embed_tokens.weight": "token_embd.weight",
-            "norm.weight": "output_norm.weight",
-            "lm_head.weight": "output.weight",
-        }
-        for n in range(self.config.num_hidden_layers):
-            tensor_map.update({
-                f"layers.{n}.input_layernorm.weight": f"blk.{n}.attn_norm.weight",
-                f"layers.{n}.post_attention_layernorm.weight": f"blk.{n}.ffn_norm.weight",
-                f"layers.{n}.self_attn.q_proj.weight": f"blk.{n}.attn_q.weight",
-                f"layers.{n}.self_attn.k_proj.weight": f"blk.{n}.attn_k.weight",
-                f"layers.{n}.self_attn.v_proj.weight": f"blk.{n}.attn_v.weight",
-                f"layers.{n}.self_attn.o_proj.weight": f"blk.{n}.attn_output.weight",
-                f"layers.{n}.mlp.gate_proj.weight": f"blk.{n}.ffn_gate.weight",
-                f"layers.{n}.mlp.up_proj.weight": f"blk.{n}.ffn_up.weight",
-                f"layers.{n}.mlp.down_proj.weight": f"blk.{n}.ffn_down.weight",
-            })
-        
-        skip_patterns = ["rotary_emb"]
-        
-        logger.info("Adding tensors to GGUF...")
-        state_dict = self.model.state_dict()
-        tensor_count = 0
-        
-        for name, tensor in state_dict.items():
-            if any(skip in name for skip in skip_patterns):
-                continue
-            
-            gguf_name = tensor_map.get(name)
-            if not gguf_name:
-                continue
-            
-            tensor_cpu = tensor.cpu()
-            if "norm" in gguf_name or tensor_cpu.dim() == 1:
-                data = tensor_cpu.numpy().astype(np.float32)
-                writer.add_tensor(gguf_name, data, raw_dtype=GGMLQuantizationType.F32)
-            else:
-                data = tensor_cpu.float().numpy().astype(np.float16)
-                writer.add_tensor(gguf_name, data, raw_dtype=GGMLQuantizationType.F16)
-            tensor_count += 1
-        
-        logger.info(f"Added {tensor_count} tensors")
-        
-        writer.write_header_to_file()
-        writer.write_kv_data_to_file()
-        writer.write_tensors_to_file()
-        writer.close()
-        
-        size_mb = output_path.stat().st_size / 1024 / 1024
-        logger.info(f"✓ GGUF exported: {output_path} ({size_mb:.1f} MB)")
+        info = write_gguf(output_path, self.model.state_dict(), self.config, self.tokenizer, quant)
+        logger.info(f"✓ GGUF exported: {output_path} ({info['size_mb']:.1f} MB, {info['types']})")
         return output_path
     
-    def _add_tokenizer_to_gguf(self, writer, TokenType):
-        """Add tokenizer to GGUF"""
-        tokens, scores, token_types = [], [], []
-        
-        for idx in range(self.config.vocab_size):
-            tok = self.tokenizer.id_to_token.get(idx, f"<unused{idx}>")
-            tokens.append(tok.encode('utf-8'))
-            scores.append(-float(idx))
-            
-            if tok == "<unk>":
-                token_types.append(int(TokenType.UNKNOWN))
-            elif tok in ["<s>", "</s>"]:
-                token_types.append(int(TokenType.CONTROL))
-            elif tok.startswith("<0x"):
-                token_types.append(int(TokenType.BYTE))
-            elif tok.startswith("<unused"):
-                token_types.append(int(TokenType.UNUSED))
-            else:
-                token_types.append(int(TokenType.NORMAL))
-        
-        writer.add_tokenizer_model("llama")
-        writer.add_token_list(tokens)
-        writer.add_token_scores([float(s) for s in scores])
-        writer.add_token_types(token_types)
-        writer.add_bos_token_id(self.tokenizer.bos_id)
-        writer.add_eos_token_id(self.tokenizer.eos_id)
-        writer.add_pad_token_id(self.tokenizer.unk_id)
+    def verify_gguf(self, quants=("f16", "q8_0", "q4_0"), out_dir: Path = None) -> Dict[str, Any]:
+        """Export each quantization level and compare it with the PyTorch model"""
+        from gladius_to_gguf import benchmark_gguf_export
         
-        logger.info(f"Added tokenizer with {self.config.vocab_size} tokens")
+        return benchmark_gguf_export(self.model, self.tokenizer, out_dir or TMP_DIR / "gguf_verify", quants)
 
 
 # =============================================================================
 # MAIN
 # =============================================================================
 
+# =============================================================================
+# ATTENTION BENCHMARK
+# =============================================================================
+
+def _reset_peak_rss():
+    """Reset the kernel's RSS high-water mark (Linux), so each run reports its own peak"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _attention_bench_run(model: "GladiusModel", implementation: str, input_ids: torch.Tensor,
+                         steps: int) -> Dict[str, float]:
+    model.set_attn_implementation(implementation)
+    tokens = input_ids.numel() * steps
+    
+    model.eval()
+    with torch.no_grad():
+        model(input_ids)  # warm-up
+        _reset_peak_rss()
+        start = time.perf_counter()
+        for _ in range(steps):
+            model(input_ids)
+        inference_time = time.perf_counter() - start
+    inference_rss = _peak_rss_mb()
+    
+    model.train()
+    _reset_peak_rss()
+    start = time.perf_counter()
+    for _ in range(steps):
+        model(input_ids, labels=input_ids)["loss"].backward()
+        model.zero_grad(set_to_none=True)
+    train_time = time.perf_counter() - start
+    
+    return {
+        "train_tokens_per_sec": round(tokens / train_time, 1),
+        "train_peak_rss_mb": round(_peak_rss_mb(), 1),
+        "inference_tokens_per_sec": round(tokens / inference_time, 1),
+        "inference_peak_rss_mb": round(inference_rss, 1),
+    }
+
+
+def _isolated_child(conn, fn, args):
+    conn.send(fn(*args))
+    conn.close()
+
+
+def _run_isolated(fn, *args):
+    """Run fn(*args) in a forked process where available, so its RSS peak is its own"""
+    import multiprocessing
+    
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return fn(*args)
+    ctx = multiprocessing.get_context("fork")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_isolated_child, args=(child_conn, fn, args))
+    proc.start()
+    result = parent_conn.recv()
+    proc.join()
+    return result
+
+
+def benchmark_attention(params_m: int = 50, seq_len: int = 256, batch_size: int = 4,
+                        steps: int = 3) -> Dict[str, Any]:
+    """
+    CPU tokens/second and peak RSS of a training step (forward + backward)
+    and of inference, for the eager and SDPA attention paths on identical
+    weights, plus the largest logit difference between them. Each path runs
+    in its own forked process where possible so their peaks don't overlap.
+    """
+    torch.manual_seed(0)
+    config = GladiusConfig.for_size(params_m)
+    model = GladiusModel(config)
+    input_ids = torch.randint(1, config.vocab_size, (batch_size, seq_len))
+    
+    results = {"params_m": round(config.total_params / 1e6, 1), "seq_len": seq_len,
+               "batch_size": batch_size, "threads": torch.get_num_threads()}
+    for implementation in ("eager", "sdpa"):
+        results[implementation] = _run_isolated(_attention_bench_run, model, implementation, input_ids, steps)
+    
+    model.eval()
+    with torch.no_grad():
+        model.set_attn_implementation("eager")
+        reference = model(input_ids[:1])["logits"]
+        model.set_attn_implementation("sdpa")
+        results["max_abs_logit_diff"] = (model(input_ids[:1])["logits"] - reference).abs().max().item()
+    return results
+
+
+def _data_bench_run(mode: str, data_path: Path, tokenizer: "LlamaTokenizer", max_length: int,
+                    batch_size: int, num_workers: int, model: "GladiusModel", train_steps: int) -> Dict[str, float]:
+    pad_id = tokenizer.unk_id
+    _reset_peak_rss()
+    if mode == "packed":
+        dataset = PackedGladiusDataset(data_path, max_length, pad_id=pad_id)
+        loader = DataLoader(dataset, batch_size=batch_size, num_workers=num_workers)
+    else:
+        dataset = GladiusDataset(data_path, tokenizer, max_length)
+        loader = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=num_workers)
+    
+    # One pass over the corpus through the loader
+    start = time.perf_counter()
+    total = effective = 0
+    for batch in loader:
+        total += batch["input_ids"].numel()
+        effective += int((batch["input_ids"] != pad_id).sum())
+    load_time = time.perf_counter() - start
+    result = {
+        "sequences_tokens": total,
+        "effective_tokens": effective,
+        "pad_fraction": round(1 - effective / total, 3) if total else 0.0,
+        "loader_effective_tokens_per_sec": round(effective / load_time, 1),
+    }
+    
+    if train_steps:
+        optimizer = torch.optim.AdamW(model.parameters(), lr=1e-4)
+        model.train()
+        steps = trained = 0
+        start = time.perf_counter()
+        while steps < train_steps:
+            for batch in loader:
+                outputs = model(batch["input_ids"], labels=batch["labels"], segment_ids=batch.get("segment_ids"))
+                outputs["loss"].backward()
+                optimizer.step()
+                optimizer.zero_grad(set_to_none=True)
+                trained += int((batch["input_ids"] != pad_id).sum())
+                steps += 1
+                if steps == train_steps:
+                    break
+        result["train_effective_tokens_per_sec"] = round(trained / (time.perf_counter() - start), 1)
+    
+    result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    return result
+
+
+def benchmark_data_pipeline(data_path: Path, params_m: int = 50, max_length: int = 256,
+                            batch_size: int = 4, num_workers: int = 0, train_steps: int = 5) -> Dict[str, Any]:
+    """
+    Effective (non-pad) tokens/second and peak RSS of the padded on-the-fly
+    dataset against the pre-tokenized packed one, for a full loader pass and
+    for `train_steps` training steps of a `params_m` model.
+    """
+    tokenizer = LlamaTokenizer()
+    start = time.perf_counter()
+    pretokenize_corpus(data_path, tokenizer)
+    results = {"data": str(data_path), "max_length": max_length, "batch_size": batch_size,
+               "num_workers": num_workers, "pretokenize_sec": round(time.perf_counter() - start, 2)}
+    
+    torch.manual_seed(0)
+    model = GladiusModel(GladiusConfig.for_size(params_m)) if train_steps else None
+    for mode in ("padded", "packed"):
+        results[mode] = _run_isolated(_data_bench_run, mode, data_path, tokenizer, max_length,
+                                      batch_size, num_workers, model, train_steps)
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description="GLADIUS Unified Trainer")
     parser.add_argument("--params", type=int, default=None, help="Target parameters in millions (auto-detected if not set)")
@@ -1255,12 +1629,39 @@ def main():
     parser.add_argument("--data", type=str, default=None, help="Training data path")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
     parser.add_argument("--export-gguf", action="store_true", help="Export to GGUF after training")
+    parser.add_argument("--quant", choices=["f32", "f16", "q8_0", "q4_0"], default="f16", help="GGUF weight type")
+    parser.add_argument("--verify-gguf", action="store_true",
+                        help="Compare f16/q8_0/q4_0 exports with the PyTorch model after training")
     parser.add_argument("--force-cpu", action="store_true", help="Force CPU training")
     parser.add_argument("--force-gpu", action="store_true", help="Force GPU training (fails if no GPU)")
     parser.add_argument("--no-animate", action="store_true", help="Disable animated display (use simple logging)")
+    parser.add_argument("--bench-attention", action="store_true", help="Benchmark eager vs fused attention on CPU and exit")
+    parser.add_argument("--no-pack", action="store_true", help="Tokenize on the fly and pad every sample instead of packing")
+    parser.add_argument("--num-workers", type=int, default=None, help="DataLoader workers")
+    parser.add_argument("--pretokenize", action="store_true", help="Only pre-tokenize the training data, then exit")
+    parser.add_argument("--bench-data", action="store_true", help="Benchmark padded vs packed data loading and exit")
     
     args = parser.parse_args()
     
+    if args.bench_attention:
+        print(json.dumps(benchmark_attention(params_m=args.params or 50, seq_len=args.max_length,
+                                             batch_size=args.batch_size or 4), indent=2))
+        return
+    
+    data_path = Path(args.data) if args.data else DATA_DIR / "gladius_1b_training.jsonl"
+    if args.pretokenize or args.bench_data:
+        if not data_path.exists():
+            logger.error(f"Training data not found: {data_path}")
+            sys.exit(1)
+        if args.pretokenize:
+            pretokenize_corpus(data_path, LlamaTokenizer(), workers=args.num_workers, force=True)
+        else:
+            print(json.dumps(benchmark_data_pipeline(data_path, params_m=args.params or 50,
+                                                     max_length=args.max_length,
+                                                     batch_size=args.batch_size or 4,
+                                                     num_workers=args.num_workers or 0), indent=2))
+        return
+    
     # Handle device forcing
     if args.force_cpu:
         os.environ["CUDA_VISIBLE_DEVICES"] = ""
@@ -1282,21 +1683,24 @@ def main():
         trainer.load_checkpoint()
     
     # Find data
-    data_path = Path(args.data) if args.data else DATA_DIR / "gladius_1b_training.jsonl"
     if not data_path.exists():
         logger.error(f"Training data not found: {data_path}")
         sys.exit(1)
     
     # Train
     trainer.train(data_path, epochs=args.epochs, batch_size=args.batch_size, 
-                  max_length=args.max_length, animated=not args.no_animate)
+                  max_length=args.max_length, animated=not args.no_animate,
+                  packed=not args.no_pack, num_workers=args.num_workers)
     
     # Export if requested
     if args.export_gguf:
-        gguf_path = trainer.export_gguf()
+        gguf_path = trainer.export_gguf(quant=args.quant)
         if trainer.display and not args.no_animate:
             trainer.display.print_completion(trainer.metrics, str(gguf_path) if gguf_path else None)
     
+    if args.verify_gguf:
+        print(json.dumps(trainer.verify_gguf(), indent=2))
+    
     if args.no_animate:
         logger.info("=" * 70)
         logger.info("Training complete!")
@@ -41,27 +41,20 @@ import hashlib
 import secrets
 
 # Rate limiting
-request_counts = {}
+from rate_limiter import SlidingWindowLimiter
+
 RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', '1000'))
 RATE_LIMIT_WINDOW = int(os.getenv('RATE_LIMIT_WINDOW', '900'))  # 15 minutes
+request_limiter = SlidingWindowLimiter(limit=RATE_LIMIT_REQUESTS, window=RATE_LIMIT_WINDOW)
 
 def rate_limit(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR'))
-        current_time = time.time()
-        
-        # Clean old entries
-        request_counts[client_ip] = [req_time for req_time in request_counts.get(client_ip, []) 
-                                   if current_time - req_time < RATE_LIMIT_WINDOW]
         
-        # Check rate limit
-        if len(request_counts.get(client_ip, [])) >= RATE_LIMIT_REQUESTS:
+        if not request_limiter.hit(client_ip):
             return jsonify({'error': 'Rate limit exceeded'}), 429
         
-        # Add current request
-        request_counts.setdefault(client_ip, []).append(current_time)
-        
         return f(*args, **kwargs)
     return decorated_function
 
@@ -783,7 +776,8 @@ def get_api_monitoring():
                     'enabled': True,
                     'default_rate': '1 request/minute',
                     'strategies': ['sliding_window', 'token_bucket', 'exponential_backoff'],
-                    'fallback_enabled': True
+                    'fallback_enabled': True,
+                    'inbound': request_limiter.get_stats()
                 }
             })
         else:
@@ -828,7 +822,8 @@ def get_api_monitoring():
                     'enabled': False,
                     'default_rate': '1 request/minute',
                     'strategies': ['fallback_mode'],
-                    'fallback_enabled': True
+                    'fallback_enabled': True,
+                    'inbound': request_limiter.get_stats()
                 }
             })
     except Exception as e:
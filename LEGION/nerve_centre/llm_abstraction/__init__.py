@@ -64,6 +64,9 @@ from llm_abstraction.agents.llm_agent import (
     SecurityError
 )
 
+# Response caching
+from llm_abstraction.response_cache import ResponseCache
+
 # Advanced algorithms
 from llm_abstraction.algorithms.context_window_optimization import (
     ContextOptimizer,
@@ -152,6 +155,9 @@ __all__ = [
     "TaskScheduler",
     "SecurityError",
     
+    # Response caching
+    "ResponseCache",
+    
     # Algorithms
     "ContextOptimizer",
     "optimize_context_window",
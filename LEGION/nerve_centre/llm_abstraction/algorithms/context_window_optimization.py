@@ -9,15 +9,67 @@ from collections import defaultdict, Counter
 import hashlib
 import json
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 
 logger = logging.getLogger(__name__)
 
 
+class TokenCounter:
+    """
+    Local token counter.
+    
+    Uses the tiktoken cl100k_base encoding when tiktoken is installed.
+    Otherwise words, numbers and punctuation are counted separately, with
+    long words split into 4-character pieces, which tracks BPE counts far
+    closer than a flat characters / 4.
+    """
+    
+    _PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+    
+    def __init__(self, encoding: str = "cl100k_base"):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.get_encoding(encoding)
+            except Exception as e:
+                logger.warning(f"tiktoken encoding {encoding} unavailable, approximating: {e}")
+    
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        tokens = 0
+        for piece in self._PIECES.findall(text):
+            tokens += (len(piece) + 3) // 4 if piece.isalpha() else 1
+        return tokens
+    
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of text, cut at a word boundary, within max_tokens."""
+        if self.count(text) <= max_tokens:
+            return text
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        cut = text[:low]
+        space = cut.rfind(" ")
+        return cut[:space] if space > len(cut) * 0.8 else cut
+
+
 class ContextOptimizer:
     """Advanced context window optimization with multiple strategies."""
     
-    def __init__(self, max_tokens: int = 4000):
+    def __init__(self, max_tokens: int = 4000, token_counter: Optional[TokenCounter] = None):
         self.max_tokens = max_tokens
+        self.token_counter = token_counter or TokenCounter()
         self.token_weights = self._initialize_token_weights()
         self.context_cache = {}
         
@@ -33,7 +85,8 @@ class ContextOptimizer:
             "recency": self._optimize_by_recency,
             "importance": self._optimize_by_importance,
             "compression": self._optimize_by_compression,
-            "hybrid": self._optimize_hybrid
+            "hybrid": self._optimize_hybrid,
+            "knapsack": lambda c, p: self.pack(c, p)[0]
         }
         
         if strategy not in strategies:
@@ -225,6 +278,97 @@ class ContextOptimizer:
         # Third pass: importance boosting
         return self._optimize_by_importance(compressed, prompt)
     
+    def pack(
+        self,
+        context: Dict[str, Any],
+        prompt: str,
+        priority_keys: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Pack context elements into max_tokens, maximizing relevance.
+        
+        Each element costs the tokens of its rendered "- key: value" line and
+        is worth its relevance to the prompt, plus a boost for priority_keys
+        (earlier keys weigh more). The 0/1 knapsack over those is solved
+        exactly by dynamic programming; for large budgets the costs are
+        rounded up to coarser units, which can only under-fill. Leftover
+        budget is given to the best excluded element, truncated. Selected
+        elements keep their original order.
+        
+        Returns the packed context and a report with original/packed token
+        counts and the dropped and truncated keys.
+        """
+        priority_keys = priority_keys or []
+        prompt_keywords = self._extract_keywords(prompt)
+        items = list(context.items())
+        
+        costs, values = [], []
+        for key, value in items:
+            costs.append(self._line_tokens(key, value))
+            relevance = self._calculate_relevance_score(f"{key} {value}", prompt_keywords)
+            boost = len(priority_keys) - priority_keys.index(key) if key in priority_keys else 0
+            # Every element is worth something, so spare budget is never wasted
+            values.append(relevance + boost + 0.1)
+        
+        chosen = self._solve_knapsack(costs, values, self.max_tokens)
+        packed = {key: value for i, (key, value) in enumerate(items) if i in chosen}
+        used = sum(costs[i] for i in chosen)
+        
+        truncated = []
+        excluded = sorted((i for i in range(len(items)) if i not in chosen),
+                          key=lambda i: values[i] / max(costs[i], 1), reverse=True)
+        if excluded and self.max_tokens - used > 50:
+            key, value = items[excluded[0]]
+            partial_key = f"{key}_partial"
+            overhead = self._line_tokens(partial_key, "")
+            partial = self.token_counter.truncate(str(value), self.max_tokens - used - overhead)
+            if partial:
+                packed[partial_key] = partial
+                used += self._line_tokens(partial_key, partial)
+                truncated.append(key)
+        
+        original_tokens = sum(costs)
+        report = {
+            "original_tokens": original_tokens,
+            "packed_tokens": used,
+            "tokens_saved": original_tokens - used,
+            "budget": self.max_tokens,
+            "dropped": [items[i][0] for i in excluded if items[i][0] not in truncated],
+            "truncated": truncated,
+        }
+        return packed, report
+    
+    def _line_tokens(self, key: str, value: Any) -> int:
+        # Elements reach the prompt as "- key: value" lines
+        return self.token_counter.count(f"- {key}: {value}\n")
+    
+    @staticmethod
+    def _solve_knapsack(costs: List[int], values: List[float], capacity: int, max_cells: int = 4096) -> set:
+        """Indices of the 0/1 knapsack optimum, with costs in units of capacity / max_cells."""
+        unit = max(1, math.ceil(capacity / max_cells))
+        slots = capacity // unit
+        weights = [math.ceil(c / unit) for c in costs]
+        
+        best = [0.0] * (slots + 1)
+        keep = []
+        for i, (w, v) in enumerate(zip(weights, values)):
+            took = bytearray(slots + 1)
+            if w <= slots:
+                for cap in range(slots, w - 1, -1):
+                    candidate = best[cap - w] + v
+                    if candidate > best[cap]:
+                        best[cap] = candidate
+                        took[cap] = 1
+            keep.append(took)
+        
+        chosen = set()
+        cap = slots
+        for i in range(len(weights) - 1, -1, -1):
+            if keep[i][cap]:
+                chosen.add(i)
+                cap -= weights[i]
+        return chosen
+    
     def _calculate_relevance_score(
         self,
         content: str,
@@ -362,14 +506,13 @@ class ContextOptimizer:
             return truncated + "..."
     
     def _estimate_tokens(self, data: Any) -> int:
-        """Estimate token count for data."""
+        """Count tokens for data."""
         if isinstance(data, dict):
             content = json.dumps(data, default=str)
         else:
             content = str(data)
         
-        # Rough approximation: 1 token ≈ 4 characters
-        return len(content) // 4
+        return self.token_counter.count(content)
     
     def _enforce_token_limit(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Enforce maximum token limit on context."""
@@ -437,3 +580,43 @@ def optimize_context_window(context: dict) -> dict:
     """Simple context optimization function."""
     optimizer = ContextOptimizer()
     return optimizer.optimize_context_window(context, "", "relevance")
+
+
+def replay_packing_workload(
+    records: List[Dict[str, Any]],
+    max_tokens: int = 4000,
+    priority_keys: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Pack a recorded workload of {"prompt": ..., "context": {...}} requests
+    and report the prompt tokens saved per request and in total.
+    """
+    optimizer = ContextOptimizer(max_tokens=max_tokens)
+    per_request = []
+    for record in records:
+        _, report = optimizer.pack(record.get("context") or {}, record.get("prompt", ""), priority_keys)
+        per_request.append(report)
+    
+    original = sum(r["original_tokens"] for r in per_request)
+    saved = sum(r["tokens_saved"] for r in per_request)
+    return {
+        "requests": len(per_request),
+        "original_tokens": original,
+        "packed_tokens": original - saved,
+        "tokens_saved": saved,
+        "saved_per_request": saved / len(per_request) if per_request else 0.0,
+        "per_request": per_request,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    
+    # python context_window_optimization.py workload.jsonl [max_tokens]
+    with open(sys.argv[1]) as f:
+        workload = [json.loads(line) for line in f if line.strip()]
+    summary = replay_packing_workload(workload, int(sys.argv[2]) if len(sys.argv) > 2 else 4000)
+    for i, report in enumerate(summary.pop("per_request")):
+        print(f"request {i}: {report['original_tokens']} -> {report['packed_tokens']} tokens "
+              f"(saved {report['tokens_saved']}, dropped {report['dropped']}, truncated {report['truncated']})")
+    print(json.dumps(summary, indent=2))
@@ -1,11 +1,13 @@
 """
 LLM Abstraction Subsystem Core Module
 """
+import asyncio
 import json
 import logging
 import time
 import hashlib
 import re
+from collections import OrderedDict, deque
 from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
@@ -13,6 +15,8 @@ import requests
 import yaml
 
 from llm_abstraction.base import LLMProviderBase, ProviderType, SecurityLevel, LLMRequest, LLMResponse
+from llm_abstraction.metrics import percentile
+from llm_abstraction.algorithms.context_window_optimization import ContextOptimizer
 
 
 # Configure logging
@@ -343,73 +347,48 @@ class PromptEngineer:
 class ContextManager:
     """Advanced context management and optimization."""
     
-    def __init__(self, max_context_tokens: int = 4000):
+    # Kept ahead of equally relevant elements, earlier keys first
+    PRIORITY_KEYS = [
+        'current_task', 'user_intent', 'primary_data',
+        'recent_history', 'constraints', 'objectives'
+    ]
+    
+    def __init__(self, max_context_tokens: int = 4000, max_cached_contexts: int = 256):
         self.max_context_tokens = max_context_tokens
-        self.context_cache = {}
-        
-    def optimize(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Optimize context for maximum relevance and efficiency."""
+        self.max_cached_contexts = max_cached_contexts
+        self.context_cache = OrderedDict()
+        self.packer = ContextOptimizer(max_tokens=max_context_tokens)
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.packing_stats = {'requests': 0, 'original_tokens': 0, 'packed_tokens': 0, 'tokens_saved': 0}
+        
+    def optimize(self, context: Dict[str, Any], prompt: str = "") -> Dict[str, Any]:
+        """Pack the most relevant context elements for prompt into max_context_tokens."""
         # Calculate context hash for caching
-        context_hash = self._hash_context(context)
+        context_hash = self._hash_context({'context': context, 'prompt': prompt})
         
         if context_hash in self.context_cache:
             logger.info("Using cached context optimization")
-            return self.context_cache[context_hash]
-        
-        # Prioritize context elements
-        prioritized_context = self._prioritize_context(context)
-        
-        # Trim context to fit token limits
-        optimized_context = self._trim_context(prioritized_context)
-        
-        # Cache the result
-        self.context_cache[context_hash] = optimized_context
-        
-        logger.info(f"Context optimized: {len(context)} -> {len(optimized_context)} elements")
-        return optimized_context
-    
-    def _prioritize_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Prioritize context elements by relevance."""
-        priority_keys = [
-            'current_task', 'user_intent', 'primary_data',
-            'recent_history', 'constraints', 'objectives'
-        ]
-        
-        prioritized = {}
-        
-        # Add high-priority items first
-        for key in priority_keys:
-            if key in context:
-                prioritized[key] = context[key]
-        
-        # Add remaining items
-        for key, value in context.items():
-            if key not in prioritized:
-                prioritized[key] = value
-        
-        return prioritized
-    
-    def _trim_context(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Trim context to fit within token limits."""
-        trimmed = {}
-        estimated_tokens = 0
-        
-        for key, value in context.items():
-            # Estimate tokens (rough approximation: 1 token ≈ 4 characters)
-            item_tokens = len(str(value)) // 4
+            self.context_cache.move_to_end(context_hash)
+            optimized_context, report = self.context_cache[context_hash]
+        else:
+            optimized_context, report = self.packer.pack(context, prompt, self.PRIORITY_KEYS)
             
-            if estimated_tokens + item_tokens <= self.max_context_tokens:
-                trimmed[key] = value
-                estimated_tokens += item_tokens
-            else:
-                # Try to include partial content
-                remaining_tokens = self.max_context_tokens - estimated_tokens
-                if remaining_tokens > 10:  # Minimum useful size
-                    partial_content = str(value)[:remaining_tokens * 4]
-                    trimmed[f"{key}_partial"] = partial_content
-                break
-        
-        return trimmed
+            # Cache the result, evicting the least recently used
+            self.context_cache[context_hash] = (optimized_context, report)
+            while len(self.context_cache) > self.max_cached_contexts:
+                self.context_cache.popitem(last=False)
+        
+        self.last_report = report
+        self.packing_stats['requests'] += 1
+        self.packing_stats['original_tokens'] += report['original_tokens']
+        self.packing_stats['packed_tokens'] += report['packed_tokens']
+        self.packing_stats['tokens_saved'] += report['tokens_saved']
+        
+        logger.info(
+            f"Context packed: {len(context)} -> {len(optimized_context)} elements, "
+            f"{report['original_tokens']} -> {report['packed_tokens']} tokens"
+        )
+        return optimized_context
     
     def _hash_context(self, context: Dict[str, Any]) -> str:
         """Generate hash for context caching."""
@@ -602,6 +581,44 @@ class OutputProcessor:
         return True
 
 
+class LatencyHistogram:
+    """Observed latencies of one provider over its most recent requests."""
+
+    def __init__(self, max_samples: int = 512):
+        self.samples = deque(maxlen=max_samples)
+        # Elapsed time of cancelled requests: the latency was at least this
+        self.lower_bounds = deque(maxlen=max_samples)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def record_lower_bound(self, seconds: float) -> None:
+        """Keep a cancelled request's elapsed time apart from the complete samples."""
+        self.lower_bounds.append(seconds)
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile of complete samples, q in [0, 100]; None without samples."""
+        return percentile(self.samples, q)
+
+    def median_estimate(self) -> Optional[float]:
+        """Median latency, or the median lower bound while no request has completed."""
+        median = self.percentile(50)
+        return median if median is not None else percentile(self.lower_bounds, 50)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'cancelled': len(self.lower_bounds),
+        }
+
+
 class LLMOrchestrator:
     """Advanced LLM orchestration with intelligent routing and workflow management."""
     
@@ -610,13 +627,30 @@ class LLMOrchestrator:
         providers: List[LLMProviderBase],
         prompt_engineer: Optional[PromptEngineer] = None,
         context_manager: Optional[ContextManager] = None,
-        output_processor: Optional[OutputProcessor] = None
+        output_processor: Optional[OutputProcessor] = None,
+        hedge_percentile: float = 95,
+        hedge_min_samples: int = 20,
+        hedge_default_delay: float = 2.0,
+        response_cache: Optional[Any] = None
     ):
         self.providers = providers
         self.prompt_engineer = prompt_engineer or PromptEngineer()
         self.context_manager = context_manager or ContextManager()
         self.output_processor = output_processor or OutputProcessor()
         self.provider_performance = {p.name: {'success': 0, 'failure': 0, 'avg_time': 0} for p in providers}
+        self.latency = {p.name: LatencyHistogram() for p in providers}
+        
+        # Hedging: a backup provider is fired once the running one passes
+        # its observed hedge_percentile latency (or hedge_default_delay
+        # until hedge_min_samples requests have been seen).
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_stats = {'requests': 0, 'hedges': 0, 'backup_wins': 0, 'cancelled': 0}
+        
+        # Optional llm_abstraction.response_cache.ResponseCache for
+        # single-provider runs
+        self.response_cache = response_cache
         
     def run(
         self,
@@ -626,6 +660,51 @@ class LLMOrchestrator:
         use_multiple_providers: bool = False
     ) -> Union[LLMResponse, List[LLMResponse]]:
         """Execute LLM query with advanced orchestration."""
+        request = self._prepare_request(prompt, context)
+        
+        # Execute queries
+        if use_multiple_providers:
+            return self._run_multiple_providers(request, max_retries)
+        
+        cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
+        start_time = time.perf_counter()
+        response = self._run_single_provider(request, max_retries)
+        self._cache_store(request, response, time.perf_counter() - start_time)
+        return response
+    
+    async def run_async(
+        self,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None,
+        max_retries: int = 3,
+        use_multiple_providers: bool = False,
+        hedge: bool = True
+    ) -> Union[LLMResponse, List[LLMResponse]]:
+        """
+        Execute LLM query with providers running concurrently.
+        
+        With use_multiple_providers every provider is queried at once and
+        the ranked responses are returned. Otherwise the best provider is
+        queried and, when hedge is set, backups are fired as it runs past
+        its observed tail latency; the first response that passes output
+        processing wins and the others are cancelled.
+        """
+        request = self._prepare_request(prompt, context)
+        
+        if use_multiple_providers:
+            return await self._run_multiple_providers_async(request)
+        
+        cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
+        start_time = time.perf_counter()
+        response = await self._run_hedged(request, max_retries, hedge)
+        self._cache_store(request, response, time.perf_counter() - start_time)
+        return response
+    
+    def _prepare_request(self, prompt: str, context: Optional[Dict[str, Any]]) -> LLMRequest:
         # Create structured request
         request = LLMRequest(
             prompt=prompt,
@@ -633,21 +712,47 @@ class LLMOrchestrator:
             security_level=SecurityLevel.MEDIUM
         )
         
+        # Optimize context first, so only the packed context reaches the prompt
+        if request.context:
+            request.context = self.context_manager.optimize(request.context, request.prompt)
+        
         # Engineer the prompt
         engineered_prompt = self.prompt_engineer.engineer(
             request.prompt, request.context
         )
         request.prompt = engineered_prompt
         
-        # Optimize context
-        if request.context:
-            request.context = self.context_manager.optimize(request.context)
-        
-        # Execute queries
-        if use_multiple_providers:
-            return self._run_multiple_providers(request, max_retries)
-        else:
-            return self._run_single_provider(request, max_retries)
+        return request
+    
+    def _cache_scope(self, request: LLMRequest) -> Tuple[str, Dict[str, Any]]:
+        # Which provider serves a request is only decided when it runs, so
+        # responses are shared across the orchestrator's provider pool.
+        provider = ",".join(sorted(p.name for p in self.providers))
+        params = {
+            'max_tokens': request.max_tokens,
+            'temperature': request.temperature,
+            'security_level': request.security_level.name,
+        }
+        return provider, params
+    
+    def _cache_lookup(self, request: LLMRequest) -> Optional[LLMResponse]:
+        if self.response_cache is None:
+            return None
+        provider, params = self._cache_scope(request)
+        try:
+            return self.response_cache.get(request.prompt, request.context, provider, params)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+    
+    def _cache_store(self, request: LLMRequest, response: LLMResponse, elapsed: float) -> None:
+        if self.response_cache is None:
+            return
+        provider, params = self._cache_scope(request)
+        try:
+            self.response_cache.put(request.prompt, request.context, provider, params, response, elapsed)
+        except Exception as e:
+            logger.warning(f"Response cache store failed: {e}")
     
     def _run_single_provider(
         self,
@@ -658,13 +763,15 @@ class LLMOrchestrator:
         provider = self._select_best_provider(request)
         
         for attempt in range(max_retries + 1):
+            start_time = time.perf_counter()
             try:
                 request.retry_count = attempt
                 response = provider.query(request)
                 
                 # Update performance metrics
                 self._update_performance_metrics(
-                    provider.name, True, response.processing_time
+                    provider.name, True, response.processing_time,
+                    latency=time.perf_counter() - start_time
                 )
                 
                 # Process output
@@ -702,12 +809,14 @@ class LLMOrchestrator:
         responses = []
         
         for provider in self.providers:
+            start_time = time.perf_counter()
             try:
                 response = provider.query(request)
                 responses.append(response)
                 
                 self._update_performance_metrics(
-                    provider.name, True, response.processing_time
+                    provider.name, True, response.processing_time,
+                    latency=time.perf_counter() - start_time
                 )
                 
             except Exception as e:
@@ -720,6 +829,139 @@ class LLMOrchestrator:
         # Process and rank outputs
         return self.output_processor.process(responses, request)
     
+    async def _query_async(self, provider: LLMProviderBase, request: LLMRequest) -> Tuple[LLMResponse, float]:
+        """Query one provider off the event loop; returns the response and its latency."""
+        start_time = time.perf_counter()
+        aquery = getattr(provider, 'aquery', None)
+        if aquery is not None and asyncio.iscoroutinefunction(aquery):
+            response = await aquery(request)
+        else:
+            # Blocking providers run in a worker thread. Cancelling the task
+            # abandons the call; the thread finishes it in the background.
+            response = await asyncio.to_thread(provider.query, request)
+        return response, time.perf_counter() - start_time
+    
+    async def _run_multiple_providers_async(self, request: LLMRequest) -> List[LLMResponse]:
+        """Query all providers concurrently and return ranked results."""
+        results = await asyncio.gather(
+            *(self._query_async(p, request) for p in self.providers),
+            return_exceptions=True
+        )
+        
+        responses = []
+        for provider, result in zip(self.providers, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Provider {provider.name} failed: {result}")
+                self._update_performance_metrics(provider.name, False)
+                continue
+            response, latency = result
+            responses.append(response)
+            self._update_performance_metrics(
+                provider.name, True, response.processing_time, latency=latency
+            )
+        
+        if not responses:
+            raise RuntimeError("All providers failed")
+        
+        return self.output_processor.process(responses, request)
+    
+    def hedge_delay(self, provider: LLMProviderBase) -> float:
+        """Seconds to wait on a provider before firing a backup."""
+        histogram = self.latency[provider.name]
+        if histogram.count < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return histogram.percentile(self.hedge_percentile)
+    
+    async def _run_hedged(
+        self,
+        request: LLMRequest,
+        max_retries: int,
+        hedge: bool = True
+    ) -> LLMResponse:
+        """Run query on the best provider, hedging with backups past its tail latency."""
+        self.hedge_stats['requests'] += 1
+        pending: Dict[asyncio.Task, Tuple[LLMProviderBase, float]] = {}
+        tried: List[LLMProviderBase] = []
+        last_error: Optional[BaseException] = None
+        
+        def candidates() -> List[LLMProviderBase]:
+            if len(tried) > max_retries:
+                return []
+            running = [p for p, _ in pending.values()]
+            return [p for p in self.providers if p not in running]
+        
+        def launch() -> Tuple[LLMProviderBase, float]:
+            available = candidates()
+            # Prefer providers not tried yet, like the sequential retry path
+            fresh = [p for p in available if p not in tried] or available
+            provider = self._select_best_provider(
+                request, exclude=[p for p in self.providers if p not in fresh]
+            )
+            request.retry_count = len(tried)
+            tried.append(provider)
+            started = time.perf_counter()
+            pending[asyncio.create_task(self._query_async(provider, request))] = (provider, started)
+            return provider, started
+        
+        current, started = launch()
+        try:
+            while pending:
+                timeout = None
+                if hedge and candidates():
+                    timeout = max(0.0, started + self.hedge_delay(current) - time.perf_counter())
+                done, _ = await asyncio.wait(
+                    pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if not done:
+                    logger.info(f"Provider {current.name} passed {self.hedge_delay(current):.2f}s, hedging")
+                    self.hedge_stats['hedges'] += 1
+                    current, started = launch()
+                    continue
+                
+                for task in done:
+                    provider, _ = pending.pop(task)
+                    try:
+                        response, latency = task.result()
+                        self._update_performance_metrics(
+                            provider.name, True, response.processing_time, latency=latency
+                        )
+                        processed_outputs = self.output_processor.process([response], request)
+                        if not processed_outputs:
+                            raise ValueError("Output failed processing filters")
+                    except Exception as e:
+                        logger.warning(f"Provider {provider.name} failed (attempt {tried.index(provider) + 1}): {e}")
+                        self._update_performance_metrics(provider.name, False)
+                        last_error = e
+                        continue
+                    
+                    if provider is not tried[0]:
+                        self.hedge_stats['backup_wins'] += 1
+                    return processed_outputs[0]
+                
+                # Every finished query failed: replace it right away
+                if candidates():
+                    current, started = launch()
+        finally:
+            await self._cancel_losers(pending)
+        
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError("All providers failed")
+    
+    async def _cancel_losers(self, pending: Dict[asyncio.Task, Tuple[LLMProviderBase, float]]) -> None:
+        """Cancel still-running queries, keeping their elapsed time as a latency lower bound."""
+        if not pending:
+            return
+        now = time.perf_counter()
+        for task, (provider, started) in pending.items():
+            task.cancel()
+            # Not a latency sample: it would pull the percentiles down
+            self.latency[provider.name].record_lower_bound(now - started)
+            self.hedge_stats['cancelled'] += 1
+        await asyncio.gather(*pending.keys(), return_exceptions=True)
+        pending.clear()
+    
     def _select_best_provider(
         self,
         request: LLMRequest,
@@ -741,8 +983,10 @@ class LLMOrchestrator:
             total_requests = metrics['success'] + metrics['failure']
             success_rate = metrics['success'] / max(total_requests, 1)
             
-            # Calculate speed score (inverse of average time)
-            speed_score = 1 / max(metrics['avg_time'], 0.1)
+            # Calculate speed score (inverse of median observed latency,
+            # falling back to the reported average before any samples)
+            median_latency = self.latency[provider.name].median_estimate()
+            speed_score = 1 / max(median_latency if median_latency is not None else metrics['avg_time'], 0.1)
             
             # Combine scores
             provider_scores[provider] = (success_rate * 0.7) + (speed_score * 0.3)
@@ -754,12 +998,15 @@ class LLMOrchestrator:
         self,
         provider_name: str,
         success: bool,
-        processing_time: Optional[float] = None
+        processing_time: Optional[float] = None,
+        latency: Optional[float] = None
     ) -> None:
         """Update provider performance metrics."""
         metrics = self.provider_performance[provider_name]
         
         if success:
+            if latency is not None:
+                self.latency[provider_name].record(latency)
             metrics['success'] += 1
             if processing_time:
                 # Update rolling average
@@ -786,6 +1033,7 @@ class LLMOrchestrator:
                 'metadata': provider.get_metadata(),
                 'success_rate': metrics['success'] / max(total_requests, 1),
                 'average_response_time': metrics['avg_time'],
+                'latency': self.latency[provider.name].snapshot(),
                 'total_requests': total_requests,
                 'status': 'active' if total_requests > 0 else 'ready'
             }
@@ -856,10 +1104,10 @@ class LLMAbstraction:
             return False
 
     def query(self, prompt: str, context: Optional[Dict[str, Any]] = None, max_tokens: int = 1000, temperature: float = 0.7) -> LLMResponse:
-        # Engineer prompt
-        engineered_prompt = self.prompt_engineer.engineer(prompt, context)
         # Optimize context
-        optimized_context = self.context_manager.optimize(context or {})
+        optimized_context = self.context_manager.optimize(context or {}, prompt)
+        # Engineer prompt
+        engineered_prompt = self.prompt_engineer.engineer(prompt, optimized_context)
         # Build request
         request = LLMRequest(
             prompt=engineered_prompt,
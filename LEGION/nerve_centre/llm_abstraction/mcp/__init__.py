@@ -10,6 +10,7 @@ from .client.mcp_client import (
     MCPServerRegistry,
     MCPAutoDiscovery,
     MCPSessionManager,
+    MCPSessionPool,
     MCPFunctionExecutor,
     create_mcp_client
 )
@@ -44,6 +45,7 @@ __all__ = [
     'MCPServerRegistry',
     'MCPAutoDiscovery',
     'MCPSessionManager',
+    'MCPSessionPool',
     'MCPFunctionExecutor',
     'create_mcp_client',
     
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Inverted index over MCP functions
+BM25-ranked search over function names, parameter names and descriptions,
+maintained incrementally as functions are registered and removed
+"""
+
+import bisect
+import heapq
+import math
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+_CAMEL_BOUNDARY = re.compile(r'([a-z0-9])([A-Z])')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# JSON schema keywords that are not parameter names in flat parameter maps
+_SCHEMA_KEYWORDS = {'type', 'properties', 'required', 'additionalProperties', 'description', 'title', '$schema'}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms, splitting snake_case, camelCase and punctuation"""
+    if not text:
+        return []
+    return [t for t in _NON_ALNUM.split(_CAMEL_BOUNDARY.sub(r'\1 \2', text).lower()) if t]
+
+
+def parameter_names(parameters: Dict[str, Any]) -> List[str]:
+    """Parameter names from a JSON schema or a flat {name: definition} map"""
+    if not isinstance(parameters, dict):
+        return []
+    if isinstance(parameters.get('properties'), dict):
+        return list(parameters['properties'].keys())
+    return [name for name in parameters if name not in _SCHEMA_KEYWORDS]
+
+
+class MCPFunctionIndex:
+    """
+    Inverted index with BM25 ranking.
+
+    Each function is one document whose fields are weighted by
+    `field_weights`; a term's frequency is the weighted count over fields
+    (BM25F-style). Query terms also match every indexed term they are a
+    prefix of ("file" finds "files", "webp" finds "webpage"), at
+    `prefix_weight` of an exact match.
+    Terms found in more than `max_df_ratio` of all functions (e.g. "id")
+    add almost nothing to a score but cost a full posting walk, so they are
+    skipped whenever the query has a more selective term.
+    """
+
+    def __init__(
+        self,
+        field_weights: Optional[Dict[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        prefix_weight: float = 0.5,
+        max_df_ratio: float = 0.5
+    ):
+        self.field_weights = field_weights or {'name': 3.0, 'parameters': 2.0, 'description': 1.0}
+        self.k1 = k1
+        self.b = b
+        self.prefix_weight = prefix_weight
+        self.max_df_ratio = max_df_ratio
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.doc_terms: Dict[str, Dict[str, float]] = {}
+        self.doc_lengths: Dict[str, float] = {}
+        self.total_length = 0.0
+        self._sorted_terms: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.doc_lengths
+
+    def _fields(self, function) -> Dict[str, List[str]]:
+        return {
+            'name': tokenize(function.name),
+            'parameters': [t for p in parameter_names(function.parameters) for t in tokenize(p)],
+            'description': tokenize(function.description or ''),
+        }
+
+    def add(self, function) -> None:
+        """Index a function, replacing any previous entry with the same name"""
+        self.remove(function.name)
+
+        terms: Dict[str, float] = {}
+        length = 0.0
+        for field, tokens in self._fields(function).items():
+            weight = self.field_weights.get(field, 1.0)
+            for token in tokens:
+                terms[token] = terms.get(token, 0.0) + weight
+            length += weight * len(tokens)
+
+        for term, tf in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                self.postings[term] = posting = {}
+                self._sorted_terms = None
+            posting[function.name] = tf
+        self.doc_terms[function.name] = terms
+        self.doc_lengths[function.name] = length
+        self.total_length += length
+
+    def remove(self, name: str) -> bool:
+        """Drop a function from the index"""
+        terms = self.doc_terms.pop(name, None)
+        if terms is None:
+            return False
+        for term in terms:
+            posting = self.postings[term]
+            del posting[name]
+            if not posting:
+                del self.postings[term]
+                self._sorted_terms = None
+        self.total_length -= self.doc_lengths.pop(name)
+        return True
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        """Indexed terms a query term matches, with their weights"""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        start = bisect.bisect_left(self._sorted_terms, term)
+        end = bisect.bisect_left(self._sorted_terms, term + '\uffff')
+        return {t: 1.0 if t == term else self.prefix_weight for t in self._sorted_terms[start:end]}
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(function name, score) pairs, best first"""
+        n_docs = len(self.doc_lengths)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+
+        k1, doc_lengths = self.k1, self.doc_lengths
+        base, per_length = k1 * (1.0 - self.b), k1 * self.b / avg_length
+        matched: Dict[str, float] = {}
+        for query_term in set(tokenize(query)):
+            for term, weight in self._expand(query_term).items():
+                matched[term] = max(matched.get(term, 0.0), weight)
+        postings = [(self.postings[term], weight) for term, weight in matched.items()]
+        selective = [(p, w) for p, w in postings if len(p) <= n_docs * self.max_df_ratio]
+        if selective:
+            postings = selective
+
+        scores: Dict[str, float] = {}
+        for posting, weight in postings:
+            idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            boost = weight * idf * (k1 + 1.0)
+            for name, tf in posting.items():
+                scores[name] = scores.get(name, 0.0) + boost * tf / (tf + base + per_length * doc_lengths[name])
+
+        order = lambda item: (-item[1], item[0])
+        if limit is not None:
+            return heapq.nsmallest(limit, scores.items(), key=order)
+        return sorted(scores.items(), key=order)
+
+
+def benchmark_function_search(
+    n_functions: int = 10000,
+    queries: Optional[Iterable[str]] = None,
+    repeat: int = 20
+) -> Dict[str, Any]:
+    """
+    Lookup latency of the indexed registry against a linear substring scan
+    over `n_functions` synthetic functions. Run it with
+    `python -m llm_abstraction.mcp.client.function_index` from nerve_centre.
+    """
+    from .mcp_client import MCPFunction, MCPServerRegistry
+
+    verbs = ['create', 'read', 'update', 'delete', 'list', 'search', 'fetch', 'sync', 'export', 'analyze']
+    nouns = ['file', 'issue', 'invoice', 'customer', 'webpage', 'memory', 'report', 'ticket', 'order', 'chart']
+    registry = MCPServerRegistry()
+    for i in range(n_functions):
+        verb, noun = verbs[i % len(verbs)], nouns[(i // len(verbs)) % len(nouns)]
+        service = f"service{i // (len(verbs) * len(nouns))}"
+        registry.register_function(MCPFunction(
+            name=f"{service}_{verb}_{noun}",
+            description=f"{verb.capitalize()} a {noun} record through {service}",
+            parameters={'type': 'object', 'properties': {f"{noun}_id": {'type': 'string'}, 'workspace': {'type': 'integer'}}},
+            returns={'type': 'object'},
+            server=service,
+            category=noun
+        ))
+    queries = list(queries or ['service42 search invoice', 'delete ticket', 'customer_id', 'fetch webpage', 'service7'])
+
+    def linear(query: str) -> List[Any]:
+        query_lower = query.lower()
+        return [f for f in registry.functions.values()
+                if query_lower in f.name.lower() or query_lower in f.description.lower()]
+
+    def timed(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for query in queries:
+                fn(query)
+        return (time.perf_counter() - start) / (repeat * len(queries))
+
+    linear_latency = timed(linear)
+    indexed_latency = timed(lambda q: registry.search_functions(q, limit=20))
+    listed_latency = timed(lambda q: registry.list_functions(category='invoice', server='service7'))
+    return {
+        'functions': n_functions,
+        'queries': len(queries),
+        'linear_scan_ms': linear_latency * 1000,
+        'indexed_search_ms': indexed_latency * 1000,
+        'filtered_list_ms': listed_latency * 1000,
+        'speedup': linear_latency / indexed_latency if indexed_latency else float('inf'),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Benchmark MCP function discovery")
+    parser.add_argument('--functions', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(benchmark_function_search(args.functions, repeat=args.repeat), indent=2))
@@ -5,16 +5,23 @@ Enterprise-grade Model Context Protocol client with auto-discovery and intellige
 """
 
 import asyncio
+import copy
 import json
 import logging
 import time
 import inspect
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Callable, Union
 from dataclasses import dataclass, asdict
 import aiohttp
 import websockets
 
+from llm_abstraction.metrics import percentile
+
+from .function_index import MCPFunctionIndex
+
 # MCP Protocol imports
 try:
     from mcp.client.session import ClientSession
@@ -45,6 +52,8 @@ class MCPServerInfo:
     status: str = "discovered"
     last_ping: Optional[float] = None
     error_count: int = 0
+    max_sessions: Optional[int] = None  # pool size, defaults to the session manager's
+    max_concurrency: Optional[int] = None  # in-flight calls, defaults to the session manager's
 
 
 @dataclass
@@ -57,16 +66,27 @@ class MCPFunction:
     server: str
     category: str
     examples: Optional[List[Dict[str, Any]]] = None
+    cacheable: bool = False  # idempotent and read-only, results may be reused
+    cache_ttl: Optional[float] = None  # seconds, defaults to the executor's
 
 
 class MCPServerRegistry:
-    """Registry for managing MCP servers and their capabilities"""
+    """
+    Registry for managing MCP servers and their capabilities.
+
+    Functions are indexed as they are registered: an inverted index for
+    ranked search and per-category / per-server name sets for listing.
+    """
     
     def __init__(self):
         self.servers: Dict[str, MCPServerInfo] = {}
         self.functions: Dict[str, MCPFunction] = {}
         self.auto_discovery_active = False
         self.health_check_interval = 30  # seconds
+        self.function_index = MCPFunctionIndex()
+        # Insertion-ordered name sets
+        self.functions_by_category: Dict[str, Dict[str, None]] = {}
+        self.functions_by_server: Dict[str, Dict[str, None]] = {}
         
     def register_server(self, server_info: MCPServerInfo) -> bool:
         """Register a new MCP server"""
@@ -82,12 +102,8 @@ class MCPServerRegistry:
         """Unregister an MCP server"""
         if server_name in self.servers:
             # Remove all functions from this server
-            functions_to_remove = [
-                func_name for func_name, func in self.functions.items()
-                if func.server == server_name
-            ]
-            for func_name in functions_to_remove:
-                del self.functions[func_name]
+            for func_name in self.functions_by_server.get(server_name, {}).copy():
+                self._remove_function(func_name)
             
             del self.servers[server_name]
             logger.info(f"Unregistered MCP server: {server_name}")
@@ -97,13 +113,30 @@ class MCPServerRegistry:
     def register_function(self, function: MCPFunction) -> bool:
         """Register a function from an MCP server"""
         try:
+            if function.name in self.functions:
+                self._remove_function(function.name)
             self.functions[function.name] = function
+            self.function_index.add(function)
+            self.functions_by_category.setdefault(function.category, {})[function.name] = None
+            self.functions_by_server.setdefault(function.server, {})[function.name] = None
             logger.debug(f"Registered function: {function.name} from {function.server}")
             return True
         except Exception as e:
             logger.error(f"Failed to register function {function.name}: {e}")
             return False
     
+    def _remove_function(self, function_name: str):
+        """Drop a function and its index entries"""
+        function = self.functions.pop(function_name)
+        self.function_index.remove(function_name)
+        for table, key in ((self.functions_by_category, function.category),
+                           (self.functions_by_server, function.server)):
+            names = table.get(key)
+            if names is not None:
+                names.pop(function_name, None)
+                if not names:
+                    del table[key]
+    
     def get_server_info(self, server_name: str) -> Optional[MCPServerInfo]:
         """Get information about a specific server"""
         return self.servers.get(server_name)
@@ -118,23 +151,29 @@ class MCPServerRegistry:
     
     def list_functions(self, category: Optional[str] = None, server: Optional[str] = None) -> List[MCPFunction]:
         """List functions with optional filtering"""
-        functions = list(self.functions.values())
+        if not category and not server:
+            return list(self.functions.values())
         
-        if category:
-            functions = [f for f in functions if f.category == category]
+        if category and server:
+            by_category = self.functions_by_category.get(category, {})
+            by_server = self.functions_by_server.get(server, {})
+            if len(by_server) < len(by_category):
+                names = [name for name in by_server if name in by_category]
+            else:
+                names = [name for name in by_category if name in by_server]
+        elif category:
+            names = self.functions_by_category.get(category, {})
+        else:
+            names = self.functions_by_server.get(server, {})
         
-        if server:
-            functions = [f for f in functions if f.server == server]
-        
-        return functions
+        return [self.functions[name] for name in names]
     
-    def search_functions(self, query: str) -> List[MCPFunction]:
-        """Search functions by name or description"""
-        query_lower = query.lower()
-        return [
-            func for func in self.functions.values()
-            if query_lower in func.name.lower() or query_lower in func.description.lower()
-        ]
+    def search_functions(self, query: str, limit: Optional[int] = None) -> List[MCPFunction]:
+        """Search functions by name, parameter names and description, best match first"""
+        if not query.strip():
+            functions = list(self.functions.values())
+            return functions[:limit] if limit is not None else functions
+        return [self.functions[name] for name, _ in self.function_index.search(query, limit)]
 
 
 class MCPAutoDiscovery:
@@ -229,7 +268,9 @@ class MCPAutoDiscovery:
                             protocol=server_config.get('protocol', 'sse'),
                             capabilities=server_config.get('capabilities', []),
                             tools=server_config.get('tools', []),
-                            resources=server_config.get('resources', [])
+                            resources=server_config.get('resources', []),
+                            max_sessions=server_config.get('max_sessions'),
+                            max_concurrency=server_config.get('max_concurrency')
                         )
                         servers.append(server_info)
                         
@@ -239,83 +280,280 @@ class MCPAutoDiscovery:
         return servers
 
 
+@dataclass
+class MCPSessionLease:
+    """A session checked out of a pool for one call"""
+    session: ClientSession
+    queue_wait: float
+
+
+class _PooledSession:
+    """
+    One pooled connection. The session's transport context is entered and
+    exited by a dedicated task, since anyio scopes must be closed by the task
+    that opened them and pooled sessions outlive the call that opened them.
+    """
+
+    def __init__(self, session_factory: Callable, server_info: MCPServerInfo):
+        self.session_factory = session_factory
+        self.server_info = server_info
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def open(self) -> ClientSession:
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            return await ready
+        except asyncio.CancelledError:
+            self._task.cancel()
+            raise
+
+    async def _run(self, ready: asyncio.Future):
+        try:
+            async with self.session_factory(self.server_info) as session:
+                if session is None:
+                    raise ConnectionError(f"No session for {self.server_info.name} ({self.server_info.protocol})")
+                self.session = session
+                ready.set_result(session)
+                await self._closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"Pooled session for {self.server_info.name} ended: {e}")
+        finally:
+            self.session = None
+            if not ready.done():
+                ready.set_exception(ConnectionError(f"Session for {self.server_info.name} closed while opening"))
+
+    async def close(self):
+        self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """Bounded pool of sessions to one MCP server"""
+
+    def __init__(
+        self,
+        server_info: MCPServerInfo,
+        session_factory: Callable,
+        max_sessions: int = 4,
+        max_concurrency: int = 16
+    ):
+        self.server_info = server_info
+        self.session_factory = session_factory
+        self.max_sessions = max(1, max_sessions)
+        self.max_concurrency = max(1, max_concurrency)
+        self.sessions: List[_PooledSession] = []
+        self.queue_waits: deque = deque(maxlen=1000)
+        self.stats = {'leases': 0, 'sessions_opened': 0, 'open_failures': 0, 'sessions_dropped': 0}
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._open_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Wait for a concurrency slot, then lease the least busy session"""
+        start = time.perf_counter()
+        async with self._slots:
+            queue_wait = time.perf_counter() - start
+            self.queue_waits.append(queue_wait)
+            pooled = await self._checkout()
+            pooled.in_flight += 1
+            self.stats['leases'] += 1
+            try:
+                yield MCPSessionLease(session=pooled.session, queue_wait=queue_wait)
+            finally:
+                pooled.in_flight -= 1
+
+    async def _checkout(self) -> _PooledSession:
+        self._drop_dead()
+        idle = [p for p in self.sessions if p.in_flight == 0]
+        if idle or len(self.sessions) >= self.max_sessions:
+            return idle[0] if idle else min(self.sessions, key=lambda p: p.in_flight)
+
+        async with self._open_lock:
+            self._drop_dead()
+            idle = [p for p in self.sessions if p.in_flight == 0]
+            if idle:
+                return idle[0]
+            if len(self.sessions) < self.max_sessions:
+                pooled = _PooledSession(self.session_factory, self.server_info)
+                try:
+                    await pooled.open()
+                except Exception:
+                    self.stats['open_failures'] += 1
+                    raise
+                self.sessions.append(pooled)
+                self.stats['sessions_opened'] += 1
+                return pooled
+            return min(self.sessions, key=lambda p: p.in_flight)
+
+    def _drop_dead(self):
+        live = [p for p in self.sessions if p.alive]
+        self.stats['sessions_dropped'] += len(self.sessions) - len(live)
+        self.sessions = live
+
+    async def get_session(self) -> ClientSession:
+        """A pooled session without taking a concurrency slot"""
+        return (await self._checkout()).session
+
+    def get_stats(self) -> Dict[str, Any]:
+        waits = list(self.queue_waits)
+        return {
+            **self.stats,
+            'open_sessions': len(self.sessions),
+            'in_flight': sum(p.in_flight for p in self.sessions),
+            'max_sessions': self.max_sessions,
+            'max_concurrency': self.max_concurrency,
+            'avg_queue_wait': sum(waits) / len(waits) if waits else 0.0,
+            'p95_queue_wait': percentile(waits, 95) or 0.0,
+        }
+
+    async def close(self):
+        sessions, self.sessions = self.sessions, []
+        await asyncio.gather(*(p.close() for p in sessions), return_exceptions=True)
+
+
 class MCPSessionManager:
-    """Manager for MCP client sessions"""
+    """
+    Manager for MCP client sessions.
+
+    Each server gets an MCPSessionPool of up to `max_sessions_per_server`
+    sessions with at most `max_concurrency_per_server` calls in flight;
+    MCPServerInfo.max_sessions / max_concurrency override these per server.
+    `session_factory(server_info)` must return an async context manager
+    yielding an initialized ClientSession, e.g.
+    mcp.shared.memory.create_connected_server_and_client_session for an
+    in-process server.
+    """
     
-    def __init__(self, registry: MCPServerRegistry):
+    def __init__(
+        self,
+        registry: MCPServerRegistry,
+        max_sessions_per_server: int = 4,
+        max_concurrency_per_server: int = 16,
+        session_factory: Optional[Callable] = None
+    ):
         self.registry = registry
-        self.sessions: Dict[str, ClientSession] = {}
-        self.connection_pools: Dict[str, Any] = {}
-        
-    async def get_session(self, server_name: str) -> Optional[ClientSession]:
-        """Get or create a session for a server"""
-        if server_name in self.sessions:
-            return self.sessions[server_name]
+        self.max_sessions_per_server = max_sessions_per_server
+        self.max_concurrency_per_server = max_concurrency_per_server
+        self.session_factory = session_factory or self._open_session
+        self.connection_pools: Dict[str, MCPSessionPool] = {}
+
+    def get_pool(self, server_name: str) -> Optional[MCPSessionPool]:
+        """Get or create the session pool for a server"""
+        if server_name in self.connection_pools:
+            return self.connection_pools[server_name]
         
         server_info = self.registry.get_server_info(server_name)
         if not server_info:
             logger.error(f"Server not found: {server_name}")
             return None
         
+        pool = MCPSessionPool(
+            server_info,
+            self.session_factory,
+            max_sessions=server_info.max_sessions or self.max_sessions_per_server,
+            max_concurrency=server_info.max_concurrency or self.max_concurrency_per_server
+        )
+        self.connection_pools[server_name] = pool
+        return pool
+
+    @asynccontextmanager
+    async def lease(self, server_name: str):
+        """Lease a session for one call, waiting for a free slot if needed"""
+        pool = self.get_pool(server_name)
+        if pool is None:
+            raise Exception(f"Failed to get session for server: {server_name}")
+        async with pool.acquire() as lease:
+            yield lease
+        
+    async def get_session(self, server_name: str) -> Optional[ClientSession]:
+        """Get a pooled session for a server, e.g. for tool listing and health checks"""
+        pool = self.get_pool(server_name)
+        if pool is None:
+            return None
+        
         try:
-            session = await self._create_session(server_info)
-            if session:
-                self.sessions[server_name] = session
-                return session
+            return await pool.get_session()
         except Exception as e:
             logger.error(f"Failed to create session for {server_name}: {e}")
             
         return None
     
-    async def _create_session(self, server_info: MCPServerInfo) -> Optional[ClientSession]:
-        """Create a new MCP session based on protocol"""
-        try:
-            if server_info.protocol == 'sse':
-                streams = await sse_client(server_info.url)
-                session = ClientSession(streams[0], streams[1])
-                await session.initialize()
-                return session
-                
-            elif server_info.protocol == 'stdio':
-                # For stdio connections, we'd need to start the process
-                # This is more complex and depends on the server implementation
-                pass
-                
-            elif server_info.protocol == 'websocket':
-                # WebSocket implementation would go here
-                pass
-                
-        except Exception as e:
-            logger.error(f"Failed to create {server_info.protocol} session: {e}")
+    @asynccontextmanager
+    async def _open_session(self, server_info: MCPServerInfo):
+        """Open a new MCP session based on protocol"""
+        if server_info.protocol == 'sse':
+            async with sse_client(server_info.url) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    yield session
+            return
             
-        return None
+        # stdio servers need their process started and websocket transport is
+        # not implemented; neither can be pooled yet
+        logger.error(f"Failed to create {server_info.protocol} session: unsupported protocol")
+        yield None
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-server pool occupancy and queue wait times"""
+        return {name: pool.get_stats() for name, pool in self.connection_pools.items()}
     
     async def close_session(self, server_name: str) -> bool:
-        """Close a session"""
-        if server_name in self.sessions:
-            try:
-                session = self.sessions[server_name]
-                await session.close()
-                del self.sessions[server_name]
-                return True
-            except Exception as e:
-                logger.error(f"Failed to close session for {server_name}: {e}")
+        """Close all pooled sessions for a server"""
+        pool = self.connection_pools.pop(server_name, None)
+        if pool is None:
+            return False
+        try:
+            await pool.close()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to close session for {server_name}: {e}")
         
         return False
     
     async def close_all_sessions(self):
         """Close all active sessions"""
-        for server_name in list(self.sessions.keys()):
+        for server_name in list(self.connection_pools.keys()):
             await self.close_session(server_name)
 
 
 class MCPFunctionExecutor:
-    """Executor for MCP functions with intelligent routing and error handling"""
+    """
+    Executor for MCP functions with intelligent routing and error handling.
+
+    Results of functions declared `cacheable` are reused for identical
+    arguments until their `cache_ttl` (or `default_cache_ttl`) expires, and
+    concurrent identical calls share one execution. At most
+    `result_cache_size` results are kept, least recently used first out.
+    """
     
-    def __init__(self, registry: MCPServerRegistry, session_manager: MCPSessionManager):
+    def __init__(
+        self,
+        registry: MCPServerRegistry,
+        session_manager: MCPSessionManager,
+        default_cache_ttl: float = 60.0,
+        result_cache_size: int = 1024
+    ):
         self.registry = registry
         self.session_manager = session_manager
         self.execution_history: List[Dict[str, Any]] = []
+        self.default_cache_ttl = default_cache_ttl
+        self.result_cache_size = result_cache_size
+        self.result_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self.cache_stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'expired': 0, 'evictions': 0}
+        self._pending_results: Dict[str, asyncio.Future] = {}
+        self._required_params: Dict[str, tuple] = {}
         self.retry_strategies = {
             'immediate': self._immediate_retry,
             'exponential_backoff': self._exponential_backoff_retry,
@@ -351,10 +589,16 @@ class MCPFunctionExecutor:
             # Validate arguments
             self._validate_arguments(function_info, arguments)
             
-            # Execute with retry strategy
-            result = await self.retry_strategies[retry_strategy](
-                function_info, arguments, max_retries, execution_record
-            )
+            cache_key = self._cache_key(function_info, arguments)
+            if cache_key is not None:
+                result = await self._execute_cached(
+                    cache_key, function_info, arguments, retry_strategy, max_retries, execution_record
+                )
+            else:
+                # Execute with retry strategy
+                result = await self.retry_strategies[retry_strategy](
+                    function_info, arguments, max_retries, execution_record
+                )
             
             execution_record['success'] = True
             execution_record['result'] = result
@@ -374,6 +618,83 @@ class MCPFunctionExecutor:
             if len(self.execution_history) > 1000:
                 self.execution_history = self.execution_history[-1000:]
     
+    def _cache_key(self, function_info: MCPFunction, arguments: Dict[str, Any]) -> Optional[str]:
+        """Result cache key, or None if the call must not be cached"""
+        if not function_info.cacheable:
+            return None
+        try:
+            return f"{function_info.server}:{function_info.name}:" + json.dumps(arguments, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+    async def _execute_cached(
+        self,
+        cache_key: str,
+        function_info: MCPFunction,
+        arguments: Dict[str, Any],
+        retry_strategy: str,
+        max_retries: int,
+        execution_record: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Serve a cacheable call from the result cache, or execute and store it"""
+        entry = self.result_cache.get(cache_key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.time():
+                self.result_cache.move_to_end(cache_key)
+                self.cache_stats['hits'] += 1
+                execution_record['cached'] = True
+                return copy.deepcopy(result)
+            del self.result_cache[cache_key]
+            self.cache_stats['expired'] += 1
+
+        pending = self._pending_results.get(cache_key)
+        if pending is not None:
+            # An identical call is already running; share its result
+            self.cache_stats['coalesced'] += 1
+            execution_record['cached'] = True
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        self.cache_stats['misses'] += 1
+        pending = asyncio.get_running_loop().create_future()
+        self._pending_results[cache_key] = pending
+        try:
+            result = await self.retry_strategies[retry_strategy](
+                function_info, arguments, max_retries, execution_record
+            )
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            # Nobody may be waiting on it
+            pending.exception()
+            raise
+        finally:
+            self._pending_results.pop(cache_key, None)
+
+        pending.set_result(result)
+        # Tool errors are reported in the result, don't pin them in the cache
+        if not (isinstance(result, dict) and result.get('isError')):
+            ttl = function_info.cache_ttl if function_info.cache_ttl is not None else self.default_cache_ttl
+            self.result_cache[cache_key] = (time.time() + ttl, copy.deepcopy(result))
+            self.result_cache.move_to_end(cache_key)
+            while len(self.result_cache) > self.result_cache_size:
+                self.result_cache.popitem(last=False)
+                self.cache_stats['evictions'] += 1
+        return result
+
+    def invalidate_cache(self, function_name: Optional[str] = None) -> int:
+        """Drop cached results, for one function or all of them"""
+        if function_name is None:
+            dropped = len(self.result_cache)
+            self.result_cache.clear()
+            return dropped
+        keys = [k for k in self.result_cache if k.split(':', 2)[1] == function_name]
+        for key in keys:
+            del self.result_cache[key]
+        return len(keys)
+    
     async def _immediate_retry(
         self,
         function_info: MCPFunction,
@@ -385,7 +706,7 @@ class MCPFunctionExecutor:
         for attempt in range(max_retries + 1):
             execution_record['attempts'] = attempt + 1
             try:
-                return await self._execute_single_attempt(function_info, arguments)
+                return await self._execute_single_attempt(function_info, arguments, execution_record)
             except Exception as e:
                 if attempt == max_retries:
                     raise
@@ -402,7 +723,7 @@ class MCPFunctionExecutor:
         for attempt in range(max_retries + 1):
             execution_record['attempts'] = attempt + 1
             try:
-                return await self._execute_single_attempt(function_info, arguments)
+                return await self._execute_single_attempt(function_info, arguments, execution_record)
             except Exception as e:
                 if attempt == max_retries:
                     raise
@@ -431,18 +752,18 @@ class MCPFunctionExecutor:
     async def _execute_single_attempt(
         self,
         function_info: MCPFunction,
-        arguments: Dict[str, Any]
+        arguments: Dict[str, Any],
+        execution_record: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Execute a single function call attempt"""
-        session = await self.session_manager.get_session(function_info.server)
-        if not session:
-            raise Exception(f"Failed to get session for server: {function_info.server}")
-        
+        """Execute a single function call attempt on a pooled session"""
         try:
-            result = await session.call_tool(
-                name=function_info.name,
-                arguments=arguments
-            )
+            async with self.session_manager.lease(function_info.server) as lease:
+                if execution_record is not None:
+                    execution_record['queue_wait'] = execution_record.get('queue_wait', 0.0) + lease.queue_wait
+                result = await lease.session.call_tool(
+                    name=function_info.name,
+                    arguments=arguments
+                )
             
             # Update server health
             server_info = self.registry.get_server_info(function_info.server)
@@ -461,14 +782,19 @@ class MCPFunctionExecutor:
     
     def _validate_arguments(self, function_info: MCPFunction, arguments: Dict[str, Any]):
         """Validate function arguments against schema"""
-        required_params = []
         param_schema = function_info.parameters
         
-        # Extract required parameters
-        if 'properties' in param_schema:
-            for param_name, param_def in param_schema['properties'].items():
-                if param_def.get('required', False) or param_name in param_schema.get('required', []):
-                    required_params.append(param_name)
+        # Extract required parameters once per schema
+        cached = self._required_params.get(function_info.name)
+        if cached is not None and cached[0] is param_schema:
+            required_params = cached[1]
+        else:
+            required_params = []
+            if 'properties' in param_schema:
+                for param_name, param_def in param_schema['properties'].items():
+                    if param_def.get('required', False) or param_name in param_schema.get('required', []):
+                        required_params.append(param_name)
+            self._required_params[function_info.name] = (param_schema, required_params)
         
         # Check required parameters
         for param in required_params:
@@ -477,16 +803,32 @@ class MCPFunctionExecutor:
         
         # Type validation could be added here
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Result cache hit rate and occupancy"""
+        served = self.cache_stats['hits'] + self.cache_stats['coalesced']
+        lookups = served + self.cache_stats['misses']
+        return {
+            **self.cache_stats,
+            'entries': len(self.result_cache),
+            'hit_rate': served / lookups if lookups else 0.0,
+        }
+
     def get_execution_stats(self) -> Dict[str, Any]:
         """Get execution statistics"""
         if not self.execution_history:
-            return {"total_executions": 0}
+            return {
+                "total_executions": 0,
+                "cache": self.get_cache_stats(),
+                "pools": self.session_manager.get_pool_stats()
+            }
         
         total_executions = len(self.execution_history)
         successful_executions = sum(1 for ex in self.execution_history if ex['success'])
+        queue_waits = [ex['queue_wait'] for ex in self.execution_history if 'queue_wait' in ex]
         
         function_stats = {}
         server_stats = {}
+        function_waits: Dict[str, List[float]] = {}
         
         for execution in self.execution_history:
             func_name = execution['function_name']
@@ -494,11 +836,17 @@ class MCPFunctionExecutor:
             
             # Function stats
             if func_name not in function_stats:
-                function_stats[func_name] = {'calls': 0, 'successes': 0, 'avg_time': 0}
+                function_stats[func_name] = {'calls': 0, 'successes': 0, 'avg_time': 0,
+                                             'cache_hits': 0, 'avg_queue_wait': 0}
             
             function_stats[func_name]['calls'] += 1
             if execution['success']:
                 function_stats[func_name]['successes'] += 1
+            if execution.get('cached'):
+                function_stats[func_name]['cache_hits'] += 1
+            
+            if 'queue_wait' in execution:
+                function_waits.setdefault(func_name, []).append(execution['queue_wait'])
             
             if 'execution_time' in execution:
                 current_avg = function_stats[func_name]['avg_time']
@@ -520,11 +868,21 @@ class MCPFunctionExecutor:
                 calls = server_stats[server_name]['calls']
                 server_stats[server_name]['avg_time'] = (current_avg * (calls - 1) + new_time) / calls
         
+        for func_name, waits in function_waits.items():
+            function_stats[func_name]['avg_queue_wait'] = sum(waits) / len(waits)
+        
         return {
             'total_executions': total_executions,
             'success_rate': successful_executions / total_executions,
             'function_stats': function_stats,
-            'server_stats': server_stats
+            'server_stats': server_stats,
+            'queue_wait': {
+                'avg': sum(queue_waits) / len(queue_waits) if queue_waits else 0.0,
+                'p95': percentile(queue_waits, 95) or 0.0,
+                'max': max(queue_waits) if queue_waits else 0.0
+            },
+            'cache': self.get_cache_stats(),
+            'pools': self.session_manager.get_pool_stats()
         }
 
 
@@ -608,7 +966,9 @@ class ComprehensiveMCPClient:
                     returns=func_data['returns'],
                     server='local',  # Default to local server
                     category=category_name,
-                    examples=func_data.get('examples', [])
+                    examples=func_data.get('examples', []),
+                    cacheable=func_data.get('cacheable', False),
+                    cache_ttl=func_data.get('cache_ttl')
                 )
                 self.registry.register_function(function)
         
@@ -707,9 +1067,9 @@ class ComprehensiveMCPClient:
         functions = self.registry.list_functions(category, server)
         return [asdict(func) for func in functions]
     
-    def search_functions(self, query: str) -> List[Dict[str, Any]]:
-        """Search functions by name or description"""
-        functions = self.registry.search_functions(query)
+    def search_functions(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search functions by name, parameter names and description, best match first"""
+        functions = self.registry.search_functions(query, limit)
         return [asdict(func) for func in functions]
     
     def get_function_info(self, function_name: str) -> Optional[Dict[str, Any]]:
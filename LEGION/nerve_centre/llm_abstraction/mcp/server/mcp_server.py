@@ -13,9 +13,10 @@ import logging
 import sqlite3
 import psutil
 import hashlib
+import inspect
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from dataclasses import dataclass
 import tempfile
 import shutil
@@ -84,9 +85,11 @@ class ComprehensiveMCPServer:
         self.memory_db = sqlite3.connect(":memory:", check_same_thread=False)
         self.temp_dir = Path(tempfile.mkdtemp(prefix="mcp_workspace_"))
         self.web_driver = None
+        self.tools: Dict[str, Callable] = {}
         self.setup_memory_db()
         self.load_configuration()
         self.register_all_functions()
+        self.register_protocol_handlers()
         
     def setup_memory_db(self):
         """Initialize in-memory database for context management"""
@@ -143,10 +146,58 @@ class ComprehensiveMCPServer:
         # Auto-discovery and integration
         self.discover_external_mcp_servers()
         
+    def tool(self):
+        """Register a coroutine as an MCP tool under its function name"""
+        def decorator(func: Callable) -> Callable:
+            self.tools[func.__name__] = func
+            return func
+        return decorator
+
+    @staticmethod
+    def _input_schema(func: Callable) -> Dict[str, Any]:
+        """JSON schema for a tool's arguments, derived from its signature"""
+        json_types = {str: "string", int: "integer", float: "number", bool: "boolean"}
+        properties = {}
+        required = []
+        for name, param in inspect.signature(func).parameters.items():
+            annotation = param.annotation
+            origin = getattr(annotation, "__origin__", annotation)
+            prop = {}
+            # Parameters defaulting to None accept anything
+            if param.default is not None:
+                if annotation in json_types:
+                    prop["type"] = json_types[annotation]
+                elif origin is list:
+                    prop["type"] = "array"
+                elif origin is dict:
+                    prop["type"] = "object"
+            properties[name] = prop
+            if param.default is inspect.Parameter.empty:
+                required.append(name)
+        return {"type": "object", "properties": properties, "required": required}
+
+    def register_protocol_handlers(self):
+        """Expose the registered tools through a single MCP list/call handler pair"""
+
+        @self.server.list_tools()
+        async def list_tools() -> List[Tool]:
+            return [
+                Tool(name=name, description=(func.__doc__ or name).strip(), inputSchema=self._input_schema(func))
+                for name, func in self.tools.items()
+            ]
+
+        @self.server.call_tool()
+        async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+            func = self.tools.get(name)
+            if func is None:
+                raise ValueError(f"Unknown tool: {name}")
+            result = await func(**arguments)
+            return [TextContent(type="text", text=json.dumps(result, default=str))]
+
     def register_file_functions(self):
         """Register file management functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def create_file(file_path: str, content: str, encoding: str = "utf-8") -> Dict[str, Any]:
             """Create a new file with content"""
             try:
@@ -158,7 +209,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return {"success": False, "message": f"Error creating file: {str(e)}"}
         
-        @self.server.call_tool()
+        @self.tool()
         async def read_file(file_path: str, encoding: str = "utf-8") -> str:
             """Read file content"""
             try:
@@ -167,7 +218,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return f"Error reading file: {str(e)}"
         
-        @self.server.call_tool()
+        @self.tool()
         async def write_file(file_path: str, content: str, mode: str = "w") -> bool:
             """Write content to file"""
             try:
@@ -178,7 +229,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error writing file: {e}")
                 return False
         
-        @self.server.call_tool()
+        @self.tool()
         async def delete_file(file_path: str) -> bool:
             """Delete a file"""
             try:
@@ -188,7 +239,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error deleting file: {e}")
                 return False
         
-        @self.server.call_tool()
+        @self.tool()
         async def move_file(source_path: str, destination_path: str) -> bool:
             """Move or rename a file"""
             try:
@@ -198,7 +249,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error moving file: {e}")
                 return False
         
-        @self.server.call_tool()
+        @self.tool()
         async def copy_file(source_path: str, destination_path: str) -> bool:
             """Copy a file"""
             try:
@@ -208,7 +259,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error copying file: {e}")
                 return False
         
-        @self.server.call_tool()
+        @self.tool()
         async def list_directory(directory_path: str, recursive: bool = False) -> List[str]:
             """List directory contents"""
             try:
@@ -221,7 +272,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error listing directory: {e}")
                 return []
         
-        @self.server.call_tool()
+        @self.tool()
         async def create_directory(directory_path: str, parents: bool = True) -> bool:
             """Create a directory"""
             try:
@@ -231,7 +282,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error creating directory: {e}")
                 return False
         
-        @self.server.call_tool()
+        @self.tool()
         async def get_file_info(file_path: str) -> Dict[str, Any]:
             """Get file metadata"""
             try:
@@ -250,7 +301,7 @@ class ComprehensiveMCPServer:
     def register_code_functions(self):
         """Register code execution functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def execute_python(code: str, timeout: int = 30, capture_output: bool = True) -> Dict[str, Any]:
             """Execute Python code"""
             try:
@@ -280,7 +331,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return {"error": str(e), "exit_code": -1}
         
-        @self.server.call_tool()
+        @self.tool()
         async def execute_shell(command: str, working_directory: str = "/", timeout: int = 30) -> Dict[str, Any]:
             """Execute shell commands"""
             try:
@@ -303,7 +354,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return {"error": str(e), "exit_code": -1}
         
-        @self.server.call_tool()
+        @self.tool()
         async def execute_javascript(code: str, timeout: int = 30) -> Dict[str, Any]:
             """Execute JavaScript code using Node.js"""
             try:
@@ -324,7 +375,7 @@ class ComprehensiveMCPServer:
     def register_web_functions(self):
         """Register web operations functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def web_search(query: str, search_engine: str = "duckduckgo", num_results: int = 10) -> List[Dict[str, str]]:
             """Search the web"""
             try:
@@ -349,7 +400,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return [{"error": str(e)}]
         
-        @self.server.call_tool()
+        @self.tool()
         async def fetch_webpage(url: str, parse_html: bool = True, extract_text: bool = True) -> Dict[str, Any]:
             """Fetch and parse webpage content"""
             try:
@@ -373,7 +424,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return {"error": str(e)}
         
-        @self.server.call_tool()
+        @self.tool()
         async def download_file(url: str, destination: str, chunk_size: int = 8192) -> Dict[str, Any]:
             """Download file from URL"""
             try:
@@ -394,7 +445,7 @@ class ComprehensiveMCPServer:
     def register_system_functions(self):
         """Register system control functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def run_application(application: str, arguments: List[str] = None, wait_for_exit: bool = False) -> Dict[str, Any]:
             """Launch an application"""
             try:
@@ -408,7 +459,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return {"pid": 0, "success": False, "error": str(e)}
         
-        @self.server.call_tool()
+        @self.tool()
         async def list_processes(filter_name: str = None) -> List[Dict[str, Any]]:
             """List running processes"""
             try:
@@ -429,7 +480,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return [{"error": str(e)}]
         
-        @self.server.call_tool()
+        @self.tool()
         async def take_screenshot(region: Dict[str, int] = None, save_path: str = None) -> str:
             """Capture screen screenshot"""
             try:
@@ -448,7 +499,7 @@ class ComprehensiveMCPServer:
             except Exception as e:
                 return f"Error taking screenshot: {str(e)}"
         
-        @self.server.call_tool()
+        @self.tool()
         async def click_at(x: int, y: int, button: str = "left") -> bool:
             """Click at screen coordinates"""
             try:
@@ -458,7 +509,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error clicking: {e}")
                 return False
         
-        @self.server.call_tool()
+        @self.tool()
         async def type_text(text: str, delay: float = 0.05) -> bool:
             """Type text at current cursor position"""
             try:
@@ -471,7 +522,7 @@ class ComprehensiveMCPServer:
     def register_memory_functions(self):
         """Register memory management functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def store_memory(key: str, value: Any, category: str = "general", ttl: int = None) -> bool:
             """Store information in memory"""
             try:
@@ -490,7 +541,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error storing memory: {e}")
                 return False
         
-        @self.server.call_tool()
+        @self.tool()
         async def retrieve_memory(key: str, category: str = "general") -> Any:
             """Retrieve information from memory"""
             try:
@@ -507,7 +558,7 @@ class ComprehensiveMCPServer:
                 logger.error(f"Error retrieving memory: {e}")
                 return None
         
-        @self.server.call_tool()
+        @self.tool()
         async def search_memory(query: str, category: str = None, limit: int = 10) -> List[Dict[str, Any]]:
             """Search memory by content"""
             try:
@@ -538,7 +589,7 @@ class ComprehensiveMCPServer:
     def register_database_functions(self):
         """Register database operation functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def execute_sql(query: str, database_url: str, parameters: List[Any] = None) -> Dict[str, Any]:
             """Execute SQL query"""
             try:
@@ -573,7 +624,7 @@ class ComprehensiveMCPServer:
     def register_ai_functions(self):
         """Register AI/ML operation functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def semantic_search(query: str, documents: List[str], top_k: int = 5) -> List[Dict[str, Any]]:
             """Perform semantic search using TF-IDF"""
             try:
@@ -604,7 +655,7 @@ class ComprehensiveMCPServer:
     def register_communication_functions(self):
         """Register communication functions"""
         
-        @self.server.call_tool()
+        @self.tool()
         async def make_http_request(url: str, method: str = "GET", headers: Dict[str, str] = None, 
                                  data: Any = None, timeout: int = 30) -> Dict[str, Any]:
             """Make HTTP request"""
@@ -0,0 +1,13 @@
+"""Small statistics helpers shared by the orchestrator and the MCP client."""
+
+import math
+from typing import Iterable, Optional
+
+
+def percentile(values: Iterable[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, q in [0, 100]; None without samples."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = math.ceil(q / 100.0 * len(ordered))
+    return ordered[max(0, min(len(ordered) - 1, rank - 1))]
@@ -0,0 +1,278 @@
+"""
+Persistent LLM Response Cache
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from llm_abstraction.llm_abstraction import LLMResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Bounded, persistent cache of processed LLM responses.
+
+    Exact hits are keyed on the engineered prompt, the optimized context,
+    the provider and the request parameters. With an `embed_fn` the cache
+    also serves near-duplicate prompts: a prompt whose embedding has cosine
+    similarity >= `similarity_threshold` with a cached prompt that shares
+    the same context, provider and parameters reuses its response.
+
+    Entries expire after `ttl` seconds; beyond `max_entries` or `max_bytes`
+    the least recently used ones are evicted. `path=":memory:"` keeps the
+    cache for the life of the process only.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl: Optional[float] = 24 * 3600,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.95
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, scope TEXT NOT NULL, response TEXT NOT NULL, "
+            "embedding BLOB, size INTEGER NOT NULL, saved_seconds REAL NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses(expires_at)")
+        # Running totals, so a put doesn't have to aggregate the whole table
+        self._entries, self._bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+        # Normalized prompt embeddings per scope, for near-duplicate lookup
+        self._vectors: Dict[str, Dict[str, np.ndarray]] = {}
+        self._matrices: Dict[str, tuple] = {}
+        if embed_fn is not None:
+            for key, scope, blob in self._db.execute(
+                    "SELECT key, scope, embedding FROM responses WHERE embedding IS NOT NULL"):
+                self._vectors.setdefault(scope, {})[key] = np.frombuffer(blob, dtype=np.float32)
+
+        self.stats = {
+            'exact_hits': 0,
+            'semantic_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expired': 0,
+            'seconds_saved': 0.0,
+        }
+
+    @staticmethod
+    def scope_key(context: Optional[Dict[str, Any]], provider: str, params: Dict[str, Any]) -> str:
+        """Everything but the prompt that a cached response depends on."""
+        payload = json.dumps({'context': context or {}, 'provider': provider, 'params': params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def exact_key(prompt: str, scope: str) -> str:
+        return hashlib.sha256(f"{scope}\n{prompt}".encode()).hexdigest()
+
+    def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(self.embed_fn(prompt), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Response cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def get(
+        self,
+        prompt: str,
+        context: Optional[Dict[str, Any]],
+        provider: str,
+        params: Dict[str, Any]
+    ) -> Optional[LLMResponse]:
+        """Cached response for the request, or None."""
+        scope = self.scope_key(context, provider, params)
+        key = self.exact_key(prompt, scope)
+        with self._lock:
+            hit = self._load(key)
+            if hit is not None:
+                self.stats['exact_hits'] += 1
+                return self._served(hit, 'exact')
+
+            if self.embed_fn is not None and self._vectors.get(scope):
+                vector = self._embed(prompt)
+                if vector is not None:
+                    similar_key, similarity = self._nearest(scope, vector)
+                    if similar_key is not None and similarity >= self.similarity_threshold:
+                        hit = self._load(similar_key)
+                        if hit is not None:
+                            self.stats['semantic_hits'] += 1
+                            response = self._served(hit, 'semantic')
+                            response.metadata['similarity'] = similarity
+                            return response
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(
+        self,
+        prompt: str,
+        context: Optional[Dict[str, Any]],
+        provider: str,
+        params: Dict[str, Any],
+        response: LLMResponse,
+        elapsed: Optional[float] = None
+    ) -> None:
+        """Store a processed response; `elapsed` is what a later hit saves."""
+        scope = self.scope_key(context, provider, params)
+        key = self.exact_key(prompt, scope)
+        payload = json.dumps({
+            'content': response.content,
+            'provider': response.provider,
+            'timestamp': response.timestamp,
+            'tokens_used': response.tokens_used,
+            'confidence_score': response.confidence_score,
+            'processing_time': response.processing_time,
+            'metadata': response.metadata,
+        }, default=str)
+        vector = self._embed(prompt) if self.embed_fn is not None else None
+        now = time.time()
+        saved_seconds = elapsed if elapsed is not None else (response.processing_time or 0.0)
+
+        with self._lock:
+            replaced = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if replaced is not None:
+                self._entries -= 1
+                self._bytes -= replaced[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, scope, response, embedding, size, saved_seconds, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, scope, payload, vector.tobytes() if vector is not None else None,
+                 len(payload), saved_seconds, now + self.ttl if self.ttl else None, now)
+            )
+            self._entries += 1
+            self._bytes += len(payload)
+            if vector is not None:
+                self._vectors.setdefault(scope, {})[key] = vector
+                self._matrices.pop(scope, None)
+            self.stats['stores'] += 1
+            self._enforce_limits(now)
+
+    def _load(self, key: str) -> Optional[tuple]:
+        row = self._db.execute(
+            "SELECT response, saved_seconds, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        payload, saved_seconds, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self._delete([key])
+            self.stats['expired'] += 1
+            return None
+        self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(payload), saved_seconds
+
+    def _served(self, hit: tuple, kind: str) -> LLMResponse:
+        data, saved_seconds = hit
+        self.stats['seconds_saved'] += saved_seconds
+        metadata = dict(data.get('metadata') or {})
+        metadata['cache'] = kind
+        return LLMResponse(
+            content=data['content'],
+            provider=data['provider'],
+            timestamp=time.time(),
+            tokens_used=data.get('tokens_used'),
+            confidence_score=data.get('confidence_score'),
+            processing_time=0.0,
+            metadata=metadata
+        )
+
+    def _nearest(self, scope: str, vector: np.ndarray) -> tuple:
+        if scope not in self._matrices:
+            keys = list(self._vectors[scope].keys())
+            self._matrices[scope] = (keys, np.vstack([self._vectors[scope][k] for k in keys]))
+        keys, matrix = self._matrices[scope]
+        if matrix.shape[1] != vector.shape[0]:
+            return None, 0.0
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        return keys[best], float(similarities[best])
+
+    def _delete(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        rows = []
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            rows.extend(self._db.execute(
+                f"SELECT key, scope, size FROM responses WHERE key IN ({marks})", batch).fetchall())
+            self._db.execute(f"DELETE FROM responses WHERE key IN ({marks})", batch)
+        self._entries -= len(rows)
+        self._bytes -= sum(size for _, _, size in rows)
+        for key, scope, _ in rows:
+            if self._vectors.get(scope, {}).pop(key, None) is not None:
+                self._matrices.pop(scope, None)
+
+    def _enforce_limits(self, now: float) -> None:
+        expired = [k for (k,) in self._db.execute(
+            "SELECT key FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))]
+        self._delete(expired)
+        self.stats['expired'] += len(expired)
+
+        count, size = self._entries, self._bytes
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        victims = []
+        for key, entry_size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            victims.append(key)
+            count -= 1
+            size -= entry_size
+        self._delete(victims)
+        self.stats['evictions'] += len(victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._entries = self._bytes = 0
+            self._vectors.clear()
+            self._matrices.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates plus the provider calls and seconds the cache saved."""
+        with self._lock:
+            entries, size = self._entries, self._bytes
+            stats = dict(self.stats)
+        hits = stats['exact_hits'] + stats['semantic_hits']
+        lookups = hits + stats['misses']
+        stats.update({
+            'entries': entries,
+            'size_bytes': size,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'provider_calls_saved': hits,
+        })
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -9,6 +9,11 @@ from copy import deepcopy
 from io import BytesIO
 from timeit import default_timer as timer
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
 import numpy as np
 import pdfplumber
 import trio
@@ -19,7 +24,7 @@ from pypdf import PdfReader as pdf2_read
 
 from api import settings
 from api.utils.file_utils import get_project_base_directory
-from deepdoc.vision import OCR, LayoutRecognizer, Recognizer, TableStructureRecognizer
+from deepdoc.vision import OCR, OCRPool, LayoutRecognizer, Recognizer, TableStructureRecognizer, document_hash, get_ocr_pool, get_page_cache
 from rag.app.picture import vision_llm_chunk as picture_vision_llm_chunk
 from rag.nlp import rag_tokenizer
 from rag.prompts import vision_llm_describe_prompt
@@ -30,6 +35,45 @@ if LOCK_KEY_pdfplumber not in sys.modules:
     sys.modules[LOCK_KEY_pdfplumber] = threading.Lock()
 
 
+class PdfParseStats:
+    """Throughput and memory figures of a streamed parse."""
+
+    def __init__(self):
+        self.pages = 0
+        self.windows = 0
+        self.seconds = 0.0
+        self.zoom_retries = 0
+
+    def add_window(self, pages, seconds, zoom_retries=0):
+        self.pages += pages
+        self.windows += 1
+        self.seconds += seconds
+        self.zoom_retries += zoom_retries
+
+    @staticmethod
+    def peak_rss_mb():
+        if resource is None:
+            return None
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+    def summary(self):
+        return {
+            "pages": self.pages,
+            "windows": self.windows,
+            "seconds": self.seconds,
+            "pages_per_sec": self.pages / self.seconds if self.seconds else 0.0,
+            "zoom_retries": self.zoom_retries,
+            "peak_rss_mb": self.peak_rss_mb(),
+        }
+
+    def __str__(self):
+        s = self.summary()
+        rss = f"{s['peak_rss_mb']:.0f}MB" if s["peak_rss_mb"] is not None else "n/a"
+        return f"{s['pages']} pages in {s['seconds']:.2f}s ({s['pages_per_sec']:.2f} pages/s), peak RSS {rss}"
+
+
 class RAGFlowPdfParser:
     def __init__(self, **kwargs):
         """
@@ -44,10 +88,22 @@ class RAGFlowPdfParser:
 
         """
 
-        self.ocr = OCR()
+        # On CPU-only hosts OCR_WORKERS > 1 shards pages over a process pool,
+        # one lane per worker, the same way pages are sharded over GPUs. The
+        # pool is shared by every parser in the process.
+        ocr_workers = int(os.environ.get("OCR_WORKERS", 0))
+        if PARALLEL_DEVICES == 0 and ocr_workers > 1:
+            self.ocr = get_ocr_pool(ocr_workers)
+            self.ocr_lanes = self.ocr.workers
+        else:
+            self.ocr = OCR()
+            self.ocr_lanes = PARALLEL_DEVICES
+        self.page_cache = get_page_cache()
+        self.doc_hash = None
+        self._hashed_doc = None
         self.parallel_limiter = None
-        if PARALLEL_DEVICES > 1:
-            self.parallel_limiter = [trio.CapacityLimiter(1) for _ in range(PARALLEL_DEVICES)]
+        if self.ocr_lanes > 1:
+            self.parallel_limiter = [trio.CapacityLimiter(1) for _ in range(self.ocr_lanes)]
 
         if hasattr(self, "model_speciess"):
             self.layouter = LayoutRecognizer("layout." + self.model_speciess)
@@ -285,8 +341,7 @@ class RAGFlowPdfParser:
 
         start = timer()
         if not bxs:
-            self.boxes.append([])
-            return
+            return []
         bxs = [(line[0], line[1][0]) for line in bxs]
         bxs = Recognizer.sort_Y_firstly(
             [{"x0": b[0][0] / ZM, "x1": b[1][0] / ZM,
@@ -343,12 +398,22 @@ class RAGFlowPdfParser:
         if self.mean_height[pagenum-1] == 0:
             self.mean_height[pagenum-1] = np.median([b["bottom"] - b["top"]
                                               for b in bxs])
-        self.boxes.append(bxs)
+        return bxs
 
     def _layouts_rec(self, ZM, drop=True):
         assert len(self.page_images) == len(self.boxes)
+        layouts = None
+        if self.page_cache and self.doc_hash:
+            keys = [self.page_cache.key("layout", self.doc_hash, self.page_from + i, ZM) for i in range(len(self.page_images))]
+            layouts = self.page_cache.get_many("layout", keys)
+            missing = [i for i, lts in enumerate(layouts) if lts is None]
+            if missing:
+                predicted = self.layouter.predict([self.page_images[i] for i in missing])
+                for i, lts in zip(missing, predicted):
+                    layouts[i] = lts
+                self.page_cache.set_many({keys[i]: layouts[i] for i in missing})
         self.boxes, self.page_layout = self.layouter(
-            self.page_images, self.boxes, ZM, drop=drop)
+            self.page_images, self.boxes, ZM, drop=drop, layouts=layouts)
         # cumlative Y
         for i in range(len(self.boxes)):
             self.boxes[i]["top"] += \
@@ -987,6 +1052,25 @@ class RAGFlowPdfParser:
 
     def __images__(self, fnm, zoomin=3, page_from=0,
                    page_to=299, callback=None):
+        start = timer()
+        self._render_pages(fnm, zoomin, page_from, page_to)
+        logging.info(f"__images__ dedupe_chars cost {timer() - start}s")
+        self._load_outlines(fnm)
+        self._ocr_pages(fnm, zoomin, callback)
+
+    def _hash_document(self, fnm):
+        # stream() renders the same document window by window; hash it once.
+        if self.page_cache is None or fnm is self._hashed_doc:
+            return
+        try:
+            self.doc_hash = document_hash(fnm)
+            self._hashed_doc = fnm
+        except Exception:
+            logging.exception("RAGFlowPdfParser could not hash the document, page cache skipped")
+            self.doc_hash = None
+
+    def _render_pages(self, fnm, zoomin, page_from, page_to):
+        self._hash_document(fnm)
         self.lefted_chars = []
         self.mean_height = []
         self.mean_width = []
@@ -995,7 +1079,8 @@ class RAGFlowPdfParser:
         self.page_cum_height = [0]
         self.page_layout = []
         self.page_from = page_from
-        start = timer()
+        self.page_images = []
+        self.page_chars = []
         try:
             with sys.modules[LOCK_KEY_pdfplumber]:
                 with (pdfplumber.open(fnm) if isinstance(fnm, str) else pdfplumber.open(BytesIO(fnm))) as pdf:
@@ -1007,14 +1092,23 @@ class RAGFlowPdfParser:
                         self.page_chars = [[c for c in page.dedupe_chars().chars if self._has_color(c)] for page in self.pdf.pages[page_from:page_to]]
                     except Exception as e:
                         logging.warning(f"Failed to extract characters for pages {page_from}-{page_to}: {str(e)}")
-                        self.page_chars = [[] for _ in range(page_to - page_from)]  # If failed to extract, using empty list instead.
+                        self.page_chars = [[] for _ in range(len(self.page_images))]  # If failed to extract, using empty list instead.
 
                     self.total_page = len(self.pdf.pages)
 
         except Exception:
             logging.exception("RAGFlowPdfParser __images__")
-        logging.info(f"__images__ dedupe_chars cost {timer() - start}s")
 
+    def _rerender_page(self, fnm, page_index, zoomin):
+        """Render a single page again, at a different zoom, for the per-page retry."""
+        try:
+            with sys.modules[LOCK_KEY_pdfplumber]:
+                with (pdfplumber.open(fnm) if isinstance(fnm, str) else pdfplumber.open(BytesIO(fnm))) as pdf:
+                    return pdf.pages[self.page_from + page_index].to_image(resolution=72 * zoomin, antialias=True).annotated
+        except Exception:
+            logging.exception("RAGFlowPdfParser _rerender_page")
+
+    def _load_outlines(self, fnm):
         self.outlines = []
         try:
             with (pdf2_read(fnm if isinstance(fnm, str)
@@ -1037,6 +1131,7 @@ class RAGFlowPdfParser:
         if not self.outlines:
             logging.warning("Miss outlines")
 
+    def _ocr_pages(self, fnm, zoomin, callback=None):
         logging.debug("Images converted.")
         self.is_english = [re.search(r"[a-zA-Z0-9,/¸;:'\[\]\(\)!@#$%^&*\"?<>._-]{30,}", "".join(
             random.choices([c["text"] for c in self.page_chars[i]], k=min(100, len(self.page_chars[i]))))) for i in
@@ -1047,6 +1142,43 @@ class RAGFlowPdfParser:
         else:
             self.is_english = False
 
+        page_boxes = [[] for _ in self.page_images]
+        # Pages are OCRed on worker threads: each records its own retry and
+        # the total is summed here once they are done.
+        zoom_retried = [False] * len(self.page_images)
+
+        # OCR boxes depend on whether the text layer was merged in, which
+        # is decided per document by is_english.
+        cache_keys, cached = [], [None] * len(self.page_images)
+        if self.page_cache and self.doc_hash:
+            variant = "ocr-only" if self.is_english else "with-chars"
+            cache_keys = [self.page_cache.key("ocr", self.doc_hash, self.page_from + i, zoomin, variant)
+                          for i in range(len(self.page_images))]
+            cached = self.page_cache.get_many("ocr", cache_keys)
+
+        def __ocr_page(i, img, chars, id):
+            if cached[i] is not None:
+                bxs = cached[i]
+                for b in bxs:
+                    b["page_number"] = i + 1
+                if self.mean_height[i] == 0 and bxs:
+                    self.mean_height[i] = np.median([b["bottom"] - b["top"] for b in bxs])
+                page_boxes[i] = bxs
+                return
+            bxs = self.__ocr(i + 1, img, chars, zoomin, id)
+            # A page where detection found nothing may hold text too small for
+            # this zoom, whether or not it has a text layer (scans don't);
+            # retry just that page at a higher zoom instead of the whole
+            # document. Truly blank pages pay for one extra render.
+            if not bxs and zoomin < 9:
+                hi_img = self._rerender_page(fnm, i, zoomin * 3)
+                if hi_img is not None:
+                    zoom_retried[i] = True
+                    bxs = self.__ocr(i + 1, hi_img, chars, zoomin * 3, id)
+            page_boxes[i] = bxs
+            if cache_keys:
+                self.page_cache.set(cache_keys[i], bxs)
+
         async def __img_ocr(i, id, img, chars, limiter):
             j = 0
             while j + 1 < len(chars):
@@ -1059,9 +1191,9 @@ class RAGFlowPdfParser:
 
             if limiter:
                 async with limiter:
-                    await trio.to_thread.run_sync(lambda: self.__ocr(i + 1, img, chars, zoomin, id))
+                    await trio.to_thread.run_sync(lambda: __ocr_page(i, img, chars, id))
             else:
-                self.__ocr(i + 1, img, chars, zoomin, id)
+                __ocr_page(i, img, chars, id)
 
             if callback and i % 6 == 5:
                 callback(prog=(i + 1) * 0.6 / len(self.page_images), msg="")
@@ -1083,8 +1215,8 @@ class RAGFlowPdfParser:
                     for i, img in enumerate(self.page_images):
                         chars = __ocr_preprocess()
 
-                        nursery.start_soon(__img_ocr, i, i % PARALLEL_DEVICES, img, chars,
-                                           self.parallel_limiter[i % PARALLEL_DEVICES])
+                        nursery.start_soon(__img_ocr, i, i % self.ocr_lanes, img, chars,
+                                           self.parallel_limiter[i % self.ocr_lanes])
                         await trio.sleep(0.1)
             else:
                 for i, img in enumerate(self.page_images):
@@ -1094,8 +1226,15 @@ class RAGFlowPdfParser:
         start = timer()
 
         trio.run(__img_ocr_launcher)
+        self.boxes = page_boxes
+        self.zoom_retries = sum(zoom_retried)
 
-        logging.info(f"__images__ {len(self.page_images)} pages cost {timer() - start}s")
+        logging.info(f"__images__ {len(self.page_images)} pages cost {timer() - start}s, {self.zoom_retries} pages retried at zoom {zoomin * 3}")
+        if isinstance(self.ocr, OCRPool):
+            self.ocr.count_retries(self.zoom_retries)
+            logging.info(f"__images__ OCR pool: {self.ocr.stats()}")
+        if self.page_cache:
+            logging.info(f"__images__ page cache: {self.page_cache.stats()}")
 
         if not self.is_english and not any(
                 [c for c in self.page_chars]) and self.boxes:
@@ -1107,11 +1246,15 @@ class RAGFlowPdfParser:
 
         self.page_cum_height = np.cumsum(self.page_cum_height)
         assert len(self.page_cum_height) == len(self.page_images) + 1
-        if len(self.boxes) == 0 and zoomin < 9:
-            self.__images__(fnm, zoomin * 3, page_from, page_to, callback)
 
     def __call__(self, fnm, need_image=True, zoomin=3, return_html=False):
-        self.__images__(fnm, zoomin)
+        # A whole-document parse is stream() over a single window.
+        text, tbls = "", []
+        for _, _, text, tbls in self.stream(fnm, need_image, zoomin, return_html, window=299):
+            pass
+        return text, tbls
+
+    def _parse_pages(self, need_image, zoomin, return_html):
         self._layouts_rec(zoomin)
         self._table_transformer_job(zoomin)
         self._text_merge()
@@ -1121,6 +1264,41 @@ class RAGFlowPdfParser:
             need_image, zoomin, return_html, False)
         return self.__filterout_scraps(deepcopy(self.boxes), zoomin), tbls
 
+    def stream(self, fnm, need_image=True, zoomin=3, return_html=False,
+               page_from=0, page_to=299, window=16, callback=None):
+        """
+        Parse the document a bounded window of pages at a time.
+
+        Each window is rendered, OCRed, laid out and merged on its own and
+        yielded as (window_from, window_to, text, tables) before the next one
+        is rendered, so peak memory is bounded by `window` pages rather than
+        the whole range. Position tags in a window's text are relative to its
+        window_from, like those of __call__ are relative to page_from, and
+        `crop` works on the current window until the generator is resumed
+        (on the last window once it is exhausted). Text is not concatenated
+        across window boundaries.
+        """
+        total_page = self.total_page_number(fnm, None) if isinstance(fnm, str) else self.total_page_number(None, fnm)
+        page_to = min(page_to, total_page or 0)
+        outlines = None
+        stats = PdfParseStats()
+        for window_from in range(page_from, page_to, max(1, window)):
+            window_to = min(window_from + window, page_to)
+            start = timer()
+            self._render_pages(fnm, zoomin, window_from, window_to)
+            if outlines is None:
+                self._load_outlines(fnm)
+                outlines = self.outlines
+            self.outlines = outlines
+            self._ocr_pages(fnm, zoomin)
+            text, tbls = self._parse_pages(need_image, zoomin, return_html)
+            stats.add_window(window_to - window_from, timer() - start, self.zoom_retries)
+            self.parse_stats = stats.summary()
+            logging.info(f"RAGFlowPdfParser.stream pages {window_from}-{window_to}: {stats}")
+            if callback:
+                callback(prog=(window_to - page_from) / max(1, page_to - page_from), msg=f"Page {window_from + 1}~{window_to}: {stats}")
+            yield window_from, window_to, text, tbls
+
     def remove_tag(self, txt):
         return re.sub(r"@@[\t0-9.-]+?##", "", txt)
 
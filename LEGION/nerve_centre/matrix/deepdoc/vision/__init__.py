@@ -5,6 +5,8 @@ import threading
 import pdfplumber
 
 from .ocr import OCR
+from .ocr_pool import OCRPool, get_ocr_pool
+from .page_cache import PageResultCache, document_hash, get_page_cache
 from .recognizer import Recognizer
 from .layout_recognizer import LayoutRecognizer4YOLOv10 as LayoutRecognizer
 from .table_structure_recognizer import TableStructureRecognizer
@@ -65,6 +67,11 @@ def init_in_out(args):
 
 __all__ = [
     "OCR",
+    "OCRPool",
+    "get_ocr_pool",
+    "PageResultCache",
+    "document_hash",
+    "get_page_cache",
     "Recognizer",
     "LayoutRecognizer",
     "TableStructureRecognizer",
@@ -0,0 +1,197 @@
+#
+#  Copyright 2024 The InfiniFlow Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Multi-process OCR for CPU-only hosts.
+
+`OCRPool` runs one `OCR` instance per worker process ("lane"), each with its
+own ONNX sessions, an intra-op thread budget and, where the platform allows,
+CPU affinity to a disjoint slice of cores. It exposes the `OCR` surface used
+by `RAGFlowPdfParser` (`detect`, `recognize_batch`, `__call__`,
+`get_rotate_crop_image`), with `device_id` selecting the lane, so the parser
+can shard pages across lanes exactly like it shards them across GPUs.
+Workers execute the same `OCR` code as the in-process path with the same
+thread budget, so results are identical.
+
+Worker processes hold their own models, so parsers share one pool per
+process through `get_ocr_pool()` instead of starting their own.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+_worker_ocr = None
+
+
+def _init_worker(model_dir, threads, cores):
+    global _worker_ocr
+    os.environ["OCR_INTRA_OP_THREADS"] = str(threads)
+    # Sessions run ORT_SEQUENTIAL, so inter-op threads never exceed the same budget
+    os.environ["OCR_INTER_OP_THREADS"] = str(threads)
+    if cores and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError:
+            logging.warning(f"OCRPool could not pin worker {os.getpid()} to cores {sorted(cores)}")
+    from .ocr import OCR
+    _worker_ocr = OCR(model_dir)
+
+
+def _worker_detect(img):
+    res = _worker_ocr.detect(img)
+    # detect() returns a lazy zip on success, which cannot be pickled.
+    return res if isinstance(res, tuple) else list(res)
+
+
+def _worker_recognize_batch(img_list):
+    return _worker_ocr.recognize_batch(img_list)
+
+
+def _worker_call(img, cls):
+    return _worker_ocr(img, 0, cls)
+
+
+class OCRPool:
+    def __init__(self, model_dir=None, workers=None, threads_per_worker=None):
+        cpu_count = os.cpu_count() or 1
+        self.threads_per_worker = int(threads_per_worker or os.environ.get("OCR_THREADS_PER_WORKER", 2))
+        self.workers = int(workers or os.environ.get("OCR_WORKERS", 0) or max(1, cpu_count // self.threads_per_worker))
+        self.drop_score = 0.5
+
+        ctx = multiprocessing.get_context("spawn")
+        self._lanes = []
+        for lane in range(self.workers):
+            first = (lane * self.threads_per_worker) % cpu_count
+            cores = {(first + k) % cpu_count for k in range(self.threads_per_worker)}
+            self._lanes.append(ProcessPoolExecutor(
+                max_workers=1, mp_context=ctx,
+                initializer=_init_worker, initargs=(model_dir, self.threads_per_worker, cores)))
+
+        self._lock = threading.Lock()
+        self._pages = 0
+        self._retried_pages = 0
+        self._busy_seconds = 0.0
+        self._first_start = None
+        self._last_end = None
+        logging.info(f"OCRPool started {self.workers} workers x {self.threads_per_worker} threads")
+
+    def _submit(self, device_id, fn, *args):
+        lane = self._lanes[(device_id or 0) % self.workers]
+        start = time.time()
+        res = lane.submit(fn, *args).result()
+        end = time.time()
+        with self._lock:
+            if self._first_start is None or start < self._first_start:
+                self._first_start = start
+            self._last_end = max(self._last_end or end, end)
+            self._busy_seconds += end - start
+        return res
+
+    def _count_page(self):
+        with self._lock:
+            self._pages += 1
+
+    def count_retries(self, pages: int):
+        """Record that `pages` of the detections so far were retries of pages already counted."""
+        with self._lock:
+            self._retried_pages += pages
+
+    def detect(self, img, device_id: int | None = None):
+        if img is None:
+            return None, None, {'det': 0, 'rec': 0, 'cls': 0, 'all': 0}
+        self._count_page()
+        return self._submit(device_id, _worker_detect, np.asarray(img))
+
+    def recognize_batch(self, img_list, device_id: int | None = None):
+        if not img_list:
+            return []
+        return self._submit(device_id, _worker_recognize_batch, list(img_list))
+
+    def __call__(self, img, device_id=0, cls=True):
+        if img is None:
+            return None, None, {'det': 0, 'rec': 0, 'cls': 0, 'all': 0}
+        self._count_page()
+        return self._submit(device_id, _worker_call, img, cls)
+
+    def get_rotate_crop_image(self, img, points):
+        # Pure image geometry, no model involved: run it in the caller.
+        from .ocr import get_rotate_crop_image
+        return get_rotate_crop_image(img, points)
+
+    def sorted_boxes(self, dt_boxes):
+        from .ocr import sorted_boxes
+        return sorted_boxes(dt_boxes)
+
+    def ocr_pages(self, images, cls=True):
+        """OCR whole pages, sharded round-robin over the lanes. Results keep the input order."""
+        futures = []
+        for i, img in enumerate(images):
+            self._count_page()
+            futures.append(self._lanes[i % self.workers].submit(_worker_call, img, cls))
+        start = time.time()
+        res = [f.result() for f in futures]
+        end = time.time()
+        with self._lock:
+            if self._first_start is None or start < self._first_start:
+                self._first_start = start
+            self._last_end = max(self._last_end or end, end)
+            self._busy_seconds += (end - start) * min(len(images), self.workers)
+        return res
+
+    def stats(self) -> dict:
+        with self._lock:
+            wall = (self._last_end - self._first_start) if self._first_start is not None else 0.0
+            pages = self._pages - self._retried_pages
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "pages": pages,
+                "retried_pages": self._retried_pages,
+                "wall_seconds": wall,
+                "pages_per_sec": pages / wall if wall else 0.0,
+                "utilization": self._busy_seconds / (wall * self.workers) if wall else 0.0,
+            }
+
+    def close(self):
+        for lane in self._lanes:
+            lane.shutdown(wait=True)
+        self._lanes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+
+def get_ocr_pool(workers=None) -> OCRPool:
+    """The process-wide OCR pool, started on first use and shut down at exit."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = OCRPool(workers=workers)
+            atexit.register(_ocr_pool.close)
+        return _ocr_pool
@@ -0,0 +1,156 @@
+#
+#  Copyright 2024 The InfiniFlow Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""
+Content-addressed cache of per-page OCR boxes and layout regions.
+
+Entries are keyed by the SHA-256 of the document bytes, the absolute page
+index, the zoom and a version of the ONNX models that produced them, so
+re-parsing an unchanged PDF (e.g. after a chunking config change) skips
+detection, recognition and layout inference. The model version is derived
+from the name, size and mtime of the model files, which invalidates every
+entry as soon as a model is replaced.
+
+Storage is the shared SQLite LRU store from kv_cache. Entries are JSON (the
+boxes and regions are plain dicts of numbers and strings), so reading a cache
+file never executes code from it. Configure it with DEEPDOC_PAGE_CACHE ("0"
+disables it), DEEPDOC_PAGE_CACHE_PATH and DEEPDOC_PAGE_CACHE_MAX_BYTES.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+from api.utils.file_utils import get_project_base_directory
+from kv_cache import CacheStats, LocalCacheBackend
+
+# Part of every key, so entries written in an older encoding are never read.
+ENTRY_FORMAT = "json1"
+
+
+def document_hash(fnm) -> str:
+    """SHA-256 of a PDF given as a path or as bytes."""
+    h = hashlib.sha256()
+    if isinstance(fnm, str):
+        with open(fnm, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    else:
+        h.update(fnm)
+    return h.hexdigest()
+
+
+def _json_default(value):
+    """Numpy scalars and arrays (model scores, coordinates) as plain JSON values."""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class PageResultCache:
+    # Model files whose outputs end up in each kind of entry.
+    MODEL_FILES = {
+        "ocr": ["det.onnx", "rec.onnx"],
+        "layout": ["layout*.onnx"],
+    }
+
+    def __init__(self, path: str, max_bytes: int = 2 << 30, model_dir: str | None = None):
+        self.model_dir = model_dir or os.path.join(get_project_base_directory(), "rag/res/deepdoc")
+        self.store = LocalCacheBackend(path, max_bytes=max_bytes)
+        self.counters = CacheStats()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def model_version(self, kind: str) -> str:
+        with self._lock:
+            if kind not in self._versions:
+                h = hashlib.sha1(kind.encode("utf-8"))
+                for pattern in self.MODEL_FILES[kind]:
+                    for path in sorted(glob.glob(os.path.join(self.model_dir, pattern))):
+                        st = os.stat(path)
+                        h.update(f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns};".encode("utf-8"))
+                self._versions[kind] = h.hexdigest()[:16]
+            return self._versions[kind]
+
+    def refresh_model_versions(self):
+        """Forget the memoized model versions, e.g. after models were downloaded."""
+        with self._lock:
+            self._versions.clear()
+
+    def key(self, kind: str, doc_hash: str, page: int, zoom, variant: str = "") -> str:
+        return f"deepdoc:{ENTRY_FORMAT}:{kind}:{self.model_version(kind)}:{doc_hash}:{page}:{zoom}:{variant}"
+
+    def get_many(self, kind: str, keys: list[str]) -> list:
+        values = []
+        for raw in self.store.mget(keys):
+            if raw is None:
+                values.append(None)
+                continue
+            try:
+                values.append(json.loads(raw))
+            except Exception:
+                logging.exception(f"PageResultCache dropped an unreadable {kind} entry")
+                values.append(None)
+        hits = sum(1 for v in values if v is not None)
+        self.counters.record(kind, hits=hits, misses=len(values) - hits)
+        return values
+
+    def get(self, kind: str, key: str):
+        return self.get_many(kind, [key])[0]
+
+    def set_many(self, items: dict):
+        encoded = {}
+        for k, v in items.items():
+            try:
+                encoded[k] = json.dumps(v, default=_json_default, separators=(",", ":"))
+            except (TypeError, ValueError):
+                logging.exception(f"PageResultCache skipped an entry it can't encode: {k}")
+        self.store.mset(encoded)
+
+    def set(self, key: str, value):
+        self.set_many({key: value})
+
+    def stats(self) -> dict:
+        return {
+            **self.counters.snapshot(),
+            "size_bytes": self.store.size_bytes(),
+            "evictions": self.store.evictions,
+        }
+
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageResultCache | None:
+    """The process-wide page cache, or None when DEEPDOC_PAGE_CACHE=0."""
+    global _page_cache
+    if os.environ.get("DEEPDOC_PAGE_CACHE", "1").lower() in ("0", "false", "off"):
+        return None
+    with _page_cache_lock:
+        if _page_cache is None:
+            path = os.environ.get("DEEPDOC_PAGE_CACHE_PATH",
+                                  os.path.join(get_project_base_directory(), "data", "deepdoc_page_cache.sqlite3"))
+            try:
+                _page_cache = PageResultCache(path, max_bytes=int(os.environ.get("DEEPDOC_PAGE_CACHE_MAX_BYTES", 2 << 30)))
+            except Exception:
+                logging.exception(f"PageResultCache could not open {path}, page caching disabled")
+                return None
+        return _page_cache
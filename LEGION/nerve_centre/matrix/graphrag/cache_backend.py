@@ -0,0 +1,74 @@
+"""
+Pluggable key/value backends for the graphrag LLM, embedding and tag caches.
+
+`RedisCacheBackend` keeps the historical behaviour of storing everything in
+`REDIS_CONN`. `LocalCacheBackend` (from kv_cache, shared with deepdoc) is a
+single SQLite file with TTLs and LRU eviction by total value size, so graph
+extraction can run without a Redis server. The backend is chosen with
+GRAPHRAG_CACHE_BACKEND ("redis" or "local"); the local file defaults to
+GRAPHRAG_CACHE_PATH.
+"""
+
+import logging
+import os
+
+from kv_cache import CacheBackend, CacheStats, LocalCacheBackend  # noqa: F401 - CacheStats is re-exported
+
+
+class RedisCacheBackend(CacheBackend):
+    """Backend over the shared `REDIS_CONN` connection."""
+
+    binary_safe = False
+
+    def __init__(self, conn=None):
+        if conn is None:
+            from rag.utils.redis_conn import REDIS_CONN
+            conn = REDIS_CONN
+        self._conn = conn
+
+    def get(self, key):
+        return self._conn.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._conn.set(key, value, ttl)
+
+    def mget(self, keys):
+        client = getattr(self._conn, "REDIS", None)
+        if client is None or not keys:
+            return super().mget(keys)
+        try:
+            return client.mget(keys)
+        except Exception:
+            logging.exception("RedisCacheBackend.mget failed, falling back to single gets")
+            return super().mget(keys)
+
+    def mset(self, items, ttl=None):
+        client = getattr(self._conn, "REDIS", None)
+        if client is None or not items:
+            return super().mset(items, ttl)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for k, v in items.items():
+                pipe.set(k, v, ex=ttl)
+            pipe.execute()
+        except Exception:
+            logging.exception("RedisCacheBackend.mset failed, falling back to single sets")
+            super().mset(items, ttl)
+
+
+def create_cache_backend(kind: str | None = None, path: str | None = None) -> CacheBackend:
+    kind = (kind or os.environ.get("GRAPHRAG_CACHE_BACKEND", "redis")).lower()
+    if kind == "local":
+        path = path or os.environ.get("GRAPHRAG_CACHE_PATH", os.path.join("data", "graphrag_cache.sqlite3"))
+        max_bytes = int(os.environ.get("GRAPHRAG_CACHE_MAX_BYTES", 1 << 30))
+        return LocalCacheBackend(path, max_bytes=max_bytes)
+    if kind == "redis":
+        return RedisCacheBackend()
+    raise ValueError(f"Unknown graphrag cache backend: {kind}")
+
+
+def as_text(value: bytes | str | None) -> str | None:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
@@ -0,0 +1,55 @@
+"""
+Candidate pair generation for entity resolution.
+
+`EntityResolution.is_similarity` accepts a pair when the two names share at
+least two distinct characters, or, for two English names, when their edit
+distance is at most half of the shorter length. Both rules imply that the
+names share at least one character, so an inverted index from character to
+names is an exact blocking key: pairs that never meet in a posting list can
+never be similar. Counting co-occurrences over the postings also yields the
+number of shared distinct characters directly, so most pairs are accepted
+without calling `editdistance` at all.
+"""
+
+import itertools
+from collections import Counter, defaultdict
+from typing import Callable, Iterable
+
+
+class EntityCandidateIndex:
+    """Character postings over the entity names of one entity type."""
+
+    def __init__(self, names: Iterable[str], is_english: Callable[[str], bool]):
+        self.names = sorted(names)
+        self._chars = [frozenset(name) for name in self.names]
+        self._english = [is_english(name) for name in self.names]
+        self._postings: dict[str, list[int]] = defaultdict(list)
+        for i, chars in enumerate(self._chars):
+            for ch in chars:
+                self._postings[ch].append(i)
+
+    def _maybe_within_edit_distance(self, i: int, j: int) -> bool:
+        # The length difference is a lower bound of the edit distance.
+        len_i, len_j = len(self.names[i]), len(self.names[j])
+        return self._english[i] and self._english[j] and abs(len_i - len_j) <= min(len_i, len_j) // 2
+
+    def candidate_pairs(self, anchors: set[str], is_similarity: Callable[[str, str], bool]) -> list[tuple[str, str]]:
+        """Similar pairs with at least one name in `anchors`.
+
+        The result is identical, including order, to filtering
+        `itertools.combinations(sorted(names), 2)` with
+        `(a in anchors or b in anchors) and is_similarity(a, b)`.
+        """
+        anchor_ids = [i for i, name in enumerate(self.names) if name in anchors]
+        anchor_set = set(anchor_ids)
+        pairs = []
+        for i in anchor_ids:
+            shared = Counter(itertools.chain.from_iterable(self._postings[ch] for ch in self._chars[i]))
+            for j, count in shared.items():
+                if j == i or (j in anchor_set and j < i):
+                    continue
+                a, b = (i, j) if i < j else (j, i)
+                if count > 1 or (self._maybe_within_edit_distance(a, b) and is_similarity(self.names[a], self.names[b])):
+                    pairs.append((a, b))
+        pairs.sort()
+        return [(self.names[a], self.names[b]) for a, b in pairs]
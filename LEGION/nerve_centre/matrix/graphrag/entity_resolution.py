@@ -1,6 +1,5 @@
 
 import logging
-import itertools
 import re
 from dataclasses import dataclass
 from typing import Any, Callable
@@ -12,8 +11,9 @@ from graphrag.general.extractor import Extractor
 from rag.nlp import is_english
 import editdistance
 from graphrag.entity_resolution_prompt import ENTITY_RESOLUTION_PROMPT
+from graphrag.entity_blocking import EntityCandidateIndex
 from rag.llm.chat_model import Base as CompletionLLM
-from graphrag.utils import perform_variable_replacements, chat_limiter, GraphChange
+from graphrag.utils import perform_variable_replacements, chat_limiter, GraphChange, update_pagerank
 
 DEFAULT_RECORD_DELIMITER = "##"
 DEFAULT_ENTITY_INDEX_DELIMITER = "<|>"
@@ -77,7 +77,7 @@ class EntityResolution(Extractor):
 
         candidate_resolution = {entity_type: [] for entity_type in entity_types}
         for k, v in node_clusters.items():
-            candidate_resolution[k] = [(a, b) for a, b in itertools.combinations(v, 2) if (a in subgraph_nodes or b in subgraph_nodes) and self.is_similarity(a, b)]
+            candidate_resolution[k] = EntityCandidateIndex(v, is_english).candidate_pairs(subgraph_nodes, self.is_similarity)
         num_candidates = sum([len(candidates) for _, candidates in candidate_resolution.items()])
         callback(msg=f"Identified {num_candidates} candidate pairs")
 
@@ -101,9 +101,7 @@ class EntityResolution(Extractor):
                 nursery.start_soon(self._merge_graph_nodes, graph, merging_nodes, change)
 
         # Update pagerank
-        pr = nx.pagerank(graph)
-        for node_name, pagerank in pr.items():
-            graph.nodes[node_name]["pagerank"] = pagerank
+        update_pagerank(graph, change)
 
         return EntityResolutionResult(
             graph=graph,
@@ -33,6 +33,9 @@ from graphrag.utils import (
     does_graph_contains,
     tidy_graph,
     GraphChange,
+    dump_graph_snapshot,
+    insert_chunks_adaptive,
+    update_pagerank,
 )
 from rag.nlp import rag_tokenizer, search
 from rag.utils.redis_conn import RedisDistributedLock
@@ -170,9 +173,7 @@ async def generate_subgraph(
 
     subgraph.graph["source_id"] = [doc_id]
     chunk = {
-        "content_with_weight": json.dumps(
-            nx.node_link_data(subgraph, edges="edges"), ensure_ascii=False
-        ),
+        "content_with_weight": dump_graph_snapshot(subgraph),
         "knowledge_graph_kwd": "subgraph",
         "kb_id": kb_id,
         "source_id": [doc_id],
@@ -207,15 +208,14 @@ async def merge_subgraph(
     old_graph = await get_graph(tenant_id, kb_id, subgraph.graph["source_id"])
     if old_graph is not None:
         logging.info("Merge with an exiting graph...................")
-        tidy_graph(old_graph, callback)
+        tidy_graph(old_graph, callback, change)
         new_graph = graph_merge(old_graph, subgraph, change)
     else:
         new_graph = subgraph
         change.added_updated_nodes = set(new_graph.nodes())
         change.added_updated_edges = set(new_graph.edges())
-    pr = nx.pagerank(new_graph)
-    for node_name, pagerank in pr.items():
-        new_graph.nodes[node_name]["pagerank"] = pagerank
+        change.added_updated_sources = set(new_graph.graph["source_id"])
+    update_pagerank(new_graph, change)
 
     await set_graph(tenant_id, kb_id, embedding_model, new_graph, change, callback)
     now = trio.current_time()
@@ -307,12 +307,7 @@ async def extract_community(
             kb_id,
         )
     )
-    es_bulk_size = 4
-    for b in range(0, len(chunks), es_bulk_size):
-        doc_store_result = await trio.to_thread.run_sync(lambda: settings.docStoreConn.insert(chunks[b:b + es_bulk_size], search.index_name(tenant_id), kb_id))
-        if doc_store_result:
-            error_message = f"Insert chunk error: {doc_store_result}, please check log file and Elasticsearch/Infinity status!"
-            raise Exception(error_message)
+    await insert_chunks_adaptive(chunks, tenant_id, kb_id)
 
     now = trio.current_time()
     callback(
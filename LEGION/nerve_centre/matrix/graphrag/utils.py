@@ -4,11 +4,13 @@ Reference:
  - [LightRag](https://github.com/HKUDS/LightRAG)
 """
 
+import base64
 import html
 import json
 import logging
 import re
 import time
+import zlib
 from collections import defaultdict
 from hashlib import md5
 from typing import Any, Callable
@@ -26,20 +28,35 @@ from api import settings
 from api.utils import get_uuid
 from rag.nlp import search, rag_tokenizer
 from rag.utils.doc_store_conn import OrderByExpr
-from rag.utils.redis_conn import REDIS_CONN
+from graphrag.cache_backend import CacheBackend, CacheStats, create_cache_backend, as_text
 
 GRAPH_FIELD_SEP = "<SEP>"
+GRAPH_SNAPSHOT_PREFIX = "nxz1:"
 
 ErrorHandlerFn = Callable[[BaseException | None, str | None, dict | None], None]
 
 chat_limiter = trio.CapacityLimiter(int(os.environ.get('MAX_CONCURRENT_CHATS', 10)))
 
+_cache_backend: CacheBackend | None = None
+cache_stats = CacheStats()
+
+# Embedding vectors are cached as raw little-endian float32 behind a marker;
+# backends that only hold text get the same bytes base64-encoded.
+EMBED_CACHE_RAW = b"f32:"
+EMBED_CACHE_B64 = "f32b64:"
+
+# Relative pagerank drift an entity's persisted documents may carry before
+# they are rewritten; the whole-graph document always holds exact values.
+PAGERANK_TOLERANCE = 0.05
+
 @dataclasses.dataclass
 class GraphChange:
     removed_nodes: Set[str] = dataclasses.field(default_factory=set)
     added_updated_nodes: Set[str] = dataclasses.field(default_factory=set)
     removed_edges: Set[Tuple[str, str]] = dataclasses.field(default_factory=set)
     added_updated_edges: Set[Tuple[str, str]] = dataclasses.field(default_factory=set)
+    added_updated_sources: Set[str] = dataclasses.field(default_factory=set)
+    pagerank_updated_nodes: Set[str] = dataclasses.field(default_factory=set)
 
 def perform_variable_replacements(
     input: str, history: list[dict] | None = None, variables: dict | None = None
@@ -90,51 +107,121 @@ def dict_has_keys_with_types(
     return True
 
 
-def get_llm_cache(llmnm, txt, history, genconf):
-    hasher = xxhash.xxh64()
-    hasher.update(str(llmnm).encode("utf-8"))
-    hasher.update(str(txt).encode("utf-8"))
-    hasher.update(str(history).encode("utf-8"))
-    hasher.update(str(genconf).encode("utf-8"))
+def get_cache_backend() -> CacheBackend:
+    global _cache_backend
+    if _cache_backend is None:
+        _cache_backend = create_cache_backend()
+    return _cache_backend
 
-    k = hasher.hexdigest()
-    bin = REDIS_CONN.get(k)
-    if not bin:
-        return
-    return bin
 
+def set_cache_backend(backend: CacheBackend | None):
+    """Replace the backend used by the LLM/embedding/tag caches (None re-reads the environment)."""
+    global _cache_backend
+    _cache_backend = backend
 
-def set_llm_cache(llmnm, txt, v, history, genconf):
+
+def get_cache_stats() -> dict:
+    return cache_stats.snapshot()
+
+
+def _llm_cache_key(llmnm, txt, history, genconf):
     hasher = xxhash.xxh64()
     hasher.update(str(llmnm).encode("utf-8"))
     hasher.update(str(txt).encode("utf-8"))
     hasher.update(str(history).encode("utf-8"))
     hasher.update(str(genconf).encode("utf-8"))
-
-    k = hasher.hexdigest()
-    REDIS_CONN.set(k, v.encode("utf-8"), 24*3600)
+    return hasher.hexdigest()
 
 
-def get_embed_cache(llmnm, txt):
+def _embed_cache_key(llmnm, txt):
     hasher = xxhash.xxh64()
     hasher.update(str(llmnm).encode("utf-8"))
     hasher.update(str(txt).encode("utf-8"))
+    return hasher.hexdigest()
 
-    k = hasher.hexdigest()
-    bin = REDIS_CONN.get(k)
+
+def _encode_embedding(arr, binary_safe: bool) -> bytes | str:
+    raw = np.asarray(arr, dtype="<f4").tobytes()
+    if binary_safe:
+        return EMBED_CACHE_RAW + raw
+    return EMBED_CACHE_B64 + base64.b64encode(raw).decode("ascii")
+
+
+def _decode_embedding(value: bytes | str) -> np.ndarray:
+    if isinstance(value, bytes) and value.startswith(EMBED_CACHE_RAW):
+        return np.frombuffer(value, dtype="<f4", offset=len(EMBED_CACHE_RAW))
+    value = as_text(value)
+    if value.startswith(EMBED_CACHE_B64):
+        return np.frombuffer(base64.b64decode(value[len(EMBED_CACHE_B64):]), dtype="<f4")
+    # JSON float lists written before the binary format
+    return np.array(json.loads(value))
+
+
+def get_llm_cache(llmnm, txt, history, genconf):
+    k = _llm_cache_key(llmnm, txt, history, genconf)
+    bin = get_cache_backend().get(k)
     if not bin:
+        cache_stats.record("llm", misses=1)
         return
-    return np.array(json.loads(bin))
+    cache_stats.record("llm", hits=1)
+    return as_text(bin)
+
+
+def set_llm_cache(llmnm, txt, v, history, genconf):
+    k = _llm_cache_key(llmnm, txt, history, genconf)
+    get_cache_backend().set(k, v.encode("utf-8"), 24*3600)
+
+
+def get_embed_cache(llmnm, txt):
+    return get_embed_cache_many(llmnm, [txt])[0]
 
 
 def set_embed_cache(llmnm, txt, arr):
-    hasher = xxhash.xxh64()
-    hasher.update(str(llmnm).encode("utf-8"))
-    hasher.update(str(txt).encode("utf-8"))
+    set_embed_cache_many(llmnm, {txt: arr})
 
-    k = hasher.hexdigest()
-    arr = json.dumps(arr.tolist() if isinstance(arr, np.ndarray) else arr)
-    REDIS_CONN.set(k, arr.encode("utf-8"), 24*3600)
+
+def get_embed_cache_many(llmnm, txts: list[str]) -> list[np.ndarray | None]:
+    """Look up several cached embeddings with a single backend round trip."""
+    if not txts:
+        return []
+    values = get_cache_backend().mget([_embed_cache_key(llmnm, txt) for txt in txts])
+    res = []
+    for v in values:
+        if not v:
+            res.append(None)
+            continue
+        try:
+            res.append(_decode_embedding(v))
+        except Exception:
+            logging.exception("Failed to decode cached embedding")
+            res.append(None)
+    hits = sum(1 for r in res if r is not None)
+    cache_stats.record("embed", hits=hits, misses=len(res) - hits)
+    return res
+
+
+def set_embed_cache_many(llmnm, items: dict):
+    backend = get_cache_backend()
+    backend.mset({_embed_cache_key(llmnm, txt): _encode_embedding(arr, backend.binary_safe) for txt, arr in items.items()}, 24*3600)
+
+
+async def prefetch_embeddings(embd_mdl, texts: dict[str, str], batch_size: int = 32) -> dict[str, np.ndarray]:
+    """
+    Resolve embeddings for many texts at once. `texts` maps a cache key text to
+    the text actually encoded. Cached vectors come from one multi-get; the
+    misses are encoded in batches and written back with one multi-set per batch.
+    """
+    keys = list(texts.keys())
+    cached = get_embed_cache_many(embd_mdl.llm_name, keys)
+    res = {k: v for k, v in zip(keys, cached) if v is not None}
+    missing = [k for k, v in zip(keys, cached) if v is None]
+    for i in range(0, len(missing), batch_size):
+        batch = missing[i:i + batch_size]
+        ebds, _ = await trio.to_thread.run_sync(lambda: embd_mdl.encode([texts[k] for k in batch]))
+        fresh = dict(zip(batch, ebds))
+        set_embed_cache_many(embd_mdl.llm_name, fresh)
+        res.update(fresh)
+    return res
 
 
 def get_tags_from_cache(kb_ids):
@@ -142,10 +229,12 @@ def get_tags_from_cache(kb_ids):
     hasher.update(str(kb_ids).encode("utf-8"))
 
     k = hasher.hexdigest()
-    bin = REDIS_CONN.get(k)
+    bin = get_cache_backend().get(k)
     if not bin:
+        cache_stats.record("tags", misses=1)
         return
-    return bin
+    cache_stats.record("tags", hits=1)
+    return as_text(bin)
 
 
 def set_tags_to_cache(kb_ids, tags):
@@ -153,11 +242,13 @@ def set_tags_to_cache(kb_ids, tags):
     hasher.update(str(kb_ids).encode("utf-8"))
 
     k = hasher.hexdigest()
-    REDIS_CONN.set(k, json.dumps(tags).encode("utf-8"), 600)
+    get_cache_backend().set(k, json.dumps(tags).encode("utf-8"), 600)
 
-def tidy_graph(graph: nx.Graph, callback):
+def tidy_graph(graph: nx.Graph, callback, change: GraphChange | None = None):
     """
     Ensure all nodes and edges in the graph have some essential attribute.
+    Purged nodes and edges, including the edges of purged nodes, are recorded
+    as removals in `change`, so set_graph deletes their persisted documents.
     """
     def is_valid_node(node_attrs: dict) -> bool:
         valid_node = True
@@ -171,6 +262,10 @@ def tidy_graph(graph: nx.Graph, callback):
         if not is_valid_node(node_attrs):
             purged_nodes.append(node)
     for node in purged_nodes:
+        if change is not None:
+            change.removed_nodes.add(node)
+            change.removed_edges.update(get_from_to(node, neighbor) for neighbor in graph.neighbors(node))
+            change.added_updated_sources.update(graph.nodes[node].get("source_id", []))
         graph.remove_node(node)
     if purged_nodes and callback:
         callback(msg=f"Purged {len(purged_nodes)} nodes from graph due to missing essential attributes.")
@@ -182,6 +277,8 @@ def tidy_graph(graph: nx.Graph, callback):
         if "keywords" not in attr:
             attr["keywords"] = []
     for source, target in purged_edges:
+        if change is not None:
+            change.removed_edges.add(get_from_to(source, target))
         graph.remove_edge(source, target)
     if purged_edges and callback:
         callback(msg=f"Purged {len(purged_edges)} edges from graph due to missing essential attributes.")
@@ -222,6 +319,7 @@ def graph_merge(g1: nx.Graph, g2: nx.Graph, change: GraphChange):
     if "source_id" not in g1.graph:
         g1.graph["source_id"] = []
     g1.graph["source_id"] += g2.graph.get("source_id", [])
+    change.added_updated_sources.update(g2.graph.get("source_id", []))
     return g1
 
 def compute_args_hash(*args):
@@ -297,7 +395,7 @@ def chunk_id(chunk):
     return xxhash.xxh64((chunk["content_with_weight"] + chunk["kb_id"]).encode("utf-8")).hexdigest()
 
 
-async def graph_node_to_chunk(kb_id, embd_mdl, ent_name, meta, chunks):
+async def graph_node_to_chunk(kb_id, embd_mdl, ent_name, meta, chunks, ebd=None):
     chunk = {
         "id": get_uuid(),
         "important_kwd": [ent_name],
@@ -312,7 +410,8 @@ async def graph_node_to_chunk(kb_id, embd_mdl, ent_name, meta, chunks):
         "available_int": 0
     }
     chunk["content_sm_ltks"] = rag_tokenizer.fine_grained_tokenize(chunk["content_ltks"])
-    ebd = get_embed_cache(embd_mdl.llm_name, ent_name)
+    if ebd is None:
+        ebd = get_embed_cache(embd_mdl.llm_name, ent_name)
     if ebd is None:
         ebd, _ = await trio.to_thread.run_sync(lambda: embd_mdl.encode([ent_name]))
         ebd = ebd[0]
@@ -349,7 +448,7 @@ def get_relation(tenant_id, kb_id, from_ent_name, to_ent_name, size=1):
     return res
 
 
-async def graph_edge_to_chunk(kb_id, embd_mdl, from_ent_name, to_ent_name, meta, chunks):
+async def graph_edge_to_chunk(kb_id, embd_mdl, from_ent_name, to_ent_name, meta, chunks, ebd=None):
     chunk = {
         "id": get_uuid(),
         "from_entity_kwd": from_ent_name,
@@ -365,7 +464,8 @@ async def graph_edge_to_chunk(kb_id, embd_mdl, from_ent_name, to_ent_name, meta,
     }
     chunk["content_sm_ltks"] = rag_tokenizer.fine_grained_tokenize(chunk["content_ltks"])
     txt = f"{from_ent_name}->{to_ent_name}"
-    ebd = get_embed_cache(embd_mdl.llm_name, txt)
+    if ebd is None:
+        ebd = get_embed_cache(embd_mdl.llm_name, txt)
     if ebd is None:
         ebd, _ = await trio.to_thread.run_sync(lambda: embd_mdl.encode([txt+f": {meta['description']}"]))
         ebd = ebd[0]
@@ -415,7 +515,7 @@ async def get_graph(tenant_id, kb_id, exclude_rebuild=None):
         for id in res.ids:
             try:
                 if res.field[id]["removed_kwd"] == "N":
-                    g = json_graph.node_link_graph(json.loads(res.field[id]["content_with_weight"]), edges="edges")
+                    g = load_graph_snapshot(res.field[id]["content_with_weight"])
                     if "source_id" not in g.graph:
                         g.graph["source_id"] = res.field[id]["source_id"]
                 else:
@@ -427,13 +527,140 @@ async def get_graph(tenant_id, kb_id, exclude_rebuild=None):
     return result
 
 
+def dump_graph_snapshot(graph: nx.Graph) -> str:
+    """
+    Serialize a graph into the compact snapshot stored in content_with_weight:
+    compact node-link JSON, zlib-compressed and base64-encoded behind a prefix.
+    """
+    data = json.dumps(nx.node_link_data(graph, edges="edges"), ensure_ascii=False, separators=(",", ":"))
+    return GRAPH_SNAPSHOT_PREFIX + base64.b64encode(zlib.compress(data.encode("utf-8"))).decode("ascii")
+
+
+def load_graph_snapshot(content: str) -> nx.Graph:
+    """Inverse of dump_graph_snapshot. Plain node-link JSON written by older versions is accepted too."""
+    if content.startswith(GRAPH_SNAPSHOT_PREFIX):
+        content = zlib.decompress(base64.b64decode(content[len(GRAPH_SNAPSHOT_PREFIX):])).decode("utf-8")
+    return json_graph.node_link_graph(json.loads(content), edges="edges")
+
+
+def update_pagerank(graph: nx.Graph, change: GraphChange, tolerance: float = PAGERANK_TOLERANCE):
+    """
+    Recompute pagerank over the whole graph. A node whose new value differs
+    by more than `tolerance` (relative) from the value last written to its
+    entity document ("pagerank_indexed") goes into
+    change.pagerank_updated_nodes, so set_graph rewrites its entity document
+    and the subgraphs that hold it. Drift is measured against what was
+    persisted, so small changes cannot pile up unnoticed.
+    """
+    for node, rank in nx.pagerank(graph).items():
+        attrs = graph.nodes[node]
+        attrs["pagerank"] = rank
+        indexed = attrs.get("pagerank_indexed")
+        if indexed is None or abs(rank - indexed) > tolerance * max(rank, indexed):
+            change.pagerank_updated_nodes.add(node)
+
+
+def graph_source_index(graph: nx.Graph) -> dict[str, set[str]]:
+    """Map each source (document) id to the nodes extracted from it, in one pass over the nodes."""
+    index = defaultdict(set)
+    for node, attrs in graph.nodes(data=True):
+        for source in attrs.get("source_id", []):
+            index[source].add(node)
+    return index
+
+
+def affected_graph_sources(graph: nx.Graph, change: GraphChange) -> set[str]:
+    """
+    Sources whose persisted subgraph no longer matches the graph after `change`.
+    A subgraph holds the nodes of its source and the edges between them, so a
+    changed node touches all of its sources and a changed edge touches the
+    sources shared by both ends. Nodes removed by merging hand their sources to
+    the surviving node, which is recorded as updated. Nodes rewritten for a
+    pagerank change touch their sources as well.
+    """
+    affected = set(change.added_updated_sources)
+    for node in change.added_updated_nodes | change.pagerank_updated_nodes:
+        if graph.has_node(node):
+            affected.update(graph.nodes[node].get("source_id", []))
+    for from_node, to_node in change.added_updated_edges | change.removed_edges:
+        if graph.has_node(from_node) and graph.has_node(to_node):
+            affected.update(set(graph.nodes[from_node].get("source_id", [])) & set(graph.nodes[to_node].get("source_id", [])))
+    return affected
+
+
+def _estimate_chunk_bytes(chunk: dict) -> int:
+    size = 0
+    for v in chunk.values():
+        if isinstance(v, str):
+            size += len(v)
+        elif isinstance(v, (list, tuple, np.ndarray)):
+            size += 8 * len(v)
+        else:
+            size += 8
+    return size
+
+
+async def insert_chunks_adaptive(chunks: list[dict], tenant_id: str, kb_id: str,
+                                 max_batch_bytes: int = 8 * 1024 * 1024, max_batch_size: int = 512,
+                                 target_seconds: float = 2.0) -> int:
+    """
+    Bulk insert chunks with a batch size that adapts to the doc store.
+    Batches are capped by document count and estimated payload bytes; the count
+    doubles while inserts finish within `target_seconds` and halves when they are
+    slower. A batch that fails is retried at half the size, which also becomes the
+    new upper bound, until a single chunk fails, which raises. Returns the number
+    of insert requests issued.
+    """
+    batch_size = 16
+    requests = 0
+    b = 0
+    while b < len(chunks):
+        batch_bytes = 0
+        end = b
+        while end < len(chunks) and end - b < batch_size:
+            chunk_bytes = _estimate_chunk_bytes(chunks[end])
+            if end > b and batch_bytes + chunk_bytes > max_batch_bytes:
+                break
+            batch_bytes += chunk_bytes
+            end += 1
+        batch = chunks[b:end]
+        started = time.monotonic()
+        doc_store_result = await trio.to_thread.run_sync(lambda: settings.docStoreConn.insert(batch, search.index_name(tenant_id), kb_id))
+        elapsed = time.monotonic() - started
+        requests += 1
+        if doc_store_result:
+            if len(batch) == 1:
+                error_message = f"Insert chunk error: {doc_store_result}, please check log file and Elasticsearch/Infinity status!"
+                raise Exception(error_message)
+            batch_size = max_batch_size = max(1, len(batch) // 2)
+            logging.warning(f"Bulk insert of {len(batch)} chunks failed, retrying with batches of {batch_size}: {doc_store_result}")
+            continue
+        b = end
+        if elapsed > target_seconds:
+            batch_size = max(1, batch_size // 2)
+        else:
+            batch_size = min(max_batch_size, batch_size * 2)
+    return requests
+
+
 async def set_graph(tenant_id: str, kb_id: str, embd_mdl, graph: nx.Graph, change: GraphChange, callback):
     start = trio.current_time()
 
-    await trio.to_thread.run_sync(lambda: settings.docStoreConn.delete({"knowledge_graph_kwd": ["graph", "subgraph"]}, search.index_name(tenant_id), kb_id))
+    source_index = graph_source_index(graph)
+    graph_sources = list(dict.fromkeys(graph.graph.get("source_id", [])))
+    affected_sources = affected_graph_sources(graph, change) & set(graph_sources)
+    # Entity documents to (re)write: changed nodes, and nodes whose pagerank drifted
+    written_nodes = sorted(n for n in change.added_updated_nodes | change.pagerank_updated_nodes if graph.has_node(n))
+    for node in written_nodes:
+        graph.nodes[node]["pagerank_indexed"] = graph.nodes[node].get("pagerank")
 
-    if change.removed_nodes:
-        await trio.to_thread.run_sync(lambda: settings.docStoreConn.delete({"knowledge_graph_kwd": ["entity"], "entity_kwd": sorted(change.removed_nodes)}, search.index_name(tenant_id), kb_id))
+    await trio.to_thread.run_sync(lambda: settings.docStoreConn.delete({"knowledge_graph_kwd": ["graph"]}, search.index_name(tenant_id), kb_id))
+    if affected_sources:
+        await trio.to_thread.run_sync(lambda: settings.docStoreConn.delete({"knowledge_graph_kwd": ["subgraph"], "source_id": sorted(affected_sources)}, search.index_name(tenant_id), kb_id))
+
+    if change.removed_nodes or written_nodes:
+        stale_entities = sorted(change.removed_nodes | set(written_nodes))
+        await trio.to_thread.run_sync(lambda: settings.docStoreConn.delete({"knowledge_graph_kwd": ["entity"], "entity_kwd": stale_entities}, search.index_name(tenant_id), kb_id))
 
     if change.removed_edges:
         async with trio.open_nursery() as nursery:
@@ -446,7 +673,7 @@ async def set_graph(tenant_id: str, kb_id: str, embd_mdl, graph: nx.Graph, chang
 
     chunks = [{
         "id": get_uuid(),
-        "content_with_weight": json.dumps(nx.node_link_data(graph, edges="edges"), ensure_ascii=False),
+        "content_with_weight": dump_graph_snapshot(graph),
         "knowledge_graph_kwd": "graph",
         "kb_id": kb_id,
         "source_id": graph.graph.get("source_id", []),
@@ -454,15 +681,17 @@ async def set_graph(tenant_id: str, kb_id: str, embd_mdl, graph: nx.Graph, chang
         "removed_kwd": "N"
     }]
     
-    # generate updated subgraphs
-    for source in graph.graph["source_id"]:
-        subgraph = graph.subgraph([n for n in graph.nodes if source in graph.nodes[n]["source_id"]]).copy()
+    # regenerate only the subgraphs touched by this change
+    for source in graph_sources:
+        if source not in affected_sources:
+            continue
+        subgraph = graph.subgraph(source_index.get(source, ())).copy()
         subgraph.graph["source_id"] = [source]
         for n in subgraph.nodes:
             subgraph.nodes[n]["source_id"] = [source]
         chunks.append({
             "id": get_uuid(),
-            "content_with_weight": json.dumps(nx.node_link_data(subgraph, edges="edges"), ensure_ascii=False),
+            "content_with_weight": dump_graph_snapshot(subgraph),
             "knowledge_graph_kwd": "subgraph",
             "kb_id": kb_id,
             "source_id": [source],
@@ -470,30 +699,29 @@ async def set_graph(tenant_id: str, kb_id: str, embd_mdl, graph: nx.Graph, chang
             "removed_kwd": "N"
         })
     
+    # added_updated_edges could record a non-existing edge if both from_node and to_node participate in nodes merging.
+    updated_edges = [(f, t, graph.get_edge_data(f, t)) for f, t in change.added_updated_edges]
+    updated_edges = [(f, t, attrs) for f, t, attrs in updated_edges if attrs]
+    embed_texts = {node: node for node in written_nodes}
+    for from_node, to_node, edge_attrs in updated_edges:
+        embed_texts[f"{from_node}->{to_node}"] = f"{from_node}->{to_node}: {edge_attrs['description']}"
+    ebds = await prefetch_embeddings(embd_mdl, embed_texts)
+
     async with trio.open_nursery() as nursery:
-        for node in change.added_updated_nodes:
+        for node in written_nodes:
             node_attrs = graph.nodes[node]
-            nursery.start_soon(graph_node_to_chunk, kb_id, embd_mdl, node, node_attrs, chunks)
-        for from_node, to_node in change.added_updated_edges:
-            edge_attrs = graph.get_edge_data(from_node, to_node)
-            if not edge_attrs:
-                # added_updated_edges could record a non-existing edge if both from_node and to_node participate in nodes merging.
-                continue
-            nursery.start_soon(graph_edge_to_chunk, kb_id, embd_mdl, from_node, to_node, edge_attrs, chunks)
+            nursery.start_soon(graph_node_to_chunk, kb_id, embd_mdl, node, node_attrs, chunks, ebds.get(node))
+        for from_node, to_node, edge_attrs in updated_edges:
+            nursery.start_soon(graph_edge_to_chunk, kb_id, embd_mdl, from_node, to_node, edge_attrs, chunks, ebds.get(f"{from_node}->{to_node}"))
     now = trio.current_time()
     if callback:
-        callback(msg=f"set_graph converted graph change to {len(chunks)} chunks in {now - start:.2f}s.")
+        callback(msg=f"set_graph converted graph change to {len(chunks)} chunks ({len(affected_sources)}/{len(graph_sources)} subgraphs, {len(set(written_nodes) - change.added_updated_nodes)} entities for pagerank only) in {now - start:.2f}s.")
     start = now
 
-    es_bulk_size = 4
-    for b in range(0, len(chunks), es_bulk_size):
-        doc_store_result = await trio.to_thread.run_sync(lambda: settings.docStoreConn.insert(chunks[b:b + es_bulk_size], search.index_name(tenant_id), kb_id))
-        if doc_store_result:
-            error_message = f"Insert chunk error: {doc_store_result}, please check log file and Elasticsearch/Infinity status!"
-            raise Exception(error_message)
+    requests = await insert_chunks_adaptive(chunks, tenant_id, kb_id)
     now = trio.current_time()
     if callback:
-        callback(msg=f"set_graph added/updated {len(change.added_updated_nodes)} nodes and {len(change.added_updated_edges)} edges from index in {now - start:.2f}s.")
+        callback(msg=f"set_graph added/updated {len(change.added_updated_nodes)} nodes and {len(change.added_updated_edges)} edges from index in {requests} requests, {now - start:.2f}s.")
 
 
 def is_continuous_subsequence(subseq, seq):
@@ -595,7 +823,7 @@ async def rebuild_graph(tenant_id, kb_id, exclude_rebuild=None):
             elif exclude_rebuild in d["source_id"]:
                 continue
             
-            next_graph = json_graph.node_link_graph(json.loads(d["content_with_weight"]), edges="edges")
+            next_graph = load_graph_snapshot(d["content_with_weight"])
             merged_graph = nx.compose(graph, next_graph)
             merged_source = {
                 n: graph.nodes[n]["source_id"] + next_graph.nodes[n]["source_id"]
@@ -0,0 +1,157 @@
+"""
+Key/value cache building blocks shared by graphrag and deepdoc.
+
+`LocalCacheBackend` is a single SQLite file with TTLs and LRU eviction by
+total value size; `CacheStats` counts hits and misses per kind of entry.
+The graphrag Redis backend lives in graphrag.cache_backend on top of the
+`CacheBackend` interface defined here.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+
+class CacheBackend:
+    """Interface of a cache backend. Values are bytes or str, TTLs are in seconds."""
+
+    # Whether arbitrary bytes survive a round trip. Redis connections that
+    # decode responses can only hold text.
+    binary_safe = True
+
+    def get(self, key: str) -> bytes | str | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes | str, ttl: int | None = None):
+        raise NotImplementedError
+
+    def mget(self, keys: list[str]) -> list[bytes | str | None]:
+        return [self.get(k) for k in keys]
+
+    def mset(self, items: dict[str, bytes | str], ttl: int | None = None):
+        for k, v in items.items():
+            self.set(k, v, ttl)
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    SQLite file cache. Entries expire after their TTL and, once the stored
+    values exceed `max_bytes`, the least recently read entries are evicted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1 << 30):
+        self.path = path
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed_at)")
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        self.evictions = 0
+
+    def get(self, key):
+        return self.mget([key])[0]
+
+    def set(self, key, value, ttl=None):
+        self.mset({key: value}, ttl)
+
+    def mget(self, keys):
+        if not keys:
+            return []
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                marks = ",".join("?" * len(batch))
+                for k, v, expires_at in self._db.execute(
+                        f"SELECT key, value, expires_at FROM cache WHERE key IN ({marks})", batch):
+                    if expires_at is None or expires_at > now:
+                        found[k] = v
+            if found:
+                self._db.execute("BEGIN")
+                self._db.executemany("UPDATE cache SET accessed_at = ? WHERE key = ?", [(now, k) for k in found])
+                self._db.execute("COMMIT")
+        return [found.get(k) for k in keys]
+
+    def mset(self, items, ttl=None):
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        rows = []
+        for k, v in items.items():
+            if isinstance(v, str):
+                v = v.encode("utf-8")
+            rows.append((k, sqlite3.Binary(v), len(v), expires_at, now))
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                keys = [r[0] for r in rows]
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    marks = ",".join("?" * len(batch))
+                    replaced = self._db.execute(f"SELECT COALESCE(SUM(size), 0) FROM cache WHERE key IN ({marks})", batch).fetchone()[0]
+                    self._total_bytes -= replaced
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)", rows)
+                self._total_bytes += sum(r[2] for r in rows)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+                raise
+            if self._total_bytes > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently read ones down to 90% of max_bytes (lock held)."""
+        expired = self._db.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)).rowcount
+        self.evictions += max(expired, 0)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        while self._total_bytes > target:
+            victims = self._db.execute("SELECT key, size FROM cache ORDER BY accessed_at LIMIT 256").fetchall()
+            if not victims:
+                break
+            self._db.executemany("DELETE FROM cache WHERE key = ?", [(k,) for k, _ in victims])
+            self._total_bytes -= sum(size for _, size in victims)
+            self.evictions += len(victims)
+
+    def size_bytes(self) -> int:
+        return self._total_bytes
+
+
+class CacheStats:
+    """Hit/miss counters per cache kind, e.g. "llm", "embed" or "ocr"."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def record(self, kind: str, hits: int = 0, misses: int = 0):
+        with self._lock:
+            self._counts[kind]["hits"] += hits
+            self._counts[kind]["misses"] += misses
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            res = {}
+            for kind, c in self._counts.items():
+                total = c["hits"] + c["misses"]
+                res[kind] = {**c, "hit_rate": c["hits"] / total if total else 0.0}
+            return res
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
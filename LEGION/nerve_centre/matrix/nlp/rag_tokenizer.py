@@ -18,16 +18,61 @@ import logging
 import copy
 import datrie
 import math
+import multiprocessing
 import os
 import re
 import string
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from hanziconv import HanziConv
 from nltk import word_tokenize
 from nltk.stem import PorterStemmer, WordNetLemmatizer
 from api.utils.file_utils import get_project_base_directory
 
 
+class _SegmentCache:
+    """Bounded LRU of segmented spans, shared by all calls on one tokenizer."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0}
+
+
 class RagTokenizer:
     def key_(self, line):
         return str(line.lower().encode("utf-8"))[2:-1]
@@ -67,6 +112,9 @@ class RagTokenizer:
         self.lemmatizer = WordNetLemmatizer()
 
         self.SPLIT_CHAR = r"([ ,\.<>/?;:'\[\]\\`!@#$%^&*\(\)\{\}\|_+=《》，。？、；‘’：“”【】~！￥%……（）——-]+|[a-zA-Z0-9,\.-]+)"
+        # Segmentation only depends on the span and the dictionary, and chunk
+        # text repeats a lot within a corpus.
+        self.segment_cache = _SegmentCache(int(os.environ.get("RAG_TOKENIZER_CACHE_SIZE", 200000)))
 
         trie_file_name = self.DIR_ + ".txt.trie"
         # check if trie file existence
@@ -88,6 +136,7 @@ class RagTokenizer:
         self.loadDict_(self.DIR_ + ".txt")
 
     def loadUserDict(self, fnm):
+        self.segment_cache.clear()
         try:
             self.trie_ = datrie.Trie.load(fnm + ".trie")
             return
@@ -96,6 +145,7 @@ class RagTokenizer:
         self.loadDict_(fnm)
 
     def addUserDict(self, fnm):
+        self.segment_cache.clear()
         self.loadDict_(fnm)
 
     def _strQ2B(self, ustring):
@@ -327,69 +377,81 @@ class RagTokenizer:
         arr = self._split_by_lang(line)
         res = []
         for L,lang in arr:
-            if not lang:
-                res.extend([self.stemmer.stem(self.lemmatizer.lemmatize(t)) for t in word_tokenize(L)])
-                continue
-            if len(L) < 2 or re.match(
-                    r"[a-z\.-]+$", L) or re.match(r"[0-9\.-]+$", L):
-                res.append(L)
+            res.extend(self._segment(L, lang))
+
+        res = " ".join(res)
+        logging.debug("[TKS] {}".format(self.merge_(res)))
+        return self.merge_(res)
+
+    def _segment(self, L, lang):
+        key = (L, lang)
+        tks = self.segment_cache.get(key)
+        if tks is None:
+            tks = self._segment_span(L, lang)
+            self.segment_cache.put(key, tks)
+        return tks
+
+    def _segment_span(self, L, lang):
+        if not lang:
+            return [self.stemmer.stem(self.lemmatizer.lemmatize(t)) for t in word_tokenize(L)]
+        if len(L) < 2 or re.match(
+                r"[a-z\.-]+$", L) or re.match(r"[0-9\.-]+$", L):
+            return [L]
+
+        res = []
+        # use maxforward for the first time
+        tks, s = self.maxForward_(L)
+        tks1, s1 = self.maxBackward_(L)
+        if self.DEBUG:
+            logging.debug("[FW] {} {}".format(tks, s))
+            logging.debug("[BW] {} {}".format(tks1, s1))
+
+        i, j, _i, _j = 0, 0, 0, 0
+        same = 0
+        while i + same < len(tks1) and j + same < len(tks) and tks1[i + same] == tks[j + same]:
+            same += 1
+        if same > 0:
+            res.append(" ".join(tks[j: j + same]))
+        _i = i + same
+        _j = j + same
+        j = _j + 1
+        i = _i + 1
+
+        while i < len(tks1) and j < len(tks):
+            tk1, tk = "".join(tks1[_i:i]), "".join(tks[_j:j])
+            if tk1 != tk:
+                if len(tk1) > len(tk):
+                    j += 1
+                else:
+                    i += 1
                 continue
 
-            # use maxforward for the first time
-            tks, s = self.maxForward_(L)
-            tks1, s1 = self.maxBackward_(L)
-            if self.DEBUG:
-                logging.debug("[FW] {} {}".format(tks, s))
-                logging.debug("[BW] {} {}".format(tks1, s1))
+            if tks1[i] != tks[j]:
+                i += 1
+                j += 1
+                continue
+            # backward tokens from_i to i are different from forward tokens from _j to j.
+            tkslist = []
+            self.dfs_("".join(tks[_j:j]), 0, [], tkslist)
+            res.append(" ".join(self.sortTks_(tkslist)[0][0]))
 
-            i, j, _i, _j = 0, 0, 0, 0
-            same = 0
+            same = 1
             while i + same < len(tks1) and j + same < len(tks) and tks1[i + same] == tks[j + same]:
                 same += 1
-            if same > 0:
-                res.append(" ".join(tks[j: j + same]))
+            res.append(" ".join(tks[j: j + same]))
             _i = i + same
             _j = j + same
             j = _j + 1
             i = _i + 1
 
-            while i < len(tks1) and j < len(tks):
-                tk1, tk = "".join(tks1[_i:i]), "".join(tks[_j:j])
-                if tk1 != tk:
-                    if len(tk1) > len(tk):
-                        j += 1
-                    else:
-                        i += 1
-                    continue
+        if _i < len(tks1):
+            assert _j < len(tks)
+            assert "".join(tks1[_i:]) == "".join(tks[_j:])
+            tkslist = []
+            self.dfs_("".join(tks[_j:]), 0, [], tkslist)
+            res.append(" ".join(self.sortTks_(tkslist)[0][0]))
 
-                if tks1[i] != tks[j]:
-                    i += 1
-                    j += 1
-                    continue
-                # backward tokens from_i to i are different from forward tokens from _j to j.
-                tkslist = []
-                self.dfs_("".join(tks[_j:j]), 0, [], tkslist)
-                res.append(" ".join(self.sortTks_(tkslist)[0][0]))
-
-                same = 1
-                while i + same < len(tks1) and j + same < len(tks) and tks1[i + same] == tks[j + same]:
-                    same += 1
-                res.append(" ".join(tks[j: j + same]))
-                _i = i + same
-                _j = j + same
-                j = _j + 1
-                i = _i + 1
-
-            if _i < len(tks1):
-                assert _j < len(tks)
-                assert "".join(tks1[_i:]) == "".join(tks[_j:])
-                tkslist = []
-                self.dfs_("".join(tks[_j:]), 0, [], tkslist)
-                res.append(" ".join(self.sortTks_(tkslist)[0][0]))
-
-        res = " ".join(res)
-        logging.debug("[TKS] {}".format(self.merge_(res)))
-        return self.merge_(res)
+        return res
 
     def fine_grained_tokenize(self, tks):
         tks = tks.split()
@@ -405,32 +467,67 @@ class RagTokenizer:
             if len(tk) < 3 or re.match(r"[0-9,\.-]+$", tk):
                 res.append(tk)
                 continue
-            tkslist = []
-            if len(tk) > 10:
-                tkslist.append(tk)
-            else:
-                self.dfs_(tk, 0, [], tkslist)
-            if len(tkslist) < 2:
-                res.append(tk)
-                continue
-            stk = self.sortTks_(tkslist)[1][0]
-            if len(stk) == len(tk):
-                stk = tk
-            else:
-                if re.match(r"[a-z\.-]+$", tk):
-                    for t in stk:
-                        if len(t) < 3:
-                            stk = tk
-                            break
-                    else:
-                        stk = " ".join(stk)
-                else:
-                    stk = " ".join(stk)
-
+            key = ("fine", tk)
+            stk = self.segment_cache.get(key)
+            if stk is None:
+                stk = self._fine_grained_token(tk)
+                self.segment_cache.put(key, stk)
             res.append(stk)
 
         return " ".join(self.english_normalize_(res))
 
+    def _fine_grained_token(self, tk):
+        tkslist = []
+        if len(tk) > 10:
+            tkslist.append(tk)
+        else:
+            self.dfs_(tk, 0, [], tkslist)
+        if len(tkslist) < 2:
+            return tk
+        stk = self.sortTks_(tkslist)[1][0]
+        if len(stk) == len(tk):
+            stk = tk
+        else:
+            if re.match(r"[a-z\.-]+$", tk):
+                for t in stk:
+                    if len(t) < 3:
+                        stk = tk
+                        break
+                else:
+                    stk = " ".join(stk)
+            else:
+                stk = " ".join(stk)
+        return stk
+
+    def tokenize_batch(self, lines, fine_grained=False, workers=0, chunk_size=256):
+        """
+        Tokenize many lines; the result is identical to calling `tokenize`
+        (followed by `fine_grained_tokenize` when `fine_grained`) on each.
+
+        Repeated lines are tokenized once and spans are shared through
+        `segment_cache`. With `workers` > 1 the distinct lines are fanned out
+        to forked processes, each inheriting this tokenizer and its
+        dictionary; where fork is unavailable the batch runs in-process.
+        """
+        lines = list(lines)
+        distinct = list(dict.fromkeys(lines))
+        if workers > 1 and len(distinct) > chunk_size and "fork" in multiprocessing.get_all_start_methods():
+            chunks = [distinct[i:i + chunk_size] for i in range(0, len(distinct), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                     initializer=_init_batch_worker, initargs=(self,)) as pool:
+                outputs = [tks for part in pool.map(_batch_worker, chunks, [fine_grained] * len(chunks)) for tks in part]
+        else:
+            outputs = self._tokenize_lines(distinct, fine_grained)
+        tokenized = dict(zip(distinct, outputs))
+        return [tokenized[line] for line in lines]
+
+    def _tokenize_lines(self, lines, fine_grained=False):
+        res = []
+        for line in lines:
+            tks = self.tokenize(line)
+            res.append(self.fine_grained_tokenize(tks) if fine_grained else tks)
+        return res
+
 
 def is_chinese(s):
     if s >= u'\u4e00' and s <= u'\u9fa5':
@@ -454,6 +551,56 @@ def is_alphabet(s):
         return False
 
 
+_batch_tokenizer = None
+
+
+def _init_batch_worker(tknzr):
+    global _batch_tokenizer
+    _batch_tokenizer = tknzr
+
+
+def _batch_worker(lines, fine_grained):
+    return _batch_tokenizer._tokenize_lines(lines, fine_grained)
+
+
+def benchmark(lines=20000, workers=0, seed=0):
+    """Tokens/second of tokenize_batch against per-line tokenize on a synthetic mixed zh/en corpus."""
+    import random
+    rnd = random.Random(seed)
+    zh = ["数据分析", "项目经理", "境外投资者", "人民币", "外汇市场", "学区房", "就近入学", "南京市长江大桥",
+          "发动机", "最大功率", "农贸市场", "业务中心", "安全部门", "政府企业", "开发工程师", "测试"]
+    en = ["scripts", "are", "compiled", "and", "cached", "python", "hive", "tableau", "retrieval",
+          "augmented", "generation", "documents", "chunking", "embedding", "vector", "search"]
+    sentences = []
+    for _ in range(max(1, lines // 4)):
+        words = [rnd.choice(zh) if rnd.random() < 0.6 else rnd.choice(en) for _ in range(rnd.randint(5, 30))]
+        sentences.append("".join(w if is_chinese(w[0]) else f" {w} " for w in words) + rnd.choice(["。", "，", "!", "?"]))
+    # Chunk text repeats: headers, boilerplate, table cells.
+    corpus = [rnd.choice(sentences) for _ in range(lines)]
+
+    tknzr = RagTokenizer()
+    # Baseline: per-line calls without the segment cache.
+    tknzr.segment_cache = _SegmentCache(0)
+    start = time.time()
+    expected = [tknzr.fine_grained_tokenize(tknzr.tokenize(line)) for line in corpus]
+    serial = time.time() - start
+    ntokens = sum(len(t.split()) for t in expected)
+
+    tknzr = RagTokenizer()
+    start = time.time()
+    got = tknzr.tokenize_batch(corpus, fine_grained=True, workers=workers)
+    batch = time.time() - start
+    assert got == expected, "tokenize_batch diverged from tokenize"
+    return {
+        "lines": lines,
+        "tokens": ntokens,
+        "tokenize_tokens_per_sec": ntokens / serial if serial else 0.0,
+        "batch_tokens_per_sec": ntokens / batch if batch else 0.0,
+        "speedup": serial / batch if batch else 0.0,
+        "cache": tknzr.segment_cache.stats(),
+    }
+
+
 def naiveQie(txt):
     tks = []
     for t in txt.split():
@@ -467,6 +614,7 @@ def naiveQie(txt):
 tokenizer = RagTokenizer()
 tokenize = tokenizer.tokenize
 fine_grained_tokenize = tokenizer.fine_grained_tokenize
+tokenize_batch = tokenizer.tokenize_batch
 tag = tokenizer.tag
 freq = tokenizer.freq
 loadUserDict = tokenizer.loadUserDict
@@ -475,6 +623,9 @@ tradi2simp = tokenizer._tradi2simp
 strQ2B = tokenizer._strQ2B
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        print(benchmark(workers=int(sys.argv[2]) if len(sys.argv) > 2 else 0))
+        sys.exit()
     tknzr = RagTokenizer(debug=True)
     # huqie.addUserDict("/tmp/tmp.new.tks.dict")
     tks = tknzr.tokenize(
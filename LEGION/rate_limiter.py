@@ -73,13 +73,234 @@ class APIRequestQueue:
         with self.lock:
             return {priority: len(queue) for priority, queue in self.queues.items()}
 
+class _WindowState:
+    """Two-bucket counter state for a single rate limited key"""
+    __slots__ = ('window_index', 'current', 'previous', 'allowed', 'rejected', 'last_seen')
+
+    def __init__(self, window_index: int, now: float):
+        self.window_index = window_index
+        self.current = 0
+        self.previous = 0
+        self.allowed = 0
+        self.rejected = 0
+        self.last_seen = now
+
+class _LimiterShard:
+    """Independently locked slice of the key space with its own timing wheel"""
+    __slots__ = ('lock', 'states', 'wheel', 'cursor', 'evictions')
+
+    def __init__(self, wheel_slots: int, cursor: int):
+        self.lock = threading.Lock()
+        self.states: Dict[str, _WindowState] = {}
+        self.wheel = [set() for _ in range(wheel_slots)]
+        self.cursor = cursor
+        self.evictions = 0
+
+class SlidingWindowLimiter:
+    """Sliding window counter rate limiter with constant memory per key.
+
+    Each key keeps only the request count of the current and the previous
+    window; the sliding count is the current bucket plus the previous bucket
+    weighted by how much of it still overlaps the window. Keys are spread
+    over independently locked shards, and idle keys are expired lazily by a
+    per-shard timing wheel that is advanced on every call, so memory stays
+    proportional to the number of recently active keys.
+    """
+
+    def __init__(self,
+                 limit: int,
+                 window: float = 60.0,
+                 shards: int = 16,
+                 wheel_slots: int = 8,
+                 clock: Callable[[], float] = time.time):
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.limit = limit
+        self.window = float(window)
+        self.clock = clock
+        self._wheel_slots = max(3, wheel_slots)
+        cursor = self._tick(clock())
+        self._shards = [_LimiterShard(self._wheel_slots, cursor) for _ in range(max(1, shards))]
+
+    def _tick(self, timestamp: float) -> int:
+        return int(timestamp // self.window)
+
+    def _shard(self, key: str) -> _LimiterShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _schedule(self, shard: _LimiterShard, key: str, state: _WindowState):
+        # A key carries no weight once two full windows have passed without
+        # traffic, so that is when it becomes eligible for eviction.
+        expiry_tick = self._tick(state.last_seen) + 2
+        shard.wheel[expiry_tick % self._wheel_slots].add(key)
+
+    def _advance(self, shard: _LimiterShard, now: float):
+        """Process wheel slots that became due since the last call (lock held)"""
+        tick = self._tick(now)
+        if tick <= shard.cursor:
+            return
+        start = max(shard.cursor + 1, tick - self._wheel_slots + 1)
+        for due_tick in range(start, tick + 1):
+            slot_index = due_tick % self._wheel_slots
+            due_keys = shard.wheel[slot_index]
+            if not due_keys:
+                continue
+            shard.wheel[slot_index] = set()
+            for key in due_keys:
+                state = shard.states.get(key)
+                if state is None:
+                    continue
+                if self._tick(state.last_seen) + 2 <= tick:
+                    del shard.states[key]
+                    shard.evictions += 1
+                else:
+                    self._schedule(shard, key, state)
+        shard.cursor = tick
+
+    def _roll(self, state: _WindowState, now: float):
+        """Shift the buckets so that ``state.current`` covers ``now``"""
+        window_index = self._tick(now)
+        if window_index == state.window_index:
+            return
+        if window_index == state.window_index + 1:
+            state.previous = state.current
+        else:
+            state.previous = 0
+        state.current = 0
+        state.window_index = window_index
+
+    def _state(self, shard: _LimiterShard, key: str, now: float, create: bool) -> Optional[_WindowState]:
+        self._advance(shard, now)
+        state = shard.states.get(key)
+        if state is None:
+            if not create:
+                return None
+            state = _WindowState(self._tick(now), now)
+            shard.states[key] = state
+            self._schedule(shard, key, state)
+        else:
+            self._roll(state, now)
+        return state
+
+    def _weighted_count(self, state: _WindowState, now: float) -> float:
+        elapsed = now - state.window_index * self.window
+        overlap = max(0.0, 1.0 - elapsed / self.window)
+        return state.current + state.previous * overlap
+
+    def hit(self, key: str, cost: int = 1, limit: Optional[int] = None) -> bool:
+        """Consume ``cost`` from ``key`` if that keeps it within the limit"""
+        limit = self.limit if limit is None else limit
+        now = self.clock()
+        shard = self._shard(key)
+        with shard.lock:
+            state = self._state(shard, key, now, create=True)
+            state.last_seen = now
+            if self._weighted_count(state, now) + cost > limit:
+                state.rejected += 1
+                return False
+            state.current += cost
+            state.allowed += 1
+            return True
+
+    def peek(self, key: str, cost: int = 1, limit: Optional[int] = None) -> bool:
+        """Return whether ``hit`` would currently succeed, without consuming"""
+        limit = self.limit if limit is None else limit
+        now = self.clock()
+        shard = self._shard(key)
+        with shard.lock:
+            state = self._state(shard, key, now, create=False)
+            used = self._weighted_count(state, now) if state else 0.0
+            return used + cost <= limit
+
+    def record(self, key: str, cost: int = 1):
+        """Consume ``cost`` from ``key`` unconditionally"""
+        now = self.clock()
+        shard = self._shard(key)
+        with shard.lock:
+            state = self._state(shard, key, now, create=True)
+            state.last_seen = now
+            state.current += cost
+            state.allowed += 1
+
+    def count(self, key: str, sliding: bool = True) -> float:
+        """Requests counted against ``key``.
+
+        With ``sliding=False`` only the current aligned window is counted,
+        which gives fixed window semantics.
+        """
+        now = self.clock()
+        shard = self._shard(key)
+        with shard.lock:
+            state = self._state(shard, key, now, create=False)
+            if state is None:
+                return 0
+            return self._weighted_count(state, now) if sliding else state.current
+
+    def remaining(self, key: str, limit: Optional[int] = None) -> float:
+        """Capacity left for ``key`` in the current sliding window"""
+        limit = self.limit if limit is None else limit
+        return max(0.0, limit - self.count(key))
+
+    def reset(self, key: Optional[str] = None):
+        """Forget one key, or every key when ``key`` is None"""
+        shards = [self._shard(key)] if key is not None else self._shards
+        for shard in shards:
+            with shard.lock:
+                if key is None:
+                    shard.states.clear()
+                    for slot in shard.wheel:
+                        slot.clear()
+                else:
+                    shard.states.pop(key, None)
+
+    def get_stats(self, key: Optional[str] = None) -> Dict[str, Any]:
+        """Per-key counters, or aggregate limiter statistics"""
+        now = self.clock()
+        if key is not None:
+            shard = self._shard(key)
+            with shard.lock:
+                state = self._state(shard, key, now, create=False)
+                if state is None:
+                    return {}
+                return {
+                    'count': self._weighted_count(state, now),
+                    'current_window': state.current,
+                    'previous_window': state.previous,
+                    'allowed': state.allowed,
+                    'rejected': state.rejected,
+                    'last_seen': state.last_seen
+                }
+
+        tracked_keys = allowed = rejected = evictions = 0
+        for shard in self._shards:
+            with shard.lock:
+                self._advance(shard, now)
+                tracked_keys += len(shard.states)
+                evictions += shard.evictions
+                for state in shard.states.values():
+                    allowed += state.allowed
+                    rejected += state.rejected
+        return {
+            'limit': self.limit,
+            'window': self.window,
+            'tracked_keys': tracked_keys,
+            'allowed': allowed,
+            'rejected': rejected,
+            'evictions': evictions
+        }
+
+    def __len__(self) -> int:
+        return sum(len(shard.states) for shard in self._shards)
+
 class IntelligentRateLimiter:
     """Intelligent rate limiting with multiple strategies and monitoring"""
     
     def __init__(self, config_file: str = "config/rate_limits.json"):
         self.config_file = config_file
         self.api_configs: Dict[str, RateLimitConfig] = {}
-        self.request_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.window_limiter = SlidingWindowLimiter(limit=1, window=60.0)
         self.token_buckets: Dict[str, Dict[str, Any]] = {}
         self.backoff_delays: Dict[str, float] = {}
         self.request_queue = APIRequestQueue()
@@ -232,14 +453,7 @@ class IntelligentRateLimiter:
     
     def _check_sliding_window(self, api_name: str, config: RateLimitConfig, current_time: datetime) -> bool:
         """Check sliding window rate limit"""
-        history = self.request_history[api_name]
-        window_start = current_time - timedelta(minutes=1)
-        
-        # Remove old requests outside the window
-        while history and history[0] < window_start:
-            history.popleft()
-        
-        return len(history) < config.requests_per_minute
+        return self.window_limiter.peek(api_name, limit=config.requests_per_minute)
     
     def _check_token_bucket(self, api_name: str, config: RateLimitConfig, current_time: datetime) -> bool:
         """Check token bucket rate limit"""
@@ -276,11 +490,9 @@ class IntelligentRateLimiter:
     
     def _check_fixed_window(self, api_name: str, config: RateLimitConfig, current_time: datetime) -> bool:
         """Check fixed window rate limit"""
-        history = self.request_history[api_name]
-        window_start = current_time.replace(second=0, microsecond=0)
-        
-        # Count requests in current minute
-        requests_in_window = sum(1 for req_time in history if req_time >= window_start)
+        # The limiter's current bucket is aligned to the minute, so it holds
+        # exactly the requests made in the current fixed window.
+        requests_in_window = self.window_limiter.count(api_name, sliding=False)
         
         return requests_in_window < config.requests_per_minute
     
@@ -289,7 +501,7 @@ class IntelligentRateLimiter:
         current_time = datetime.now()
         
         with self.lock:
-            self.request_history[api_name].append(current_time)
+            self.window_limiter.record(api_name)
             
             stats = self.usage_stats[api_name]
             stats['total_requests'] += 1
@@ -334,6 +546,10 @@ class IntelligentRateLimiter:
             return self.usage_stats.get(api_name, {})
         return dict(self.usage_stats)
     
+    def get_window_stats(self, api_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get sliding window counters for one API or the whole limiter"""
+        return self.window_limiter.get_stats(api_name)
+    
     def get_queue_status(self) -> Dict[str, Any]:
         """Get current queue status"""
         queue_sizes = self.request_queue.size()
@@ -0,0 +1,109 @@
+"""
+Tests for token-budgeted context packing in ContextOptimizer/ContextManager.
+"""
+
+import itertools
+import os
+import sys
+
+# Add nerve_centre to path for the llm_abstraction package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre'))
+
+from llm_abstraction.algorithms.context_window_optimization import (
+    ContextOptimizer,
+    TokenCounter,
+    replay_packing_workload,
+)
+from llm_abstraction.llm_abstraction import ContextManager, PromptEngineer
+
+
+def test_packed_context_fits_budget_and_keeps_relevant_elements():
+    optimizer = ContextOptimizer(max_tokens=120)
+    context = {
+        'gold_report': "gold prices rallied as gold demand from central banks rose " * 3,
+        'weather': "sunny with light winds and mild temperatures across the region " * 6,
+        'silver_note': "silver tracked gold higher",
+    }
+
+    packed, report = optimizer.pack(context, "What drove gold prices this week?")
+
+    assert 'gold_report' in packed
+    assert 'silver_note' in packed
+    assert 'weather' not in packed
+    assert report['packed_tokens'] <= 120
+    assert report['tokens_saved'] == report['original_tokens'] - report['packed_tokens']
+    rendered = "".join(f"- {k}: {v}\n" for k, v in packed.items())
+    assert optimizer.token_counter.count(rendered) <= 120
+
+
+def test_knapsack_matches_brute_force():
+    costs = [23, 31, 29, 44, 53, 38, 63, 85, 89, 82]
+    values = [92, 57, 49, 68, 60, 43, 67, 84, 87, 72]
+    capacity = 165
+
+    chosen = ContextOptimizer._solve_knapsack(costs, values, capacity)
+
+    best = max(
+        (sum(values[i] for i in combo), combo)
+        for r in range(len(costs) + 1)
+        for combo in itertools.combinations(range(len(costs)), r)
+        if sum(costs[i] for i in combo) <= capacity
+    )
+    assert sum(costs[i] for i in chosen) <= capacity
+    assert sum(values[i] for i in chosen) == best[0]
+
+
+def test_leftover_budget_goes_to_truncated_element():
+    optimizer = ContextOptimizer(max_tokens=200)
+    context = {'history': "the market opened higher and closed lower " * 40}
+
+    packed, report = optimizer.pack(context, "Summarize the market history")
+
+    assert 'history_partial' in packed
+    assert report['truncated'] == ['history']
+    assert report['packed_tokens'] <= 200
+
+
+def test_priority_keys_win_ties():
+    optimizer = ContextOptimizer(max_tokens=30)
+    context = {'notes': "x " * 20, 'current_task': "y " * 20}
+
+    packed, _ = optimizer.pack(context, "", priority_keys=['current_task'])
+
+    assert 'current_task' in packed or 'current_task_partial' in packed
+    assert 'notes' not in packed
+
+
+def test_fallback_counter_is_closer_than_characters_over_four():
+    counter = TokenCounter()
+    counter.encoding = None
+    assert counter.count("") == 0
+    assert counter.count("a, b, c.") == 6
+    assert counter.count("internationalization") == 5
+
+
+def test_context_manager_packs_before_prompt_engineering():
+    manager = ContextManager(max_context_tokens=60)
+    context = {'primary_data': "gold demand " * 5, 'filler': "lorem ipsum dolor " * 50}
+
+    packed = manager.optimize(context, "Explain gold demand")
+    prompt = PromptEngineer().engineer("Explain gold demand", packed)
+
+    assert 'filler' not in packed
+    assert 'lorem' not in prompt
+    assert manager.packing_stats['tokens_saved'] > 0
+    assert manager.last_report['packed_tokens'] <= 60
+
+
+def test_replay_reports_tokens_saved_per_request():
+    workload = [
+        {'prompt': "Analyze gold", 'context': {'gold': "gold " * 10, 'noise': "noise " * 500}},
+        {'prompt': "Analyze silver", 'context': {'silver': "silver " * 10}},
+    ]
+
+    summary = replay_packing_workload(workload, max_tokens=100)
+
+    assert summary['requests'] == 2
+    assert summary['per_request'][0]['tokens_saved'] > 0
+    assert summary['per_request'][1]['tokens_saved'] == 0
+    assert summary['tokens_saved'] == sum(r['tokens_saved'] for r in summary['per_request'])
@@ -0,0 +1,84 @@
+"""
+Tests that character-postings blocking in entity resolution finds the same
+merges as comparing every pair of names.
+"""
+
+import ast
+import itertools
+import os
+import re
+import sys
+import warnings
+
+import editdistance
+import networkx as nx
+
+MATRIX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre', 'matrix')
+sys.path.append(os.path.join(MATRIX, 'graphrag'))
+
+from entity_blocking import EntityCandidateIndex
+
+
+def load_function(path, name, class_name=None, **namespace):
+    """The real function from a module whose imports (api.*, rag.*) aren't installed here."""
+    with open(path, encoding='utf-8') as f, warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        tree = ast.parse(f.read())
+    if class_name is not None:
+        tree = next(node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == class_name)
+    node = next(node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == name)
+    namespace.update(re=re, editdistance=editdistance)
+    exec(compile(ast.Module(body=[node], type_ignores=[]), path, 'exec'), namespace)
+    return namespace[name]
+
+
+is_english = load_function(os.path.join(MATRIX, 'nlp', '__init__.py'), 'is_english')
+_is_similarity = load_function(os.path.join(MATRIX, 'graphrag', 'entity_resolution.py'), 'is_similarity',
+                               class_name='EntityResolution', is_english=is_english)
+
+
+def is_similarity(a, b):
+    return _is_similarity(None, a, b)
+
+
+def fake_llm_says_same(a, b):
+    """Stands in for the resolution prompt: same name up to case, punctuation and a trailing 'inc'."""
+    def canonical(name):
+        name = re.sub(r"[^0-9a-z一-鿿]", "", name.lower())
+        return name[:-3] if name.endswith("inc") else name
+    return canonical(a) == canonical(b)
+
+
+NAMES = [
+    "Apple Inc.", "APPLE", "apple inc", "Apple", "Applied Materials", "Alphabet", "Alphabet Inc",
+    "Google", "GOOGLE", "Goggle", "IBM", "I.B.M.", "Meta", "Metta", "Beta", "X", "Y", "xy",
+    "Newmont", "Newmont Corp", "Barrick Gold", "Barrick", "gold", "Gold", "GLD",
+    "中国人民银行", "人民银行", "中国银行", "银行", "黄金", "黄金ETF", "美联储", "联储",
+    "St. Louis Fed", "St Louis Fed", "Federal Reserve", "Fed", "FED", "fed.",
+]
+
+
+def merges(pairs):
+    graph = nx.Graph()
+    graph.add_nodes_from(NAMES)
+    graph.add_edges_from((a, b) for a, b in pairs if fake_llm_says_same(a, b))
+    return sorted(sorted(component) for component in nx.connected_components(graph) if len(component) > 1)
+
+
+def all_pairs(anchors):
+    return [(a, b) for a, b in itertools.combinations(sorted(NAMES), 2)
+            if (a in anchors or b in anchors) and is_similarity(a, b)]
+
+
+def test_blocked_candidates_equal_all_pairs_comparison():
+    index = EntityCandidateIndex(NAMES, is_english)
+    for anchors in (set(NAMES), {"Apple", "Fed", "黄金"}, {"X"}, set()):
+        assert index.candidate_pairs(anchors, is_similarity) == all_pairs(anchors)
+
+
+def test_blocked_candidates_give_the_same_merges():
+    blocked = EntityCandidateIndex(NAMES, is_english).candidate_pairs(set(NAMES), is_similarity)
+    merged = merges(blocked)
+    assert merged == merges(all_pairs(set(NAMES)))
+    assert ["Apple", "Apple Inc.", "apple inc"] in merged
+    assert ["St Louis Fed", "St. Louis Fed"] in merged
@@ -0,0 +1,153 @@
+"""
+Tests for the incremental graph write helpers in graphrag.utils: graph
+snapshots, the sources a change touches, tidy_graph removals and adaptive
+bulk inserts.
+"""
+
+import json
+import os
+import sys
+import types
+
+import networkx as nx
+import pytest
+import trio
+
+MATRIX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre', 'matrix')
+
+
+class FakeDocStore:
+    def __init__(self, max_batch=None):
+        self.max_batch = max_batch
+        self.batches = []
+
+    def insert(self, batch, index_name, kb_id):
+        self.batches.append([chunk['id'] for chunk in batch])
+        if self.max_batch is not None and len(batch) > self.max_batch:
+            return f"batch of {len(batch)} rejected"
+        return ""
+
+
+@pytest.fixture(scope='module')
+def graph_utils():
+    """graphrag.utils with stand-ins for the api/rag packages, which aren't installed here."""
+    settings = types.SimpleNamespace(docStoreConn=None)
+    stubs = {
+        'api': types.ModuleType('api'),
+        'api.utils': types.ModuleType('api.utils'),
+        'rag': types.ModuleType('rag'),
+        'rag.nlp': types.ModuleType('rag.nlp'),
+        'rag.utils': types.ModuleType('rag.utils'),
+        'rag.utils.doc_store_conn': types.ModuleType('rag.utils.doc_store_conn'),
+    }
+    stubs['api'].settings = settings
+    stubs['api.utils'].get_uuid = lambda: 'uuid'
+    stubs['rag.nlp'].search = types.SimpleNamespace(index_name=lambda tenant_id: f"ragflow_{tenant_id}")
+    stubs['rag.nlp'].rag_tokenizer = types.SimpleNamespace()
+    stubs['rag.utils.doc_store_conn'].OrderByExpr = object
+
+    saved = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    sys.path.insert(0, MATRIX)
+    try:
+        import graphrag.utils as utils
+        yield utils
+    finally:
+        sys.path.remove(MATRIX)
+        for name in [n for n in sys.modules if n == 'graphrag' or n.startswith('graphrag.')] + ['kv_cache']:
+            sys.modules.pop(name, None)
+        for name, previous in saved.items():
+            if previous is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = previous
+
+
+def sample_graph():
+    graph = nx.Graph(source_id=['d1', 'd2', 'd3'])
+    graph.add_node('GOLD', description='黄金 and gold', source_id=['d1', 'd2'], entity_type='COMMODITY', pagerank=0.4)
+    graph.add_node('FED', description='central bank', source_id=['d2'], entity_type='ORG')
+    graph.add_node('ETF', description='fund', source_id=['d3'], entity_type='PRODUCT')
+    graph.add_edge('FED', 'GOLD', description='rates move gold', source_id=['d2'], weight=2.0, keywords=['rates'])
+    graph.add_edge('ETF', 'GOLD', description='holds gold', source_id=['d3'], weight=1.0, keywords=[])
+    return graph
+
+
+def assert_same_graph(a, b):
+    assert dict(a.nodes(data=True)) == dict(b.nodes(data=True))
+    assert {frozenset((u, v)): d for u, v, d in a.edges(data=True)} == \
+        {frozenset((u, v)): d for u, v, d in b.edges(data=True)}
+    assert a.graph == b.graph
+
+
+def test_snapshot_round_trip_and_legacy_json(graph_utils):
+    graph = sample_graph()
+    content = graph_utils.dump_graph_snapshot(graph)
+    assert content.startswith(graph_utils.GRAPH_SNAPSHOT_PREFIX)
+    assert_same_graph(graph_utils.load_graph_snapshot(content), graph)
+
+    legacy = json.dumps(nx.node_link_data(graph, edges='edges'), ensure_ascii=False, indent=2)
+    assert_same_graph(graph_utils.load_graph_snapshot(legacy), graph)
+    assert_same_graph(graph_utils.load_graph_snapshot(graph_utils.dump_graph_snapshot(nx.Graph())), nx.Graph())
+
+
+def test_affected_graph_sources(graph_utils):
+    graph = sample_graph()
+    GraphChange = graph_utils.GraphChange
+
+    assert graph_utils.affected_graph_sources(graph, GraphChange()) == set()
+    # A changed node touches all of its sources
+    assert graph_utils.affected_graph_sources(graph, GraphChange(added_updated_nodes={'GOLD'})) == {'d1', 'd2'}
+    assert graph_utils.affected_graph_sources(graph, GraphChange(pagerank_updated_nodes={'ETF'})) == {'d3'}
+    # A changed or removed edge only touches the sources both ends share
+    assert graph_utils.affected_graph_sources(graph, GraphChange(added_updated_edges={('FED', 'GOLD')})) == {'d2'}
+    assert graph_utils.affected_graph_sources(graph, GraphChange(removed_edges={('ETF', 'FED')})) == set()
+    # Nodes gone from the graph contribute nothing; explicit sources pass through
+    change = GraphChange(added_updated_nodes={'GONE'}, added_updated_sources={'d9'})
+    assert graph_utils.affected_graph_sources(graph, change) == {'d9'}
+
+
+def test_tidy_graph_records_purged_nodes_and_edges(graph_utils):
+    graph = sample_graph()
+    graph.add_node('BROKEN', source_id=['d1'])  # no description
+    graph.add_edge('BROKEN', 'GOLD', description='dangling', source_id=['d1'])
+    graph.add_edge('ETF', 'FED', weight=1.0)  # no description or source_id
+    change = graph_utils.GraphChange()
+    messages = []
+
+    graph_utils.tidy_graph(graph, lambda msg: messages.append(msg), change)
+
+    assert not graph.has_node('BROKEN') and not graph.has_edge('ETF', 'FED')
+    assert change.removed_nodes == {'BROKEN'}
+    assert change.removed_edges == {('BROKEN', 'GOLD'), ('ETF', 'FED')}
+    assert change.added_updated_sources == {'d1'}
+    assert len(messages) == 2
+    # Without a change to record into it behaves as before
+    graph_utils.tidy_graph(sample_graph(), None)
+
+
+def test_insert_chunks_adaptive_halves_failed_batches(graph_utils, monkeypatch):
+    store = FakeDocStore(max_batch=4)
+    monkeypatch.setattr(graph_utils.settings, 'docStoreConn', store)
+    chunks = [{'id': str(i), 'content_with_weight': 'x'} for i in range(10)]
+
+    requests = trio.run(graph_utils.insert_chunks_adaptive, chunks, 'tenant', 'kb')
+
+    # 10 and 5 are rejected; the cap then stays at 2
+    assert [len(b) for b in store.batches] == [10, 5, 2, 2, 2, 2, 2]
+    assert requests == len(store.batches)
+    accepted = [i for b in store.batches if len(b) <= 4 for i in b]
+    assert accepted == [c['id'] for c in chunks]
+
+
+def test_insert_chunks_adaptive_caps_bytes_and_raises_on_single_failure(graph_utils, monkeypatch):
+    store = FakeDocStore()
+    monkeypatch.setattr(graph_utils.settings, 'docStoreConn', store)
+    chunks = [{'id': str(i), 'content_with_weight': 'x' * 1000} for i in range(6)]
+
+    trio.run(lambda: graph_utils.insert_chunks_adaptive(chunks, 'tenant', 'kb', max_batch_bytes=2500))
+    assert [len(b) for b in store.batches] == [2, 2, 2]
+
+    monkeypatch.setattr(graph_utils.settings, 'docStoreConn', FakeDocStore(max_batch=0))
+    with pytest.raises(Exception, match='Insert chunk error'):
+        trio.run(graph_utils.insert_chunks_adaptive, chunks[:1], 'tenant', 'kb')
@@ -0,0 +1,183 @@
+"""
+Tests for concurrent and hedged execution in LLMOrchestrator, using local
+fake providers with scripted delays and failures.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add nerve_centre to path for the llm_abstraction package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre'))
+
+from llm_abstraction.base import LLMProviderBase
+from llm_abstraction.llm_abstraction import LatencyHistogram, LLMOrchestrator, LLMResponse, OutputProcessor
+from llm_abstraction.metrics import percentile
+
+
+class PassThroughProcessor(OutputProcessor):
+    def process(self, outputs, request):
+        return outputs
+
+
+class FakeProvider(LLMProviderBase):
+    """Blocking provider that answers after a scripted delay, or raises."""
+
+    def __init__(self, name, delays, fail=False):
+        super().__init__({'name': name})
+        self.delays = list(delays)
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    def _next_delay(self):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        return delay
+
+    def _answer(self, delay):
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return LLMResponse(content=f"answer from {self.name}", provider=self.name,
+                           timestamp=time.time(), processing_time=delay)
+
+    def query(self, request):
+        delay = self._next_delay()
+        time.sleep(delay)
+        return self._answer(delay)
+
+    def get_metadata(self):
+        return {'name': self.name}
+
+
+class AsyncFakeProvider(FakeProvider):
+    """Native async provider, so cancellation really stops it."""
+
+    async def aquery(self, request):
+        delay = self._next_delay()
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self._answer(delay)
+
+
+def make_orchestrator(providers, **kwargs):
+    return LLMOrchestrator(providers, output_processor=PassThroughProcessor(), **kwargs)
+
+
+def test_multiple_providers_run_concurrently():
+    providers = [AsyncFakeProvider(f"p{i}", [0.2]) for i in range(4)]
+    orchestrator = make_orchestrator(providers)
+
+    start = time.perf_counter()
+    responses = asyncio.run(orchestrator.run_async("hello", use_multiple_providers=True))
+    elapsed = time.perf_counter() - start
+
+    assert len(responses) == 4
+    # Sequential execution would take 0.8s
+    assert elapsed < 0.6
+    assert all(orchestrator.latency[p.name].count == 1 for p in providers)
+
+
+def test_backup_fires_after_primary_p95_and_loser_is_cancelled():
+    primary = AsyncFakeProvider("primary", [0.01] * 20 + [2.0])
+    backup = AsyncFakeProvider("backup", [0.05])
+    orchestrator = make_orchestrator([primary, backup], hedge_min_samples=20)
+    # Primary has a fast track record, so it is selected and its p95 is ~10ms
+    for _ in range(20):
+        orchestrator._update_performance_metrics("primary", True, 0.01, latency=0.01)
+    primary.calls = 20
+
+    start = time.perf_counter()
+    response = asyncio.run(orchestrator.run_async("hello"))
+    elapsed = time.perf_counter() - start
+
+    assert response.provider == "backup"
+    assert elapsed < 1.0
+    assert primary.cancelled == 1
+    assert orchestrator.hedge_stats['hedges'] == 1
+    assert orchestrator.hedge_stats['backup_wins'] == 1
+    assert orchestrator.hedge_stats['cancelled'] == 1
+    # The loser's elapsed time is kept as a lower bound, not as a sample
+    histogram = orchestrator.latency["primary"]
+    assert histogram.count == 20 and histogram.percentile(50) == 0.01
+    assert len(histogram.lower_bounds) == 1 and histogram.snapshot()['cancelled'] == 1
+
+
+def test_median_estimate_falls_back_to_lower_bounds():
+    histogram = LatencyHistogram()
+    assert histogram.median_estimate() is None
+    histogram.record_lower_bound(0.5)
+    assert histogram.percentile(50) is None and histogram.median_estimate() == 0.5
+    histogram.record(0.1)
+    assert histogram.median_estimate() == 0.1
+
+
+def test_failure_launches_next_provider_without_waiting():
+    broken = AsyncFakeProvider("broken", [0.01], fail=True)
+    healthy = AsyncFakeProvider("healthy", [0.01])
+    orchestrator = make_orchestrator([broken, healthy], hedge_default_delay=5.0)
+
+    start = time.perf_counter()
+    response = asyncio.run(orchestrator.run_async("hello"))
+
+    assert response.provider == "healthy"
+    assert time.perf_counter() - start < 1.0
+    assert orchestrator.provider_performance["broken"]['failure'] == 1
+    assert orchestrator.hedge_stats['hedges'] == 0
+
+
+def test_all_providers_failing_raises_last_error():
+    providers = [AsyncFakeProvider("a", [0.01], fail=True), AsyncFakeProvider("b", [0.01], fail=True)]
+    orchestrator = make_orchestrator(providers)
+
+    try:
+        asyncio.run(orchestrator.run_async("hello", max_retries=1))
+    except RuntimeError as e:
+        assert "is down" in str(e)
+    else:
+        raise AssertionError("expected the last provider error")
+    assert sum(p.calls for p in providers) == 2
+
+
+def test_blocking_providers_are_hedged_from_threads():
+    slow = FakeProvider("slow", [1.0])
+    fast = FakeProvider("fast", [0.01])
+    orchestrator = make_orchestrator([slow, fast], hedge_default_delay=0.05)
+    # Make the slow provider look best so it becomes the primary
+    orchestrator._update_performance_metrics("fast", False)
+
+    async def timed():
+        start = time.perf_counter()
+        response = await orchestrator.run_async("hello")
+        # asyncio.run() itself waits for the abandoned worker thread
+        return response, time.perf_counter() - start
+
+    response, elapsed = asyncio.run(timed())
+
+    assert response.provider == "fast"
+    assert elapsed < 0.9
+
+
+def test_selection_uses_observed_latency():
+    providers = [FakeProvider("steady", [0.1]), FakeProvider("spiky", [0.1])]
+    orchestrator = make_orchestrator(providers)
+    for _ in range(10):
+        orchestrator._update_performance_metrics("steady", True, 0.1, latency=0.2)
+        orchestrator._update_performance_metrics("spiky", True, 0.1, latency=8.0)
+
+    assert orchestrator._select_best_provider(None).name == "steady"
+    status = orchestrator.get_provider_status()
+    assert status["spiky"]['latency']['p50'] == 8.0
+
+
+def test_latency_percentiles_use_the_shared_nearest_rank():
+    histogram = LatencyHistogram()
+    for seconds in (4.0, 1.0, 3.0, 2.0):
+        histogram.record(seconds)
+    assert [histogram.percentile(q) for q in (25, 50, 51, 95, 100)] == [1.0, 2.0, 3.0, 4.0, 4.0]
+    assert percentile([1.0, 2.0], 50) == 1.0 and percentile([], 95) is None
+    assert histogram.percentile(0) == percentile(histogram.samples, 0) == 1.0
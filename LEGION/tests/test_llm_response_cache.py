@@ -0,0 +1,157 @@
+"""
+Tests for the LLM response cache in front of LLMOrchestrator.run.
+"""
+
+import os
+import sys
+import time
+
+# Add nerve_centre to path for the llm_abstraction package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre'))
+
+from llm_abstraction.base import LLMProviderBase
+from llm_abstraction.llm_abstraction import ContextManager, LLMOrchestrator, LLMResponse, OutputProcessor
+from llm_abstraction.response_cache import ResponseCache
+
+
+class PassThroughProcessor(OutputProcessor):
+    def process(self, outputs, request):
+        return outputs
+
+
+class CountingProvider(LLMProviderBase):
+    def __init__(self, name='fake', delay=0.05):
+        super().__init__({'name': name})
+        self.delay = delay
+        self.calls = 0
+
+    def query(self, request):
+        self.calls += 1
+        time.sleep(self.delay)
+        return LLMResponse(content=f"answer #{self.calls}", provider=self.name,
+                           timestamp=time.time(), processing_time=self.delay)
+
+    def get_metadata(self):
+        return {'name': self.name}
+
+
+def bag_of_words(text):
+    """Tiny deterministic embedding: letter counts."""
+    vector = [0.0] * 26
+    for ch in text.lower():
+        if 'a' <= ch <= 'z':
+            vector[ord(ch) - ord('a')] += 1
+    return vector
+
+
+def make_orchestrator(cache, provider=None):
+    provider = provider or CountingProvider()
+    return LLMOrchestrator([provider], output_processor=PassThroughProcessor(), response_cache=cache), provider
+
+
+def test_exact_hit_skips_provider_and_counts_savings():
+    orchestrator, provider = make_orchestrator(ResponseCache())
+
+    first = orchestrator.run("What is the gold price trend", context={'asset': 'gold'})
+    second = orchestrator.run("What is the gold price trend", context={'asset': 'gold'})
+
+    assert provider.calls == 1
+    assert second.content == first.content
+    assert second.metadata['cache'] == 'exact'
+    stats = orchestrator.response_cache.get_stats()
+    assert stats['provider_calls_saved'] == 1
+    assert stats['seconds_saved'] >= 0.05
+
+
+def test_context_and_prompt_are_part_of_the_key():
+    orchestrator, provider = make_orchestrator(ResponseCache())
+
+    orchestrator.run("Summarize the report", context={'asset': 'gold'})
+    orchestrator.run("Summarize the report", context={'asset': 'silver'})
+    orchestrator.run("Summarize the other report", context={'asset': 'gold'})
+
+    assert provider.calls == 3
+
+
+def test_semantic_lookup_is_opt_in():
+    exact_only, provider = make_orchestrator(ResponseCache())
+    exact_only.run("Explain the silver market")
+    exact_only.run("Explain the silver market!")
+    assert provider.calls == 2
+
+    semantic, provider = make_orchestrator(ResponseCache(embed_fn=bag_of_words, similarity_threshold=0.95))
+    semantic.run("Explain the silver market")
+    response = semantic.run("Explain  the silver market!")
+    assert provider.calls == 1
+    assert response.metadata['cache'] == 'semantic'
+    assert semantic.response_cache.get_stats()['semantic_hits'] == 1
+
+
+def test_ttl_expires_entries():
+    orchestrator, provider = make_orchestrator(ResponseCache(ttl=0.1))
+    orchestrator.run("Describe the oil outlook")
+    time.sleep(0.15)
+    orchestrator.run("Describe the oil outlook")
+
+    assert provider.calls == 2
+    assert orchestrator.response_cache.get_stats()['expired'] == 1
+
+
+def test_entry_cap_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    orchestrator, provider = make_orchestrator(cache)
+    orchestrator.run("Analyze a")
+    orchestrator.run("Analyze b")
+    orchestrator.run("Analyze a")  # hit, a is now most recent
+    orchestrator.run("Analyze c")  # evicts b
+
+    stats = cache.get_stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+    calls = provider.calls
+    orchestrator.run("Analyze a")
+    assert provider.calls == calls
+    orchestrator.run("Analyze b")
+    assert provider.calls == calls + 1
+
+
+def test_running_totals_match_the_table(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(path, ttl=0.1, max_entries=3)
+    response = LLMResponse(content="x" * 10, provider="fake", timestamp=0.0)
+    for prompt in ("a", "b", "a", "c", "d", "e"):  # a replace, then evictions
+        cache.put(prompt, None, "fake", {}, response)
+    time.sleep(0.15)
+    assert cache.get("e", None, "fake", {}) is None  # expired on read
+    cache.put("f", None, "fake", {}, response)  # expires the rest
+
+    def table_totals(c):
+        return tuple(c._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone())
+
+    stats = cache.get_stats()
+    assert stats['entries'] == 1
+    assert (stats['entries'], stats['size_bytes']) == table_totals(cache)
+    cache.close()
+    reopened = ResponseCache(path)
+    assert (reopened.get_stats()['entries'], reopened.get_stats()['size_bytes']) == table_totals(reopened)
+    reopened.clear()
+    assert reopened.get_stats()['entries'] == reopened.get_stats()['size_bytes'] == 0
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    orchestrator, provider = make_orchestrator(ResponseCache(path, embed_fn=bag_of_words))
+    orchestrator.run("Generate a weekly digest")
+    orchestrator.response_cache.close()
+
+    orchestrator, provider = make_orchestrator(ResponseCache(path, embed_fn=bag_of_words))
+    response = orchestrator.run("Generate a weekly digest")
+    assert provider.calls == 0
+    assert response.content == "answer #1"
+
+
+def test_context_manager_cache_is_bounded():
+    manager = ContextManager(max_cached_contexts=3)
+    for i in range(10):
+        manager.optimize({'item': i})
+    assert len(manager.context_cache) == 3
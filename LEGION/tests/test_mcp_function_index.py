@@ -0,0 +1,112 @@
+"""
+Tests for indexed MCP function discovery in MCPServerRegistry.
+"""
+
+import os
+import sys
+
+# Add nerve_centre to path for the llm_abstraction package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre'))
+
+from llm_abstraction.mcp.client.function_index import MCPFunctionIndex, benchmark_function_search, tokenize
+from llm_abstraction.mcp.client.mcp_client import MCPFunction, MCPServerInfo, MCPServerRegistry
+
+
+def function(name, description="", parameters=None, server='local', category='general'):
+    return MCPFunction(name=name, description=description, parameters=parameters or {},
+                       returns={'type': 'object'}, server=server, category=category)
+
+
+def make_registry():
+    registry = MCPServerRegistry()
+    for server in ('local', 'remote'):
+        registry.register_server(MCPServerInfo(name=server, url='', protocol='sse',
+                                               capabilities=[], tools=[], resources=[]))
+    registry.register_function(function('read_file', "Read file contents",
+                                         {'file_path': {'type': 'string'}}, category='file_management'))
+    registry.register_function(function('list_directory', "List the files in a directory",
+                                         {'directory_path': {'type': 'string'}}, category='file_management'))
+    registry.register_function(function('web_search', "Search the web",
+                                         {'type': 'object', 'properties': {'query': {}, 'num_results': {}}},
+                                         server='remote', category='web_operations'))
+    registry.register_function(function('fetchWebpage', "Fetch and parse a page",
+                                         {'url': {'type': 'string'}}, server='remote', category='web_operations'))
+    return registry
+
+
+def names(functions):
+    return [f.name for f in functions]
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("fetchWebpage") == ['fetch', 'webpage']
+    assert tokenize("read_file, file-path") == ['read', 'file', 'file', 'path']
+
+
+def test_name_matches_rank_above_description_matches():
+    registry = make_registry()
+    results = names(registry.search_functions("file"))
+    assert results[0] == 'read_file'
+    assert 'list_directory' in results
+    assert 'web_search' not in results
+
+
+def test_parameter_names_and_prefixes_are_searchable():
+    registry = make_registry()
+    assert names(registry.search_functions("num_results")) == ['web_search']
+    assert names(registry.search_functions("directory_path"))[0] == 'list_directory'
+    assert names(registry.search_functions("webp")) == ['fetchWebpage']
+    assert names(registry.search_functions("web", limit=1)) == ['web_search']
+
+
+def test_empty_query_returns_everything():
+    registry = make_registry()
+    assert len(registry.search_functions("")) == 4
+
+
+def test_unregister_server_updates_all_indexes():
+    registry = make_registry()
+    registry.unregister_server('remote')
+
+    assert registry.search_functions("web") == []
+    assert registry.list_functions(category='web_operations') == []
+    assert registry.list_functions(server='remote') == []
+    assert 'web' not in registry.function_index.postings
+    assert len(registry.function_index) == 2
+
+
+def test_reregistering_moves_a_function():
+    registry = make_registry()
+    registry.register_function(function('read_file', "Read a remote blob", server='remote', category='storage'))
+
+    assert names(registry.list_functions(category='file_management')) == ['list_directory']
+    assert names(registry.list_functions(category='storage', server='remote')) == ['read_file']
+    assert names(registry.search_functions("blob")) == ['read_file']
+    assert registry.search_functions("contents") == []
+
+
+def test_filtered_listing_matches_a_full_scan():
+    registry = make_registry()
+    for category in ('file_management', 'web_operations', 'missing', None):
+        for server in ('local', 'remote', 'missing', None):
+            expected = [f for f in registry.functions.values()
+                        if (not category or f.category == category) and (not server or f.server == server)]
+            assert registry.list_functions(category, server) == expected
+
+
+def test_common_terms_do_not_dominate_selective_ones():
+    index = MCPFunctionIndex()
+    for i in range(10):
+        index.add(function(f'get_record_{i}', parameters={'record_id': {}}))
+    index.add(function('get_invoice', parameters={'invoice_id': {}}))
+
+    assert index.search("invoice id", limit=1)[0][0] == 'get_invoice'
+    # Alone, a common term still matches
+    assert len(index.search("id")) == 11
+
+
+def test_benchmark_with_ten_thousand_functions():
+    report = benchmark_function_search(10000, repeat=2)
+    assert report['functions'] == 10000
+    assert report['indexed_search_ms'] > 0
+    assert report['filtered_list_ms'] < report['linear_scan_ms']
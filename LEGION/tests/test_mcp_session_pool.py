@@ -0,0 +1,175 @@
+"""
+Tests for pooled MCP sessions and the opt-in result cache, against an
+in-process ComprehensiveMCPServer.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add nerve_centre to path for the llm_abstraction package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre'))
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from llm_abstraction.mcp.client.mcp_client import (
+    MCPFunction,
+    MCPFunctionExecutor,
+    MCPServerInfo,
+    MCPServerRegistry,
+    MCPSessionManager,
+)
+from llm_abstraction.mcp.server.mcp_server import ComprehensiveMCPServer
+
+
+def make_server():
+    server = ComprehensiveMCPServer()
+    server.lookup_calls = 0
+
+    @server.tool()
+    async def slow_lookup(key: str, delay: float = 0.1) -> dict:
+        """Read-only lookup that takes a while"""
+        server.lookup_calls += 1
+        await asyncio.sleep(delay)
+        return {"key": key, "call": server.lookup_calls}
+
+    return server
+
+
+def make_executor(server, max_sessions=2, max_concurrency=2, **kwargs):
+    registry = MCPServerRegistry()
+    registry.register_server(MCPServerInfo(
+        name='local', url='memory://', protocol='memory', capabilities=[], tools=[], resources=[]
+    ))
+    for name, cacheable, ttl in [('slow_lookup', True, kwargs.pop('ttl', None)),
+                                 ('store_memory', False, None),
+                                 ('retrieve_memory', False, None)]:
+        registry.register_function(MCPFunction(
+            name=name, description=name, parameters={}, returns={'type': 'object'},
+            server='local', category='test', cacheable=cacheable, cache_ttl=ttl
+        ))
+    manager = MCPSessionManager(
+        registry,
+        max_sessions_per_server=max_sessions,
+        max_concurrency_per_server=max_concurrency,
+        session_factory=lambda info: create_connected_server_and_client_session(server.server)
+    )
+    return MCPFunctionExecutor(registry, manager, **kwargs)
+
+
+def payload(result):
+    return json.loads(result['content'][0]['text'])
+
+
+def run(coro_fn):
+    server = make_server()
+    try:
+        return asyncio.run(coro_fn(server))
+    finally:
+        asyncio.run(server.cleanup())
+
+
+def test_tools_dispatch_by_name_through_a_pooled_session():
+    async def scenario(server):
+        executor = make_executor(server)
+        stored = await executor.execute_function('store_memory', {'key': 'k', 'value': {'v': 1}})
+        retrieved = await executor.execute_function('retrieve_memory', {'key': 'k'})
+        await executor.session_manager.close_all_sessions()
+        return stored, retrieved
+
+    stored, retrieved = run(scenario)
+    assert payload(stored) is True
+    assert payload(retrieved) == {'v': 1}
+
+
+def test_concurrency_limit_queues_calls_and_reports_waits():
+    async def scenario(server):
+        executor = make_executor(server, max_sessions=2, max_concurrency=2)
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            executor.execute_function('slow_lookup', {'key': f'k{i}', 'delay': 0.1}) for i in range(6)
+        ))
+        elapsed = time.perf_counter() - start
+        stats = executor.get_execution_stats()
+        await executor.session_manager.close_all_sessions()
+        return elapsed, stats
+
+    elapsed, stats = run(scenario)
+    # Six 100ms calls, two at a time
+    assert 0.28 < elapsed < 1.5
+    pool = stats['pools']['local']
+    assert pool['sessions_opened'] == 2
+    assert pool['leases'] == 6
+    assert stats['queue_wait']['max'] >= 0.15
+    assert stats['queue_wait']['p95'] >= stats['queue_wait']['avg'] > 0
+    assert stats['function_stats']['slow_lookup']['avg_queue_wait'] > 0
+
+
+def test_cacheable_results_are_reused_until_ttl():
+    async def scenario(server):
+        executor = make_executor(server, ttl=0.2)
+        first = await executor.execute_function('slow_lookup', {'key': 'a', 'delay': 0})
+        second = await executor.execute_function('slow_lookup', {'delay': 0, 'key': 'a'})
+        other = await executor.execute_function('slow_lookup', {'key': 'b', 'delay': 0})
+        await asyncio.sleep(0.25)
+        expired = await executor.execute_function('slow_lookup', {'key': 'a', 'delay': 0})
+        stats = executor.get_execution_stats()
+        await executor.session_manager.close_all_sessions()
+        return first, second, other, expired, stats
+
+    first, second, other, expired, stats = run(scenario)
+    assert payload(second) == payload(first)
+    assert payload(other)['key'] == 'b'
+    assert payload(expired)['call'] == 3
+    assert stats['cache']['hits'] == 1
+    assert stats['cache']['misses'] == 3
+    assert stats['cache']['expired'] == 1
+    assert stats['cache']['hit_rate'] == 0.25
+    assert stats['function_stats']['slow_lookup']['cache_hits'] == 1
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    async def scenario(server):
+        executor = make_executor(server)
+        results = await asyncio.gather(*(
+            executor.execute_function('slow_lookup', {'key': 'same', 'delay': 0.05}) for _ in range(5)
+        ))
+        await executor.session_manager.close_all_sessions()
+        return results, executor.get_cache_stats()
+
+    results, cache = run(scenario)
+    assert all(payload(r) == {'key': 'same', 'call': 1} for r in results)
+    assert cache['misses'] == 1
+    assert cache['coalesced'] == 4
+
+
+def test_functions_are_not_cached_unless_declared():
+    async def scenario(server):
+        executor = make_executor(server)
+        await executor.execute_function('store_memory', {'key': 'k', 'value': 1})
+        await executor.execute_function('retrieve_memory', {'key': 'k'})
+        await executor.execute_function('store_memory', {'key': 'k', 'value': 2})
+        latest = await executor.execute_function('retrieve_memory', {'key': 'k'})
+        await executor.session_manager.close_all_sessions()
+        return latest, executor.get_cache_stats()
+
+    latest, cache = run(scenario)
+    assert payload(latest) == 2
+    assert cache['hits'] == 0 and cache['entries'] == 0
+
+
+def test_tool_errors_are_not_cached():
+    async def scenario(server):
+        executor = make_executor(server)
+        # Missing required 'key' fails server-side input validation
+        first = await executor.execute_function('slow_lookup', {'delay': 0})
+        await executor.execute_function('slow_lookup', {'delay': 0})
+        await executor.session_manager.close_all_sessions()
+        return first, executor.get_cache_stats()
+
+    first, cache = run(scenario)
+    assert first['isError']
+    assert cache['entries'] == 0
+    assert cache['misses'] == 2
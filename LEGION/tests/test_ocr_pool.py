@@ -0,0 +1,83 @@
+"""
+Tests that OCRPool lanes return exactly what in-process OCR returns.
+
+Needs the deepdoc runtime (onnxruntime, OpenCV, the api/rag packages and the
+OCR models); the module is skipped where they aren't available.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('onnxruntime')
+cv2 = pytest.importorskip('cv2')
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre', 'matrix'))
+
+try:
+    from deepdoc.vision import OCR, OCRPool
+except ImportError as e:
+    pytest.skip(f"deepdoc runtime not available: {e}", allow_module_level=True)
+
+
+def page(lines):
+    img = np.full((320, 640, 3), 255, dtype=np.uint8)
+    for i, text in enumerate(lines):
+        cv2.putText(img, text, (20, 50 + 60 * i), cv2.FONT_HERSHEY_SIMPLEX, 1.1, (0, 0, 0), 2)
+    return img
+
+
+PAGES = [
+    page(["Gold closed at 2415.30", "Silver rallied 3 percent"]),
+    page(["Central banks bought 290 tonnes", "ETF outflows slowed"]),
+    page([]),
+]
+
+
+def boxes(res):
+    """detect() output as plain lists; OCR yields a lazy zip of arrays, the pool a list."""
+    if isinstance(res, tuple):
+        return res[:2]
+    return [(np.asarray(box).tolist(), rec) for box, rec in res]
+
+
+@pytest.fixture(scope='module')
+def ocr():
+    return OCR()
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with OCRPool(workers=2, threads_per_worker=2) as pool:
+        yield pool
+
+
+def test_pooled_pages_equal_serial_ocr(ocr, pool):
+    expected = [ocr(img) for img in PAGES]
+    assert any(expected)
+    assert pool.ocr_pages(PAGES) == expected
+    assert [pool(img, device_id=i) for i, img in enumerate(PAGES)] == expected
+
+
+def test_pooled_detect_and_recognize_equal_serial_ocr(ocr, pool):
+    for lane, img in enumerate(PAGES):
+        detected = boxes(pool.detect(img, device_id=lane))
+        assert detected == boxes(ocr.detect(img))
+        if isinstance(detected, tuple):
+            continue
+        crops = [pool.get_rotate_crop_image(img, np.array(box, dtype=np.float32)) for box, _ in detected]
+        assert all(np.array_equal(a, ocr.get_rotate_crop_image(img, np.array(box, dtype=np.float32)))
+                   for a, (box, _) in zip(crops, detected))
+        assert pool.recognize_batch(crops, device_id=lane) == ocr.recognize_batch(crops)
+
+
+def test_retries_are_not_counted_as_pages(pool):
+    before = pool.stats()
+    pool.detect(PAGES[0])
+    pool.detect(PAGES[0])
+    pool.count_retries(1)
+    after = pool.stats()
+    assert after['pages'] == before['pages'] + 1
+    assert after['retried_pages'] == before['retried_pages'] + 1
@@ -0,0 +1,75 @@
+"""
+Tests that RAGFlowPdfParser.stream() parses a document window by window into
+the same text and tables as a whole-document parse.
+
+Needs the deepdoc runtime (pdfplumber, onnxruntime, OpenCV, the api/rag
+packages and the models); the module is skipped where they aren't available.
+"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('pdfplumber')
+pytest.importorskip('onnxruntime')
+pytest.importorskip('cv2')
+matplotlib = pytest.importorskip('matplotlib')
+matplotlib.use('Agg')
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nerve_centre', 'matrix'))
+
+try:
+    from deepdoc.parser import PdfParser
+except ImportError as e:
+    pytest.skip(f"deepdoc runtime not available: {e}", allow_module_level=True)
+
+PAGES = [
+    ("Gold outlook", "Central banks kept buying gold through the quarter."),
+    ("Silver outlook", "Industrial demand for silver held up in Asia."),
+    ("Rates", "Real yields fell after the last policy meeting."),
+    ("Positioning", "Futures positioning stayed long but below its peak."),
+    ("Appendix", None),
+]
+
+
+@pytest.fixture(scope='module')
+def pdf_path(tmp_path_factory):
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    path = tmp_path_factory.mktemp('pdf') / 'report.pdf'
+    with PdfPages(path) as pdf:
+        for title, body in PAGES:
+            fig = plt.figure(figsize=(8.27, 11.69))
+            fig.text(0.1, 0.9, title, fontsize=20)
+            if body:
+                fig.text(0.1, 0.84, body, fontsize=12)
+            pdf.savefig(fig)
+            plt.close(fig)
+    return str(path)
+
+
+def paragraphs(parser, text):
+    return [p for p in parser.remove_tag(text).split("\n\n") if p.strip()]
+
+
+def test_windowed_parse_matches_whole_document(pdf_path):
+    whole_parser = PdfParser()
+    text, tables = whole_parser(pdf_path, need_image=False)
+    whole = paragraphs(whole_parser, text)
+    assert any("Central banks" in p for p in whole)
+
+    parser = PdfParser()
+    windowed, windowed_tables, windows = [], [], []
+    for window_from, window_to, window_text, window_tables in parser.stream(pdf_path, need_image=False, window=2):
+        windows.append((window_from, window_to))
+        # crop() and the page images belong to the window just yielded
+        assert len(parser.page_images) == window_to - window_from
+        windowed.extend(paragraphs(parser, window_text))
+        windowed_tables.extend(window_tables)
+
+    assert windows == [(0, 2), (2, 4), (4, 5)]
+    assert windowed == whole
+    assert len(windowed_tables) == len(tables)
+    assert parser.parse_stats["pages"] == len(PAGES)
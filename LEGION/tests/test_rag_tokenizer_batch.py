@@ -0,0 +1,118 @@
+"""
+Tests that batched and cached tokenization in RagTokenizer give exactly what
+the uncached per-line tokenizer gives.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+pytest.importorskip('datrie')
+pytest.importorskip('hanziconv')
+pytest.importorskip('nltk')
+
+TOKENIZER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              'nerve_centre', 'matrix', 'nlp', 'rag_tokenizer.py')
+
+DICTIONARY = """数据 9188 n
+分析 6820 n
+数据分析 7064 n
+项目 9520 n
+经理 736 n
+项目经理 1712 n
+境外 1544 n
+投资 5783 n
+投资者 4014 n
+境外投资者 8801 n
+人民币 6412 n
+南京 5540 ns
+南京市 3210 ns
+市长 2310 n
+长江 4120 ns
+大桥 2890 n
+长江大桥 1980 ns
+学区 310 n
+学区房 120 n
+就近 1350 d
+入学 980 v
+"""
+
+# Unbroken Chinese text only: spaces, punctuation and Latin spans go through
+# NLTK, whose corpora may not be downloaded.
+CORPUS = [
+    "数据分析项目经理",
+    "境外投资者可使用人民币投资",
+    "南京市长江大桥",
+    "学区房就近入学",
+    "数据分析项目经理",
+    "南京市长江大桥境外投资者",
+    "南京市长江大桥",
+]
+
+
+@pytest.fixture(scope='module')
+def rag_tokenizer(tmp_path_factory):
+    base = tmp_path_factory.mktemp('rag_base')
+    (base / 'rag' / 'res').mkdir(parents=True)
+    (base / 'rag' / 'res' / 'huqie.txt').write_text(DICTIONARY, encoding='utf-8')
+
+    # The tokenizer only needs api.* to locate its dictionary.
+    file_utils = types.ModuleType('api.utils.file_utils')
+    file_utils.get_project_base_directory = lambda: str(base)
+    stubs = {'api': types.ModuleType('api'), 'api.utils': types.ModuleType('api.utils'),
+             'api.utils.file_utils': file_utils}
+    saved = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    try:
+        spec = importlib.util.spec_from_file_location('rag_tokenizer_under_test', TOKENIZER_PATH)
+        module = importlib.util.module_from_spec(spec)
+        # Registered so the batch worker function pickles by reference
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    finally:
+        for name, previous in saved.items():
+            if previous is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = previous
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+def uncached(module):
+    tknzr = module.RagTokenizer()
+    tknzr.segment_cache = module._SegmentCache(0)
+    return tknzr
+
+
+def test_batch_matches_uncached_per_line_tokenize(rag_tokenizer):
+    reference = uncached(rag_tokenizer)
+    expected = [reference.tokenize(line) for line in CORPUS]
+    expected_fine = [reference.fine_grained_tokenize(tks) for tks in expected]
+    assert reference.segment_cache.stats()['size'] == 0
+    assert "项目经理" in expected[0].split()
+
+    tknzr = rag_tokenizer.RagTokenizer()
+    assert tknzr.tokenize_batch(CORPUS) == expected
+    assert tknzr.tokenize_batch(CORPUS, fine_grained=True) == expected_fine
+    assert tknzr.tokenize_batch(CORPUS * 3, fine_grained=True, workers=2, chunk_size=2) == expected_fine * 3
+
+
+def test_cache_hits_return_the_same_tokens(rag_tokenizer):
+    reference = uncached(rag_tokenizer)
+    tknzr = rag_tokenizer.RagTokenizer()
+
+    first = [tknzr.tokenize(line) for line in CORPUS]
+    hits = tknzr.segment_cache.stats()['hits']
+    # Repeated lines and spans shared across lines are served from the cache
+    assert hits > 0
+    second = [tknzr.tokenize(line) for line in CORPUS]
+    assert tknzr.segment_cache.stats()['hits'] > hits
+    assert first == second == [reference.tokenize(line) for line in CORPUS]
+
+    # A dictionary change drops cached segmentations
+    tknzr.addUserDict(os.path.join(rag_tokenizer.get_project_base_directory(), 'rag', 'res', 'huqie.txt'))
+    assert tknzr.segment_cache.stats()['size'] == 0
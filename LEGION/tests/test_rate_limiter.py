@@ -0,0 +1,105 @@
+"""
+Tests for the sliding window limiter engine shared by the backend API
+rate_limit decorator and IntelligentRateLimiter.
+"""
+
+import os
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import SlidingWindowLimiter
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_limit_enforced_within_window():
+    clock = FakeClock(600.0)
+    limiter = SlidingWindowLimiter(limit=3, window=60, clock=clock)
+
+    assert [limiter.hit('10.0.0.1') for _ in range(4)] == [True, True, True, False]
+    # Other keys are unaffected
+    assert limiter.hit('10.0.0.2')
+
+    stats = limiter.get_stats('10.0.0.1')
+    assert stats['allowed'] == 3
+    assert stats['rejected'] == 1
+
+
+def test_previous_window_is_weighted_by_overlap():
+    clock = FakeClock(600.0)
+    limiter = SlidingWindowLimiter(limit=4, window=60, clock=clock)
+    for _ in range(4):
+        assert limiter.hit('key')
+
+    # Halfway into the next window half of the previous bucket still counts
+    clock.now = 690.0
+    assert limiter.count('key') == 2.0
+    assert limiter.hit('key')
+    assert limiter.hit('key')
+    assert not limiter.hit('key')
+
+    # The fixed window view only sees the current aligned bucket
+    assert limiter.count('key', sliding=False) == 2
+
+
+def test_peek_does_not_consume():
+    clock = FakeClock(600.0)
+    limiter = SlidingWindowLimiter(limit=1, window=60, clock=clock)
+
+    assert limiter.peek('api')
+    assert limiter.peek('api')
+    limiter.record('api')
+    assert not limiter.peek('api')
+    assert limiter.peek('api', limit=2)
+
+
+def test_idle_keys_are_evicted():
+    clock = FakeClock(600.0)
+    limiter = SlidingWindowLimiter(limit=10, window=60, shards=4, clock=clock)
+    for i in range(500):
+        limiter.hit(f'10.0.{i // 256}.{i % 256}')
+    assert len(limiter) == 500
+
+    # One active client keeps traffic flowing while the scan goes idle
+    for step in range(1, 4):
+        clock.now = 600.0 + step * 60
+        limiter.hit('dashboard')
+
+    stats = limiter.get_stats()
+    assert len(limiter) == 1
+    assert stats['tracked_keys'] == 1
+    assert stats['evictions'] == 500
+
+
+def test_recently_active_keys_survive_wheel_rotation():
+    clock = FakeClock(600.0)
+    limiter = SlidingWindowLimiter(limit=100, window=60, wheel_slots=3, clock=clock)
+    for step in range(20):
+        clock.now = 600.0 + step * 30
+        assert limiter.hit('steady')
+    assert limiter.get_stats('steady')['allowed'] == 20
+
+
+def test_concurrent_hits_never_exceed_limit():
+    limiter = SlidingWindowLimiter(limit=250, window=3600)
+    allowed = []
+
+    def worker():
+        allowed.append(sum(limiter.hit('shared') for _ in range(100)))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(allowed) == 250